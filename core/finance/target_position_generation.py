@@ -63,34 +63,38 @@ def compute_target_positions_cross_sectionally(
             "Predictions provided for one asset; skipping Gaussian ranking."
         )
         gaussian_ranked = prediction
-    _LOG.debug(
-        "gaussian_ranked=\n%s",
-        hpandas.df_to_str(gaussian_ranked, num_rows=10),
-    )
+    if _LOG.isEnabledFor(logging.DEBUG):
+        _LOG.debug(
+            "gaussian_ranked=\n%s",
+            hpandas.df_to_str(gaussian_ranked, num_rows=10),
+        )
     target_position_signs = np.sign(gaussian_ranked)
-    _LOG.debug(
-        "target_position_signs=\n%s",
-        hpandas.df_to_str(target_position_signs, num_rows=10),
-    )
-    _LOG.debug(
-        "position count=\n%s",
-        hpandas.df_to_str(target_position_signs.abs().sum(axis=1)),
-    )
-    _LOG.debug(
-        "position sign imbalance=\n%s",
-        hpandas.df_to_str(target_position_signs.sum(axis=1)),
-    )
+    if _LOG.isEnabledFor(logging.DEBUG):
+        _LOG.debug(
+            "target_position_signs=\n%s",
+            hpandas.df_to_str(target_position_signs, num_rows=10),
+        )
+        _LOG.debug(
+            "position count=\n%s",
+            hpandas.df_to_str(target_position_signs.abs().sum(axis=1)),
+        )
+        _LOG.debug(
+            "position sign imbalance=\n%s",
+            hpandas.df_to_str(target_position_signs.sum(axis=1)),
+        )
     volatility = volatility.clip(lower=volatility_lower_bound)
     target_positions = target_position_signs.divide(volatility**2)
-    _LOG.debug(
-        "target_positions prior to gmv scaling=\n%s",
-        hpandas.df_to_str(target_positions, num_rows=10),
-    )
+    if _LOG.isEnabledFor(logging.DEBUG):
+        _LOG.debug(
+            "target_positions prior to gmv scaling=\n%s",
+            hpandas.df_to_str(target_positions, num_rows=10),
+        )
     target_positions = _apply_gmv_scaling(target_positions, target_gmv)
-    _LOG.debug(
-        "gmv-scaled target_positions=\n%s",
-        hpandas.df_to_str(target_positions, num_rows=10),
-    )
+    if _LOG.isEnabledFor(logging.DEBUG):
+        _LOG.debug(
+            "gmv-scaled target_positions=\n%s",
+            hpandas.df_to_str(target_positions, num_rows=10),
+        )
     hdbg.dassert_isinstance(target_positions, pd.DataFrame)
     return target_positions
 
@@ -112,7 +116,8 @@ def _apply_gmv_scaling(
         )
     else:
         raise ValueError("`target_gmv` type=%s not supported", type(target_gmv))
-    _LOG.debug("`scale_factors`=\n%s", hpandas.df_to_str(scale_factors))
+    if _LOG.isEnabledFor(logging.DEBUG):
+        _LOG.debug("`scale_factors`=\n%s", hpandas.df_to_str(scale_factors))
     target_positions = target_positions.divide(scale_factors, axis=0).replace(
         [-np.inf, np.inf], 0.0
     )
@@ -186,10 +191,11 @@ def compute_target_positions_longitudinally(
         )
     hpandas.dassert_axes_equal(prediction, spread)
     spread = spread.clip(lower=spread_lower_bound)
-    _LOG.debug(
-        "spread=\n%s",
-        hpandas.df_to_str(spread),
-    )
+    if _LOG.isEnabledFor(logging.DEBUG):
+        _LOG.debug(
+            "spread=\n%s",
+            hpandas.df_to_str(spread),
+        )
     #
     idx = prediction.index
     prediction = prediction.dropna(how="all")
@@ -198,16 +204,18 @@ def compute_target_positions_longitudinally(
             prediction,
             constant_decorrelation_coefficient,
         )
-        _LOG.debug(
-            "decorrelated predictions=\n%s",
-            hpandas.df_to_str(prediction),
-        )
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug(
+                "decorrelated predictions=\n%s",
+                hpandas.df_to_str(prediction),
+            )
     non_nan_idx = prediction.index
     volatility_to_spread = volatility.divide(spread)
-    _LOG.debug(
-        "volatility_to_spread=\n%s",
-        hpandas.df_to_str(volatility_to_spread),
-    )
+    if _LOG.isEnabledFor(logging.DEBUG):
+        _LOG.debug(
+            "volatility_to_spread=\n%s",
+            hpandas.df_to_str(volatility_to_spread),
+        )
     pred_term = (prediction.abs() - prediction_abs_threshold).clip(lower=0.0)
     vol_to_spread_term = (
         volatility_to_spread - volatility_to_spread_threshold
@@ -222,35 +230,39 @@ def compute_target_positions_longitudinally(
     # Add back the all-NaN rows.
     prediction = prediction.reindex(index=idx)
     #
-    _LOG.debug(
-        "prediction=\n%s",
-        hpandas.df_to_str(prediction),
-    )
+    if _LOG.isEnabledFor(logging.DEBUG):
+        _LOG.debug(
+            "prediction=\n%s",
+            hpandas.df_to_str(prediction),
+        )
     #
     target_position_signs = np.sign(prediction)
-    _LOG.debug(
-        "target_position_signs=\n%s",
-        hpandas.df_to_str(target_position_signs),
-    )
-    _LOG.debug(
-        "position count=\n%s",
-        hpandas.df_to_str(target_position_signs.abs().sum(axis=1)),
-    )
-    _LOG.debug(
-        "position sign imbalance=\n%s",
-        hpandas.df_to_str(target_position_signs.sum(axis=1)),
-    )
+    if _LOG.isEnabledFor(logging.DEBUG):
+        _LOG.debug(
+            "target_position_signs=\n%s",
+            hpandas.df_to_str(target_position_signs),
+        )
+        _LOG.debug(
+            "position count=\n%s",
+            hpandas.df_to_str(target_position_signs.abs().sum(axis=1)),
+        )
+        _LOG.debug(
+            "position sign imbalance=\n%s",
+            hpandas.df_to_str(target_position_signs.sum(axis=1)),
+        )
     #
     volatility = volatility.clip(lower=volatility_lower_bound)
     target_capital = target_dollar_risk_per_name / volatility
-    _LOG.debug(
-        "target_capital=\n%s",
-        hpandas.df_to_str(target_capital),
-    )
+    if _LOG.isEnabledFor(logging.DEBUG):
+        _LOG.debug(
+            "target_capital=\n%s",
+            hpandas.df_to_str(target_capital),
+        )
     target_positions = target_position_signs.multiply(target_capital)
     if modulate_using_prediction_magnitude:
         target_positions = target_positions.multiply(prediction.abs())
-    _LOG.debug("target_positions=\n%s", hpandas.df_to_str(target_positions))
+    if _LOG.isEnabledFor(logging.DEBUG):
+        _LOG.debug("target_positions=\n%s", hpandas.df_to_str(target_positions))
     #
     hdbg.dassert_isinstance(target_positions, pd.DataFrame)
     return target_positions
@@ -6,7 +6,7 @@ import core.signal_processing.ema_smoothing as cspremsm
 
 import functools
 import logging
-from typing import Any, Optional, Union
+from typing import Any, Dict, List, Optional, Union
 
 import numpy as np
 import pandas as pd
@@ -23,6 +23,8 @@ def compute_ema(
     tau: float,
     min_periods: int,
     depth: int = 1,
+    *,
+    state: Optional[Dict[str, Any]] = None,
 ) -> Union[pd.DataFrame, pd.Series]:
     r"""Implement iterated EMA operator (e.g., see 3.3.6 of Dacorogna, et al).
 
@@ -48,6 +50,15 @@ def compute_ema(
       - <t^2> = n(n + 1) \tau^2
       - width = \sqrt{n} \tau
       - aspect ratio = \sqrt{1 + 1 / n}
+
+    If `state` is passed, the EMA is computed incrementally:
+      - with an empty dict, `signal` is the full history and `state` is
+        populated with the carry-over state of the filter
+      - with the dict populated by a previous call, `signal` contains only the
+        rows following the ones already processed and the result is the same
+        (up to floating point errors) as the one computed on the full history
+
+    :param state: carry-over state of the filter, updated in place
     """
     hdbg.dassert_isinstance(depth, int)
     hdbg.dassert_lte(1, depth)
@@ -60,14 +71,137 @@ def compute_ema(
     _LOG.debug("tau = %0.2f", tau)
     com = csprspfu.calculate_com_from_tau(tau)
     _LOG.debug("com = %0.2f", com)
+    if state is not None:
+        levels = _compute_ema_levels_incrementally(
+            _to_2d_array(signal),
+            com,
+            min_periods,
+            depth,
+            state.setdefault("ema_levels", []),
+        )
+        return _from_2d_array(levels[-1], signal)
     signal_hat = signal.copy()
     for _ in range(0, depth):
         signal_hat = signal_hat.ewm(
-            com=com, min_periods=min_periods, adjust=True, ignore_na=False, axis=0
+            com=com, min_periods=min_periods, adjust=True, ignore_na=False
         ).mean()
     return signal_hat
 
 
+def _to_2d_array(signal: Union[pd.DataFrame, pd.Series]) -> np.ndarray:
+    return signal.to_numpy(dtype=float).reshape(signal.shape[0], -1)
+
+
+def _from_2d_array(
+    values: np.ndarray, signal: Union[pd.DataFrame, pd.Series]
+) -> Union[pd.DataFrame, pd.Series]:
+    """
+    Package `values` with the same index and columns (or name) of `signal`.
+    """
+    if isinstance(signal, pd.Series):
+        return pd.Series(values[:, 0], index=signal.index, name=signal.name)
+    return pd.DataFrame(values, index=signal.index, columns=signal.columns)
+
+
+def _compute_ema_levels_incrementally(
+    values: np.ndarray,
+    com: float,
+    min_periods: int,
+    depth: int,
+    level_states: List[Dict[str, np.ndarray]],
+) -> List[np.ndarray]:
+    """
+    Compute the iterated EMAs of `values` carrying over the state of each
+    level.
+
+    The state of a level is represented by the decayed sum of the observations
+    (`num`), of their weights (`den`), and by the number of observations
+    (`nobs`). Since `adjust=True`, the EMA is `num / den`.
+
+    :param values: 2D array with the rows to process
+    :param level_states: states of the levels from the previous call. If
+        empty, `values` is the full history and the list is populated
+    :return: output of each level, from depth 1 to `depth`
+    """
+    decay = com / (1.0 + com)
+    if level_states:
+        hdbg.dassert_eq(len(level_states), depth)
+    levels = []
+    level_in = values
+    for level in range(depth):
+        if len(level_states) <= level:
+            # Use the same implementation of the non-incremental path for the
+            # history and compute the state with a single vectorized pass.
+            level_out = (
+                pd.DataFrame(level_in)
+                .ewm(
+                    com=com,
+                    min_periods=min_periods,
+                    adjust=True,
+                    ignore_na=False,
+                )
+                .mean()
+                .to_numpy()
+            )
+            level_states.append(_get_ema_level_state(level_in, decay))
+        else:
+            level_out = _update_ema_level(
+                level_in, decay, min_periods, level_states[level]
+            )
+        levels.append(level_out)
+        level_in = level_out
+    return levels
+
+
+def _get_ema_level_state(
+    values: np.ndarray, decay: float
+) -> Dict[str, np.ndarray]:
+    """
+    Compute the state of an EMA after processing all the rows of `values`.
+    """
+    num_rows = values.shape[0]
+    is_obs = ~np.isnan(values)
+    # Weights of the observations as seen from the last row.
+    weights = (decay ** np.arange(num_rows - 1, -1, -1))[:, np.newaxis]
+    state = {
+        "num": (np.where(is_obs, values, 0.0) * weights).sum(axis=0),
+        "den": (is_obs * weights).sum(axis=0),
+        "nobs": is_obs.sum(axis=0),
+    }
+    return state
+
+
+def _update_ema_level(
+    values: np.ndarray,
+    decay: float,
+    min_periods: int,
+    state: Dict[str, np.ndarray],
+) -> np.ndarray:
+    """
+    Process the new rows `values` updating `state` in place.
+
+    NaNs are not observations but still age the weights of the previous
+    observations, consistently with `ignore_na=False`.
+    """
+    num = state["num"]
+    den = state["den"]
+    nobs = state["nobs"]
+    # Like pandas, an output requires at least one observation.
+    min_periods = max(min_periods, 1)
+    out = np.full(values.shape, np.nan)
+    for idx, row in enumerate(values):
+        is_obs = ~np.isnan(row)
+        num = decay * num + np.where(is_obs, row, 0.0)
+        den = decay * den + is_obs
+        nobs = nobs + is_obs
+        mask = nobs >= min_periods
+        out[idx, mask] = num[mask] / den[mask]
+    state["num"] = num
+    state["den"] = den
+    state["nobs"] = nobs
+    return out
+
+
 def compute_smooth_derivative(
     signal: Union[pd.DataFrame, pd.Series],
     tau: float,
@@ -292,6 +426,8 @@ def compute_rolling_zscore(
     demean: bool = True,
     delay: int = 0,
     atol: float = 0,
+    *,
+    state: Optional[Dict[str, Any]] = None,
 ) -> Union[pd.DataFrame, pd.Series]:
     """
     Z-score using compute_smooth_moving_average and compute_rolling_std.
@@ -304,8 +440,25 @@ def compute_rolling_zscore(
     If denominator.abs() <= atol, Z-score value is set to np.nan in order to
     avoid extreme value spikes.
 
+    If `state` is passed, the z-score is computed incrementally with the same
+    semantic of `state` in `compute_ema()`.
+
     TODO(Paul): determine whether signal == signal.shift(0) always.
     """
+    if state is not None:
+        ret = _compute_rolling_zscore_incrementally(
+            _to_2d_array(signal),
+            tau,
+            min_periods,
+            min_depth,
+            max_depth,
+            p_moment,
+            demean,
+            delay,
+            atol,
+            state,
+        )
+        return _from_2d_array(ret, signal)
     if demean:
         # Equivalent to invoking compute_rolling_demean and compute_rolling_std, but
         # this way we avoid calculating signal_ma twice.
@@ -327,6 +480,67 @@ def compute_rolling_zscore(
     return ret
 
 
+def _compute_rolling_zscore_incrementally(
+    values: np.ndarray,
+    tau: float,
+    min_periods: int,
+    min_depth: int,
+    max_depth: int,
+    p_moment: float,
+    demean: bool,
+    delay: int,
+    atol: float,
+    state: Dict[str, Any],
+) -> np.ndarray:
+    """
+    Implement `compute_rolling_zscore()` carrying over the state of the EMAs.
+
+    Besides the state of the EMAs, `state` stores the last `delay` rows of the
+    moving average and of the standard deviation, which are needed to delay the
+    new rows.
+    """
+    hdbg.dassert_lte(1, min_depth)
+    hdbg.dassert_lte(min_depth, max_depth)
+    hdbg.dassert_lte(0, delay)
+    com = csprspfu.calculate_com_from_tau(tau)
+    num_cols = values.shape[1]
+    if not state:
+        state["ma_tail"] = np.full((delay, num_cols), np.nan)
+        state["std_tail"] = np.full((delay, num_cols), np.nan)
+
+    def _compute_sma(values_: np.ndarray, key: str) -> np.ndarray:
+        # An SMA averages the EMAs with depth in `[min_depth, max_depth]`,
+        # which are the levels of the iterated EMA of depth `max_depth`.
+        levels = _compute_ema_levels_incrementally(
+            values_, com, min_periods, max_depth, state.setdefault(key, [])
+        )
+        return sum(levels[min_depth - 1 :]) / float(max_depth - min_depth + 1)
+
+    def _shift(values_: np.ndarray, key: str) -> np.ndarray:
+        # Prepend the last `delay` rows of the previous call.
+        values_ = np.vstack([state[key], values_])
+        state[key] = values_[values_.shape[0] - delay :].copy()
+        return values_[: values_.shape[0] - delay]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if demean:
+            signal_ma = _compute_sma(values, "signal_ema_levels")
+            signal_moment = _compute_sma(
+                np.abs(values - signal_ma) ** p_moment, "moment_ema_levels"
+            )
+            numerator = values - _shift(signal_ma, "ma_tail")
+        else:
+            signal_moment = _compute_sma(
+                np.abs(values) ** p_moment, "moment_ema_levels"
+            )
+            numerator = values
+        signal_std = signal_moment ** (1.0 / p_moment)
+        denominator = _shift(signal_std, "std_tail")
+        denominator[np.abs(denominator) <= atol] = np.nan
+        ret = numerator / denominator
+    return ret
+
+
 def compute_rolling_skew(
     signal: Union[pd.DataFrame, pd.Series],
     tau_z: float,
@@ -5,7 +5,7 @@ import core.signal_processing.incremental_pca as csprinpc
 """
 
 import logging
-from typing import Dict, List, Tuple
+from typing import List, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -52,54 +52,167 @@ def compute_ipca(
         msg="Dimension should be greater than or equal to the number of principal components.",
     )
     hdbg.dassert_lt(0, tau)
-    com = csprspfu.calculate_com_from_tau(tau)
-    alpha = 1.0 / (com + 1.0)
-    _LOG.debug("com = %0.2f", com)
-    _LOG.debug("alpha = %0.2f", alpha)
     # TODO(Paul): Consider requiring that the caller do this instead.
     # Fill NaNs with zero.
     df.fillna(0, inplace=True)
-    lambdas: Dict[int, list] = {k: [] for k in range(num_pc)}
-    # V's are eigenvectors with norm equal to corresponding eigenvalue.
-    vs: Dict[int, list] = {k: [] for k in range(num_pc)}
-    unit_eigenvecs: Dict[int, list] = {k: [] for k in range(num_pc)}
-    step = 0
-    for n in df.index:
-        # Initialize u(n).
-        u = df.loc[n].copy()
-        for i in range(min(num_pc, step + 1)):
-            # Initialize ith eigenvector.
-            if i == step:
-                v = u.copy()
-                if np.linalg.norm(v):
-                    _LOG.debug("Initializing eigenvector %s...", i)
-                    step += 1
-            else:
-                # Main update step for eigenvector i.
-                u, v = _compute_ipca_step(u, vs[i][-1], alpha)
-            # Bookkeeping.
-            v.name = n
-            vs[i].append(v)
-            norm = np.linalg.norm(v)
-            lambdas[i].append(norm)
-            unit_eigenvecs[i].append(v / norm)
+    ipca = IncrementalPca(num_pc, tau)
+    lambdas, unit_eigenvecs = ipca.partial_fit(df.values)
     _LOG.debug("Completed %s steps of incremental PCA.", len(df))
-    # Convert lambda dict of lists to list of series.
-    # Convert unit_eigenvecs dict of lists to list of dataframes.
-    lambdas_srs = []
+    # Convert the eigenvalue array to a df and the eigenvector array to a list
+    # of dfs. The estimate for the ith eigenvector is available starting from
+    # the first time step at which all the previous eigenvectors are
+    # initialized.
+    lambda_df = pd.DataFrame(lambdas, index=df.index)
     unit_eigenvec_dfs = []
     for i in range(num_pc):
-        lambdas_srs.append(
-            pd.Series(index=df.index[-len(lambdas[i]) :], data=lambdas[i])
+        first_idx = _get_first_initialized_idx(lambdas[:, i])
+        index = df.index[first_idx:].rename(None)
+        if isinstance(index, pd.DatetimeIndex):
+            index = pd.DatetimeIndex(index, freq=None)
+        unit_eigenvec_df = pd.DataFrame(
+            unit_eigenvecs[first_idx:, i, :], index=index, columns=df.columns
         )
-        unit_eigenvec_dfs.append(pd.concat(unit_eigenvecs[i], axis=1).transpose())
-    lambda_df = pd.concat(lambdas_srs, axis=1)
+        unit_eigenvec_dfs.append(unit_eigenvec_df)
     return lambda_df, unit_eigenvec_dfs
 
 
+class IncrementalPca:
+    """
+    Array-backed incremental PCA that can be updated one batch at a time.
+
+    The state (i.e., the unnormalized eigenvector estimates) is kept across
+    calls to `partial_fit()`, so that feeding the rows of a dataframe in
+    chunks gives the same result as `compute_ipca()` on the whole dataframe.
+    """
+
+    def __init__(self, num_pc: int, tau: float) -> None:
+        """
+        Constructor.
+
+        :param num_pc: number of principal components to calculate
+        :param tau: same as in `compute_ipca()`
+        """
+        hdbg.dassert_isinstance(
+            num_pc, int, msg="Specify an integral number of principal components."
+        )
+        hdbg.dassert_lt(0, num_pc)
+        hdbg.dassert_lt(0, tau)
+        self._num_pc = num_pc
+        com = csprspfu.calculate_com_from_tau(tau)
+        self._alpha = 1.0 / (com + 1.0)
+        _LOG.debug("com = %0.2f", com)
+        _LOG.debug("alpha = %0.2f", self._alpha)
+        # Unnormalized eigenvector estimates, i.e. eigenvectors with norm
+        # equal to the corresponding eigenvalue, with shape `(num_pc, dim)`.
+        # It is allocated at the first update, when the dimension is known.
+        self._vs = None
+        # Number of initialized eigenvectors.
+        self._step = 0
+
+    @property
+    def num_initialized_components(self) -> int:
+        return self._step
+
+    def get_eigenvalues(self) -> np.ndarray:
+        """
+        Return the current eigenvalue estimates.
+
+        :return: array of shape `(num_pc,)` with NaNs for the eigenvalues that
+            haven't been initialized yet
+        """
+        hdbg.dassert_is_not(self._vs, None, "No data has been processed yet")
+        lambdas = np.full(self._num_pc, np.nan)
+        lambdas[: self._step] = np.linalg.norm(self._vs[: self._step], axis=1)
+        return lambdas
+
+    def get_unit_eigenvectors(self) -> np.ndarray:
+        """
+        Return the current unit eigenvector estimates.
+
+        :return: array of shape `(num_pc, dim)` with NaNs for the eigenvectors
+            that haven't been initialized yet
+        """
+        lambdas = self.get_eigenvalues()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            unit_eigenvecs = self._vs / lambdas[:, None]
+        return unit_eigenvecs
+
+    def partial_fit(self, data: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Update the estimates with a batch of observations.
+
+        :param data: (already centered) observations with shape
+            `(num_steps, dim)` or `(dim,)` for a single observation; NaNs are
+            treated as zeros
+        :return:
+          - eigenvalue estimates after each observation, with shape
+            `(num_steps, num_pc)`
+          - unit eigenvector estimates after each observation, with shape
+            `(num_steps, num_pc, dim)`
+          Estimates for the components that are not available yet at a
+          given step are NaN (see `compute_ipca()` for when a component is
+          initialized).
+        """
+        data = np.asarray(data, dtype=np.float64)
+        if data.ndim == 1:
+            data = data[None, :]
+        hdbg.dassert_eq(data.ndim, 2)
+        num_steps, dim = data.shape
+        if self._vs is None:
+            hdbg.dassert_lte(
+                self._num_pc,
+                dim,
+                msg="Dimension should be greater than or equal to the number of principal components.",
+            )
+            self._vs = np.zeros((self._num_pc, dim))
+        else:
+            hdbg.dassert_eq(dim, self._vs.shape[1])
+        data = np.nan_to_num(data, nan=0.0, posinf=np.inf, neginf=-np.inf)
+        # Preallocate the outputs.
+        lambdas = np.full((num_steps, self._num_pc), np.nan)
+        unit_eigenvecs = np.full((num_steps, self._num_pc, dim), np.nan)
+        vs = self._vs
+        alpha = self._alpha
+        # The updates are inherently sequential both in time and across
+        # components (each component is updated with the observation
+        # residualized with respect to the previous components), but operating
+        # on preallocated arrays avoids the overhead of pandas.
+        for n in range(num_steps):
+            # Initialize u(n).
+            u = data[n].copy()
+            for i in range(min(self._num_pc, self._step + 1)):
+                if i == self._step:
+                    # Initialize ith eigenvector.
+                    vs[i] = u
+                    if np.linalg.norm(u):
+                        _LOG.debug("Initializing eigenvector %s...", i)
+                        self._step += 1
+                else:
+                    # Main update step for eigenvector i.
+                    u, vs[i] = _compute_ipca_step(u, vs[i], alpha)
+                # Bookkeeping.
+                norm = np.linalg.norm(vs[i])
+                lambdas[n, i] = norm
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    unit_eigenvecs[n, i] = vs[i] / norm
+        return lambdas, unit_eigenvecs
+
+
+def _get_first_initialized_idx(lambdas: np.ndarray) -> int:
+    """
+    Return the index of the first non-NaN eigenvalue estimate.
+    """
+    is_available = ~np.isnan(lambdas)
+    if not is_available.any():
+        return lambdas.shape[0]
+    return int(np.argmax(is_available))
+
+
 def _compute_ipca_step(
-    u: pd.Series, v: pd.Series, alpha: float
-) -> Tuple[pd.Series, pd.Series]:
+    u: Union[pd.Series, np.ndarray],
+    v: Union[pd.Series, np.ndarray],
+    alpha: float,
+) -> Tuple[Union[pd.Series, np.ndarray], Union[pd.Series, np.ndarray]]:
     """
     Single step of incremental PCA.
 
@@ -114,12 +227,14 @@ def _compute_ipca_step(
       * u_next is residualized observation for step n, component i + 1
       * v_next is unnormalized eigenvector estimate for step n, component i
     """
-    if np.linalg.norm(v) == 0:
+    v_norm = np.linalg.norm(v)
+    if v_norm == 0:
         v_next = v * 0
         u_next = u.copy()
     else:
-        v_next = (1 - alpha) * v + alpha * u * np.dot(u, v) / np.linalg.norm(v)
-        u_next = u - np.dot(u, v) * v / (np.linalg.norm(v) ** 2)
+        dot = np.dot(u, v)
+        v_next = (1 - alpha) * v + alpha * u * dot / v_norm
+        u_next = u - dot * v / (v_norm**2)
     return u_next, v_next
 
 
@@ -27,6 +27,29 @@ class Test_compute_smooth_derivative1(hunitest.TestCase):
         self.check_string(actual.to_string())
 
 
+class Test_compute_ema1(hunitest.TestCase):
+    def test_incremental1(self) -> None:
+        """
+        Check that computing the EMA in chunks matches the full computation.
+        """
+        np.random.seed(42)
+        signal = pd.DataFrame(np.random.randn(100, 2), columns=["a", "b"])
+        signal.iloc[10:15, 0] = np.nan
+        tau = 10
+        min_periods = 5
+        depth = 2
+        expected = cspremsm.compute_ema(signal, tau, min_periods, depth)
+        state = {}
+        chunks = [
+            cspremsm.compute_ema(
+                signal.iloc[start:end], tau, min_periods, depth, state=state
+            )
+            for start, end in [(0, 3), (3, 12), (12, 13), (13, 100)]
+        ]
+        actual = pd.concat(chunks)
+        self.assert_dfs_close(actual, expected, rtol=1e-10, atol=1e-12)
+
+
 class Test_compute_smooth_moving_average1(hunitest.TestCase):
     def test1(self) -> None:
         np.random.seed(42)
@@ -659,6 +682,28 @@ class Test_compute_rolling_zscore1(hunitest.TestCase):
         output_df_string = hunitest.convert_df_to_string(output_df, index=True)
         self.check_string(output_df_string)
 
+    def test_incremental1(self) -> None:
+        """
+        Check that computing the z-score in chunks matches the full
+        computation.
+        """
+        series = self._get_arma_series(seed=1)
+        series[5:10] = np.nan
+        series[20:25] = 0
+        kwargs = {"tau": 5, "max_depth": 2, "delay": 2, "atol": 0.01}
+        expected = cspremsm.compute_rolling_zscore(series, **kwargs)
+        state = {}
+        chunks = [
+            cspremsm.compute_rolling_zscore(
+                series.iloc[start:end], **kwargs, state=state
+            )
+            for start, end in [(0, 1), (1, 7), (7, 8), (8, 40)]
+        ]
+        actual = pd.concat(chunks)
+        self.assert_dfs_close(
+            actual.to_frame(), expected.to_frame(), rtol=1e-10, atol=1e-12
+        )
+
     @staticmethod
     def _get_arma_series(seed: int) -> pd.Series:
         arma_process = carsigen.ArmaProcess([1], [1])
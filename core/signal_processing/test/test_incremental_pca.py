@@ -1,4 +1,5 @@
 import logging
+from typing import Dict, List, Tuple
 
 import numpy as np
 import pandas as pd
@@ -6,6 +7,7 @@ import pytest
 
 import core.artificial_signal_generators as carsigen
 import core.signal_processing.incremental_pca as csprinpc
+import core.signal_processing.special_functions as csprspfu
 import helpers.hunit_test as hunitest
 
 _LOG = logging.getLogger(__name__)
@@ -138,6 +140,109 @@ class Test_compute_ipca(hunitest.TestCase):
         return df
 
 
+class TestIncrementalPca(hunitest.TestCase):
+    def test_compute_ipca1(self) -> None:
+        """
+        Check that `compute_ipca()` matches the pandas-based reference.
+        """
+        df = Test_compute_ipca._get_df(seed=1)
+        self._check_compute_ipca(df)
+
+    def test_compute_ipca2(self) -> None:
+        """
+        Check the output for an input with a full-NaN row.
+
+        The second eigenvector is initialized with a null vector.
+        """
+        df = Test_compute_ipca._get_df(seed=1)
+        df.iloc[1:2, :] = np.nan
+        df.iloc[5:8, 3:5] = np.nan
+        self._check_compute_ipca(df)
+
+    def test_partial_fit1(self) -> None:
+        """
+        Check that updating in chunks gives the same result as in one batch.
+        """
+        df = Test_compute_ipca._get_df(seed=2)
+        num_pc = 3
+        tau = 16
+        ipca = csprinpc.IncrementalPca(num_pc, tau)
+        expected_lambdas, expected_unit_eigenvecs = ipca.partial_fit(df.values)
+        # Update row by row and then with the remaining chunk.
+        ipca = csprinpc.IncrementalPca(num_pc, tau)
+        lambdas = []
+        unit_eigenvecs = []
+        for i in range(5):
+            lambdas_tmp, unit_eigenvecs_tmp = ipca.partial_fit(df.values[i])
+            lambdas.append(lambdas_tmp)
+            unit_eigenvecs.append(unit_eigenvecs_tmp)
+        lambdas_tmp, unit_eigenvecs_tmp = ipca.partial_fit(df.values[5:])
+        lambdas.append(lambdas_tmp)
+        unit_eigenvecs.append(unit_eigenvecs_tmp)
+        np.testing.assert_array_equal(np.concatenate(lambdas), expected_lambdas)
+        np.testing.assert_array_equal(
+            np.concatenate(unit_eigenvecs), expected_unit_eigenvecs
+        )
+        # Check the current state.
+        self.assertEqual(ipca.num_initialized_components, num_pc)
+        np.testing.assert_array_equal(
+            ipca.get_eigenvalues(), expected_lambdas[-1]
+        )
+        np.testing.assert_array_equal(
+            ipca.get_unit_eigenvectors(), expected_unit_eigenvecs[-1]
+        )
+
+    def _check_compute_ipca(self, df: pd.DataFrame) -> None:
+        num_pc = 3
+        tau = 16
+        expected_lambda_df, expected_unit_eigenvec_dfs = _compute_ipca_reference(
+            df.copy(), num_pc, tau
+        )
+        lambda_df, unit_eigenvec_dfs = csprinpc.compute_ipca(df, num_pc, tau)
+        pd.testing.assert_frame_equal(lambda_df, expected_lambda_df, check_exact=True)
+        self.assertEqual(len(unit_eigenvec_dfs), len(expected_unit_eigenvec_dfs))
+        for actual, expected in zip(unit_eigenvec_dfs, expected_unit_eigenvec_dfs):
+            pd.testing.assert_frame_equal(actual, expected, check_exact=True)
+
+
+def _compute_ipca_reference(
+    df: pd.DataFrame, num_pc: int, tau: float
+) -> Tuple[pd.DataFrame, List[pd.DataFrame]]:
+    """
+    Compute incremental PCA with a loop over pandas series.
+    """
+    com = csprspfu.calculate_com_from_tau(tau)
+    alpha = 1.0 / (com + 1.0)
+    df = df.fillna(0)
+    lambdas: Dict[int, list] = {k: [] for k in range(num_pc)}
+    vs: Dict[int, list] = {k: [] for k in range(num_pc)}
+    unit_eigenvecs: Dict[int, list] = {k: [] for k in range(num_pc)}
+    step = 0
+    for n in df.index:
+        u = df.loc[n].copy()
+        for i in range(min(num_pc, step + 1)):
+            if i == step:
+                v = u.copy()
+                if np.linalg.norm(v):
+                    step += 1
+            else:
+                u, v = csprinpc._compute_ipca_step(u, vs[i][-1], alpha)
+            v.name = n
+            vs[i].append(v)
+            norm = np.linalg.norm(v)
+            lambdas[i].append(norm)
+            unit_eigenvecs[i].append(v / norm)
+    lambdas_srs = []
+    unit_eigenvec_dfs = []
+    for i in range(num_pc):
+        lambdas_srs.append(
+            pd.Series(index=df.index[-len(lambdas[i]) :], data=lambdas[i])
+        )
+        unit_eigenvec_dfs.append(pd.concat(unit_eigenvecs[i], axis=1).transpose())
+    lambda_df = pd.concat(lambdas_srs, axis=1)
+    return lambda_df, unit_eigenvec_dfs
+
+
 @pytest.mark.skip("See CmTask5898.")
 class Test__compute_ipca_step(hunitest.TestCase):
     def test1(self) -> None:
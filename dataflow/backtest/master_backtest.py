@@ -85,8 +85,13 @@ def _save_tiled_output(
     )
     if tag:
         tiled_dst_dir += "." + tag
+    # Index the tiles, so that the readers (e.g., `ParquetTileAnalyzer`) don't
+    # need to walk the dirs.
     hparque.to_partitioned_parquet(
-        df, [asset_id_col_name, "year", "month"], dst_dir=tiled_dst_dir
+        df,
+        [asset_id_col_name, "year", "month"],
+        dst_dir=tiled_dst_dir,
+        update_tile_index=True,
     )
     _LOG.info("Tiled results written in '%s'", tiled_dst_dir)
 
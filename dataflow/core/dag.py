@@ -4,10 +4,12 @@ Import as:
 import dataflow.core.dag as dtfcordag
 """
 
+import concurrent.futures
 import itertools
 import json
 import logging
 import os
+import threading
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union, cast
 
 import networkx as networ
@@ -15,6 +17,8 @@ import pandas as pd
 from tqdm.autonotebook import tqdm
 
 import dataflow.core.node as dtfcornode
+import dataflow.core.node_cache as dtfcornoca
+import dataflow.core.node_io_writer as dtfconiowr
 import helpers.hdatetime as hdateti
 import helpers.hdbg as hdbg
 import helpers.hio as hio
@@ -33,6 +37,10 @@ _LOG = logging.getLogger(__name__)
 
 DagOutput = Dict[dtfcornode.NodeId, dtfcornode.NodeOutput]
 
+# Protect the bookkeeping of the node outputs still in use when the nodes are
+# executed by multiple threads.
+_LIVENESS_LOCK = threading.Lock()
+
 
 # TODO(gp): Consider calling it `Dag` given our convention of snake case
 #  abbreviations in the code (but not in comments).
@@ -86,12 +94,32 @@ class DAG(hobject.PrintableMixin):
         self._save_node_io = ""
         self._profile_execution = False
         self._dst_dir: Optional[str] = None
+        # Free the outputs of a node as soon as all its successors have been
+        # executed, unless the node is a sink or it is pinned.
         self.force_free_nodes = False
+        self.pinned_nids: List[dtfcornode.NodeId] = []
+        self._node_io_writer: Optional[dtfconiowr.NodeIoWriter] = None
         self.set_debug_mode(
             self._save_node_io, self._profile_execution, self._dst_dir
         )
+        # By default the nodes are executed sequentially.
+        self._num_threads = 1
+        # By default the results of the nodes are not cached.
+        self._node_cache: Optional[dtfcornoca.NodeCache] = None
 
-    def __repr__(self) -> str:
+    def __str__(
+        self,
+        attr_names_to_skip: Optional[List[str]] = None,
+    ) -> str:
+        if attr_names_to_skip is None:
+            attr_names_to_skip = []
+        attr_names_to_skip.extend(self._get_attr_names_to_skip())
+        return super().__str__(attr_names_to_skip=attr_names_to_skip)
+
+    def __repr__(
+        self,
+        attr_names_to_skip: Optional[List[str]] = None,
+    ) -> str:
         """
         Return a detailed representation for debugging.
 
@@ -112,9 +140,12 @@ class DAG(hobject.PrintableMixin):
           }
         ```
         """
+        if attr_names_to_skip is None:
+            attr_names_to_skip = []
+        attr_names_to_skip.extend(self._get_attr_names_to_skip())
         txt = []
         # Get the representation for the class.
-        txt.append(super().__repr__())
+        txt.append(super().__repr__(attr_names_to_skip=attr_names_to_skip))
         # Add more details.
         res = []
         res.append("nodes=" + str(self.nx_dag.nodes(data=True)))
@@ -147,13 +178,25 @@ class DAG(hobject.PrintableMixin):
             - `df_as_csv`: save the full content of the node interface, using CSV for
               dataframes
             - `df_as_parquet`: like `df_as_csv` but using Parquet for dataframes
+            - `df_as_pq_append`: save the stats and append only the new rows of
+              each node output to Parquet from a background thread (see
+              `NodeIoWriter`), e.g., for real-time runs where each bar
+              mostly repeats the history of the previous bar; call
+              `flush_node_io()` to wait for the data to be saved
         :param profile_execution: if not `None`, store information about the
             execution of the nodes
         :param dst_dir: directory to save node interface and execution profiling info
         """
         hdbg.dassert_in(
             save_node_io,
-            ("", "stats", "df_as_csv", "df_as_pq", "df_as_csv_and_pq"),
+            (
+                "",
+                "stats",
+                "df_as_csv",
+                "df_as_pq",
+                "df_as_csv_and_pq",
+                "df_as_pq_append",
+            ),
         )
         _LOG.debug(hprint.to_str("save_node_io profile_execution dst_dir"))
         self._save_node_io = save_node_io
@@ -163,6 +206,10 @@ class DAG(hobject.PrintableMixin):
         # ```
         self._profile_execution = profile_execution
         self._dst_dir = dst_dir
+        if self._node_io_writer is not None:
+            # Save the outputs enqueued with the previous debug mode.
+            self._node_io_writer.close()
+            self._node_io_writer = None
         if self._dst_dir:
             hio.create_dir(self._dst_dir, incremental=False)
         if self._save_node_io or self._profile_execution:
@@ -173,6 +220,56 @@ class DAG(hobject.PrintableMixin):
             hdbg.dassert_is_not(
                 dst_dir, None, "Need to specify a directory to save the data"
             )
+        if self._save_node_io == "df_as_pq_append":
+            self._node_io_writer = dtfconiowr.NodeIoWriter(self._dst_dir)
+
+    def flush_node_io(self) -> None:
+        """
+        Wait until the node outputs saved in the background are written.
+
+        This is a no-op unless `save_node_io="df_as_pq_append"`.
+        """
+        if self._node_io_writer is not None:
+            self._node_io_writer.flush()
+
+    def set_parallel_mode(self, num_threads: int) -> None:
+        """
+        Set the number of threads used to execute the DAG nodes.
+
+        When `num_threads` > 1, the nodes whose predecessors have already been
+        executed are run concurrently on a thread pool (e.g., the independent
+        branches of a DAG joined by a `YConnector`). This is beneficial when the
+        nodes spend most of their time in code releasing the GIL (e.g., NumPy,
+        pandas, I/O).
+
+        Nodes are stateful objects that store their outputs and fit state in
+        place, so they can't be moved to a different process and we don't
+        support a process pool.
+
+        :param num_threads: number of threads to use. `1` executes the nodes
+            sequentially in topological order
+        """
+        hdbg.dassert_isinstance(num_threads, int)
+        hdbg.dassert_lte(1, num_threads)
+        _LOG.debug(hprint.to_str("num_threads"))
+        self._num_threads = num_threads
+
+    def set_node_cache(
+        self, node_cache: Optional[dtfcornoca.NodeCache]
+    ) -> None:
+        """
+        Set the cache used to memoize the results of the DAG nodes.
+
+        A node is not run if a result computed by a node with the same class,
+        config, state, and inputs is in the cache (e.g., the upstream nodes
+        shared by the DAGs of a config list sweep).
+
+        :param node_cache: cache to use. `None` disables caching
+        """
+        if node_cache is not None:
+            hdbg.dassert_isinstance(node_cache, dtfcornoca.NodeCache)
+        _LOG.debug(hprint.to_str("node_cache"))
+        self._node_cache = node_cache
 
     @property
     def nx_dag(self) -> networ.DiGraph:
@@ -460,8 +557,8 @@ class DAG(hobject.PrintableMixin):
             `get_outputs(method)`
         """
         sinks = self.get_sinks()
-        for id_, nid in enumerate(networ.topological_sort(self._nx_dag)):
-            self._run_node(id_, nid, method)
+        nids = list(networ.topological_sort(self._nx_dag))
+        self._run_nodes(nids, method)
         return {sink: self.get_node(sink).get_outputs(method) for sink in sinks}
 
     def run_leq_node(
@@ -490,13 +587,9 @@ class DAG(hobject.PrintableMixin):
         )
         # The `ancestors` filter only returns nodes strictly less than `nid`,
         # and so we need to add `nid` back.
-        nids = itertools.chain(ancestors, [nid])
+        nids = list(itertools.chain(ancestors, [nid]))
         # Execute all the ancestors of `nid`.
-        if progress_bar:
-            nids = tqdm(list(nids), desc="run_leq_node")
-        for id_, pred_nid in enumerate(nids):
-            _LOG.debug("Executing node '%s'", pred_nid)
-            self._run_node(id_, pred_nid, method)
+        self._run_nodes(nids, method, progress_bar=progress_bar)
         # Retrieve the output the node.
         node = self.get_node(nid)
         node_output = node.get_outputs(method)
@@ -504,6 +597,21 @@ class DAG(hobject.PrintableMixin):
 
     # /////////////////////////////////////////////////////////////////////////////
 
+    @staticmethod
+    def _get_attr_names_to_skip() -> List[str]:
+        """
+        Return the names of the attributes not printed in `str` and `repr`.
+
+        The execution settings are skipped to keep the DAG representation
+        independent of how the DAG is run.
+        """
+        return [
+            "pinned_nids",
+            "_node_io_writer",
+            "_num_threads",
+            "_node_cache",
+        ]
+
     def _to_json(self) -> str:
         # Get internal networkx representation of the DAG.
         graph: networ.classes.digraph.DiGraph = self.nx_dag
@@ -610,6 +718,8 @@ class DAG(hobject.PrintableMixin):
                 node_io.data/
                     predict.0.read_data.df_out.20220808_161500.csv
         ```
+        With `save_node_io="df_as_pq_append"`, the layout is the one of
+        `NodeIoWriter`.
 
         :param: similar to `_write_prof_stats_to_dst_dir()`
         """
@@ -622,7 +732,18 @@ class DAG(hobject.PrintableMixin):
         #
         if isinstance(obj, pd.Series):
             obj = pd.DataFrame(obj)
-        if isinstance(obj, pd.DataFrame):
+        if isinstance(obj, pd.DataFrame) and self._node_io_writer is not None:
+            # Save the df outside the critical path of the bar.
+            self._node_io_writer.write(
+                topological_id,
+                nid,
+                method,
+                output_name,
+                bar_timestamp,
+                wall_clock_time_str,
+                obj,
+            )
+        elif isinstance(obj, pd.DataFrame):
             df = obj
             # Save high level description about the df.
             # TODO(Grisha): should we save the df stats only if `self._profile_execution`
@@ -657,16 +778,210 @@ class DAG(hobject.PrintableMixin):
                 obj,
             )
 
+    def _run_nodes(
+        self,
+        nids: List[dtfcornode.NodeId],
+        method: dtfcornode.Method,
+        *,
+        progress_bar: bool = False,
+    ) -> None:
+        """
+        Run the requested `method` on the nodes `nids`.
+
+        :param nids: nodes to execute sorted in topological order. The position
+            of a node in the list is used as its topological id
+        :param progress_bar: whether to show a progress bar while executing
+        """
+        pbar = None
+        if progress_bar:
+            pbar = tqdm(total=len(nids), desc="run_leq_node")
+        num_pending_consumers = None
+        if self.force_free_nodes:
+            num_pending_consumers = self._get_num_consumers(nids)
+        if self._num_threads == 1:
+            for id_, nid in enumerate(nids):
+                _LOG.debug("Executing node '%s'", nid)
+                self._run_node(
+                    id_,
+                    nid,
+                    method,
+                    num_pending_consumers=num_pending_consumers,
+                )
+                if pbar is not None:
+                    pbar.update(1)
+        else:
+            self._run_nodes_in_parallel(
+                nids, method, pbar, num_pending_consumers
+            )
+        if pbar is not None:
+            pbar.close()
+
+    def _run_nodes_in_parallel(
+        self,
+        nids: List[dtfcornode.NodeId],
+        method: dtfcornode.Method,
+        pbar: Optional[tqdm],
+        num_pending_consumers: Optional[Dict[dtfcornode.NodeId, int]],
+    ) -> None:
+        """
+        Run the requested `method` on the nodes `nids` using a thread pool.
+
+        A node is submitted for execution as soon as all its predecessors in
+        `nids` have been executed. Each node stores its own outputs, so the
+        results don't depend on the order of execution of independent nodes.
+
+        :param nids, pbar: same as in `_run_nodes()`
+        :param num_pending_consumers: same as in `_run_node()`
+        """
+        topological_ids = {nid: id_ for id_, nid in enumerate(nids)}
+        # Count the predecessors of each node that still need to be executed.
+        num_pending_preds = {
+            nid: sum(
+                1
+                for pred_nid in self._nx_dag.predecessors(nid)
+                if pred_nid in topological_ids
+            )
+            for nid in nids
+        }
+        ready_nids = [nid for nid in nids if num_pending_preds[nid] == 0]
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self._num_threads
+        ) as executor:
+            futures: Dict[concurrent.futures.Future, dtfcornode.NodeId] = {}
+            while ready_nids or futures:
+                # Submit the ready nodes in topological order.
+                for nid in ready_nids:
+                    _LOG.debug("Submitting node '%s'", nid)
+                    future = executor.submit(
+                        self._run_node,
+                        topological_ids[nid],
+                        nid,
+                        method,
+                        num_pending_consumers=num_pending_consumers,
+                    )
+                    futures[future] = nid
+                ready_nids = []
+                done_futures, _ = concurrent.futures.wait(
+                    futures, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done_futures:
+                    nid = futures.pop(future)
+                    exception = future.exception()
+                    if exception is not None:
+                        # Do not start any other node and propagate the error.
+                        for pending_future in futures:
+                            pending_future.cancel()
+                        raise exception
+                    if pbar is not None:
+                        pbar.update(1)
+                    # Mark the successors with all the inputs available as ready.
+                    for succ_nid in self._nx_dag.successors(nid):
+                        if succ_nid not in num_pending_preds:
+                            continue
+                        num_pending_preds[succ_nid] -= 1
+                        if num_pending_preds[succ_nid] == 0:
+                            ready_nids.append(succ_nid)
+                ready_nids.sort(key=lambda x: topological_ids[x])
+
+    def _get_num_consumers(
+        self, nids: List[dtfcornode.NodeId]
+    ) -> Dict[dtfcornode.NodeId, int]:
+        """
+        Compute how many nodes in `nids` read the outputs of each node.
+
+        The outputs of a node are not needed anymore after all its consumers
+        have been executed. Nodes without consumers (e.g., the sinks or the
+        node requested by `run_leq_node()`) and pinned nodes are not reported,
+        since their outputs need to be kept.
+
+        :param nids: nodes to execute
+        :return: node -> number of successors of the node in `nids`
+        """
+        nids_set = set(nids)
+        num_consumers = {}
+        for nid in nids:
+            if nid in self.pinned_nids:
+                continue
+            num_consumers_tmp = sum(
+                1
+                for succ_nid in self._nx_dag.successors(nid)
+                if succ_nid in nids_set
+            )
+            if num_consumers_tmp > 0:
+                num_consumers[nid] = num_consumers_tmp
+        _LOG.debug(hprint.to_str("num_consumers"))
+        return num_consumers
+
+    def _free_unused_preds(
+        self,
+        nid: dtfcornode.NodeId,
+        num_pending_consumers: Dict[dtfcornode.NodeId, int],
+    ) -> None:
+        """
+        Free the outputs of the predecessors of `nid` that are not needed
+        anymore.
+
+        :param nid: node that has just been executed
+        :param num_pending_consumers: node -> number of consumers that still
+            need to be executed. It is updated in place
+        """
+        nids_to_free = []
+        with _LIVENESS_LOCK:
+            for pred_nid in self._nx_dag.predecessors(nid):
+                if pred_nid not in num_pending_consumers:
+                    continue
+                num_pending_consumers[pred_nid] -= 1
+                if num_pending_consumers[pred_nid] == 0:
+                    del num_pending_consumers[pred_nid]
+                    nids_to_free.append(pred_nid)
+        for pred_nid in nids_to_free:
+            pred_node = self.get_node(pred_nid)
+            _LOG.debug(
+                "Freeing pred_node=%s after its last consumer '%s'",
+                pred_nid,
+                nid,
+            )
+            pred_node.free()
+
+    def _get_node_cache_key(
+        self, nid: dtfcornode.NodeId, method: dtfcornode.Method
+    ) -> Optional[str]:
+        """
+        Compute the key of the result of `method` on a node in the node cache.
+
+        :return: key or `None` if the result of the node can't be cached
+        """
+        hdbg.dassert_is_not(self._node_cache, None)
+        input_fingerprints = {}
+        for pred_nid in self._nx_dag.predecessors(nid):
+            kvs = self._nx_dag.edges[[pred_nid, nid]]
+            pred_node = self.get_node(pred_nid)
+            for input_name, value in kvs.items():
+                input_fingerprints[input_name] = (
+                    self._node_cache.get_input_fingerprint(
+                        pred_node, method, value
+                    )
+                )
+        node = self.get_node(nid)
+        cache_key = self._node_cache.get_key(node, method, input_fingerprints)
+        return cache_key
+
     def _run_node(
         self,
         topological_id: int,
         nid: dtfcornode.NodeId,
         method: dtfcornode.Method,
+        *,
+        num_pending_consumers: Optional[Dict[dtfcornode.NodeId, int]] = None,
     ) -> None:
         """
         Run the requested `method` on a single node.
 
         This method DOES NOT run (or re-run) ancestors of `nid`.
+
+        :param num_pending_consumers: node -> number of consumers that still
+            need to be executed. If not `None`, the predecessors of `nid` are
+            freed after the execution of their last consumer
         """
         _LOG.debug(
             "\n%s",
@@ -692,25 +1007,34 @@ class DAG(hobject.PrintableMixin):
             for input_name, value in kvs.items():
                 # Retrieve output from store.
                 kwargs[input_name] = pred_node.get_output(method, value)
-                if self.force_free_nodes:
-                    _LOG.warning(
-                        "Forcing deallocation of pred_node=%s", pred_node
-                    )
-                    # TODO(gp): We should move this after using the data deallocating
-                    # all the nodes whose output has been used. For linear pipelines,
-                    # this check is not needed.
-                    pred_node.free()
             # TODO(gp): Save info for inputs, if needed.
         _LOG.debug("kwargs are %s", kwargs)
+        node = self.get_node(nid)
+        # Look up the result of `node.method()` in the cache.
+        output = None
+        cache_key = None
+        if self._node_cache is not None:
+            cache_key = self._get_node_cache_key(nid, method)
+            if cache_key is not None:
+                output = self._node_cache.load(node, method, cache_key)
         # Execute `node.method()`.
         with htimer.TimedScope(logging.DEBUG, "node_execution") as ts:
-            node = self.get_node(nid)
-            try:
-                output = getattr(node, method)(**kwargs)
-            except AttributeError as e:
-                raise AttributeError(
-                    f"An exception occurred in node '{nid}'\n{str(e)}"
-                ) from e
+            if output is None:
+                try:
+                    output = getattr(node, method)(**kwargs)
+                except AttributeError as e:
+                    raise AttributeError(
+                        f"An exception occurred in node '{nid}'\n{str(e)}"
+                    ) from e
+                if cache_key is not None:
+                    self._node_cache.store(node, method, cache_key, output)
+            else:
+                _LOG.debug("Loaded node '%s' from cache", nid)
+        if self._node_cache is not None:
+            if cache_key is None:
+                self._node_cache.reset_output_fingerprints(node, method)
+            else:
+                self._node_cache.set_output_fingerprints(node, method, cache_key)
         # Update the node.
         for output_name in node.output_names:
             value = output[output_name]
@@ -722,6 +1046,12 @@ class DAG(hobject.PrintableMixin):
                 self._write_node_interface_to_dst_dir(
                     topological_id, nid, method, output_name, value
                 )
+        # Release the outputs of the predecessors that are not used anymore, so
+        # that the memory profiling after execution accounts for it.
+        if num_pending_consumers is not None:
+            # Drop the references to the inputs held by this function.
+            del kwargs
+            self._free_unused_preds(nid, num_pending_consumers)
         # Save system info after execution the node.
         if self._profile_execution:
             file_tag = "after_execution"
@@ -0,0 +1,502 @@
+"""
+Import as:
+
+import dataflow.core.node_cache as dtfcornoca
+"""
+
+import functools
+import hashlib
+import logging
+import os
+import pickle
+import threading
+import types
+import uuid
+import weakref
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import dataflow.core.node as dtfcornode
+import dataflow.core.nodes.base as dtfconobas
+import helpers.hdbg as hdbg
+import helpers.hintrospection as hintros
+import helpers.hio as hio
+
+_LOG = logging.getLogger(__name__)
+
+# Attributes of a node that are not part of its configuration.
+_NODE_ATTRS_TO_SKIP = ["_output_vals", "_info"]
+
+# Max depth of the nested objects to fingerprint.
+_MAX_FINGERPRINT_DEPTH = 20
+
+
+# #############################################################################
+# Fingerprinting
+# #############################################################################
+
+
+class _NotFingerprintableError(ValueError):
+    """
+    Raised when an object can't be fingerprinted deterministically.
+    """
+
+
+def _update_hasher(hasher: Any, obj: Any, depth: int = 0) -> None:
+    """
+    Update `hasher` with the content of `obj`.
+
+    Objects are hashed by content, so that equal objects built by different
+    processes (e.g., different runs of a config list) have the same fingerprint.
+
+    :raises _NotFingerprintableError: if `obj` can't be fingerprinted
+    """
+    if depth > _MAX_FINGERPRINT_DEPTH:
+        raise _NotFingerprintableError("Object is too deeply nested")
+    update = lambda x: _update_hasher(hasher, x, depth + 1)
+    # Tag each object with its type to avoid collisions, e.g., between `1` and
+    # `"1"`.
+    hasher.update(type(obj).__qualname__.encode())
+    if obj is None or isinstance(obj, (bool, int, float, complex, str)):
+        hasher.update(repr(obj).encode())
+    elif isinstance(obj, bytes):
+        hasher.update(obj)
+    elif isinstance(obj, (pd.DataFrame, pd.Series)):
+        hasher.update(repr(obj.shape).encode())
+        update(obj.index.tolist() if obj.index.nlevels > 1 else None)
+        if isinstance(obj, pd.DataFrame):
+            update([str(col) for col in obj.columns])
+            update([str(dtype) for dtype in obj.dtypes])
+        else:
+            update(str(obj.name))
+            update(str(obj.dtype))
+        # Hash the values and the index.
+        try:
+            hashes = pd.util.hash_pandas_object(obj, index=True)
+        except TypeError as e:
+            # E.g., a column with lists.
+            raise _NotFingerprintableError(
+                f"Can't fingerprint {type(obj).__name__}: {e}"
+            ) from e
+        hasher.update(hashes.to_numpy().tobytes())
+    elif isinstance(obj, pd.Index):
+        update(pd.Series(obj, dtype=obj.dtype))
+    elif isinstance(obj, np.ndarray):
+        hasher.update(repr((obj.shape, str(obj.dtype))).encode())
+        if obj.dtype == object:
+            update(obj.tolist())
+        else:
+            hasher.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, dict):
+        # Sort the items to be independent of the insertion order.
+        items = sorted(obj.items(), key=lambda x: repr(x[0]))
+        for key, value in items:
+            update(key)
+            update(value)
+    elif isinstance(obj, (list, tuple)):
+        hasher.update(str(len(obj)).encode())
+        for value in obj:
+            update(value)
+    elif isinstance(obj, (set, frozenset)):
+        update(sorted(obj, key=repr))
+    elif isinstance(obj, functools.partial):
+        update(obj.func)
+        update(obj.args)
+        update(obj.keywords)
+    elif isinstance(obj, types.MethodType):
+        update(type(obj.__self__))
+        update(obj.__func__)
+    elif isinstance(obj, types.FunctionType):
+        # Hash the code, so that a change in the implementation of a function
+        # invalidates the cache.
+        update(obj.__module__)
+        update(obj.__qualname__)
+        update(obj.__code__)
+        update(obj.__defaults__)
+        update(obj.__kwdefaults__)
+        closure = obj.__closure__ or ()
+        update([cell.cell_contents for cell in closure])
+    elif isinstance(obj, types.CodeType):
+        hasher.update(obj.co_code)
+        update(obj.co_consts)
+        update(obj.co_names)
+    elif isinstance(obj, (type, types.BuiltinFunctionType, types.ModuleType)):
+        update(getattr(obj, "__module__", ""))
+        update(getattr(obj, "__qualname__", obj.__name__))
+    else:
+        # Fall back to the serialized representation of the object.
+        try:
+            hasher.update(pickle.dumps(obj, protocol=4))
+        except Exception as e:
+            raise _NotFingerprintableError(
+                f"Can't fingerprint object of type {type(obj)}"
+            ) from e
+
+
+def get_fingerprint(obj: Any) -> Optional[str]:
+    """
+    Compute a fingerprint of the content of `obj`.
+
+    :return: hex digest or `None` if `obj` can't be fingerprinted
+    """
+    hasher = hashlib.sha256()
+    try:
+        _update_hasher(hasher, obj)
+    except _NotFingerprintableError as e:
+        _LOG.debug("%s", str(e))
+        return None
+    return hasher.hexdigest()
+
+
+def get_node_fingerprint(node: dtfcornode.Node) -> Optional[str]:
+    """
+    Compute a fingerprint of the configuration and of the state of a node.
+
+    The outputs and the info stored in the node are not included.
+
+    :return: hex digest or `None` if the node can't be fingerprinted
+    """
+    attrs = {
+        attr_name: attr_value
+        for attr_name, attr_value in vars(node).items()
+        if attr_name not in _NODE_ATTRS_TO_SKIP
+    }
+    return get_fingerprint([type(node), attrs])
+
+
+# #############################################################################
+# NodeCache
+# #############################################################################
+
+
+class NodeCache:
+    """
+    Memoize the outputs of DAG nodes in a local disk cache.
+
+    An entry is addressed by a key computed from:
+    - the class, the configuration, and the state of the node (e.g., the fit
+      state for `predict`)
+    - the method to run (e.g., `fit`, `predict`)
+    - the fingerprints of the inputs of the node
+
+    The fingerprint of an output of a node is derived from the key of the node,
+    so the data needs to be hashed only for the nodes without inputs (e.g.,
+    data sources). Nodes without inputs are never cached since their output
+    depends on external state (e.g., a DB or a file).
+
+    E.g., sweeping a list of configs that differ only in the model node
+    computes the upstream nodes once and then reads their outputs from the
+    cache.
+
+    The cache is stored like:
+    ```
+    {cache_dir}/
+        {key[:2]}/
+            {key}/
+                metadata.pkl
+                {output_name}.parquet
+    ```
+    DataFrames are stored as Parquet and the other objects are pickled.
+
+    The cache can be shared among processes: each entry is written in a
+    temporary dir and then renamed. When the size of the cache exceeds
+    `max_size_in_bytes`, the least recently used entries are evicted.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        *,
+        max_size_in_bytes: Optional[int] = None,
+    ) -> None:
+        """
+        Constructor.
+
+        :param cache_dir: dir storing the cache
+        :param max_size_in_bytes: max size of the cache. `None` means no limit
+        """
+        hdbg.dassert_isinstance(cache_dir, str)
+        if max_size_in_bytes is not None:
+            hdbg.dassert_lt(0, max_size_in_bytes)
+        self._cache_dir = cache_dir
+        self._max_size_in_bytes = max_size_in_bytes
+        hio.create_dir(self._cache_dir, incremental=True)
+        # Map node -> method -> output name -> fingerprint of the output.
+        self._output_fingerprints: weakref.WeakKeyDictionary = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+        # Stats about the cache usage.
+        self.num_hits = 0
+        self.num_misses = 0
+
+    def __repr__(self) -> str:
+        txt = (
+            f"{self.__class__.__name__}(cache_dir='{self._cache_dir}', "
+            f"max_size_in_bytes={self._max_size_in_bytes}, "
+            f"num_hits={self.num_hits}, num_misses={self.num_misses})"
+        )
+        return txt
+
+    def get_key(
+        self,
+        node: dtfcornode.Node,
+        method: dtfcornode.Method,
+        input_fingerprints: Dict[str, Optional[str]],
+    ) -> Optional[str]:
+        """
+        Compute the key of the entry for the result of `node.method()`.
+
+        :param input_fingerprints: input name -> fingerprint of the input
+        :return: key or `None` if the node can't be cached
+        """
+        if not input_fingerprints or not isinstance(
+            node, dtfconobas.FitPredictNode
+        ):
+            return None
+        if any(fp is None for fp in input_fingerprints.values()):
+            return None
+        node_fingerprint = get_node_fingerprint(node)
+        if node_fingerprint is None:
+            _LOG.debug("Node '%s' can't be fingerprinted", node.nid)
+            return None
+        key = get_fingerprint([node_fingerprint, method, input_fingerprints])
+        return key
+
+    def get_input_fingerprint(
+        self,
+        pred_node: dtfcornode.Node,
+        method: dtfcornode.Method,
+        output_name: str,
+    ) -> Optional[str]:
+        """
+        Return the fingerprint of an output of a node that has been executed.
+        """
+        with self._lock:
+            fingerprints = self._output_fingerprints.get(pred_node, {})
+            fingerprint = fingerprints.get(method, {}).get(output_name)
+        if fingerprint is None:
+            # The node has not been cached (e.g., a data source), so hash the
+            # data itself.
+            fingerprint = get_fingerprint(
+                pred_node.get_output(method, output_name)
+            )
+            self._set_output_fingerprint(
+                pred_node, method, output_name, fingerprint
+            )
+        return fingerprint
+
+    def set_output_fingerprints(
+        self, node: dtfcornode.Node, method: dtfcornode.Method, key: str
+    ) -> None:
+        """
+        Derive the fingerprints of the outputs of a node from its key.
+        """
+        for output_name in node.output_names:
+            fingerprint = get_fingerprint([key, output_name])
+            self._set_output_fingerprint(node, method, output_name, fingerprint)
+
+    def reset_output_fingerprints(
+        self, node: dtfcornode.Node, method: dtfcornode.Method
+    ) -> None:
+        """
+        Forget the fingerprints of the outputs of a node that has been run.
+        """
+        with self._lock:
+            self._output_fingerprints.get(node, {}).pop(method, None)
+
+    def load(
+        self, node: dtfcornode.Node, method: dtfcornode.Method, key: str
+    ) -> Optional[dtfcornode.NodeOutput]:
+        """
+        Load the outputs of a node from the cache and restore its state.
+
+        :return: output name -> output or `None` if the entry is not cached
+        """
+        entry_dir = self._get_entry_dir(key)
+        metadata_file_name = os.path.join(entry_dir, "metadata.pkl")
+        if not os.path.exists(metadata_file_name):
+            self.num_misses += 1
+            return None
+        _LOG.debug("Loading node '%s' from '%s'", node.nid, entry_dir)
+        try:
+            with open(metadata_file_name, "rb") as f:
+                metadata = pickle.load(f)
+            output = {}
+            index_freqs = metadata.get("index_freqs", {})
+            for output_name, file_name in metadata["file_names"].items():
+                obj = self._load_obj(os.path.join(entry_dir, file_name))
+                if output_name in index_freqs:
+                    # Parquet doesn't store the freq of the index.
+                    obj.index.freq = index_freqs[output_name]
+                output[output_name] = obj
+        except FileNotFoundError:
+            # The entry has been evicted by another process while reading.
+            self.num_misses += 1
+            return None
+        # Mark the entry as recently used.
+        os.utime(entry_dir)
+        # Restore the state of the node as if `method` was run.
+        hdbg.dassert_isinstance(node, dtfconobas.FitPredictNode)
+        if metadata["info"] is not None:
+            node._set_info(  # pylint: disable=protected-access
+                method, metadata["info"]
+            )
+        if metadata["fit_state"] is not None:
+            node.set_fit_state(metadata["fit_state"])
+        self.num_hits += 1
+        return output
+
+    def store(
+        self,
+        node: dtfcornode.Node,
+        method: dtfcornode.Method,
+        key: str,
+        output: dtfcornode.NodeOutput,
+    ) -> None:
+        """
+        Store the outputs and the state of a node that has been run.
+        """
+        entry_dir = self._get_entry_dir(key)
+        if os.path.exists(entry_dir):
+            return
+        hdbg.dassert_isinstance(node, dtfconobas.FitPredictNode)
+        # Write the entry in a tmp dir and then rename it, so that readers
+        # never see a partial entry.
+        tmp_dir = f"{entry_dir}.tmp.{uuid.uuid4().hex}"
+        hio.create_dir(tmp_dir, incremental=False)
+        file_names = {}
+        index_freqs = {}
+        for output_name, obj in output.items():
+            file_names[output_name] = self._store_obj(
+                obj, os.path.join(tmp_dir, output_name)
+            )
+            freq = getattr(obj.index, "freq", None)
+            is_parquet = file_names[output_name].endswith(".parquet")
+            if is_parquet and freq is not None:
+                index_freqs[output_name] = freq
+        metadata = {
+            "nid": node.nid,
+            "method": method,
+            "file_names": file_names,
+            "index_freqs": index_freqs,
+            "info": node._info.get(method),  # pylint: disable=protected-access
+            "fit_state": node.get_fit_state() if method == "fit" else None,
+        }
+        with open(os.path.join(tmp_dir, "metadata.pkl"), "wb") as f:
+            pickle.dump(metadata, f)
+        try:
+            os.rename(tmp_dir, entry_dir)
+        except OSError:
+            # Another process has already stored the same entry.
+            _LOG.debug("Entry '%s' already exists", entry_dir)
+            hio.delete_dir(tmp_dir)
+            return
+        _LOG.debug("Stored node '%s' in '%s'", node.nid, entry_dir)
+        if self._max_size_in_bytes is not None:
+            self._evict(self._max_size_in_bytes)
+
+    def clear(self) -> None:
+        """
+        Remove all the entries from the cache.
+        """
+        self._evict(0)
+
+    def get_size_in_bytes(self) -> int:
+        return sum(size for _, _, size in self._get_entries())
+
+    # /////////////////////////////////////////////////////////////////////////
+
+    def _set_output_fingerprint(
+        self,
+        node: dtfcornode.Node,
+        method: dtfcornode.Method,
+        output_name: str,
+        fingerprint: Optional[str],
+    ) -> None:
+        with self._lock:
+            fingerprints = self._output_fingerprints.setdefault(node, {})
+            fingerprints.setdefault(method, {})[output_name] = fingerprint
+
+    def _get_entry_dir(self, key: str) -> str:
+        return os.path.join(self._cache_dir, key[:2], key)
+
+    @staticmethod
+    def _store_obj(obj: Any, file_name: str) -> str:
+        """
+        Store `obj` as Parquet, if possible, or as pickle.
+
+        :return: basename of the file storing `obj`
+        """
+        if isinstance(obj, pd.DataFrame):
+            try:
+                table = pa.Table.from_pandas(obj)
+            except (pa.ArrowException, TypeError, ValueError) as e:
+                _LOG.debug("Can't convert df to Arrow: %s", str(e))
+            else:
+                file_name = f"{file_name}.parquet"
+                pq.write_table(table, file_name)
+                return os.path.basename(file_name)
+        file_name = f"{file_name}.pkl"
+        with open(file_name, "wb") as f:
+            pickle.dump(obj, f)
+        return os.path.basename(file_name)
+
+    @staticmethod
+    def _load_obj(file_name: str) -> Any:
+        if file_name.endswith(".parquet"):
+            obj = pq.read_table(file_name).to_pandas()
+        else:
+            with open(file_name, "rb") as f:
+                obj = pickle.load(f)
+        return obj
+
+    def _get_entries(self) -> List[Any]:
+        """
+        Return the entries of the cache.
+
+        :return: list of (last access time, entry dir, size in bytes)
+        """
+        entries = []
+        for prefix in os.listdir(self._cache_dir):
+            prefix_dir = os.path.join(self._cache_dir, prefix)
+            if not os.path.isdir(prefix_dir):
+                continue
+            for basename in os.listdir(prefix_dir):
+                if ".tmp." in basename:
+                    # Skip entries that are being written.
+                    continue
+                entry_dir = os.path.join(prefix_dir, basename)
+                try:
+                    access_time = os.path.getmtime(entry_dir)
+                    size = sum(
+                        entry.stat().st_size for entry in os.scandir(entry_dir)
+                    )
+                except FileNotFoundError:
+                    # The entry has been evicted by another process.
+                    continue
+                entries.append((access_time, entry_dir, size))
+        return entries
+
+    def _evict(self, max_size_in_bytes: int) -> None:
+        """
+        Evict the least recently used entries until the cache fits in
+        `max_size_in_bytes`.
+        """
+        entries = sorted(self._get_entries())
+        size = sum(size for _, _, size in entries)
+        for _, entry_dir, entry_size in entries:
+            if size <= max_size_in_bytes:
+                break
+            _LOG.debug(
+                "Evicting '%s' (%s)",
+                entry_dir,
+                hintros.format_size(entry_size),
+            )
+            hio.delete_dir(entry_dir)
+            size -= entry_size
+
@@ -0,0 +1,251 @@
+"""
+Import as:
+
+import dataflow.core.node_io_writer as dtfconiowr
+"""
+
+import atexit
+import logging
+import os
+import queue
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+import helpers.hdbg as hdbg
+import helpers.hio as hio
+import helpers.hpandas as hpandas
+import helpers.hparquet as hparque
+
+_LOG = logging.getLogger(__name__)
+
+# Dir with the node outputs, one subdir per node output.
+_NODE_OUTPUT_DIR_NAME = "node_io.data_by_node"
+
+
+# #############################################################################
+# NodeIoWriter
+# #############################################################################
+
+
+class NodeIoWriter:
+    """
+    Save the outputs of the DAG nodes from a background thread.
+
+    The outputs of a node in real-time runs repeat most of the rows of the
+    previous bar, so only the rows with an index after the last row already
+    saved for a node are appended. Rows of previous bars that are modified
+    later are not saved again.
+
+    The file layout is like:
+    ```
+    {dst_dir}/
+        node_io.data/
+            {method}.{topological_id}.{nid}.{output_name}.{bar_timestamp}.{wall_clock_time}.txt
+        node_io.data_by_node/
+            {method}.{topological_id}.{nid}.{output_name}/
+                date={wall_clock_date}/
+                    {bar_timestamp}.{wall_clock_time}.{seq}.parquet
+    ```
+    where the txt files contain the stats of the full node output (as
+    `DAG._write_node_interface_to_dst_dir()`) and the Parquet files contain
+    the new rows. `seq` is the number of writes of the node output, which
+    makes the file names unique when the bar timestamp is not set. E.g.,
+    ```
+    system_log_dir/20220808/dag/node_io/
+        node_io.data/
+            predict.0.read_data.df_out.20220808_161500.20220808_161502.txt
+        node_io.data_by_node/
+            predict.0.read_data.df_out/
+                date=20220808/
+                    20220808_161500.20220808_161502.000000.parquet
+    ```
+    """
+
+    def __init__(self, dst_dir: str, *, max_queue_size: int = 64) -> None:
+        """
+        Constructor.
+
+        :param dst_dir: dir to save the node outputs
+        :param max_queue_size: max number of outputs waiting to be saved;
+            when the queue is full, the DAG blocks until the writer catches up
+        """
+        hdbg.dassert_isinstance(dst_dir, str)
+        hdbg.dassert_lte(1, max_queue_size)
+        self._dst_dir = dst_dir
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        # Index of the last row saved for each node output.
+        self._last_idx: Dict[Tuple[str, int, str, str], Any] = {}
+        # Number of writes for each node output.
+        self._num_writes: Dict[Tuple[str, int, str, str], int] = {}
+        self._last_idx_lock = threading.Lock()
+        # First error raised by the writer thread.
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(
+            target=self._write_loop, name="NodeIoWriter", daemon=True
+        )
+        self._thread.start()
+        # Save the outputs still in the queue when the interpreter exits.
+        atexit.register(self.close)
+
+    def write(
+        self,
+        topological_id: int,
+        nid: str,
+        method: str,
+        output_name: str,
+        bar_timestamp_as_str: Optional[str],
+        wall_clock_time_as_str: str,
+        df: pd.DataFrame,
+    ) -> None:
+        """
+        Enqueue a node output to be saved.
+
+        Only the new rows are copied before being enqueued, so that the DAG
+        can keep modifying the node output while the writer thread saves them
+        without paying for a copy of the full output at every bar. The stats
+        of the full node output are computed by the writer thread.
+        """
+        self._raise_if_error()
+        hdbg.dassert(self._thread.is_alive(), "The writer is closed")
+        hdbg.dassert_isinstance(df, pd.DataFrame)
+        # Select the rows that have not been saved yet.
+        key = (method, topological_id, nid, output_name)
+        with self._last_idx_lock:
+            last_idx = self._last_idx.get(key)
+            if last_idx is None or df.empty:
+                new_df = df.copy()
+            else:
+                # Boolean indexing returns a copy of the selected rows.
+                new_df = df[df.index > last_idx]
+            if not df.empty:
+                idx_max = df.index.max()
+                if last_idx is None or idx_max > last_idx:
+                    self._last_idx[key] = idx_max
+            seq = self._num_writes.get(key, 0)
+            self._num_writes[key] = seq + 1
+        item = (
+            key,
+            seq,
+            bar_timestamp_as_str,
+            wall_clock_time_as_str,
+            df,
+            new_df,
+        )
+        self._queue.put(item)
+
+    def flush(self) -> None:
+        """
+        Wait until all the enqueued node outputs are saved.
+        """
+        self._queue.join()
+        self._raise_if_error()
+
+    def close(self) -> None:
+        """
+        Save the enqueued node outputs and stop the writer thread.
+        """
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        atexit.unregister(self.close)
+        self._raise_if_error()
+
+    def _raise_if_error(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def _write_loop(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    break
+                if self._error is None:
+                    self._write_item(*item)
+            except BaseException as e:  # pylint: disable=broad-except
+                _LOG.error("Failed to save node output: %s", e)
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+    def _write_item(
+        self,
+        key: Tuple[str, int, str, str],
+        seq: int,
+        bar_timestamp_as_str: Optional[str],
+        wall_clock_time_as_str: str,
+        df: pd.DataFrame,
+        new_df: pd.DataFrame,
+    ) -> None:
+        method, topological_id, nid, output_name = key
+        node_output_name = f"{method}.{topological_id}.{nid}.{output_name}"
+        # Save high level description about the full df.
+        basename = (
+            f"{node_output_name}.{bar_timestamp_as_str}.{wall_clock_time_as_str}"
+        )
+        file_name = os.path.join(self._dst_dir, "node_io.data", basename)
+        txt = hpandas.df_to_str(
+            df,
+            print_dtypes=True,
+            print_shape_info=True,
+            print_memory_usage=True,
+            print_nan_info=True,
+        )
+        hio.to_file(file_name + ".txt", txt)
+        # Append the new rows.
+        if new_df.empty:
+            _LOG.debug("No new rows for '%s'", node_output_name)
+            return
+        date_as_str = wall_clock_time_as_str[:8]
+        file_name = os.path.join(
+            self._dst_dir,
+            _NODE_OUTPUT_DIR_NAME,
+            node_output_name,
+            f"date={date_as_str}",
+            f"{bar_timestamp_as_str}.{wall_clock_time_as_str}.{seq:06d}.parquet",
+        )
+        hparque.to_parquet(new_df, file_name)
+        _LOG.debug("Saved %s new rows in '%s'", new_df.shape[0], file_name)
+
+
+# #############################################################################
+# Readers
+# #############################################################################
+
+
+def load_node_output_from_dst_dir(
+    dst_dir: str,
+    topological_id: int,
+    nid: str,
+    method: str,
+    *,
+    output_name: str = "df_out",
+) -> pd.DataFrame:
+    """
+    Load the rows of a node output saved by `NodeIoWriter`.
+
+    :param dst_dir: dir that contains the DAG output
+    :param topological_id, nid, method: information about the node and its
+        method
+    :param output_name: name of the node output
+    :return: all the rows of the node output, in order of the bars that
+        generated them
+    """
+    node_output_name = f"{method}.{topological_id}.{nid}.{output_name}"
+    dir_name = os.path.join(dst_dir, _NODE_OUTPUT_DIR_NAME, node_output_name)
+    hdbg.dassert_dir_exists(dir_name)
+    pattern = "*.parquet"
+    only_files = True
+    use_relative_paths = True
+    file_names = hio.listdir(dir_name, pattern, only_files, use_relative_paths)
+    hdbg.dassert_lte(1, len(file_names), "No data in '%s'", dir_name)
+    # Sort by date and then by bar.
+    file_names = sorted(file_names)
+    dfs = [
+        hparque.from_parquet(os.path.join(dir_name, file_name))
+        for file_name in file_names
+    ]
+    df = pd.concat(dfs)
+    return df
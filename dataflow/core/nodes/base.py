@@ -11,11 +11,13 @@ import functools
 import logging
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union, cast
 
+import numpy as np
 import pandas as pd
 
 import dataflow.core.node as dtfcornode
 import dataflow.core.utils as dtfcorutil
 import helpers.hdbg as hdbg
+import helpers.hpandas as hpandas
 
 _LOG = logging.getLogger(__name__)
 
@@ -250,11 +252,65 @@ class Transformer(FitPredictNode, abc.ABC):
     #  input and single output (but verify there is only one of each).
     def __init__(self, nid: dtfcornode.NodeId) -> None:
         super().__init__(nid)
+        # Parameters and state of the incremental predict mode, see
+        # `set_incremental_predict_mode()`.
+        self._warmup_length: Optional[int] = None
+        self._verify_incremental_predict = False
+        self._verify_atol = 0.0
+        # Carry-over state of the node. It is `None` when the incremental mode
+        # is disabled.
+        self._incremental_state: Optional[FitPredictNode.NodeState] = None
+        self._prev_df_in_columns: Optional[pd.Index] = None
+        self._prev_df_in_first_idx: Any = None
+        self._prev_df_in_last_idx: Any = None
+        self._prev_df_out: Optional[pd.DataFrame] = None
+
+    def set_incremental_predict_mode(
+        self,
+        warmup_length: Optional[int],
+        *,
+        verify: bool = False,
+        verify_atol: float = 1e-6,
+    ) -> None:
+        """
+        Compute in `predict()` only the rows appended since the previous call.
+
+        In a real-time DAG the source node emits at every bar the history
+        window shifted by one bar, so the node needs to compute only the
+        output for the new rows. The node keeps the output of the previous
+        call and, by default, recomputes the new rows together with the
+        `warmup_length` rows preceding them, splicing the result into the
+        previous output. Nodes that can carry over an exact state (e.g., an
+        EMA) override `_transform_new_rows()`. The state accounts for all the
+        rows since the start of the input, so it speeds up only an input
+        growing with a fixed start (e.g., an expanding window): with a sliding
+        window, like the one of a real-time DAG, these nodes process the full
+        input at every call.
+
+        If the input is not an extension of the previous one (e.g., at the
+        first call) the node processes the full input.
+
+        :param warmup_length: number of rows preceding the new ones needed to
+            compute them (e.g., the window of a rolling function or the number
+            of rows in a resampling bucket). `None` disables the incremental
+            mode
+        :param verify: compare the rows computed incrementally with a full
+            recomputation and assert if they differ
+        :param verify_atol: max absolute difference allowed by the
+            verification
+        """
+        if warmup_length is not None:
+            hdbg.dassert_lte(0, warmup_length)
+        self._warmup_length = warmup_length
+        self._verify_incremental_predict = verify
+        self._verify_atol = verify_atol
+        self._reset_incremental_state()
 
     def fit(self, df_in: pd.DataFrame) -> Dict[str, pd.DataFrame]:
         hdbg.dassert_no_duplicates(df_in.columns)
-        # Transform the input df.
-        df_out, info = self._transform(df_in)
+        # Transform the input df, leaving the state of the incremental predict
+        # mode unchanged.
+        df_out, info = self._transform_without_incremental_state(df_in)
         hdbg.dassert_no_duplicates(df_out.columns)
         # Update `info`.
         self._set_info("fit", info)
@@ -263,7 +319,10 @@ class Transformer(FitPredictNode, abc.ABC):
     def predict(self, df_in: pd.DataFrame) -> Dict[str, pd.DataFrame]:
         hdbg.dassert_no_duplicates(df_in.columns)
         # Transform the input df.
-        df_out, info = self._transform(df_in)
+        if self._warmup_length is None:
+            df_out, info = self._transform(df_in)
+        else:
+            df_out, info = self._transform_incrementally(df_in)
         hdbg.dassert_no_duplicates(df_out.columns)
         # Update `info`.
         self._set_info("predict", info)
@@ -277,6 +336,135 @@ class Transformer(FitPredictNode, abc.ABC):
         :return: df, info
         """
 
+    def _transform_new_rows(
+        self, df_in: pd.DataFrame, num_new_rows: int
+    ) -> Tuple[pd.DataFrame, collections.OrderedDict]:
+        """
+        Compute the output for the last `num_new_rows` rows of `df_in`.
+
+        The last row of the previous output is recomputed as well, since it
+        might have been computed from an incomplete input (e.g., a resampling
+        bucket that is still open).
+
+        :return: df, info, like `_transform()`
+        """
+        self._warmup_length = cast(int, self._warmup_length)
+        num_rows = self._warmup_length + num_new_rows + 1
+        df_tail_out, info = self._transform(df_in.iloc[-num_rows:])
+        prev_df_out = self._get_prev_df_out(df_in)
+        splice_idx = self._prev_df_out.index[-1]
+        hdbg.dassert(
+            df_tail_out.columns.equals(prev_df_out.columns),
+            "Columns of node '%s' differ from the previous invocation",
+            self.nid,
+        )
+        df_out = pd.concat(
+            [
+                prev_df_out[prev_df_out.index < splice_idx],
+                df_tail_out[df_tail_out.index >= splice_idx],
+            ]
+        )
+        if "df_transformed_info" in info:
+            info["df_transformed_info"] = dtfcorutil.get_df_info_as_string(
+                df_out
+            )
+        return df_out, info
+
+    def _get_prev_df_out(self, df_in: pd.DataFrame) -> pd.DataFrame:
+        """
+        Return the previous output without the rows before the start of
+        `df_in`.
+        """
+        prev_df_out = cast(pd.DataFrame, self._prev_df_out)
+        return prev_df_out[prev_df_out.index >= df_in.index[0]]
+
+    def _transform_incrementally(
+        self, df_in: pd.DataFrame
+    ) -> Tuple[pd.DataFrame, collections.OrderedDict]:
+        num_new_rows = self._get_num_new_rows(df_in)
+        if num_new_rows is None:
+            _LOG.debug("Processing the full input of node '%s'", self.nid)
+            self._reset_incremental_state()
+            df_out, info = self._transform(df_in)
+        else:
+            _LOG.debug(
+                "Processing %s new rows of node '%s'", num_new_rows, self.nid
+            )
+            df_out, info = self._transform_new_rows(df_in, num_new_rows)
+            if self._verify_incremental_predict:
+                self._verify_new_rows(df_in, df_out)
+        self._prev_df_in_columns = df_in.columns
+        self._prev_df_in_first_idx = df_in.index[0] if not df_in.empty else None
+        self._prev_df_in_last_idx = df_in.index[-1] if not df_in.empty else None
+        self._prev_df_out = df_out
+        return df_out, info
+
+    def _transform_without_incremental_state(
+        self, df_in: pd.DataFrame
+    ) -> Tuple[pd.DataFrame, collections.OrderedDict]:
+        """
+        Run the full computation without touching the carry-over state.
+        """
+        incremental_state = self._incremental_state
+        self._incremental_state = None
+        try:
+            df_out, info = self._transform(df_in)
+        finally:
+            self._incremental_state = incremental_state
+        return df_out, info
+
+    def _reset_incremental_state(self) -> None:
+        self._incremental_state = None if self._warmup_length is None else {}
+        self._prev_df_in_columns = None
+        self._prev_df_in_first_idx = None
+        self._prev_df_in_last_idx = None
+        self._prev_df_out = None
+
+    def _get_num_new_rows(self, df_in: pd.DataFrame) -> Optional[int]:
+        """
+        Return the number of rows of `df_in` after the previous input.
+
+        :return: `None` if `df_in` is not an extension of the previous input
+        """
+        if self._prev_df_out is None or self._prev_df_out.empty:
+            return None
+        if df_in.empty or not df_in.index.is_monotonic_increasing:
+            return None
+        if not df_in.columns.equals(self._prev_df_in_columns):
+            return None
+        if self._prev_df_in_last_idx not in df_in.index:
+            return None
+        idx = df_in.index.get_loc(self._prev_df_in_last_idx)
+        if not isinstance(idx, int):
+            # The index is not unique.
+            return None
+        num_new_rows = df_in.shape[0] - idx - 1
+        return num_new_rows
+
+    def _verify_new_rows(self, df_in: pd.DataFrame, df_out: pd.DataFrame) -> None:
+        """
+        Assert if the rows computed incrementally differ from a full
+        recomputation.
+        """
+        df_out_expected, _ = self._transform_without_incremental_state(df_in)
+        prev_df_out = cast(pd.DataFrame, self._prev_df_out)
+        splice_idx = prev_df_out.index[-1]
+        df_out = df_out[df_out.index >= splice_idx]
+        df_out_expected = df_out_expected[df_out_expected.index >= splice_idx]
+        hpandas.dassert_axes_equal(df_out, df_out_expected)
+        values = df_out.to_numpy(dtype=float)
+        values_expected = df_out_expected.to_numpy(dtype=float)
+        is_close = np.isclose(
+            values, values_expected, rtol=0, atol=self._verify_atol, equal_nan=True
+        )
+        hdbg.dassert(
+            is_close.all(),
+            "Incremental output of node '%s' differs from the full "
+            "recomputation:\n%s",
+            self.nid,
+            df_out[~is_close.all(axis=1)],
+        )
+
 
 # #############################################################################
 # Plumbing nodes
@@ -407,7 +595,7 @@ class ColModeMixin:
         cols = cols or df_out.columns.tolist()
         #
         col_rename_func = col_rename_func or (lambda x: x)
-        hdbg.dassert_isinstance(col_rename_func, collections.Callable)
+        hdbg.dassert_isinstance(col_rename_func, collections.abc.Callable)
         #
         col_mode = col_mode or "merge_all"
         # Rename transformed columns.
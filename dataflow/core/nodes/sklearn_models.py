@@ -5,12 +5,16 @@ import dataflow.core.nodes.sklearn_models as dtfcnoskmo
 """
 
 import collections
+import concurrent.futures
+import copy
+import functools
 import logging
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union, cast
 
 import numpy as np
 import pandas as pd
 import sklearn as sklear
+import sklearn.linear_model as slmode
 
 import core.data_adapters as cdatadap
 import core.finance as cofinanc
@@ -348,6 +352,12 @@ class MultiindexPooledSkLearnModel(dtfconobas.FitPredictNode):
 class MultiindexSkLearnModel(dtfconobas.FitPredictNode):
     """
     Fit and predict multiple sklearn models.
+
+    There is one model for each key, which can be run:
+    - with one `ContinuousSkLearnModel` for each key, serially or in parallel
+      across `num_processes` processes
+    - for linear models (see `_BATCHED_SOLVER_MODEL_FUNCS`), with a
+      closed-form solver that fits and predicts all the keys at once
     """
 
     def __init__(
@@ -361,6 +371,9 @@ class MultiindexSkLearnModel(dtfconobas.FitPredictNode):
         steps_ahead: int,
         model_kwargs: Optional[Any] = None,
         nan_mode: Optional[str] = None,
+        *,
+        num_processes: int = 1,
+        use_batched_solver: bool = False,
     ) -> None:
         """
         Params not listed are as in `ContinuousSkLearnModel`.
@@ -371,6 +384,14 @@ class MultiindexSkLearnModel(dtfconobas.FitPredictNode):
             of the dataframe with the `x_vars` and `y_vars`.
         :param out_col_group: column level prefix of length
             `df_in.columns.nlevels - 2`. It may be an empty tuple.
+        :param num_processes: number of processes running the models of
+            different keys in parallel; `model_func` needs to be picklable
+            when `num_processes > 1`
+        :param use_batched_solver: fit and predict the models of all the keys
+            with array operations instead of one `ContinuousSkLearnModel` for
+            each key. Only the models in `_BATCHED_SOLVER_MODEL_FUNCS` are
+            supported. The fit state is the same as running the models one at
+            a time, while the info doesn't contain `df_out_info`
         """
         super().__init__(nid)
         hdbg.dassert_isinstance(in_col_groups, list)
@@ -384,6 +405,14 @@ class MultiindexSkLearnModel(dtfconobas.FitPredictNode):
         self._model_kwargs = model_kwargs
         self._nan_mode = nan_mode
         #
+        hdbg.dassert_lte(1, num_processes)
+        self._num_processes = num_processes
+        if use_batched_solver:
+            _dassert_batched_solver_is_supported(
+                self._model_func, self._model_kwargs or {}
+            )
+        self._use_batched_solver = use_batched_solver
+        #
         self._key_fit_state: Dict[str, Any] = {}
 
     def fit(self, df_in: pd.DataFrame) -> Dict[str, pd.DataFrame]:
@@ -410,19 +439,28 @@ class MultiindexSkLearnModel(dtfconobas.FitPredictNode):
         dfs = dtfconobas.GroupedColDfToDfColProcessor.preprocess(
             df_in, self._in_col_groups
         )
-        results = {}
-        info = collections.OrderedDict()
+        keys = self._get_keys(dfs, fit)
+        if self._use_batched_solver:
+            results, info = self._fit_predict_batched(dfs, keys, fit)
+        else:
+            results, info = self._fit_predict_by_key(dfs, keys, fit)
+        df_out = dtfconobas.GroupedColDfToDfColProcessor.postprocess(
+            results, self._out_col_group
+        )
+        df_out = df_out.reindex(df_in.index)
+        df_out = dtfcorutil.merge_dataframes(df_in, df_out)
+        method = "fit" if fit else "predict"
+        self._set_info(method, info)
+        return {"df_out": df_out}
+
+    def _get_keys(
+        self, dfs: Dict[dtfcorutil.NodeColumn, pd.DataFrame], fit: bool
+    ) -> List[dtfcorutil.NodeColumn]:
+        """
+        Get the keys with a model to fit or predict.
+        """
+        keys = []
         for key, df in dfs.items():
-            csklm = ContinuousSkLearnModel(
-                "sklearn",
-                model_func=self._model_func,
-                x_vars=self._x_vars,
-                y_vars=self._y_vars,
-                steps_ahead=self._steps_ahead,
-                model_kwargs=self._model_kwargs,
-                col_mode="replace_all",
-                nan_mode=self._nan_mode,
-            )
             if fit:
                 df_drop_na = hpandas.dropna(df, how="all")
                 if df_drop_na.empty:
@@ -433,9 +471,6 @@ class MultiindexSkLearnModel(dtfconobas.FitPredictNode):
                         "No data found for key=%s, skipping the fit stage", key
                     )
                     continue
-                df_out = csklm.fit(df)["df_out"]
-                info_out = csklm.get_info("fit")
-                self._key_fit_state[key] = csklm.get_fit_state()
             else:
                 if key not in self._key_fit_state:
                     # TODO(Grisha): come up with a better mechanism to handle
@@ -445,19 +480,331 @@ class MultiindexSkLearnModel(dtfconobas.FitPredictNode):
                         key,
                     )
                     continue
-                csklm.set_fit_state(self._key_fit_state[key])
-                df_out = csklm.predict(df)["df_out"]
-                info_out = csklm.get_info("predict")
+            keys.append(key)
+        return keys
+
+    def _fit_predict_by_key(
+        self,
+        dfs: Dict[dtfcorutil.NodeColumn, pd.DataFrame],
+        keys: List[dtfcorutil.NodeColumn],
+        fit: bool,
+    ) -> Tuple[
+        Dict[dtfcorutil.NodeColumn, pd.DataFrame], collections.OrderedDict
+    ]:
+        """
+        Run one `ContinuousSkLearnModel` for each key.
+        """
+        func = functools.partial(
+            _fit_predict_continuous_sklearn_model,
+            fit=fit,
+            csklm_kwargs={
+                "model_func": self._model_func,
+                "x_vars": self._x_vars,
+                "y_vars": self._y_vars,
+                "steps_ahead": self._steps_ahead,
+                "model_kwargs": self._model_kwargs,
+                "col_mode": "replace_all",
+                "nan_mode": self._nan_mode,
+            },
+        )
+        key_dfs = [dfs[key] for key in keys]
+        fit_states = [
+            None if fit else self._key_fit_state[key] for key in keys
+        ]
+        if self._num_processes == 1 or len(keys) <= 1:
+            outs = list(map(func, key_dfs, fit_states))
+        else:
+            # Send the keys to the processes in a few chunks, since each model
+            # runs quickly.
+            chunksize = max(1, len(keys) // (4 * self._num_processes))
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=self._num_processes
+            ) as executor:
+                outs = list(
+                    executor.map(func, key_dfs, fit_states, chunksize=chunksize)
+                )
+        results = {}
+        info = collections.OrderedDict()
+        for key, (df_out, info_out, fit_state) in zip(keys, outs):
+            if fit:
+                self._key_fit_state[key] = fit_state
             results[key] = df_out
             info[key] = info_out
-        df_out = dtfconobas.GroupedColDfToDfColProcessor.postprocess(
-            results, self._out_col_group
+        return results, info
+
+    def _fit_predict_batched(
+        self,
+        dfs: Dict[dtfcorutil.NodeColumn, pd.DataFrame],
+        keys: List[dtfcorutil.NodeColumn],
+        fit: bool,
+    ) -> Tuple[
+        Dict[dtfcorutil.NodeColumn, pd.DataFrame], collections.OrderedDict
+    ]:
+        """
+        Fit and predict the models of all the keys with array operations.
+
+        The output is the same as `_fit_predict_by_key()` up to numerical
+        precision.
+        """
+        results: Dict[dtfcorutil.NodeColumn, pd.DataFrame] = {}
+        info: collections.OrderedDict = collections.OrderedDict()
+        if not keys:
+            return results, info
+        x_vars = dtfcorutil.convert_to_list(self._x_vars)
+        y_vars = dtfcorutil.convert_to_list(self._y_vars)
+        model_kwargs = self._model_kwargs or {}
+        idx = dfs[keys[0]].index
+        num_rows = idx.size
+        # Build the arrays with shape (num_keys, num_rows, num_vars).
+        x = np.stack(
+            [dfs[key][x_vars].to_numpy(dtype=np.float64) for key in keys]
         )
-        df_out = df_out.reindex(df_in.index)
-        df_out = dtfcorutil.merge_dataframes(df_in, df_out)
-        method = "fit" if fit else "predict"
-        self._set_info(method, info)
-        return {"df_out": df_out}
+        y = np.stack(
+            [dfs[key][y_vars].to_numpy(dtype=np.float64) for key in keys]
+        )
+        hdbg.dassert_lte(0, self._steps_ahead)
+        hdbg.dassert_lt(self._steps_ahead, num_rows)
+        forward_y = np.full_like(y, np.nan)
+        forward_y[:, : num_rows - self._steps_ahead] = y[:, self._steps_ahead :]
+        # Find the rows used by the models, like in
+        # `get_x_and_forward_y_fit_df()` and
+        # `get_x_and_forward_y_predict_df()`.
+        mask = np.isfinite(x).all(axis=2)
+        if fit:
+            num_model_rows = num_rows - self._steps_ahead
+            mask &= np.isfinite(forward_y).all(axis=2)
+            mask[:, num_model_rows:] = False
+        else:
+            num_model_rows = num_rows
+        self._handle_nans(idx[:num_model_rows], keys, mask[:, :num_model_rows])
+        # Fit or load the models.
+        if fit:
+            models = _fit_linear_models_batched(
+                x, forward_y, mask, self._model_func, model_kwargs
+            )
+        else:
+            models = [self._key_fit_state[key]["_model"] for key in keys]
+        num_x_vars = len(x_vars)
+        num_y_vars = len(y_vars)
+        coef = np.stack(
+            [
+                np.reshape(model.coef_, (num_y_vars, num_x_vars)).T
+                for model in models
+            ]
+        )
+        intercept = np.stack(
+            [
+                np.broadcast_to(model.intercept_, (num_y_vars,))
+                for model in models
+            ]
+        )
+        # Predict.
+        x_vals = np.where(mask[:, :, None], x, 0.0)
+        forward_y_hat = (
+            np.einsum("ktp,kpm->ktm", x_vals, coef) + intercept[:, None, :]
+        )
+        forward_y_hat[~mask] = np.nan
+        forward_y = np.where(mask[:, :, None], forward_y, np.nan)
+        # Score the predictions where the forward values are known.
+        score_mask = mask & np.isfinite(forward_y).all(axis=2)
+        scores = _compute_r2_scores_batched(forward_y, forward_y_hat, score_mask)
+        # Package the results.
+        forward_y_cols = [f"{y}.shift_-{self._steps_ahead}" for y in y_vars]
+        forward_y_hat_cols = [f"{y}_hat" for y in forward_y_cols]
+        columns = forward_y_cols + forward_y_hat_cols
+        for i, key in enumerate(keys):
+            results[key] = pd.DataFrame(
+                np.concatenate([forward_y[i], forward_y_hat[i]], axis=1),
+                index=idx,
+                columns=columns,
+            )
+            info_out = collections.OrderedDict()
+            info_out["model_x_vars"] = x_vars
+            info_out["model_params"] = models[i].get_params()
+            info_out["model_attributes"] = collections.OrderedDict(
+                vars(models[i])
+            )
+            info_out["model_score"] = scores[i]
+            info[key] = info_out
+            if fit:
+                self._key_fit_state[key] = {
+                    "_model": models[i],
+                    "_info['fit']": info_out,
+                }
+        return results, info
+
+    def _handle_nans(
+        self,
+        idx: pd.Index,
+        keys: List[dtfcorutil.NodeColumn],
+        mask: np.ndarray,
+    ) -> None:
+        """
+        Handle the rows with NaNs as `ContinuousSkLearnModel._handle_nans()`.
+
+        :param idx: index of the rows that should be used by the models
+        :param keys: keys of the models
+        :param mask: boolean array with shape `(len(keys), len(idx))`, which
+            is True for the rows without NaNs
+        """
+        nan_mode = self._nan_mode or "raise"
+        if nan_mode == "raise":
+            for i, key in enumerate(keys):
+                if not mask[i].all():
+                    nan_idx = idx[~mask[i]]
+                    raise ValueError(f"NaNs detected at {nan_idx}")
+        elif nan_mode == "drop":
+            pass
+        else:
+            raise ValueError(f"Unrecognized nan_mode `{nan_mode}`")
+        for i, key in enumerate(keys):
+            hdbg.dassert(mask[i].any(), "No data for key=%s", key)
+
+
+# Models supported by `MultiindexSkLearnModel(..., use_batched_solver=True)`.
+_BATCHED_SOLVER_MODEL_FUNCS = (slmode.LinearRegression, slmode.Ridge)
+
+
+def _fit_predict_continuous_sklearn_model(
+    df: pd.DataFrame,
+    fit_state: Optional[Dict[str, Any]],
+    *,
+    fit: bool,
+    csklm_kwargs: Dict[str, Any],
+) -> Tuple[pd.DataFrame, collections.OrderedDict, Dict[str, Any]]:
+    """
+    Fit or predict a `ContinuousSkLearnModel` on the data of one key.
+
+    :param df: data of the key
+    :param fit_state: fit state to predict with, ignored when fitting
+    :param csklm_kwargs: params of `ContinuousSkLearnModel`
+    :return: output df, info and fit state of the model
+    """
+    csklm = ContinuousSkLearnModel("sklearn", **csklm_kwargs)
+    if fit:
+        df_out = csklm.fit(df)["df_out"]
+        info_out = csklm.get_info("fit")
+    else:
+        csklm.set_fit_state(fit_state)
+        df_out = csklm.predict(df)["df_out"]
+        info_out = csklm.get_info("predict")
+    return df_out, info_out, csklm.get_fit_state()
+
+
+def _dassert_batched_solver_is_supported(
+    model_func: Callable[..., Any], model_kwargs: Dict[str, Any]
+) -> None:
+    hdbg.dassert_in(
+        model_func,
+        _BATCHED_SOLVER_MODEL_FUNCS,
+        "The batched solver doesn't support model_func=%s",
+        model_func,
+    )
+    hdbg.dassert(
+        not model_kwargs.get("positive", False),
+        "The batched solver doesn't support `positive=True`",
+    )
+    if model_func is slmode.Ridge:
+        hdbg.dassert_in(model_kwargs.get("solver", "auto"), ["auto", "cholesky"])
+        hdbg.dassert_eq(np.ndim(model_kwargs.get("alpha", 1.0)), 0)
+
+
+def _fit_linear_models_batched(
+    x: np.ndarray,
+    y: np.ndarray,
+    mask: np.ndarray,
+    model_func: Callable[..., Any],
+    model_kwargs: Dict[str, Any],
+) -> List[sklear.base.BaseEstimator]:
+    """
+    Fit one linear model for each key in closed form.
+
+    The models are solved as in sklearn, i.e., centering the data when
+    fitting the intercept, then with least squares for `LinearRegression` and
+    with the normal equations (as the "cholesky" solver) for `Ridge`.
+
+    :param x: array with shape (num_keys, num_rows, num_x_vars)
+    :param y: array with shape (num_keys, num_rows, num_y_vars)
+    :param mask: boolean array with shape (num_keys, num_rows), which is True
+        for the rows to fit on
+    :return: fitted sklearn models, one for each key
+    """
+    weights = mask[:, :, None].astype(np.float64)
+    num_fit_rows = weights.sum(axis=1)
+    x = np.where(mask[:, :, None], x, 0.0)
+    y = np.where(mask[:, :, None], y, 0.0)
+    fit_intercept = model_kwargs.get("fit_intercept", True)
+    if fit_intercept:
+        x_offset = x.sum(axis=1) / num_fit_rows
+        y_offset = y.sum(axis=1) / num_fit_rows
+        x = (x - x_offset[:, None, :]) * weights
+        y = (y - y_offset[:, None, :]) * weights
+    # Solve for the coefficients with shape (num_keys, num_x_vars, num_y_vars).
+    if model_func is slmode.Ridge:
+        alpha = model_kwargs.get("alpha", 1.0)
+        num_x_vars = x.shape[2]
+        xtx = np.einsum("ktp,ktq->kpq", x, x) + alpha * np.eye(num_x_vars)
+        xty = np.einsum("ktp,ktm->kpm", x, y)
+        coef = np.linalg.solve(xtx, xty)
+    elif model_func is slmode.LinearRegression:
+        # Use the same cutoff for small singular values as
+        # `scipy.linalg.lstsq()`.
+        eps = np.finfo(np.float64).eps
+        coef = np.linalg.pinv(x, rcond=eps) @ y
+        singular = np.linalg.svd(x, compute_uv=False)
+        rank = (singular > eps * singular[:, :1]).sum(axis=1)
+    else:
+        raise ValueError(f"Unsupported model_func={model_func}")
+    if fit_intercept:
+        intercept = y_offset - np.einsum("kp,kpm->km", x_offset, coef)
+    # Fit the model of the first key with sklearn to get the attributes of a
+    # fitted model (e.g., the shape of `coef_` depends on the sklearn
+    # version), and replace the coefficients for the other keys.
+    template = model_func(**model_kwargs).fit(x[0][mask[0]], y[0][mask[0]])
+    models = []
+    for i in range(x.shape[0]):
+        model = copy.deepcopy(template)
+        model.coef_ = np.reshape(coef[i].T, np.shape(template.coef_))
+        if fit_intercept:
+            model.intercept_ = np.reshape(
+                intercept[i], np.shape(template.intercept_)
+            )
+        if model_func is slmode.LinearRegression:
+            model.singular_ = singular[i]
+            model.rank_ = int(rank[i])
+        models.append(model)
+    return models
+
+
+def _compute_r2_scores_batched(
+    y_true: np.ndarray, y_pred: np.ndarray, mask: np.ndarray
+) -> List[Optional[float]]:
+    """
+    Compute the R^2 score of each key as `sklearn.metrics.r2_score()`.
+
+    :param y_true, y_pred: arrays with shape (num_keys, num_rows, num_y_vars)
+    :param mask: boolean array with shape (num_keys, num_rows), which is True
+        for the rows to score
+    :return: score averaged over the `y_vars` for each key, or None if there
+        are no rows to score
+    """
+    weights = mask[:, :, None].astype(np.float64)
+    num_rows = weights.sum(axis=1)
+    y_true = np.where(mask[:, :, None], y_true, 0.0)
+    y_pred = np.where(mask[:, :, None], y_pred, 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        y_mean = y_true.sum(axis=1) / num_rows
+        ss_res = (weights * (y_true - y_pred) ** 2).sum(axis=1)
+        ss_tot = (weights * (y_true - y_mean[:, None, :]) ** 2).sum(axis=1)
+        r2 = 1 - ss_res / ss_tot
+    # Constant targets have a score of 1 if perfectly predicted and 0
+    # otherwise.
+    r2 = np.where(ss_tot == 0, np.where(ss_res == 0, 1.0, 0.0), r2)
+    scores = [
+        float(r2[i].mean()) if mask[i].any() else None
+        for i in range(r2.shape[0])
+    ]
+    return scores
 
 
 class SkLearnModel(dtfconobas.FitPredictNode, dtfconobas.ColModeMixin):
@@ -1,4 +1,5 @@
 import logging
+from typing import Any, Callable, Dict, Tuple
 
 import numpy as np
 import pandas as pd
@@ -310,6 +311,90 @@ class TestMultiindexSkLearnModel(hunitest.TestCase):
         )
         self.check_string(df_str, fuzzy_match=True)
 
+    def test_num_processes1(self) -> None:
+        """
+        Check that running the models in parallel gives the same results.
+        """
+        expected = self._fit_predict(slmode.Ridge, {"alpha": 0.5})
+        actual = self._fit_predict(
+            slmode.Ridge, {"alpha": 0.5}, num_processes=2
+        )
+        self._check_equal(actual, expected)
+
+    def test_batched_solver1(self) -> None:
+        """
+        Check that the batched solver gives the same results for `Ridge`.
+        """
+        expected = self._fit_predict(slmode.Ridge, {"alpha": 0.5})
+        actual = self._fit_predict(
+            slmode.Ridge, {"alpha": 0.5}, use_batched_solver=True
+        )
+        self._check_equal(actual, expected)
+
+    def test_batched_solver2(self) -> None:
+        """
+        Check that the batched solver gives the same results for
+        `LinearRegression`.
+        """
+        expected = self._fit_predict(slmode.LinearRegression, {})
+        actual = self._fit_predict(
+            slmode.LinearRegression, {}, use_batched_solver=True
+        )
+        self._check_equal(actual, expected)
+
+    def test_batched_solver3(self) -> None:
+        """
+        Check that an unsupported model is rejected by the batched solver.
+        """
+        with self.assertRaises(AssertionError):
+            self._fit_predict(slmode.Lasso, {}, use_batched_solver=True)
+
+    def _fit_predict(
+        self,
+        model_func: Callable[..., Any],
+        model_kwargs: Dict[str, Any],
+        **kwargs: Any,
+    ) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[str, Any]]:
+        """
+        Fit and predict a model, returning the outputs and the fit state.
+        """
+        data = self._get_data()
+        data_fit = data.loc[:"2000-01-31"]  # type: ignore[misc]
+        data_predict = data.loc["2000-01-31":]  # type: ignore[misc]
+        node = dtfcnoskmo.MultiindexSkLearnModel(
+            "sklearn",
+            in_col_groups=[("ret_0",)],
+            out_col_group=(),
+            model_func=model_func,
+            x_vars=["ret_0"],
+            y_vars=["ret_0"],
+            steps_ahead=1,
+            model_kwargs=model_kwargs,
+            **kwargs,
+        )
+        fit_df_out = node.fit(data_fit)["df_out"]
+        predict_df_out = node.predict(data_predict)["df_out"]
+        return fit_df_out, predict_df_out, node.get_fit_state()
+
+    def _check_equal(
+        self,
+        actual: Tuple[pd.DataFrame, pd.DataFrame, Dict[str, Any]],
+        expected: Tuple[pd.DataFrame, pd.DataFrame, Dict[str, Any]],
+    ) -> None:
+        pd.testing.assert_frame_equal(actual[0], expected[0], rtol=1e-8)
+        pd.testing.assert_frame_equal(actual[1], expected[1], rtol=1e-8)
+        actual_key_fit_state = actual[2]["_key_fit_state"]
+        expected_key_fit_state = expected[2]["_key_fit_state"]
+        self.assertEqual(list(actual_key_fit_state), list(expected_key_fit_state))
+        for key, fit_state in expected_key_fit_state.items():
+            actual_model = actual_key_fit_state[key]["_model"]
+            expected_model = fit_state["_model"]
+            self.assertEqual(type(actual_model), type(expected_model))
+            np.testing.assert_allclose(actual_model.coef_, expected_model.coef_)
+            np.testing.assert_allclose(
+                actual_model.intercept_, expected_model.intercept_
+            )
+
     def _get_data(self) -> pd.DataFrame:
         """
         Generate multivariate normal returns.
@@ -1,5 +1,6 @@
 import io
 import logging
+from typing import Any, Dict, Optional
 
 import numpy as np
 import pandas as pd
@@ -7,6 +8,8 @@ import pytest
 
 import core.artificial_signal_generators as carsigen
 import core.config as cconfig
+import core.signal_processing as csigproc
+import dataflow.core as dtfcore
 import dataflow.core.nodes.test.helpers as cdnth
 import dataflow.core.nodes.transformers as dtfconotra
 import helpers.hpandas as hpandas
@@ -786,6 +789,173 @@ datetime,MN0,MN1,MN0,MN1
         return df
 
 
+class TestSeriesToSeriesTransformer4(hunitest.TestCase):
+    """
+    Test the incremental predict mode.
+    """
+
+    def test_stateful1(self) -> None:
+        """
+        Check that a node carrying over the state of `compute_rolling_zscore()`
+        matches the full computation.
+        """
+        data = self._get_data()
+        config = cconfig.Config.from_dict(
+            {
+                "in_col_group": ("close",),
+                "out_col_group": ("zscore",),
+                "transformer_func": csigproc.compute_rolling_zscore,
+                "transformer_kwargs": {"tau": 5, "delay": 1},
+            }
+        )
+        node = dtfconotra.SeriesToSeriesTransformer("zscore", **config.to_dict())
+        expected = node.predict(data)["df_out"]
+        node.set_incremental_predict_mode(0, verify=True)
+        for end in range(20, 41):
+            actual = node.predict(data.iloc[:end])["df_out"]
+        self.assert_dfs_close(actual, expected, rtol=1e-10, atol=1e-12)
+
+    def test_warmup1(self) -> None:
+        """
+        Check that recomputing the new rows on a warm-up window matches the
+        full computation on a sliding window.
+        """
+        data = self._get_data()
+        config = cconfig.Config.from_dict(
+            {
+                "in_col_group": ("close",),
+                "out_col_group": ("diff",),
+                "transformer_func": lambda x: x.diff(),
+            }
+        )
+        node = dtfconotra.SeriesToSeriesTransformer("diff", **config.to_dict())
+        node.set_incremental_predict_mode(1, verify=True, verify_atol=0)
+        for end in range(20, 41):
+            actual = node.predict(data.iloc[end - 20 : end])["df_out"]
+        node.set_incremental_predict_mode(None)
+        expected = node.predict(data.iloc[20:40])["df_out"]
+        # The first row of the window is computed by the full computation
+        # from the previous window.
+        self.assert_dfs_close(actual.iloc[1:], expected.iloc[1:])
+
+    def test_stateful2(self) -> None:
+        """
+        Check that a node carrying over the state of `compute_ema()` matches
+        the full computation on a sliding window.
+        """
+        data = self._get_data()
+        node = self._get_ema_node()
+        node.set_incremental_predict_mode(0, verify=True, verify_atol=1e-10)
+        for end in range(20, 41):
+            actual = node.predict(data.iloc[end - 20 : end])["df_out"]
+        node.set_incremental_predict_mode(None)
+        expected = node.predict(data.iloc[20:40])["df_out"]
+        self.assert_dfs_close(actual, expected, rtol=1e-10, atol=1e-12)
+
+    def test_stateful3(self) -> None:
+        """
+        Check that a stateful node processes only the new rows of an
+        expanding window and the full input of a sliding window.
+        """
+        data = self._get_data()
+        num_rows = []
+
+        def _compute_ema(
+            signal: pd.Series, *, state: Optional[Dict[str, Any]] = None
+        ) -> pd.Series:
+            num_rows.append(len(signal))
+            return csigproc.compute_ema(signal, 20, 0, state=state)
+
+        config = cconfig.Config.from_dict(
+            {
+                "in_col_group": ("close",),
+                "out_col_group": ("ema",),
+                "transformer_func": _compute_ema,
+            }
+        )
+        node = dtfconotra.SeriesToSeriesTransformer("ema", **config.to_dict())
+        node.set_incremental_predict_mode(0)
+        # Expanding window: after the first call only the new row of each of
+        # the 2 leaf cols is processed.
+        for end in range(20, 23):
+            node.predict(data.iloc[:end])
+        self.assertEqual(num_rows, [20, 20, 1, 1, 1, 1])
+        # Sliding window: the full input is processed at every call.
+        node.set_incremental_predict_mode(0)
+        num_rows.clear()
+        for end in range(20, 23):
+            node.predict(data.iloc[end - 20 : end])
+        self.assertEqual(num_rows, [20] * 6)
+
+    def test_fit1(self) -> None:
+        """
+        Check that `fit()` doesn't change the carry-over state of `predict()`.
+        """
+        data = self._get_data()
+        node = self._get_ema_node()
+        node.set_incremental_predict_mode(0, verify=True, verify_atol=1e-10)
+        for end in range(20, 41):
+            node.fit(data.iloc[end - 10 : end])
+            actual = node.predict(data.iloc[:end])["df_out"]
+        node.set_incremental_predict_mode(None)
+        expected = node.predict(data)["df_out"]
+        self.assert_dfs_close(actual, expected, rtol=1e-10, atol=1e-12)
+
+    def test_set_incremental_predict_mode1(self) -> None:
+        """
+        Check setting the warm-up length of the nodes of a DAG by nid.
+        """
+        dag = dtfcore.DAG(mode="strict")
+        dag.append_to_tail(self._get_ema_node())
+        config = cconfig.Config.from_dict(
+            {
+                "in_col_group": ("ema",),
+                "out_col_group": ("diff",),
+                "transformer_func": lambda x: x.diff(),
+            }
+        )
+        node = dtfconotra.SeriesToSeriesTransformer("diff", **config.to_dict())
+        dag.append_to_tail(node)
+        dtfcore.set_incremental_predict_mode(dag, {"ema": 0, "diff": 1})
+        self.assertEqual(dag.get_node("ema")._warmup_length, 0)
+        self.assertEqual(dag.get_node("diff")._warmup_length, 1)
+        # Set only one node.
+        dtfcore.set_incremental_predict_mode(dag, {"diff": None})
+        self.assertEqual(dag.get_node("ema")._warmup_length, 0)
+        self.assertIsNone(dag.get_node("diff")._warmup_length)
+
+    @staticmethod
+    def _get_ema_node() -> dtfconotra.SeriesToSeriesTransformer:
+        config = cconfig.Config.from_dict(
+            {
+                "in_col_group": ("close",),
+                "out_col_group": ("ema",),
+                "transformer_func": csigproc.compute_ema,
+                "transformer_kwargs": {"tau": 20, "min_periods": 0},
+                "join_output_with_input": True,
+            }
+        )
+        node = dtfconotra.SeriesToSeriesTransformer("ema", **config.to_dict())
+        return node
+
+    def _get_data(self) -> pd.DataFrame:
+        """
+        Generate multivariate normal returns.
+        """
+        mn_process = carsigen.MultivariateNormalProcess()
+        mn_process.set_cov_from_inv_wishart_draw(dim=2, seed=342)
+        realization = mn_process.generate_sample(
+            {"start": "2000-01-01", "periods": 40, "freq": "B"}, seed=134
+        )
+        realization = realization.rename(columns=lambda x: "MN" + str(x))
+        realization = np.exp(0.1 * realization.cumsum())
+        volume = pd.DataFrame(
+            index=realization.index, columns=realization.columns, data=100
+        )
+        data = pd.concat([realization, volume], axis=1, keys=["close", "volume"])
+        return data
+
+
 class TestFunctionWrapper(hunitest.TestCase):
     def test1(self) -> None:
         """
@@ -671,6 +671,33 @@ class TestMultiindexVolatilityModel(hunitest.TestCase):
         )
         self.assert_equal(actual, expected)
 
+    def test_num_processes1(self) -> None:
+        """
+        Check that modeling the keys in parallel gives the same results.
+        """
+        data = self._get_data()
+        fit_df = data.loc[:"2000-01-31"]  # type: ignore[misc]
+        outs = []
+        for num_processes in [1, 2]:
+            node = MultiindexVolatilityModel(
+                "vol_model",
+                in_col_group=("ret_0",),
+                steps_ahead=2,
+                nan_mode="drop",
+                num_processes=num_processes,
+            )
+            fit_df_out = node.fit(fit_df)["df_out"]
+            predict_df_out = node.predict(data)["df_out"]
+            fit_state = node.get_fit_state()
+            outs.append((fit_df_out, predict_df_out, fit_state))
+        # Check.
+        expected, actual = outs
+        pd.testing.assert_frame_equal(actual[0], expected[0])
+        pd.testing.assert_frame_equal(actual[1], expected[1])
+        self.assertEqual(
+            str(actual[2]["_col_fit_state"]), str(expected[2]["_col_fit_state"])
+        )
+
     @staticmethod
     def _package_results1(
         method: str,
@@ -631,6 +631,13 @@ class SeriesToSeriesTransformer(dtfconobas.Transformer):
         :param reindex_like_input: reindex result of `transformer_func` like
             the input series
         join_output_with_input: whether to join the output with the input
+
+        If `transformer_func` accepts a `state` parameter (e.g.,
+        `compute_ema()`), in incremental predict mode the node passes a state
+        for each leaf col and processes only the new rows, as long as the start
+        of the input doesn't change (e.g., for an expanding window). With a
+        sliding window the state is seeded again from the full input at every
+        call, so there is no speedup.
         """
         super().__init__(nid)
         hdbg.dassert_isinstance(in_col_group, tuple)
@@ -669,11 +676,23 @@ class SeriesToSeriesTransformer(dtfconobas.Transformer):
         srs_list = []
         leaf_cols = self._leaf_cols
         leaf_cols = cast(List[str], leaf_cols)
+        is_stateful = self._is_stateful()
         for col in leaf_cols:
+            transformer_kwargs = self._transformer_kwargs
+            if is_stateful:
+                # Pass the carry-over state of the col, which is populated by
+                # `transformer_func`.
+                self._incremental_state = cast(
+                    dtfconobas.FitPredictNode.NodeState, self._incremental_state
+                )
+                transformer_kwargs = {
+                    **transformer_kwargs,
+                    "state": self._incremental_state.setdefault(col, {}),
+                }
             srs, col_info = _apply_func_to_data(
                 df[col],
                 self._transformer_func,
-                self._transformer_kwargs,
+                transformer_kwargs,
                 self._drop_nans,
                 self._reindex_like_input,
                 self._permitted_exceptions,
@@ -697,6 +716,48 @@ class SeriesToSeriesTransformer(dtfconobas.Transformer):
         info["df_transformed_info"] = dtfcorutil.get_df_info_as_string(df)
         return df, info
 
+    def _transform_new_rows(
+        self, df_in: pd.DataFrame, num_new_rows: int
+    ) -> Tuple[pd.DataFrame, collections.OrderedDict]:
+        if not self._is_stateful():
+            return super()._transform_new_rows(df_in, num_new_rows)
+        if df_in.index[0] != self._prev_df_in_first_idx:
+            # The carry-over state accounts for all the rows since the start of
+            # the first input, so it can't be used when the start of the input
+            # changes (e.g., with a sliding window) and the state is seeded
+            # again from the full input.
+            _LOG.debug(
+                "Processing the full input of node '%s' since its start changed",
+                self.nid,
+            )
+            self._incremental_state = {}
+            df_out, info = self._transform(df_in)
+            return df_out, info
+        # The carry-over state accounts for all the previous rows, so only the
+        # new rows are processed.
+        prev_df_out = self._get_prev_df_out(df_in)
+        if num_new_rows == 0:
+            info = cast(collections.OrderedDict, self.get_info("predict"))
+            return prev_df_out, info
+        df_new_out, info = self._transform(df_in.iloc[-num_new_rows:])
+        hdbg.dassert(
+            df_new_out.columns.equals(prev_df_out.columns),
+            "Columns of node '%s' differ from the previous invocation",
+            self.nid,
+        )
+        df_out = pd.concat([prev_df_out, df_new_out])
+        info["df_transformed_info"] = dtfcorutil.get_df_info_as_string(df_out)
+        return df_out, info
+
+    def _is_stateful(self) -> bool:
+        """
+        Return whether `transformer_func` carries over a state across calls.
+        """
+        if self._incremental_state is None:
+            return False
+        func_sig = inspect.signature(self._transformer_func)
+        return "state" in func_sig.parameters
+
 
 def _apply_func_to_data(
     data: Union[pd.Series, pd.DataFrame],
@@ -5,6 +5,8 @@ import dataflow.core.nodes.volatility_models as dtfcnovomo
 """
 
 import collections
+import concurrent.futures
+import functools
 import logging
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
@@ -411,32 +413,82 @@ class SingleColumnVolatilityModel(dtfconobas.FitPredictNode):
         return dag
 
 
+def _fit_predict_single_column_volatility_model(
+    df: pd.DataFrame,
+    fit_state: Optional[Dict[str, Any]],
+    *,
+    fit: bool,
+    scvm_kwargs: Dict[str, Any],
+) -> Tuple[pd.DataFrame, collections.OrderedDict, Dict[str, Any]]:
+    """
+    Fit or predict a `SingleColumnVolatilityModel` on a single column.
+
+    :param df: data with the column to model
+    :param fit_state: fit state to predict with, ignored when fitting
+    :param scvm_kwargs: params of `SingleColumnVolatilityModel`
+    :return: output df, info and fit state of the model
+    """
+    scvm = SingleColumnVolatilityModel("volatility", **scvm_kwargs)
+    if fit:
+        df_out = scvm.fit(df)["df_out"]
+        info_out = scvm.get_info("fit")
+    else:
+        scvm.set_fit_state(fit_state)
+        df_out = scvm.predict(df)["df_out"]
+        info_out = scvm.get_info("predict")
+    return df_out, info_out, scvm.get_fit_state()
+
+
 class _MultiColVolatilityModelMixin:
     def _fit_predict_volatility_model(
         self, df: pd.DataFrame, fit: bool, out_col_prefix: Optional[str] = None
     ) -> Tuple[Dict[str, pd.DataFrame], collections.OrderedDict]:
+        """
+        Run one `SingleColumnVolatilityModel` for each column of `df`.
+
+        The models run in parallel across `self._num_processes` processes, if
+        more than one.
+        """
+        cols = df.columns.to_list()
+        funcs = [
+            functools.partial(
+                _fit_predict_single_column_volatility_model,
+                fit=fit,
+                scvm_kwargs={
+                    "steps_ahead": self._steps_ahead,
+                    "col": col,
+                    "p_moment": self._p_moment,
+                    "progress_bar": self._progress_bar,
+                    "tau": self._tau,
+                    "nan_mode": self._nan_mode,
+                    "out_col_prefix": out_col_prefix or col,
+                },
+            )
+            for col in cols
+        ]
+        col_dfs = [df[[col]] for col in cols]
+        fit_states = [None if fit else self._col_fit_state[col] for col in cols]
+        if self._num_processes == 1 or len(cols) <= 1:
+            outs = [
+                func(col_df, fit_state)
+                for func, col_df, fit_state in zip(funcs, col_dfs, fit_states)
+            ]
+        else:
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=self._num_processes
+            ) as executor:
+                futures = [
+                    executor.submit(func, col_df, fit_state)
+                    for func, col_df, fit_state in zip(
+                        funcs, col_dfs, fit_states
+                    )
+                ]
+                outs = [future.result() for future in futures]
         dfs = {}
         info = collections.OrderedDict()
-        for col in df.columns:
-            local_out_col_prefix = out_col_prefix or col
-            scvm = SingleColumnVolatilityModel(
-                "volatility",
-                steps_ahead=self._steps_ahead,
-                col=col,
-                p_moment=self._p_moment,
-                progress_bar=self._progress_bar,
-                tau=self._tau,
-                nan_mode=self._nan_mode,
-                out_col_prefix=local_out_col_prefix,
-            )
+        for col, (df_out, info_out, fit_state) in zip(cols, outs):
             if fit:
-                df_out = scvm.fit(df[[col]])["df_out"]
-                info_out = scvm.get_info("fit")
-                self._col_fit_state[col] = scvm.get_fit_state()
-            else:
-                scvm.set_fit_state(self._col_fit_state[col])
-                df_out = scvm.predict(df[[col]])["df_out"]
-                info_out = scvm.get_info("predict")
+                self._col_fit_state[col] = fit_state
             dfs[col] = df_out
             info[col] = info_out
         return dfs, info
@@ -465,6 +517,8 @@ class VolatilityModel(
         col_rename_func: Callable[[Any], Any] = lambda x: f"{x}_zscored",
         col_mode: Optional[str] = None,
         nan_mode: Optional[str] = None,
+        *,
+        num_processes: int = 1,
     ) -> None:
         """
         Specify the data and smooth moving average (SMA) modeling parameters.
@@ -483,6 +537,8 @@ class VolatilityModel(
               and transformed selected columns
             - If "replace_all", leave only transformed selected columns
         :param nan_mode: as in ContinuousSkLearnModel
+        :param num_processes: number of processes modeling different columns
+            in parallel
         """
         super().__init__(nid)
         self._cols = cols
@@ -498,6 +554,8 @@ class VolatilityModel(
         self._col_rename_func = col_rename_func
         self._col_mode = col_mode or "merge_all"
         self._nan_mode = nan_mode
+        hdbg.dassert_lte(1, num_processes)
+        self._num_processes = num_processes
         # State of the model to serialize/deserialize.
         self._fit_cols: List[dtfcorutil.NodeColumn] = []
         self._col_fit_state = {}
@@ -560,6 +618,8 @@ class MultiindexVolatilityModel(
         progress_bar: bool = False,
         tau: Optional[float] = None,
         nan_mode: Optional[str] = None,
+        *,
+        num_processes: int = 1,
     ) -> None:
         """
         Specify the data and sma modeling parameters.
@@ -570,6 +630,8 @@ class MultiindexVolatilityModel(
         :param tau: as in `csigproc.compute_smooth_moving_average`. If `None`,
             learn this parameter
         :param nan_mode: as in ContinuousSkLearnModel
+        :param num_processes: number of processes modeling different keys in
+            parallel
         """
         super().__init__(nid)
         hdbg.dassert_isinstance(in_col_group, tuple)
@@ -586,6 +648,9 @@ class MultiindexVolatilityModel(
         self._tau = tau
         self._nan_mode = nan_mode
         #
+        hdbg.dassert_lte(1, num_processes)
+        self._num_processes = num_processes
+        #
         self._col_fit_state = {}
 
     def fit(self, df_in: pd.DataFrame) -> Dict[str, pd.DataFrame]:
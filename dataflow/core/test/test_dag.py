@@ -1,11 +1,24 @@
 import logging
 import os
+import threading
+import unittest.mock as umock
+
+import numpy as np
+import pandas as pd
 
 import dataflow.core.dag as dtfcordag
 import dataflow.core.node as dtfcornode
+import dataflow.core.node_cache as dtfcornoca
+import dataflow.core.node_io_writer as dtfconiowr
+import dataflow.core.nodes.base as dtfconobas
+import dataflow.core.nodes.sources as dtfconosou
+import dataflow.core.nodes.transformers as dtfconotra
 import dataflow.core.visualization as dtfcorvisu
+import helpers.hio as hio
+import helpers.hparquet as hparque
 import helpers.hprint as hprint
 import helpers.hunit_test as hunitest
+import helpers.hwall_clock_time as hwacltim
 
 _LOG = logging.getLogger(__name__)
 
@@ -527,3 +540,317 @@ class Test_dataflow_core_DAG5(_TestDataflowHelper):
         #
         dag1.compose(dag2)
         self._check(dag1)
+
+
+# #############################################################################
+# Test_dataflow_core_DAG6
+# #############################################################################
+
+
+def _get_diamond_dag(num_threads: int) -> dtfcordag.DAG:
+    """
+    Build a DAG with two independent branches joined by a `YConnector`.
+    """
+    index = pd.date_range("2022-01-03 09:30", periods=20, freq="T", tz="UTC")
+    data = np.arange(40, dtype=float).reshape(20, 2)
+    df = pd.DataFrame(data, index=index, columns=["a", "b"])
+    dag = dtfcordag.DAG()
+    dag.set_parallel_mode(num_threads)
+    dag.add_node(dtfconosou.DfDataSource("source", df))
+    # Add the branches.
+    node = dtfconotra.FunctionWrapper(
+        "branch1", lambda df_: df_.rolling(3).mean()
+    )
+    dag.add_node(node)
+    dag.connect("source", "branch1")
+    node = dtfconotra.FunctionWrapper(
+        "branch2", lambda df_: df_.diff().add_suffix("_diff")
+    )
+    dag.add_node(node)
+    dag.connect("source", "branch2")
+    # Join the branches.
+    node = dtfconobas.YConnector(
+        "join", lambda df_in1, df_in2: df_in1.join(df_in2)
+    )
+    dag.add_node(node)
+    dag.connect("branch1", ("join", "df_in1"))
+    dag.connect("branch2", ("join", "df_in2"))
+    return dag
+
+
+class Test_dataflow_core_DAG6(hunitest.TestCase):
+    """
+    Check that the parallel execution of a DAG matches the sequential one.
+    """
+
+    def test_run_dag1(self) -> None:
+        """
+        Run the entire DAG.
+        """
+        expected = _get_diamond_dag(1).run_dag("fit")["join"]["df_out"]
+        actual = _get_diamond_dag(4).run_dag("fit")["join"]["df_out"]
+        self.assert_dfs_close(actual, expected)
+
+    def test_run_leq_node1(self) -> None:
+        """
+        Run the DAG up to one of the branches.
+        """
+        expected = _get_diamond_dag(1).run_leq_node("branch2", "fit")["df_out"]
+        dag = _get_diamond_dag(4)
+        actual = dag.run_leq_node("branch2", "fit")["df_out"]
+        self.assert_dfs_close(actual, expected)
+        # The other branch is not executed.
+        with self.assertRaises(AssertionError):
+            dag.get_node("branch1").get_outputs("fit")
+
+    def test_error1(self) -> None:
+        """
+        Check that an error in a node is propagated.
+        """
+        dag = _get_diamond_dag(4)
+        node = dtfconotra.FunctionWrapper("fail", lambda df_: 1 / 0)
+        dag.add_node(node)
+        dag.connect("source", "fail")
+        with self.assertRaises(ZeroDivisionError):
+            dag.run_dag("fit")
+
+
+# #############################################################################
+# Test_dataflow_core_DAG7
+# #############################################################################
+
+
+class Test_dataflow_core_DAG7(hunitest.TestCase):
+    """
+    Check that the node outputs are freed after their last consumer.
+    """
+
+    def helper(self, num_threads: int) -> None:
+        expected = _get_diamond_dag(1).run_dag("fit")["join"]["df_out"]
+        #
+        dag = _get_diamond_dag(num_threads)
+        dag.force_free_nodes = True
+        dag.pinned_nids = ["branch2"]
+        actual = dag.run_dag("fit")["join"]["df_out"]
+        self.assert_dfs_close(actual, expected)
+        # The outputs of the intermediate nodes are freed.
+        for nid in ["source", "branch1"]:
+            with self.assertRaises(AssertionError):
+                dag.get_node(nid).get_outputs("fit")
+        # The pinned node is kept.
+        _ = dag.get_node("branch2").get_outputs("fit")
+
+    def test1(self) -> None:
+        self.helper(num_threads=1)
+
+    def test2(self) -> None:
+        self.helper(num_threads=4)
+
+    def test_run_leq_node1(self) -> None:
+        """
+        Check that the requested node is kept.
+        """
+        dag = _get_diamond_dag(1)
+        dag.force_free_nodes = True
+        df_out = dag.run_leq_node("branch1", "fit")["df_out"]
+        self.assertEqual(df_out.shape, (20, 2))
+        with self.assertRaises(AssertionError):
+            dag.get_node("source").get_outputs("fit")
+
+
+# #############################################################################
+# Test_dataflow_core_DAG8
+# #############################################################################
+
+
+class Test_dataflow_core_DAG8(hunitest.TestCase):
+    """
+    Check that the results of the nodes are memoized in the node cache.
+    """
+
+    def helper(
+        self, node_cache: dtfcornoca.NodeCache, num_threads: int
+    ) -> pd.DataFrame:
+        dag = _get_diamond_dag(num_threads)
+        dag.set_node_cache(node_cache)
+        df_out = dag.run_dag("fit")["join"]["df_out"]
+        return df_out
+
+    def test1(self) -> None:
+        """
+        Check that rerunning the same DAG reads the results from the cache.
+        """
+        expected = _get_diamond_dag(1).run_dag("fit")["join"]["df_out"]
+        node_cache = dtfcornoca.NodeCache(self.get_scratch_space())
+        actual = self.helper(node_cache, num_threads=1)
+        self.assert_dfs_close(actual, expected)
+        self.assertEqual((node_cache.num_hits, node_cache.num_misses), (0, 3))
+        # All the nodes but the source are loaded from the cache.
+        actual = self.helper(node_cache, num_threads=4)
+        self.assert_dfs_close(actual, expected)
+        self.assertEqual((node_cache.num_hits, node_cache.num_misses), (3, 3))
+
+    def test2(self) -> None:
+        """
+        Check that changing a node invalidates the node and its successors.
+        """
+        node_cache = dtfcornoca.NodeCache(self.get_scratch_space())
+        _ = self.helper(node_cache, num_threads=1)
+        dag = _get_diamond_dag(1)
+        node = dtfconotra.FunctionWrapper(
+            "branch2", lambda df_: df_.diff(2).add_suffix("_diff")
+        )
+        dag.remove_node("branch2")
+        dag.add_node(node)
+        dag.connect("source", "branch2")
+        dag.connect("branch2", ("join", "df_in2"))
+        dag.set_node_cache(node_cache)
+        actual = dag.run_dag("fit")["join"]["df_out"]
+        # Only `branch1` is loaded from the cache.
+        self.assertEqual((node_cache.num_hits, node_cache.num_misses), (1, 5))
+        self.assertTrue(actual["a_diff"].iloc[:2].isna().all())
+        self.assertEqual(actual["a_diff"].iloc[2], 4.0)
+
+    def test_freq1(self) -> None:
+        """
+        Check that the freq of the index is restored from the cache.
+        """
+        node_cache = dtfcornoca.NodeCache(self.get_scratch_space())
+        expected = self.helper(node_cache, num_threads=1)
+        self.assertEqual(expected.index.freq, "T")
+        actual = self.helper(node_cache, num_threads=1)
+        self.assertEqual(node_cache.num_hits, 3)
+        self.assertEqual(actual.index.freq, expected.index.freq)
+
+    def test_not_fingerprintable1(self) -> None:
+        """
+        Check that a node whose input can't be fingerprinted is not cached.
+        """
+        index = pd.date_range("2022-01-03 09:30", periods=3, freq="T", tz="UTC")
+        df = pd.DataFrame({"a": [[1], [2, 3], []]}, index=index)
+        node_cache = dtfcornoca.NodeCache(self.get_scratch_space())
+        for _ in range(2):
+            dag = dtfcordag.DAG()
+            dag.add_node(dtfconosou.DfDataSource("source", df))
+            node = dtfconotra.FunctionWrapper(
+                "len", lambda df_: df_["a"].str.len().to_frame()
+            )
+            dag.add_node(node)
+            dag.connect("source", "len")
+            dag.set_node_cache(node_cache)
+            actual = dag.run_dag("fit")["len"]["df_out"]
+            self.assertEqual(actual["a"].tolist(), [1, 2, 0])
+        self.assertEqual((node_cache.num_hits, node_cache.num_misses), (0, 0))
+
+    def test_eviction1(self) -> None:
+        """
+        Check that the least recently used entries are evicted.
+        """
+        max_size_in_bytes = 1
+        node_cache = dtfcornoca.NodeCache(
+            self.get_scratch_space(), max_size_in_bytes=max_size_in_bytes
+        )
+        _ = self.helper(node_cache, num_threads=1)
+        self.assertLessEqual(node_cache.get_size_in_bytes(), max_size_in_bytes)
+        _ = self.helper(node_cache, num_threads=1)
+        self.assertEqual(node_cache.num_hits, 0)
+
+
+# #############################################################################
+# Test_dataflow_core_DAG9
+# #############################################################################
+
+
+class Test_dataflow_core_DAG9(hunitest.TestCase):
+    """
+    Check that the node outputs are appended to Parquet in the background.
+    """
+
+    def helper(self, num_threads: int) -> None:
+        dst_dir = self.get_scratch_space()
+        dag = _get_diamond_dag(num_threads)
+        dag.set_debug_mode("df_as_pq_append", False, dst_dir)
+        # Run the DAG on a growing window of data, like in a real-time run.
+        source = dag.get_node("source")
+        index = source.df.index
+        hwacltim.reset_current_bar_timestamp()
+        for end_idx in [9, 14, 19]:
+            hwacltim.set_current_bar_timestamp(index[end_idx])
+            source.set_predict_intervals([(index[0], index[end_idx])])
+            dag.run_dag("predict")
+        hwacltim.reset_current_bar_timestamp()
+        dag.flush_node_io()
+        # Check that the saved rows add up to the last output.
+        for topological_id, nid in [(0, "source"), (3, "join")]:
+            actual = dtfconiowr.load_node_output_from_dst_dir(
+                dst_dir, topological_id, nid, "predict"
+            )
+            expected = dag.get_node(nid).get_output("predict", "df_out")
+            self.assert_dfs_close(actual, expected)
+        # Check that only the new rows are saved at each run.
+        node_dir = os.path.join(
+            dst_dir, "node_io.data_by_node", "predict.3.join.df_out"
+        )
+        file_names = sorted(
+            hio.listdir(node_dir, "*.parquet", True, True)
+        )
+        num_rows = [
+            hparque.from_parquet(os.path.join(node_dir, file_name)).shape[0]
+            for file_name in file_names
+        ]
+        self.assertEqual(num_rows, [10, 5, 5])
+        # The stats are saved for every node and run.
+        file_names = hio.listdir(
+            os.path.join(dst_dir, "node_io.data"), "*.txt", True, True
+        )
+        self.assertEqual(len(file_names), 12)
+
+    def test1(self) -> None:
+        self.helper(num_threads=1)
+
+    def test2(self) -> None:
+        self.helper(num_threads=4)
+
+    def test_modify_after_write1(self) -> None:
+        """
+        Check that modifying a node output after enqueueing it doesn't change
+        what is saved.
+        """
+        dst_dir = self.get_scratch_space()
+        writer = dtfconiowr.NodeIoWriter(dst_dir)
+        # Block the writer thread until the node output is modified.
+        can_write = threading.Event()
+        write_item = writer._write_item
+
+        def _blocked_write_item(*args) -> None:
+            can_write.wait()
+            write_item(*args)
+
+        index = pd.date_range(
+            "2022-01-03 09:31", periods=5, freq="T", tz="America/New_York"
+        )
+        df = pd.DataFrame({"a": [1.0, 2.0, 3.0, 4.0, 5.0]}, index=index)
+        expected = df.copy()
+        with umock.patch.object(writer, "_write_item", _blocked_write_item):
+            # Write the first rows and then all the rows, so that only the new
+            # rows are enqueued by the second write.
+            for end_idx, bar_timestamp_as_str in [
+                (3, "20220103_093300"),
+                (5, "20220103_093500"),
+            ]:
+                writer.write(
+                    0,
+                    "source",
+                    "predict",
+                    "df_out",
+                    bar_timestamp_as_str,
+                    bar_timestamp_as_str[:-2] + "02",
+                    df.iloc[:end_idx],
+                )
+            df.loc[:, "a"] = 0.0
+            can_write.set()
+            writer.close()
+        actual = dtfconiowr.load_node_output_from_dst_dir(
+            dst_dir, 0, "source", "predict"
+        )
+        self.assert_dfs_close(actual, expected)
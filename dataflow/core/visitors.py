@@ -7,7 +7,7 @@ import dataflow.core.visitors as dtfcorvisi
 import collections
 import copy
 import logging
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Union
 
 import dataflow.core.dag as dtfcordag
 import dataflow.core.node as dtfcornode
@@ -97,3 +97,49 @@ def set_fit_state(dag: dtfcordag.DAG, fit_state: NodeState) -> None:
         hdbg.dassert_in(nid, fit_state.keys())
         node_fit_state = copy.copy(fit_state[nid])
         node.set_fit_state(node_fit_state)
+
+
+# #############################################################################
+
+
+def set_incremental_predict_mode(
+    dag: dtfcordag.DAG,
+    warmup_length: Union[
+        Optional[int], Dict[dtfcornode.NodeId, Optional[int]]
+    ],
+    *,
+    verify: bool = False,
+    verify_atol: float = 1e-6,
+) -> None:
+    """
+    Set the incremental predict mode of the `Transformer` nodes of a DAG.
+
+    See `Transformer.set_incremental_predict_mode()` for the params.
+
+    :param dag: dataflow DAG
+    :param warmup_length: warm-up length for all the `Transformer` nodes or a
+        dict from nid to the warm-up length of that node, since it depends on
+        the function computed by the node (e.g., the window of a rolling
+        function). With a dict, the other nodes are left unchanged
+    """
+    hdbg.dassert_isinstance(dag, dtfcordag.DAG)
+    graph = dag.nx_dag
+    if isinstance(warmup_length, dict):
+        warmup_length_by_nid = warmup_length
+        for nid in warmup_length_by_nid.keys():
+            hdbg.dassert_isinstance(dag.get_node(nid), dtfconobas.Transformer)
+    else:
+        warmup_length_by_nid = {
+            nid: warmup_length
+            for nid in graph.nodes()
+            if isinstance(dag.get_node(nid), dtfconobas.Transformer)
+        }
+    # Scan the nodes.
+    for nid in graph.nodes():
+        if nid not in warmup_length_by_nid:
+            continue
+        _LOG.debug("Setting incremental predict mode for node '%s'", nid)
+        node = dag.get_node(nid)
+        node.set_incremental_predict_mode(
+            warmup_length_by_nid[nid], verify=verify, verify_atol=verify_atol
+        )
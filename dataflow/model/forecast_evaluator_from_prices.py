@@ -8,6 +8,7 @@ import logging
 import os
 from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
 import core.finance as cofinanc
@@ -332,6 +333,7 @@ class ForecastEvaluatorFromPrices:
         burn_in_days: int = 0,
         compute_extended_stats: bool = False,
         asset_id_to_share_decimals: Optional[Dict[int, int]] = None,
+        engine: str = "pandas",
         **kwargs,
     ) -> Dict[str, pd.DataFrame]:
         """
@@ -367,11 +369,20 @@ class ForecastEvaluatorFromPrices:
             value of `style`
         :param asset_id_to_share_decimals: same as in
             `core.finance.share_quantization.quantize_shares()`
+        :param engine: how to compute holdings, trades, PnL, and stats from the
+            target positions
+            - "pandas": on dataframes, using the `core.finance` functions
+            - "numpy": on 2D time x asset arrays sharing a single index, which
+              is faster and uses less memory on wide universes
+            The results are the same
         :return: dictionary of portfolio dataframes, with keys
             ["holdings_shares", "holdings_notional", "executed_trades_shares",
              "executed_trades_notional", "pnl", "stats"]
         """
-        _LOG.debug("df=\n%s", hpandas.df_to_str(df, print_shape_info=True))
+        if _LOG.isEnabledFor(logging.DEBUG):
+            # Formatting a wide dataframe is expensive, so do it only if it is
+            # logged.
+            _LOG.debug("df=\n%s", hpandas.df_to_str(df, print_shape_info=True))
         self._validate_df(df)
         # Record index in case we reindex the results.
         if reindex_like_input:
@@ -386,9 +397,29 @@ class ForecastEvaluatorFromPrices:
             style,
             **kwargs,
         )
-        # Compute holdings (in shares).
         # TODO(Paul): Expose these two parameters.
         ffill_limit = 4
+        if engine == "numpy":
+            derived_dfs = self._compute_derived_dfs_from_arrays(
+                df,
+                target_holdings_notional,
+                quantization,
+                liquidate_at_end_of_day,
+                initialize_beginning_of_day_trades_to_zero,
+                adjust_for_splits,
+                ffill_limit,
+                asset_id_to_share_decimals,
+                compute_extended_stats,
+            )
+            return self._apply_burn_in_and_reindex(
+                df,
+                derived_dfs,
+                burn_in_bars,
+                burn_in_days,
+                idx,
+            )
+        hdbg.dassert_eq(engine, "pandas")
+        # Compute holdings (in shares).
         holdings_shares = self._compute_holdings_shares(
             df,
             target_holdings_notional,
@@ -623,7 +654,8 @@ class ForecastEvaluatorFromPrices:
         )
         df = df.loc[first_valid_index:]
         _LOG.debug("df.shape=%s", str(df.shape))
-        _LOG.debug("trimmed df=\n%s", hpandas.df_to_str(df))
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug("trimmed df=\n%s", hpandas.df_to_str(df))
         return df
 
     def _compute_target_holdings_notional(
@@ -645,11 +677,12 @@ class ForecastEvaluatorFromPrices:
         prediction_df = ForecastEvaluatorFromPrices._get_df(
             df, self._prediction_col
         )
-        _LOG.debug("prediction_df=\n%s", hpandas.df_to_str(prediction_df))
         volatility_df = ForecastEvaluatorFromPrices._get_df(
             df, self._volatility_col
         )
-        _LOG.debug("volatility_df=\n%s", hpandas.df_to_str(volatility_df))
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug("prediction_df=\n%s", hpandas.df_to_str(prediction_df))
+            _LOG.debug("volatility_df=\n%s", hpandas.df_to_str(volatility_df))
         spread_df = None
         if self._spread_col is not None:
             spread_df = ForecastEvaluatorFromPrices._get_df(df, self._spread_col)
@@ -766,10 +799,11 @@ class ForecastEvaluatorFromPrices:
         executed_trades_shares = holdings_shares.subtract(
             holdings_shares.shift(1), fill_value=0
         )
-        _LOG.debug(
-            "`executed_trades_shares pre-adjusted`=\n%s",
-            hpandas.df_to_str(executed_trades_shares),
-        )
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug(
+                "`executed_trades_shares pre-adjusted`=\n%s",
+                hpandas.df_to_str(executed_trades_shares),
+            )
         # In equity markets with corporate actions, the previous end-of-day
         # share counts may differ from the beginning-of-day share counts even
         # though no trades have taken place. This can be remedied by resetting
@@ -783,10 +817,11 @@ class ForecastEvaluatorFromPrices:
             )
             # Set overnight trades to zero.
             executed_trades_shares.loc[bod_timestamps["timestamp"]] *= 0
-        _LOG.debug(
-            "`executed_trades_shares adjusted`=\n%s",
-            hpandas.df_to_str(executed_trades_shares),
-        )
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug(
+                "`executed_trades_shares adjusted`=\n%s",
+                hpandas.df_to_str(executed_trades_shares),
+            )
         return executed_trades_shares
 
     def _compute_executed_trades_notional(
@@ -921,6 +956,156 @@ class ForecastEvaluatorFromPrices:
         )
         return stats
 
+    def _compute_derived_dfs_from_arrays(
+        self,
+        df: pd.DataFrame,
+        target_notional_positions: pd.DataFrame,
+        quantization: Optional[int],
+        liquidate_at_end_of_day: bool,
+        initialize_beginning_of_day_trades_to_zero: bool,
+        adjust_for_splits: bool,
+        ffill_limit: int,
+        asset_id_to_share_decimals: Optional[Dict[int, int]],
+        compute_extended_stats: bool,
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Compute the portfolio from the target positions using 2D arrays.
+
+        This is equivalent to calling `_compute_holdings_shares()`,
+        `_compute_executed_trades_shares()`,
+        `_compute_executed_trades_notional()`, `_compute_holdings_notional()`,
+        `_compute_pnl()`, and `_compute_stats()`, but all the quantities are
+        time x asset arrays sharing the index of `target_notional_positions`,
+        so that no intermediate dataframe is built.
+
+        :return: same as the dict in `compute_portfolio()`, before burn-in
+        """
+        index = target_notional_positions.index
+        columns = target_notional_positions.columns
+
+        def _get_values(col: str) -> np.ndarray:
+            values = ForecastEvaluatorFromPrices._get_df(df, col)
+            hpandas.dassert_axes_equal(values, target_notional_positions)
+            return values.to_numpy(dtype=np.float64)
+
+        price = _get_values(self._price_col)
+        # Find the first and last bar of each day.
+        day_start_rows, day_end_rows = _get_day_start_end_rows(index)
+        row_day_start_rows = _get_row_day_start_rows(index, day_start_rows)
+        # Compute target (next bar) holdings based on prices available at
+        # decision time.
+        target_holdings_shares = (
+            target_notional_positions.to_numpy(dtype=np.float64) / price
+        )
+        # Quantize holdings (e.g., nearest share).
+        if quantization is not None:
+            hdbg.dassert_isinstance(quantization, int)
+            hdbg.dassert(
+                asset_id_to_share_decimals is None,
+                "`asset_id_to_decimals` must be `None` when `quantization` is"
+                " passed",
+            )
+            target_holdings_shares = np.round(
+                target_holdings_shares, quantization
+            )
+        else:
+            hdbg.dassert_isinstance(asset_id_to_share_decimals, dict)
+            hdbg.dassert_is_subset(columns, asset_id_to_share_decimals.keys())
+            for j, asset_id in enumerate(columns):
+                target_holdings_shares[:, j] = np.round(
+                    target_holdings_shares[:, j],
+                    asset_id_to_share_decimals[asset_id],
+                )
+        # Convert from next-bar desired holdings to end-of-bar realized
+        # (assuming perfect fills) holdings and adjust them for end-of-day and
+        # splits.
+        holdings_shares = _shift(target_holdings_shares)
+        if liquidate_at_end_of_day:
+            holdings_shares[day_end_rows] = 0.0
+            # Multiply instead of assigning to keep the NaNs.
+            holdings_shares[day_start_rows] *= 0
+        elif adjust_for_splits:
+            # Splits are rare, so reuse the dataframe implementation.
+            holdings_shares = cofinanc.adjust_holdings_for_overnight(
+                pd.DataFrame(holdings_shares, index, columns),
+                pd.DataFrame(price, index, columns),
+                liquidate_at_end_of_day,
+                adjust_for_splits,
+                0,
+            ).to_numpy(dtype=np.float64)
+        if ffill_limit > 0:
+            holdings_shares = _ffill(
+                holdings_shares, ffill_limit, row_day_start_rows
+            )
+        # If buy/sell prices are available, adjust the holdings for
+        # underfills.
+        buy_price = None
+        sell_price = None
+        if self._buy_price_col is not None:
+            buy_price = _get_values(self._buy_price_col)
+            sell_price = _get_values(self._sell_price_col)
+            holdings_shares = _adjust_holdings_for_underfills(
+                holdings_shares, price, buy_price, sell_price, day_end_rows
+            )
+        # Compute trades as the difference in (share) holdings.
+        executed_trades_shares = _subtract_with_fill_value(
+            holdings_shares, _shift(holdings_shares)
+        )
+        if initialize_beginning_of_day_trades_to_zero:
+            # Set overnight trades to zero.
+            has_price = ~np.isnan(price).all(axis=1)
+            bod_rows, _ = _get_day_start_end_rows(index, has_price)
+            executed_trades_shares[bod_rows] *= 0
+        # Compute execution prices.
+        mark_to_market_price = _ffill(price, ffill_limit)
+        if self._buy_price_col is not None and self._sell_price_col is not None:
+            execution_price = _apply_execution_prices_to_trades(
+                index,
+                executed_trades_shares,
+                buy_price,
+                sell_price,
+                mark_to_market_price,
+            )
+        else:
+            execution_price = mark_to_market_price
+        executed_trades_notional = executed_trades_shares * _ffill(
+            execution_price, ffill_limit
+        )
+        # Compute notional positions and PnL.
+        holdings_notional = holdings_shares * price
+        pnl = _subtract_with_fill_value(
+            _subtract_with_fill_value(
+                holdings_notional, _shift(holdings_notional)
+            ),
+            executed_trades_notional,
+        )
+        # Compute statistics.
+        spread = None
+        if self._spread_col is not None:
+            spread = _get_values(self._spread_col)
+        stats = _compute_bar_metrics(
+            index,
+            holdings_notional,
+            executed_trades_notional,
+            pnl,
+            spread,
+            compute_extended_stats,
+        )
+        #
+        derived_dfs = {
+            "holdings_shares": pd.DataFrame(holdings_shares, index, columns),
+            "holdings_notional": pd.DataFrame(holdings_notional, index, columns),
+            "executed_trades_shares": pd.DataFrame(
+                executed_trades_shares, index, columns
+            ),
+            "executed_trades_notional": pd.DataFrame(
+                executed_trades_notional, index, columns
+            ),
+            "pnl": pd.DataFrame(pnl, index, columns),
+            "stats": stats,
+        }
+        return derived_dfs
+
     def _apply_burn_in_and_reindex(
         self,
         df: pd.DataFrame,
@@ -949,6 +1134,233 @@ class ForecastEvaluatorFromPrices:
         return derived_dfs
 
 
+# #############################################################################
+# Array-based computations
+# #############################################################################
+
+# The functions below mirror the dataframe-based functions in `core.finance`
+# on time x asset arrays, whose rows correspond to a strictly increasing
+# datetime index.
+
+
+def _shift(values: np.ndarray) -> np.ndarray:
+    """
+    Same as `df.shift(1)`.
+    """
+    shifted = np.empty_like(values)
+    shifted[:1] = np.nan
+    shifted[1:] = values[:-1]
+    return shifted
+
+
+def _subtract_with_fill_value(
+    values1: np.ndarray, values2: np.ndarray
+) -> np.ndarray:
+    """
+    Same as `df1.subtract(df2, fill_value=0)`.
+
+    A NaN is replaced by 0 unless it is in both arrays.
+    """
+    diff = np.nan_to_num(values1, nan=0.0) - np.nan_to_num(values2, nan=0.0)
+    diff[np.isnan(values1) & np.isnan(values2)] = np.nan
+    return diff
+
+
+def _ffill(
+    values: np.ndarray,
+    limit: int,
+    row_group_start_rows: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Same as `df.ffill(limit=limit)`.
+
+    :param row_group_start_rows: for each row, the position of the first row
+        of its group, to forward fill only within groups (e.g., same as
+        `df.groupby(lambda x: x.date()).ffill(limit=limit)`)
+        - `None` to forward fill across all the rows
+    """
+    num_rows, num_cols = values.shape
+    rows = np.arange(num_rows)[:, np.newaxis]
+    # Find the position of the last non-NaN value for each cell.
+    last_valid_rows = np.where(np.isnan(values), -1, rows)
+    np.maximum.accumulate(last_valid_rows, axis=0, out=last_valid_rows)
+    mask = (last_valid_rows >= 0) & (rows - last_valid_rows <= limit)
+    if row_group_start_rows is not None:
+        mask &= last_valid_rows >= row_group_start_rows[:, np.newaxis]
+    filled = values[np.maximum(last_valid_rows, 0), np.arange(num_cols)]
+    filled[~mask] = np.nan
+    return filled
+
+
+def _get_day_start_end_rows(
+    index: pd.DatetimeIndex, mask: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Get the positions of the first and last row of each day.
+
+    :param mask: consider only the rows where `mask` is true, e.g., the
+        "active" bars
+    :return: positions of the first rows, positions of the last rows
+    """
+    if mask is None:
+        rows = np.arange(len(index))
+    else:
+        rows = np.flatnonzero(mask)
+    if rows.size == 0:
+        return rows, rows
+    # Use the date in the timezone of the index, like `x.date()`.
+    dates = index[rows].normalize()
+    is_day_start = np.empty(rows.size, dtype=bool)
+    is_day_start[0] = True
+    is_day_start[1:] = dates[1:] != dates[:-1]
+    is_day_end = np.empty(rows.size, dtype=bool)
+    is_day_end[:-1] = is_day_start[1:]
+    is_day_end[-1] = True
+    return rows[is_day_start], rows[is_day_end]
+
+
+def _get_row_day_start_rows(
+    index: pd.DatetimeIndex, day_start_rows: np.ndarray
+) -> np.ndarray:
+    """
+    Get for each row the position of the first row of its day.
+    """
+    day_ids = np.zeros(len(index), dtype=np.int64)
+    day_ids[day_start_rows[1:]] = 1
+    np.cumsum(day_ids, out=day_ids)
+    return day_start_rows[day_ids]
+
+
+def _adjust_holdings_for_underfills(
+    holdings: np.ndarray,
+    mark_to_market_price: np.ndarray,
+    buy_price: np.ndarray,
+    sell_price: np.ndarray,
+    day_end_rows: np.ndarray,
+) -> np.ndarray:
+    """
+    Same as `cofinanc.adjust_holdings_for_underfills()`.
+    """
+    # Use mark to market price at close.
+    ffill_limit = 2
+    prices = _ffill(mark_to_market_price, ffill_limit)
+    buy_price = buy_price.copy()
+    buy_price[day_end_rows] = prices[day_end_rows]
+    sell_price = sell_price.copy()
+    sell_price[day_end_rows] = prices[day_end_rows]
+    no_buy_price = np.isnan(buy_price)
+    no_sell_price = np.isnan(sell_price)
+    adjusted_holdings = holdings.copy()
+    iteration_count = 1
+    while True:
+        _LOG.debug("Underfill adjustment iteration cycle=%d", iteration_count)
+        # If we want to buy but no buy price is available, or we want to
+        # sell and no sell price is available, then hold.
+        diff = adjusted_holdings - _shift(adjusted_holdings)
+        force_hold = ((diff > 0) & no_buy_price) | ((diff < 0) & no_sell_price)
+        if not force_hold.any():
+            _LOG.info(
+                "Performed %d iterations of underfill adjustments",
+                iteration_count - 1,
+            )
+            break
+        adjusted_holdings[force_hold] = np.nan
+        adjusted_holdings = _ffill(adjusted_holdings, 1)
+        adjusted_holdings = np.where(
+            np.isnan(adjusted_holdings), holdings, adjusted_holdings
+        )
+        iteration_count += 1
+        hdbg.dassert_lt(
+            iteration_count,
+            100,
+            "Exceeded underfill adjustment iteration limit",
+        )
+    return adjusted_holdings
+
+
+def _apply_execution_prices_to_trades(
+    index: pd.DatetimeIndex,
+    trades: np.ndarray,
+    buy_price: np.ndarray,
+    sell_price: np.ndarray,
+    mark_to_market_price: np.ndarray,
+) -> np.ndarray:
+    """
+    Same as `cofinanc.apply_execution_prices_to_trades()` after marking the
+    buy / sell prices to market in the last bar of each day.
+    """
+    # Market in last bar.
+    execution_prices = []
+    for price in [buy_price, sell_price]:
+        has_price = ~np.isnan(price).all(axis=1)
+        _, day_end_rows = _get_day_start_end_rows(index, has_price)
+        price = price.copy()
+        price[day_end_rows] = mark_to_market_price[day_end_rows]
+        execution_prices.append(price)
+    buy_price, sell_price = execution_prices
+    # Ensure all buys and sells may be filled.
+    is_buy = trades > 0
+    is_sell = trades < 0
+    hdbg.dassert(
+        not (is_buy & np.isnan(buy_price)).any(),
+        "Some buys have no buy price",
+    )
+    hdbg.dassert(
+        not (is_sell & np.isnan(sell_price)).any(),
+        "Some sells have no sell price",
+    )
+    # Splice buy and sell prices.
+    execution_price = np.full_like(trades, np.nan)
+    execution_price[is_buy] = buy_price[is_buy]
+    execution_price[is_sell] = sell_price[is_sell]
+    return execution_price
+
+
+def _sum_with_min_count(values: np.ndarray) -> np.ndarray:
+    """
+    Same as `df.sum(axis=1, min_count=1)`.
+    """
+    total = np.nansum(values, axis=1)
+    total[np.isnan(values).all(axis=1)] = np.nan
+    return total
+
+
+def _compute_bar_metrics(
+    index: pd.DatetimeIndex,
+    holdings_notional: np.ndarray,
+    executed_trades_notional: np.ndarray,
+    pnl: np.ndarray,
+    spread: Optional[np.ndarray],
+    compute_extended_stats: bool,
+) -> pd.DataFrame:
+    """
+    Same as `cofinanc.compute_bar_metrics()`.
+    """
+    stats_dict = collections.OrderedDict(
+        {
+            "pnl": _sum_with_min_count(pnl),
+            "gross_volume": _sum_with_min_count(
+                np.abs(executed_trades_notional)
+            ),
+            "net_volume": _sum_with_min_count(executed_trades_notional),
+            "gmv": _sum_with_min_count(np.abs(holdings_notional)),
+            "nmv": _sum_with_min_count(holdings_notional),
+        }
+    )
+    if compute_extended_stats:
+        stats_dict["gpc"] = _sum_with_min_count(
+            np.abs(np.sign(holdings_notional))
+        )
+        stats_dict["npc"] = _sum_with_min_count(np.sign(holdings_notional))
+        stats_dict["wnl"] = _sum_with_min_count(np.sign(pnl))
+        if spread is not None:
+            stats_dict["tc"] = 0.5 * _sum_with_min_count(
+                np.abs(executed_trades_notional) * spread
+            )
+    stats = pd.DataFrame(stats_dict, index=index)
+    return stats
+
+
 # #############################################################################
 
 
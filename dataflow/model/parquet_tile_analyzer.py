@@ -23,8 +23,15 @@ class ParquetTileAnalyzer:
     @staticmethod
     def collate_parquet_tile_metadata(
         path: str,
+        *,
+        use_tile_index: bool = False,
     ) -> pd.DataFrame:
-        return hparque.collate_parquet_tile_metadata(path)
+        """
+        See `hparque.collate_parquet_tile_metadata()` for params.
+        """
+        return hparque.collate_parquet_tile_metadata(
+            path, use_tile_index=use_tile_index
+        )
 
     @staticmethod
     def compute_metadata_stats_by_asset_id(
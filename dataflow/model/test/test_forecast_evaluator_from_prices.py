@@ -553,3 +553,130 @@ class TestForecastEvaluatorFromPrices1(hunitest.TestCase):
 2022-01-03 09:55:00-05:00    -278.06      9.64e+05  -200690.59  1.00e+06 -236802.17
 2022-01-03 10:00:00-05:00    1385.12      1.21e+05  -120770.11  9.98e+05 -356187.17"""
         self.assert_equal(stats_df_str, expected_stats_df_str, fuzzy_match=True)
+
+    def test_engines_match_3_assets(self) -> None:
+        """
+        Check that the "numpy" and "pandas" engines compute the same portfolio.
+        """
+        data = self._get_data_with_execution_prices()
+        kwargs = {
+            "target_gmv": 1e5,
+            "quantization": 0,
+            "liquidate_at_end_of_day": True,
+            "burn_in_bars": 0,
+            "compute_extended_stats": True,
+        }
+        self._check_engines_match(data, **kwargs)
+
+    def test_engines_match_overnight_holdings(self) -> None:
+        """
+        Check that the engines match holding overnight and forward-filling
+        the holdings across missing prices.
+        """
+        data = self._get_data_with_execution_prices()
+        # Remove some prices, including at the beginning of the days.
+        data.loc[data.index[[0, 5, 6, 78, 80, 81]], ("price", 101)] = np.nan
+        kwargs = {
+            "target_gmv": 1e5,
+            "quantization": 0,
+            "liquidate_at_end_of_day": False,
+            "burn_in_bars": 0,
+            "compute_extended_stats": True,
+        }
+        self._check_engines_match(data, **kwargs)
+
+    def test_engines_match_trades_at_beginning_of_day(self) -> None:
+        """
+        Check that the engines match keeping the overnight trades.
+        """
+        data = self._get_data_with_execution_prices()
+        kwargs = {
+            "target_gmv": 1e5,
+            "quantization": 0,
+            "liquidate_at_end_of_day": False,
+            "initialize_beginning_of_day_trades_to_zero": False,
+            "burn_in_bars": 0,
+        }
+        self._check_engines_match(data, **kwargs)
+
+    def test_engines_match_adjust_for_splits(self) -> None:
+        """
+        Check that the engines match adjusting the overnight holdings for
+        splits.
+        """
+        data = self._get_data_with_execution_prices()
+        # Split the shares of an asset 2:1 on the second day.
+        is_after_split = data.index.date >= data.index[-1].date()
+        for col in ["price", "buy_price", "sell_price"]:
+            data.loc[is_after_split, (col, 201)] /= 2
+        kwargs = {
+            "target_gmv": 1e5,
+            "quantization": 0,
+            "liquidate_at_end_of_day": False,
+            "adjust_for_splits": True,
+            "burn_in_bars": 0,
+        }
+        self._check_engines_match(data, **kwargs)
+
+    def test_engines_match_share_decimals(self) -> None:
+        """
+        Check that the engines match quantizing to asset-specific decimals.
+        """
+        data = self._get_data_with_execution_prices()
+        kwargs = {
+            "target_gmv": 1e5,
+            "quantization": None,
+            "asset_id_to_share_decimals": {101: 0, 201: 1, 301: 3},
+            "liquidate_at_end_of_day": True,
+            "burn_in_bars": 0,
+        }
+        self._check_engines_match(data, **kwargs)
+
+    def _get_data_with_execution_prices(self) -> pd.DataFrame:
+        """
+        Get data for 3 assets over 3 days with spreads and execution prices.
+        """
+        data = self.get_data(
+            pd.Timestamp("2022-01-03 09:30:00", tz="America/New_York"),
+            pd.Timestamp("2022-01-05 16:00:00", tz="America/New_York"),
+            asset_ids=[101, 201, 301],
+        )
+        # Add spreads and execution prices with some missing values.
+        price = data["price"]
+        buy_price = price * 1.0005
+        buy_price.iloc[::7, 0] = np.nan
+        sell_price = price * 0.9995
+        sell_price.iloc[3::11, 1] = np.nan
+        data = pd.concat(
+            {
+                "price": price,
+                "volatility": data["volatility"],
+                "prediction": data["prediction"],
+                "spread": price * 0.001,
+                "buy_price": buy_price,
+                "sell_price": sell_price,
+            },
+            axis=1,
+        )
+        return data
+
+    def _check_engines_match(self, data: pd.DataFrame, **kwargs) -> None:
+        """
+        Check that the "numpy" and "pandas" engines compute the same portfolio.
+        """
+        forecast_evaluator = dtfmfefrpr.ForecastEvaluatorFromPrices(
+            price_col="price",
+            volatility_col="volatility",
+            prediction_col="prediction",
+            spread_col="spread",
+            buy_price_col="buy_price",
+            sell_price_col="sell_price",
+        )
+        portfolio_df1, stats_df1 = forecast_evaluator.annotate_forecasts(
+            data, engine="pandas", **kwargs
+        )
+        portfolio_df2, stats_df2 = forecast_evaluator.annotate_forecasts(
+            data, engine="numpy", **kwargs
+        )
+        hunitest.compare_df(portfolio_df1, portfolio_df2)
+        hunitest.compare_df(stats_df1, stats_df2)
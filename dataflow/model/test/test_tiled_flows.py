@@ -1,9 +1,10 @@
 import datetime
 import logging
 import os
-from typing import Any, Optional
+from typing import Any, Dict, Optional
 import pytest
 
+import numpy as np
 import pandas as pd
 
 import core.config as cconfig
@@ -266,3 +267,188 @@ end_ts
         actual = hpandas.df_to_str(bar_metrics, num_rows=None, precision=2)
         expected = exp
         self.assert_equal(actual, expected, fuzzy_match=True)
+
+
+class Test_annotate_forecasts_by_tile_in_parallel(hunitest.TestCase):
+    """
+    Test evaluating tiles in parallel and by asset batches.
+    """
+
+    def test_num_processes1(self) -> None:
+        """
+        Evaluate the yearly tiles in parallel.
+        """
+        dir_name = self._get_tiled_data()
+        kwargs = {"num_processes": 2}
+        self._check_against_sequential(dir_name, kwargs)
+
+    def test_asset_batch_size1(self) -> None:
+        """
+        Evaluate the yearly tiles in batches of assets in parallel.
+        """
+        dir_name = self._get_tiled_data()
+        kwargs = {"num_processes": 2, "asset_batch_size": 2}
+        self._check_against_sequential(dir_name, kwargs)
+
+    def test_asset_batch_size2(self) -> None:
+        """
+        Evaluate in batches of assets with burn-in and staggered asset starts.
+        """
+        dir_name = self._get_tiled_data(stagger_asset_starts=True)
+        annotate_forecasts_kwargs = {"burn_in_bars": 5, "burn_in_days": 1}
+        expected_portfolio_df, expected_bar_metrics = self._run(
+            dir_name, annotate_forecasts_kwargs=annotate_forecasts_kwargs
+        )
+        portfolio_df, bar_metrics = self._run(
+            dir_name,
+            annotate_forecasts_kwargs=annotate_forecasts_kwargs,
+            asset_batch_size=2,
+        )
+        hunitest.compare_df(portfolio_df, expected_portfolio_df)
+        self._check_bar_metrics(bar_metrics, expected_bar_metrics)
+
+    def test_asset_batch_size3(self) -> None:
+        """
+        Evaluate in batches of assets with burn-in and non-default column
+        names.
+        """
+        col_names = {
+            "price": "close",
+            "volatility": "close.ret_0.vol",
+            "prediction": "feature1",
+        }
+        dir_name = self._get_tiled_data(
+            stagger_asset_starts=True, col_names=col_names
+        )
+        annotate_forecasts_kwargs = {"burn_in_bars": 5, "burn_in_days": 1}
+        expected_portfolio_df, expected_bar_metrics = self._run(
+            dir_name,
+            annotate_forecasts_kwargs=annotate_forecasts_kwargs,
+            col_names=col_names,
+        )
+        portfolio_df, bar_metrics = self._run(
+            dir_name,
+            annotate_forecasts_kwargs=annotate_forecasts_kwargs,
+            col_names=col_names,
+            asset_batch_size=2,
+        )
+        hunitest.compare_df(portfolio_df, expected_portfolio_df)
+        self._check_bar_metrics(bar_metrics, expected_bar_metrics)
+
+    def test_portfolio_dir1(self) -> None:
+        """
+        Write the portfolio of the tiles to Parquet.
+        """
+        dir_name = self._get_tiled_data()
+        portfolio_dir = os.path.join(self.get_scratch_space(), "portfolio")
+        expected_portfolio_df, expected_bar_metrics = self._run(dir_name)
+        portfolio_df, bar_metrics = self._run(
+            dir_name,
+            return_portfolio_df=False,
+            num_processes=2,
+            asset_batch_size=2,
+            portfolio_dir=portfolio_dir,
+        )
+        self.assertIsNone(portfolio_df)
+        self._check_bar_metrics(bar_metrics, expected_bar_metrics)
+        # Read back the portfolio.
+        data_cols = ["holdings_shares", "pnl"]
+        portfolio_df = pd.concat(
+            dtfmotiflo.yield_processed_parquet_tiles_by_year(
+                portfolio_dir,
+                datetime.date(2021, 12, 1),
+                datetime.date(2022, 1, 31),
+                "asset_id",
+                data_cols,
+            )
+        )
+        portfolio_df = portfolio_df.dropna(how="all")
+        expected_portfolio_df = expected_portfolio_df[data_cols].dropna(
+            how="all"
+        )
+        hunitest.compare_df(portfolio_df, expected_portfolio_df)
+
+    def _get_tiled_data(
+        self,
+        *,
+        stagger_asset_starts: bool = False,
+        col_names: Optional[Dict[str, str]] = None,
+    ) -> str:
+        """
+        Save data spanning two years in the tiled backtest format.
+
+        :param stagger_asset_starts: start the data of the assets of the
+            second batch later than the ones of the first batch
+        :param col_names: map from the default name of the price, volatility
+            and prediction columns to the name to save them with
+        """
+        df = cfidaexa.get_forecast_price_based_dataframe(
+            pd.Timestamp("2021-12-20 09:30:00", tz="America/New_York"),
+            pd.Timestamp("2022-01-10 16:00:00", tz="America/New_York"),
+            [100, 200, 300, 400],
+            bar_duration="30T",
+            seed=10,
+        )
+        if stagger_asset_starts:
+            start_timestamps = {
+                300: pd.Timestamp("2021-12-22 12:00:00", tz="America/New_York"),
+                400: pd.Timestamp("2022-01-04 11:00:00", tz="America/New_York"),
+            }
+            for asset_id, start_timestamp in start_timestamps.items():
+                df.loc[df.index < start_timestamp, (slice(None), asset_id)] = (
+                    np.nan
+                )
+        if col_names is not None:
+            df = df.rename(columns=col_names, level=0)
+        df = Test_evaluate_weighted_forecasts.convert_to_parquet_format(df)
+        dir_name = os.path.join(self.get_scratch_space(), "tiled_results")
+        hparque.to_partitioned_parquet(
+            df, ["asset_id", "year", "month"], dst_dir=dir_name
+        )
+        return dir_name
+
+    def _run(
+        self,
+        dir_name: str,
+        *,
+        annotate_forecasts_kwargs: Optional[Dict[str, Any]] = None,
+        col_names: Optional[Dict[str, str]] = None,
+        **kwargs: Any,
+    ) -> Any:
+        annotate_forecasts_kwargs = {
+            "style": "longitudinal",
+            "quantization": 0,
+            "liquidate_at_end_of_day": False,
+            "burn_in_bars": 0,
+            "compute_extended_stats": True,
+            "target_dollar_risk_per_name": 1e2,
+            **(annotate_forecasts_kwargs or {}),
+        }
+        col_names = col_names or {}
+        return dtfmotiflo.annotate_forecasts_by_tile(
+            dir_name,
+            datetime.date(2021, 12, 1),
+            datetime.date(2022, 1, 31),
+            "asset_id",
+            col_names.get("price", "price"),
+            col_names.get("volatility", "volatility"),
+            col_names.get("prediction", "prediction"),
+            annotate_forecasts_kwargs=annotate_forecasts_kwargs,
+            **kwargs,
+        )
+
+    def _check_against_sequential(
+        self, dir_name: str, kwargs: Dict[str, Any]
+    ) -> None:
+        expected_portfolio_df, expected_bar_metrics = self._run(dir_name)
+        portfolio_df, bar_metrics = self._run(dir_name, **kwargs)
+        hunitest.compare_df(portfolio_df, expected_portfolio_df)
+        self._check_bar_metrics(bar_metrics, expected_bar_metrics)
+
+    def _check_bar_metrics(
+        self, bar_metrics: pd.DataFrame, expected_bar_metrics: pd.DataFrame
+    ) -> None:
+        # The metrics of the asset batches are summed in a different order.
+        pd.testing.assert_frame_equal(
+            bar_metrics, expected_bar_metrics, check_exact=False, rtol=1e-9
+        )
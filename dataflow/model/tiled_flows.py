@@ -4,14 +4,19 @@ Import as:
 import dataflow.model.tiled_flows as dtfmotiflo
 """
 
+import collections
+import concurrent.futures
 import datetime
+import functools
+import inspect
 import logging
 
+import numpy as np
 import pandas as pd
 
 _LOG = logging.getLogger(__name__)
 
-from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 from tqdm.autonotebook import tqdm
 
@@ -151,10 +156,22 @@ def annotate_forecasts_by_tile(
     return_portfolio_df: bool = True,
     forecast_evaluator: Any = dtfmfefrpr.ForecastEvaluatorFromPrices,
     optimizer_config_dict: Optional[dict] = None,
+    num_processes: int = 1,
+    asset_batch_size: Optional[int] = None,
+    max_tiles_in_flight: Optional[int] = None,
+    portfolio_dir: Optional[str] = None,
 ) -> Tuple[Optional[pd.DataFrame], pd.DataFrame]:
     """
     Combine yearly tiled loading with forecast evaluation.
 
+    The time interval is split in tiles of up to one year and, if
+    `asset_batch_size` is not `None`, each yearly tile is further split in
+    batches of assets. Tiles are evaluated independently, possibly in
+    parallel, and the bar metrics of the asset batches of a year are summed.
+    The burn-in (i.e., `burn_in_bars` and `burn_in_days` of
+    `compute_portfolio()`) is applied once to the merged results of a year, so
+    that the results are the same as without batching.
+
     :param dir_name: as in `yield_processed_parquet_tiles_by_year()`
     :param start_date: as in `yield_processed_parquet_tiles_by_year()`
     :param end_date: as in `yield_processed_parquet_tiles_by_year()`
@@ -170,45 +187,145 @@ def annotate_forecasts_by_tile(
     :param forecast_evaluator: a forecast evaluator object.
     :param optimizer_config_dict: optional configuration dictionary. If
      not None, forecast with optimization.
+    :param num_processes: number of processes used to evaluate the tiles in
+        parallel
+    :param asset_batch_size: if not `None`, evaluate the assets in batches of
+        this size; this is supported only when the target positions of an
+        asset do not depend on the other assets (i.e., "longitudinal" style
+        without an optimizer)
+    :param max_tiles_in_flight: max number of tiles submitted to the
+        processes and not consumed yet, which bounds the memory used; if
+        `None`, use twice the number of processes
+    :param portfolio_dir: if not `None`, write the portfolio of each tile to
+        this dir as tiled Parquet data (readable with
+        `yield_processed_parquet_tiles_by_year()`) instead of returning it;
+        it requires `return_portfolio_df=False` and, with `asset_batch_size`,
+        no burn-in
     :return: (portfolio_df, bar_metrics), unless `return_portfolio_df=False`,
         in which case the first element of the tuple is `None`.
     """
-    # Create backtest dataframe tile iterator.
-    data_cols = [price_col, volatility_col, prediction_col]
-    backtest_df_iter = yield_processed_parquet_tiles_by_year(
-        dir_name,
-        start_date,
-        end_date,
-        asset_id_col,
-        data_cols=data_cols,
-        asset_ids=asset_ids,
-    )
-    args = [
-        price_col,
-        volatility_col,
-        prediction_col,
-    ]
-    if optimizer_config_dict is not None:
-        args.append(optimizer_config_dict)
-    fepo = forecast_evaluator(*args)
-    # Process the dataframes in the interator.
-    bar_metrics = []
-    portfolio_df = []
-    for df in backtest_df_iter:
-        portfolio_df_slice, bar_metrics_slice = fepo.annotate_forecasts(
-            df,
+    if portfolio_dir is not None:
+        hdbg.dassert(
+            not return_portfolio_df,
+            "The portfolio is written to `portfolio_dir` and not returned",
+        )
+    # Build the tiles.
+    burn_in_bars = burn_in_days = 0
+    if asset_batch_size is None:
+        asset_id_batches = [asset_ids]
+    else:
+        hdbg.dassert_lt(0, asset_batch_size)
+        style = annotate_forecasts_kwargs.get("style", "cross_sectional")
+        hdbg.dassert_eq(
+            style,
+            "longitudinal",
+            "Batching assets requires target positions computed asset by asset",
+        )
+        hdbg.dassert_is(
+            optimizer_config_dict,
+            None,
+            "Batching assets is not supported with an optimizer",
+        )
+        # The burn-in depends on the index of all the assets, so the batches
+        # are evaluated without burn-in, which is applied after merging them.
+        burn_in_bars, burn_in_days = _get_burn_in(
+            forecast_evaluator, annotate_forecasts_kwargs
+        )
+        if burn_in_bars > 0 or burn_in_days > 0:
+            hdbg.dassert(
+                not annotate_forecasts_kwargs.get("reindex_like_input", False),
+                "Batching assets with burn-in requires `reindex_like_input=False`",
+            )
+            hdbg.dassert_is(
+                portfolio_dir,
+                None,
+                "Batching assets with burn-in is not supported with "
+                "`portfolio_dir`",
+            )
+        annotate_forecasts_kwargs = {
             **annotate_forecasts_kwargs,
+            "burn_in_bars": 0,
+            "burn_in_days": 0,
+        }
+        if asset_ids is None:
+            parquet_tile_analyzer = dtfmpatian.ParquetTileAnalyzer()
+            parquet_tile_metadata = (
+                parquet_tile_analyzer.collate_parquet_tile_metadata(dir_name)
+            )
+            asset_ids = parquet_tile_metadata.index.levels[0].to_list()
+        asset_ids = sorted(asset_ids)
+        asset_id_batches = [
+            asset_ids[i : i + asset_batch_size]
+            for i in range(0, len(asset_ids), asset_batch_size)
+        ]
+    tiles = [
+        (tile_start_date, tile_end_date, asset_id_batch)
+        for tile_start_date, tile_end_date in _get_yearly_tiles(
+            start_date, end_date
+        )
+        for asset_id_batch in asset_id_batches
+    ]
+    _LOG.debug("Num tiles=%d", len(tiles))
+    func = functools.partial(
+        _annotate_forecasts_for_tile,
+        dir_name=dir_name,
+        asset_id_col=asset_id_col,
+        price_col=price_col,
+        volatility_col=volatility_col,
+        prediction_col=prediction_col,
+        annotate_forecasts_kwargs=annotate_forecasts_kwargs,
+        return_portfolio_df=return_portfolio_df,
+        forecast_evaluator=forecast_evaluator,
+        optimizer_config_dict=optimizer_config_dict,
+        portfolio_dir=portfolio_dir,
+    )
+    tile_results = _yield_tile_results(
+        func, tiles, num_processes, max_tiles_in_flight
+    )
+    # Merge the results of the tiles, which are ordered by year and then by
+    # asset batch.
+    bar_metrics_by_year: Dict[datetime.date, pd.DataFrame] = {}
+    portfolio_dfs_by_year: Dict[datetime.date, List[pd.DataFrame]] = {}
+    for tile, (portfolio_df_slice, bar_metrics_slice) in zip(
+        tiles, tile_results
+    ):
+        tile_start_date = tile[0]
+        bar_metrics_by_year[tile_start_date] = _merge_bar_metrics(
+            bar_metrics_by_year.get(tile_start_date), bar_metrics_slice
         )
-        bar_metrics.append(bar_metrics_slice)
         if return_portfolio_df:
-            portfolio_df.append(portfolio_df_slice)
-        else:
-            _ = portfolio_df_slice
+            portfolio_dfs_by_year.setdefault(tile_start_date, []).append(
+                portfolio_df_slice
+            )
+    portfolio_df_by_year: Dict[datetime.date, Optional[pd.DataFrame]] = {
+        tile_start_date: None for tile_start_date in bar_metrics_by_year
+    }
+    if return_portfolio_df:
+        for tile_start_date, portfolio_dfs in portfolio_dfs_by_year.items():
+            portfolio_df_by_year[tile_start_date] = _concat_asset_batches(
+                portfolio_dfs
+            )
+    if burn_in_bars > 0 or burn_in_days > 0:
+        # The portfolio stores the input columns passed to the forecast
+        # evaluator under the name of their role (e.g., `price_col` under
+        # "price"), whatever their name in the tiles.
+        input_cols = ["price", "volatility", "prediction"]
+        for tile_start_date in bar_metrics_by_year:
+            (
+                portfolio_df_by_year[tile_start_date],
+                bar_metrics_by_year[tile_start_date],
+            ) = _apply_burn_in_to_merged_tile(
+                portfolio_df_by_year[tile_start_date],
+                bar_metrics_by_year[tile_start_date],
+                burn_in_bars,
+                burn_in_days,
+                input_cols,
+            )
     if return_portfolio_df:
-        portfolio_df = pd.concat(portfolio_df)
+        portfolio_df = pd.concat(portfolio_df_by_year.values())
     else:
         portfolio_df = None
-    bar_metrics = pd.concat(bar_metrics)
+    bar_metrics = pd.concat(bar_metrics_by_year.values())
     return portfolio_df, bar_metrics
 
 
@@ -225,6 +342,8 @@ def evaluate_weighted_forecasts(
     target_freq_str: Optional[str] = None,
     preapply_gaussian_ranking: bool = False,
     index_mode: str = "assert_equal",
+    num_processes: int = 1,
+    max_tiles_in_flight: Optional[int] = None,
 ) -> pd.DataFrame:
     """
     Mix forecasts with weights and evaluate the portfolio.
@@ -262,17 +381,11 @@ def evaluate_weighted_forecasts(
         Gaussian ranking. May be useful if predictions are on different
         scales.
     :param index_mode: same as `mode` in `apply_index_mode()`
+    :param num_processes: number of processes used to evaluate the yearly
+        tiles in parallel
+    :param max_tiles_in_flight: as in `annotate_forecasts_by_tile()`
     :return: bar metrics dataframe
     """
-    forecast_evaluator = dtfmfefrpr.ForecastEvaluatorFromPrices(
-        "price",
-        "volatility",
-        "prediction",
-    )
-    pred_dict_iter = yield_processed_parquet_tile_dict(
-        simulations, start_date, end_date, asset_id_col, asset_ids=asset_ids
-    )
-    #
     hdbg.dassert_isinstance(market_data_and_volatility, pd.DataFrame)
     hdbg.dassert_is_subset(
         ["dir_name", "col"], market_data_and_volatility.columns
@@ -286,80 +399,362 @@ def evaluate_weighted_forecasts(
     #
     if target_freq_str is not None:
         hdbg.dassert_isinstance(target_freq_str, str)
-    # Create volatility time slice iterator.
+    tiles = _get_yearly_tiles(start_date, end_date)
+    func = functools.partial(
+        _evaluate_weighted_forecasts_for_tile,
+        simulations=simulations,
+        weights=weights,
+        market_data_and_volatility=market_data_and_volatility,
+        asset_id_col=asset_id_col,
+        asset_ids=asset_ids,
+        annotate_forecasts_kwargs=annotate_forecasts_kwargs,
+        target_freq_str=target_freq_str,
+        preapply_gaussian_ranking=preapply_gaussian_ranking,
+        index_mode=index_mode,
+    )
+    bar_metrics = list(
+        _yield_tile_results(func, tiles, num_processes, max_tiles_in_flight)
+    )
+    bar_metrics = pd.concat(bar_metrics)
+    return bar_metrics
+
+
+def _get_yearly_tiles(
+    start_date: datetime.date,
+    end_date: datetime.date,
+) -> List[Tuple[datetime.date, datetime.date]]:
+    """
+    Split `[start_date, end_date]` in intervals of up to one calendar year.
+    """
+    hdbg.dassert_isinstance(start_date, datetime.date)
+    hdbg.dassert_isinstance(end_date, datetime.date)
+    hdbg.dassert_lte(start_date, end_date)
+    tiles = []
+    for year in range(start_date.year, end_date.year + 1):
+        tile_start_date = max(start_date, datetime.date(year, 1, 1))
+        tile_end_date = min(end_date, datetime.date(year, 12, 31))
+        tiles.append((tile_start_date, tile_end_date))
+    return tiles
+
+
+def _yield_tile_results(
+    func: Callable,
+    tiles: List[Any],
+    num_processes: int,
+    max_tiles_in_flight: Optional[int],
+) -> Iterator[Any]:
+    """
+    Apply `func` to each tile, possibly in parallel, yielding results in order.
+
+    :param func: function to apply to a tile; it needs to be picklable when
+        `num_processes > 1`
+    :param tiles: tiles to process
+    :param num_processes: number of processes
+    :param max_tiles_in_flight: max number of tiles submitted and not yielded
+        yet; if `None`, use twice the number of processes
+    """
+    hdbg.dassert_lte(1, num_processes)
+    if num_processes == 1:
+        for tile in tqdm(tiles):
+            yield func(tile)
+        return
+    if max_tiles_in_flight is None:
+        max_tiles_in_flight = 2 * num_processes
+    hdbg.dassert_lte(num_processes, max_tiles_in_flight)
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=num_processes
+    ) as executor, tqdm(total=len(tiles)) as progress_bar:
+        futures: collections.deque = collections.deque()
+        for tile in tiles:
+            # Wait for the oldest tile before submitting a new one, so that
+            # the results are not accumulated if the consumer is slower than
+            # the processes.
+            if len(futures) == max_tiles_in_flight:
+                yield futures.popleft().result()
+                progress_bar.update()
+            futures.append(executor.submit(func, tile))
+        while futures:
+            yield futures.popleft().result()
+            progress_bar.update()
+
+
+def _annotate_forecasts_for_tile(
+    tile: Tuple[datetime.date, datetime.date, Optional[List[int]]],
+    *,
+    dir_name: str,
+    asset_id_col: str,
+    price_col: str,
+    volatility_col: str,
+    prediction_col: str,
+    annotate_forecasts_kwargs: Dict[str, Any],
+    return_portfolio_df: bool,
+    forecast_evaluator: Any,
+    optimizer_config_dict: Optional[dict],
+    portfolio_dir: Optional[str],
+) -> Tuple[Optional[pd.DataFrame], pd.DataFrame]:
+    """
+    Load and evaluate the forecasts of a tile.
+
+    :param tile: start date, end date, and asset ids of the tile
+    :return: (portfolio_df, bar_metrics) as in `annotate_forecasts_by_tile()`
+    """
+    tile_start_date, tile_end_date, asset_ids = tile
+    data_cols = [price_col, volatility_col, prediction_col]
+    dfs = list(
+        yield_processed_parquet_tiles_by_year(
+            dir_name,
+            tile_start_date,
+            tile_end_date,
+            asset_id_col,
+            data_cols=data_cols,
+            asset_ids=asset_ids,
+        )
+    )
+    hdbg.dassert_eq(len(dfs), 1)
+    args = [
+        price_col,
+        volatility_col,
+        prediction_col,
+    ]
+    if optimizer_config_dict is not None:
+        args.append(optimizer_config_dict)
+    fepo = forecast_evaluator(*args)
+    portfolio_df, bar_metrics = fepo.annotate_forecasts(
+        dfs[0],
+        **annotate_forecasts_kwargs,
+    )
+    if portfolio_dir is not None:
+        _write_portfolio_tile(portfolio_df, portfolio_dir, asset_id_col)
+    if not return_portfolio_df:
+        portfolio_df = None
+    return portfolio_df, bar_metrics
+
+
+def _write_portfolio_tile(
+    portfolio_df: pd.DataFrame,
+    portfolio_dir: str,
+    asset_id_col: str,
+) -> None:
+    """
+    Write a portfolio in the same Parquet format as the tiled backtests.
+    """
+    df = portfolio_df.stack()
+    df.index.names = ["end_ts", asset_id_col]
+    df = df.reset_index(level=1)
+    df["year"] = df.index.year
+    df["month"] = df.index.month
+    # The tiles have disjoint assets and years, so the processes write to
+    # different partitions.
+    hparque.to_partitioned_parquet(
+        df,
+        [asset_id_col, "year", "month"],
+        dst_dir=portfolio_dir,
+        update_tile_index=True,
+    )
+
+
+def _merge_bar_metrics(
+    bar_metrics1: Optional[pd.DataFrame],
+    bar_metrics2: pd.DataFrame,
+) -> pd.DataFrame:
+    """
+    Combine the bar metrics of two disjoint sets of assets.
+
+    All the bar metrics are sums over the assets with `min_count=1`, so they
+    are combined by adding them, treating a missing value as 0 unless it is
+    missing in both.
+    """
+    if bar_metrics1 is None:
+        return bar_metrics2
+    hdbg.dassert_set_eq(bar_metrics1.columns, bar_metrics2.columns)
+    bar_metrics = bar_metrics1.add(bar_metrics2, fill_value=0)
+    bar_metrics = bar_metrics[bar_metrics1.columns]
+    return bar_metrics
+
+
+def _get_burn_in(
+    forecast_evaluator: Any, annotate_forecasts_kwargs: Dict[str, Any]
+) -> Tuple[int, int]:
+    """
+    Return the burn-in used by `forecast_evaluator.compute_portfolio()`.
+
+    :return: burn-in bars and burn-in days
+    """
+    params = inspect.signature(forecast_evaluator.compute_portfolio).parameters
+    burn_in = []
+    for param in ["burn_in_bars", "burn_in_days"]:
+        hdbg.dassert_in(param, params)
+        value = annotate_forecasts_kwargs.get(param, params[param].default)
+        hdbg.dassert_lte(0, value)
+        burn_in.append(value)
+    burn_in_bars, burn_in_days = burn_in
+    return burn_in_bars, burn_in_days
+
+
+def _apply_burn_in_to_merged_tile(
+    portfolio_df: Optional[pd.DataFrame],
+    bar_metrics: pd.DataFrame,
+    burn_in_bars: int,
+    burn_in_days: int,
+    input_cols: List[str],
+) -> Tuple[Optional[pd.DataFrame], pd.DataFrame]:
+    """
+    Apply the burn-in to the merged results of the asset batches of a tile.
+
+    The burn-in is applied like in `compute_portfolio()`, which trims the bar
+    metrics and leaves in the portfolio the rows of the input (e.g., prices)
+    without the derived quantities (e.g., holdings).
+
+    :param input_cols: portfolio columns copied from the input of the
+        forecast evaluator, which are kept during the burn-in
+    """
+    # The index of the bar metrics is the union of the active bars of the
+    # batches, i.e., the active bars of all the assets.
+    idx = bar_metrics.index
+    mask = np.arange(idx.size) >= burn_in_bars
+    if burn_in_days > 0:
+        date_idx = pd.Index(idx.date).unique()
+        hdbg.dassert_lt(burn_in_days, date_idx.size)
+        first_date = pd.Timestamp(date_idx[burn_in_days], tz=idx.tz)
+        _LOG.info("Initial date after burn-in=%s", first_date)
+        mask &= idx >= first_date
+    bar_metrics = bar_metrics[mask]
+    if portfolio_df is not None:
+        # Remove the derived quantities of the burn-in bars.
+        hdbg.dassert_is_subset(
+            input_cols, portfolio_df.columns.get_level_values(0)
+        )
+        derived_cols = [
+            col
+            for col in portfolio_df.columns.get_level_values(0).unique()
+            if col not in input_cols
+        ]
+        portfolio_df = portfolio_df.copy()
+        is_burn_in = ~portfolio_df.index.isin(bar_metrics.index)
+        portfolio_df.loc[is_burn_in, derived_cols] = np.nan
+    return portfolio_df, bar_metrics
+
+
+def _concat_asset_batches(portfolio_dfs: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenate the portfolios of disjoint sets of assets over the same time.
+    """
+    if len(portfolio_dfs) == 1:
+        return portfolio_dfs[0]
+    portfolio_df = pd.concat(portfolio_dfs, axis=1)
+    # Group the columns by portfolio quantity, as in a single portfolio.
+    cols = portfolio_dfs[0].columns.get_level_values(0).unique()
+    portfolio_df = portfolio_df[cols]
+    return portfolio_df
+
+
+def _evaluate_weighted_forecasts_for_tile(
+    tile: Tuple[datetime.date, datetime.date],
+    *,
+    simulations: pd.DataFrame,
+    weights: pd.DataFrame,
+    market_data_and_volatility: pd.DataFrame,
+    asset_id_col: str,
+    asset_ids: Optional[List[int]],
+    annotate_forecasts_kwargs: dict,
+    target_freq_str: Optional[str],
+    preapply_gaussian_ranking: bool,
+    index_mode: str,
+) -> pd.DataFrame:
+    """
+    Mix and evaluate the forecasts of a tile.
+
+    :param tile: start date and end date of the tile
+    :return: bar metrics as in `evaluate_weighted_forecasts()`
+    """
+    tile_start_date, tile_end_date = tile
+    forecast_evaluator = dtfmfefrpr.ForecastEvaluatorFromPrices(
+        "price",
+        "volatility",
+        "prediction",
+    )
+    # Load the predictions, the volatility and the prices of the tile.
+    (dfs,) = list(
+        yield_processed_parquet_tile_dict(
+            simulations,
+            tile_start_date,
+            tile_end_date,
+            asset_id_col,
+            asset_ids=asset_ids,
+        )
+    )
     vol_dir = market_data_and_volatility.loc["volatility"]["dir_name"]
     vol_col = market_data_and_volatility.loc["volatility"]["col"]
-    volatility_iter = yield_processed_parquet_tiles_by_year(
-        vol_dir,
-        start_date,
-        end_date,
-        asset_id_col,
-        [vol_col],
-        asset_ids=asset_ids,
+    (volatility,) = list(
+        yield_processed_parquet_tiles_by_year(
+            vol_dir,
+            tile_start_date,
+            tile_end_date,
+            asset_id_col,
+            [vol_col],
+            asset_ids=asset_ids,
+        )
     )
-    # Create price time slice iterator.
+    volatility = volatility[vol_col]
     price_dir = market_data_and_volatility.loc["price"]["dir_name"]
     price_col = market_data_and_volatility.loc["price"]["col"]
-    price_iter = yield_processed_parquet_tiles_by_year(
-        price_dir,
-        start_date,
-        end_date,
-        asset_id_col,
-        [price_col],
-        asset_ids=asset_ids,
+    (price,) = list(
+        yield_processed_parquet_tiles_by_year(
+            price_dir,
+            tile_start_date,
+            tile_end_date,
+            asset_id_col,
+            [price_col],
+            asset_ids=asset_ids,
+        )
     )
-    bar_metrics = []
-    for dfs in pred_dict_iter:
-        volatility = next(volatility_iter)[vol_col]
-        price = next(price_iter)[price_col]
-        idx = volatility.index
-        if target_freq_str is not None:
-            bar_length = pd.Series(idx).diff().min()
-            _LOG.info("bar_length=%s", bar_length)
-            hdbg.dassert_eq(
-                bar_length,
-                pd.Timedelta(target_freq_str),
-                "bar length of market and volatility data must equal `target_freq_str`",
-            )
-        # Cross-sectionally normalize the predictions.
-        for key, val in dfs.items():
-            # Resample provided `target_freq_str` is not `None`.
-            if target_freq_str is not None:
-                # TODO(Paul): Revisit this scale factor.
-                # freq = pd.Series(val.index).diff().min()
-                # scale_factor = np.sqrt(pd.Timedelta(target_freq_str) / freq)
-                val = val.resample(target_freq_str).ffill().reindex(idx)
-                val.index = idx
-            # Cross-sectionally normalize.
-            if preapply_gaussian_ranking:
-                val = csigproc.gaussian_rank(val)
-            # TODO(Paul): Enable should we set `scale_factor` above.
-            # if target_freq_str is not None:
-            #     val *= scale_factor
-            dfs[key] = val
-        bar_metrics_dict = {}
-        weighted_sum = hpandas.compute_weighted_sum(
-            dfs, weights, index_mode=index_mode
+    price = price[price_col]
+    idx = volatility.index
+    if target_freq_str is not None:
+        bar_length = pd.Series(idx).diff().min()
+        _LOG.info("bar_length=%s", bar_length)
+        hdbg.dassert_eq(
+            bar_length,
+            pd.Timedelta(target_freq_str),
+            "bar length of market and volatility data must equal `target_freq_str`",
         )
-        for key, val in weighted_sum.items():
-            df = pd.concat(
-                [val, volatility, price],
-                axis=1,
-                keys=["prediction", "volatility", "price"],
-            )
-            _, stats = forecast_evaluator.annotate_forecasts(
-                df,
-                **annotate_forecasts_kwargs,
-            )
-            bar_metrics_dict[key] = stats
-        bar_metrics_df = pd.concat(
-            bar_metrics_dict.values(),
+    # Cross-sectionally normalize the predictions.
+    for key, val in dfs.items():
+        # Resample provided `target_freq_str` is not `None`.
+        if target_freq_str is not None:
+            # TODO(Paul): Revisit this scale factor.
+            # freq = pd.Series(val.index).diff().min()
+            # scale_factor = np.sqrt(pd.Timedelta(target_freq_str) / freq)
+            val = val.resample(target_freq_str).ffill().reindex(idx)
+            val.index = idx
+        # Cross-sectionally normalize.
+        if preapply_gaussian_ranking:
+            val = csigproc.gaussian_rank(val)
+        # TODO(Paul): Enable should we set `scale_factor` above.
+        # if target_freq_str is not None:
+        #     val *= scale_factor
+        dfs[key] = val
+    bar_metrics_dict = {}
+    weighted_sum = hpandas.compute_weighted_sum(
+        dfs, weights, index_mode=index_mode
+    )
+    for key, val in weighted_sum.items():
+        df = pd.concat(
+            [val, volatility, price],
             axis=1,
-            keys=bar_metrics_dict.keys(),
+            keys=["prediction", "volatility", "price"],
         )
-        bar_metrics.append(bar_metrics_df)
-    bar_metrics = pd.concat(bar_metrics)
-    return bar_metrics
+        _, stats = forecast_evaluator.annotate_forecasts(
+            df,
+            **annotate_forecasts_kwargs,
+        )
+        bar_metrics_dict[key] = stats
+    bar_metrics_df = pd.concat(
+        bar_metrics_dict.values(),
+        axis=1,
+        keys=bar_metrics_dict.keys(),
+    )
+    return bar_metrics_df
 
 
 def compute_forecast_correlations(
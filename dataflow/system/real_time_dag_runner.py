@@ -154,6 +154,8 @@ class RealTimeDagRunner(dtfcore.DagRunner):
         async for result_bundle in self.predict_at_datetime():
             self._apply_current_bar_timestamp()
             result_bundles.append(result_bundle)
+        # Wait for the node outputs saved in the background, if any.
+        self.dag.flush_node_io()
         return result_bundles
 
     async def predict_at_datetime(self) -> dtfcore.ResultBundle:
@@ -85,6 +85,15 @@ _LOG = logging.getLogger(__name__)
 #     - profile_execution
 #     - dst_dir
 #     - force_free_nodes
+#     - pinned_nids
+#     - num_threads
+#     - incremental_predict_config
+#       - warmup_length (for all the nodes or by nid)
+#       - verify
+#       - verify_atol
+#     - node_cache_config
+#       - cache_dir
+#       - max_size_in_bytes
 #
 #   - dag_builder_object
 #   - dag_builder_config
@@ -479,6 +479,48 @@ def apply_dag_property(
     if force_free_nodes:
         _LOG.warning("Setting force free nodes")
         dag.force_free_nodes = force_free_nodes
+        # Keep the outputs of the pinned nodes, e.g., to inspect them after
+        # the run.
+        pinned_nids = system.config.get_and_mark_as_used(
+            ("dag_property_config", "pinned_nids"), default_value=[]
+        )
+        dag.pinned_nids = list(pinned_nids)
+    # 3) num_threads
+    num_threads = system.config.get_and_mark_as_used(
+        ("dag_property_config", "num_threads"), default_value=1
+    )
+    _LOG.debug(hprint.to_str("num_threads"))
+    if num_threads > 1:
+        _LOG.warning("Setting parallel mode with num_threads=%s", num_threads)
+        dag.set_parallel_mode(num_threads)
+    # 4) incremental_predict_config
+    incremental_predict_config = system.config.get(
+        ("dag_property_config", "incremental_predict_config"),
+        default_value=None,
+    )
+    _LOG.debug(hprint.to_str("incremental_predict_config"))
+    if incremental_predict_config:
+        _LOG.warning("Setting incremental predict mode")
+        incremental_predict_config = system.config.get_and_mark_as_used(
+            ("dag_property_config", "incremental_predict_config")
+        )
+        if isinstance(incremental_predict_config, cconfig.Config):
+            # E.g., `warmup_length` can be a nested dict from nid to the
+            # warm-up length.
+            incremental_predict_config = incremental_predict_config.to_dict()
+        dtfcore.set_incremental_predict_mode(dag, **incremental_predict_config)
+    # 5) node_cache_config
+    node_cache_config = system.config.get(
+        ("dag_property_config", "node_cache_config"), default_value=None
+    )
+    _LOG.debug(hprint.to_str("node_cache_config"))
+    if node_cache_config:
+        _LOG.warning("Setting node cache")
+        node_cache_config = system.config.get_and_mark_as_used(
+            ("dag_property_config", "node_cache_config")
+        )
+        node_cache = dtfcore.NodeCache(**node_cache_config)
+        dag.set_node_cache(node_cache)
     return system
 
 
@@ -6,9 +6,14 @@ import helpers.hparquet as hparque
 
 import collections
 import datetime
+import functools
+import hashlib
+import json
 import logging
 import os
-from typing import Any, Callable, Iterator, List, Optional, Tuple, Union
+import threading
+import uuid
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -55,6 +60,14 @@ def get_pyarrow_s3fs(*args: Any, **kwargs: Any) -> pafs.S3FileSystem:
     return s3fs_
 
 
+@functools.lru_cache()
+def _get_cached_pyarrow_s3fs(aws_profile: str) -> pafs.S3FileSystem:
+    """
+    Same as `get_pyarrow_s3fs()` but reuse the filesystem across calls.
+    """
+    return get_pyarrow_s3fs(aws_profile)
+
+
 def _get_parquet_tiles_from_file_path(file_path: str) -> List[Tuple[str, Any]]:
     """
     Hacky function to help get tile values from parquet file path.
@@ -87,7 +100,12 @@ def from_parquet(
     log_level: int = logging.DEBUG,
     report_stats: bool = False,
     aws_profile: hs3.AwsProfile = None,
-) -> pd.DataFrame:
+    cache_dataset: bool = False,
+    exclude_columns: Optional[List[str]] = None,
+    return_arrow_table: bool = False,
+    use_tile_index: bool = False,
+    low_memory: bool = False,
+) -> Union[pd.DataFrame, pa.Table]:
     """
     Load a dataframe from a Parquet file.
 
@@ -105,25 +123,70 @@ def from_parquet(
     :param report_stats: whether to report Parquet file size or not
     :param aws_profile: AWS profile to use if and only if using an S3 path,
         otherwise `None` for local path
+    :param cache_dataset: reuse the filesystem and the discovered dataset
+        across calls with the same `file_name`, skipping the existence check
+        and the listing of the files after the first call
+        - files added to the dataset after the first call are not visible
+          until `clear_dataset_cache()` is called
+    :param exclude_columns: columns to skip reading, e.g., partition columns
+        that are not needed by the caller
+    :param return_arrow_table: return the `pyarrow` table, instead of
+        converting it to a dataframe
+    :param use_tile_index: read only the files selected by the filters on
+        the partition columns using the tile index of the dataset, if present,
+        instead of discovering the dataset (see `update_parquet_tile_index()`)
+    :param low_memory: convert the data to a dataframe column by column,
+        releasing each Arrow column once converted, so that the Arrow and the
+        pandas copies of the data are not held at the same time
+        - the columns are not consolidated into blocks, so operations across
+          columns (e.g., `df.values`) on the returned dataframe are slower
     :return: data from Parquet dataset
     """
-    _LOG.debug(hprint.to_str("file_name columns filters schema"))
+    _LOG.debug(
+        hprint.to_str("file_name columns filters schema exclude_columns")
+    )
     hdbg.dassert_isinstance(file_name, str)
+    if return_arrow_table:
+        hdbg.dassert_is(n_rows, None)
     hs3.dassert_is_valid_aws_profile(file_name, aws_profile)
+    dataset_cache_key = _get_dataset_cache_key(file_name, schema, aws_profile)
+    tile_index = None
+    if use_tile_index and not n_rows:
+        tile_index = load_parquet_tile_index(file_name, aws_profile=aws_profile)
+        if tile_index is not None:
+            tile_index = filter_parquet_tile_index(tile_index, filters)
+            _LOG.debug(
+                "Selected %s files from the tile index of '%s'",
+                tile_index.shape[0],
+                file_name,
+            )
+            if tile_index.empty:
+                # Discover the dataset to get the empty data with the right
+                # schema.
+                tile_index = None
+    # The existence of a cached dataset has been already checked.
+    is_cached = (
+        cache_dataset and not n_rows and dataset_cache_key in _DATASET_CACHE
+    )
     if hs3.is_s3_path(file_name):
         if isinstance(aws_profile, str):
-            filesystem = get_pyarrow_s3fs(aws_profile)
+            if cache_dataset:
+                filesystem = _get_cached_pyarrow_s3fs(aws_profile)
+            else:
+                filesystem = get_pyarrow_s3fs(aws_profile)
         else:
             # Note: `s3fs` filesystem is only to be used on exact file path
             # as `pq.ParquetDataset` is not properly handling directory path.
             filesystem = aws_profile
-        # Pyarrow S3FileSystem does not have `exists` method.
-        s3_filesystem = hs3.get_s3fs(aws_profile)
-        hs3.dassert_path_exists(file_name, s3_filesystem)
+        if not is_cached:
+            # Pyarrow S3FileSystem does not have `exists` method.
+            s3_filesystem = hs3.get_s3fs(aws_profile)
+            hs3.dassert_path_exists(file_name, s3_filesystem)
         file_name = file_name.lstrip("s3://")
     else:
         filesystem = None
-        hdbg.dassert_path_exists(file_name)
+        if not is_cached:
+            hdbg.dassert_path_exists(file_name)
     # Load data.
     with htimer.TimedScope(
         logging.DEBUG, f"# Reading Parquet file '{file_name}'"
@@ -153,25 +216,63 @@ def from_parquet(
                 # Pass partition columns types explicitly.
                 schema = pa.schema(schema)
             partitioning = ds.partitioning(schema, flavor="hive")
-            dataset = pq.ParquetDataset(
-                # Replace URI with path.
-                file_name,
-                filesystem=filesystem,
-                filters=filters,
-                partitioning=partitioning,
-                use_legacy_dataset=False,
-            )
-            if columns:
-                # Note: `schema.names` also includes and index.
-                hdbg.dassert_is_subset(columns, dataset.schema.names)
-            # To read also the index we need to use `read_pandas()`, instead of
-            # `read_table()`.
-            # See https://arrow.apache.org/docs/python/parquet.html#reading-and-writing-single-files.
-            table = dataset.read_pandas(columns=columns)
-            df = table.to_pandas()
+            if tile_index is not None:
+                root_dir = file_name.rstrip("/")
+                dataset = ds.dataset(
+                    [
+                        os.path.join(root_dir, rel_file_path)
+                        for rel_file_path in tile_index["file_path"]
+                    ],
+                    filesystem=filesystem,
+                    format="parquet",
+                    partitioning=partitioning,
+                    partition_base_dir=root_dir,
+                )
+                table = _read_pandas_from_dataset(
+                    dataset, filters, columns, exclude_columns
+                )
+            elif cache_dataset:
+                table = _read_pandas_from_cached_dataset(
+                    dataset_cache_key,
+                    file_name,
+                    filesystem,
+                    partitioning,
+                    filters,
+                    columns,
+                    exclude_columns,
+                )
+            else:
+                dataset = pq.ParquetDataset(
+                    # Replace URI with path.
+                    file_name,
+                    filesystem=filesystem,
+                    filters=filters,
+                    partitioning=partitioning,
+                    use_legacy_dataset=False,
+                )
+                columns = _get_columns_to_read(
+                    dataset.schema.names, columns, exclude_columns
+                )
+                # To read also the index we need to use `read_pandas()`,
+                # instead of `read_table()`.
+                # See https://arrow.apache.org/docs/python/parquet.html#reading-and-writing-single-files.
+                table = dataset.read_pandas(columns=columns)
+            if return_arrow_table:
+                df = table
+            elif low_memory:
+                # Convert column by column without consolidating the columns
+                # into blocks and release the memory of each Arrow column once
+                # converted, to avoid holding two copies of the data.
+                df = table.to_pandas(split_blocks=True, self_destruct=True)
+                del table
+            else:
+                df = table.to_pandas()
     # Report stats about the df.
     _LOG.debug("df.shape=%s", str(df.shape))
-    mem = df.memory_usage().sum()
+    if return_arrow_table:
+        mem = df.nbytes
+    else:
+        mem = df.memory_usage().sum()
     _LOG.debug("df.memory_usage=%s", hintros.format_size(mem))
     # Report stats about the Parquet file size.
     if report_stats:
@@ -186,6 +287,124 @@ def from_parquet(
     return df
 
 
+# #############################################################################
+# Dataset discovery cache
+# #############################################################################
+
+
+# Map a dataset key to the `pyarrow` dataset discovered for it.
+_DATASET_CACHE: Dict[Tuple[str, str, str], ds.Dataset] = {}
+_DATASET_CACHE_LOCK = threading.Lock()
+
+
+def clear_dataset_cache() -> None:
+    """
+    Forget the datasets discovered by `from_parquet(..., cache_dataset=True)`.
+    """
+    with _DATASET_CACHE_LOCK:
+        _DATASET_CACHE.clear()
+
+
+def _get_dataset_cache_key(
+    file_name: str,
+    schema: Optional[List[Tuple[str, pa.DataType]]],
+    aws_profile: hs3.AwsProfile,
+) -> Tuple[str, str, str]:
+    if aws_profile is None or isinstance(aws_profile, str):
+        aws_profile_key = str(aws_profile)
+    else:
+        # An `s3fs` filesystem is identified by the object itself.
+        aws_profile_key = str(id(aws_profile))
+    return file_name, str(schema), aws_profile_key
+
+
+def _read_pandas_from_cached_dataset(
+    dataset_cache_key: Tuple[str, str, str],
+    file_name: str,
+    filesystem: Optional[Any],
+    partitioning: Any,
+    filters: Optional[List[Any]],
+    columns: Optional[List[str]],
+    exclude_columns: Optional[List[str]],
+) -> pa.Table:
+    """
+    Same as `pq.ParquetDataset(...).read_pandas()` but reusing the dataset.
+
+    :return: table with the pandas metadata needed to restore the index
+    """
+    with _DATASET_CACHE_LOCK:
+        dataset = _DATASET_CACHE.get(dataset_cache_key)
+    if dataset is None:
+        dataset = ds.dataset(
+            file_name,
+            filesystem=filesystem,
+            format="parquet",
+            partitioning=partitioning,
+        )
+        with _DATASET_CACHE_LOCK:
+            _DATASET_CACHE[dataset_cache_key] = dataset
+    table = _read_pandas_from_dataset(dataset, filters, columns, exclude_columns)
+    return table
+
+
+def _read_pandas_from_dataset(
+    dataset: ds.Dataset,
+    filters: Optional[List[Any]],
+    columns: Optional[List[str]],
+    exclude_columns: Optional[List[str]],
+) -> pa.Table:
+    """
+    Read a `pyarrow` dataset keeping the pandas metadata.
+
+    :return: table with the pandas metadata needed to restore the index
+    """
+    pandas_metadata = dataset.schema.pandas_metadata
+    columns = _get_columns_to_read(dataset.schema.names, columns, exclude_columns)
+    if columns:
+        if pandas_metadata is not None:
+            # Read also the index columns. A `RangeIndex` is stored as a dict
+            # instead of a column name.
+            index_columns = [
+                col
+                for col in pandas_metadata["index_columns"]
+                if isinstance(col, str) and col not in columns
+            ]
+            columns = list(columns) + index_columns
+    if filters is not None:
+        filter_expression = pq.filters_to_expression(filters)
+    else:
+        filter_expression = None
+    table = dataset.to_table(columns=columns, filter=filter_expression)
+    if pandas_metadata is not None:
+        # Restore the pandas metadata that is lost when selecting columns.
+        metadata = table.schema.metadata or {}
+        metadata[b"pandas"] = dataset.schema.metadata[b"pandas"]
+        table = table.replace_schema_metadata(metadata)
+    return table
+
+
+def _get_columns_to_read(
+    schema_names: List[str],
+    columns: Optional[List[str]],
+    exclude_columns: Optional[List[str]],
+) -> Optional[List[str]]:
+    """
+    Get the columns to read from a dataset with the given schema.
+
+    :return: columns to read, `None` to read all the columns
+    """
+    if columns:
+        # Note: `schema.names` also includes and index.
+        hdbg.dassert_is_subset(columns, schema_names)
+    if exclude_columns:
+        if not columns:
+            columns = schema_names
+        # The index columns are read anyway, since they are stored in the
+        # pandas metadata.
+        columns = [col for col in columns if col not in exclude_columns]
+    return columns
+
+
 # Copied from `hio.create_enclosing_dir()` to avoid circular dependencies.
 def _create_enclosing_dir(file_name: str) -> Optional[str]:
     dir_name = os.path.dirname(file_name)
@@ -474,6 +693,8 @@ def build_year_month_filter(
 
 def collate_parquet_tile_metadata(
     path: str,
+    *,
+    use_tile_index: bool = False,
 ) -> pd.DataFrame:
     """
     Report stats in a dataframe on Parquet file partitions.
@@ -482,6 +703,12 @@ def collate_parquet_tile_metadata(
     representation of an `int`.
 
     :param path: path to top-level Parquet directory
+    :param use_tile_index: get the stats from the tile index of the dataset,
+        if present, instead of walking the dirs (see
+        `update_parquet_tile_index()`); the index is not checked against the
+        files, so use it only if all the writers of the dataset update it
+        - the size of a partition with multiple files is the total size of its
+          files
     :return: dataframe with two file size columns and a multiindex reflecting
         the Parquet path structure.
     """
@@ -490,6 +717,12 @@ def collate_parquet_tile_metadata(
     if path.endswith("/"):
         path = path[:-1]
     hdbg.dassert(not path.endswith("/"))
+    tile_index = None
+    if use_tile_index:
+        tile_index = load_parquet_tile_index(path)
+    if tile_index is not None:
+        df = _collate_parquet_tile_metadata_from_index(tile_index)
+        return df
     # Walk the path.
     # os.walk() yields a 3-tuple of the form
     #  (dirpath: str, dirnames: List[str], filenames: List[str])
@@ -497,6 +730,13 @@ def collate_parquet_tile_metadata(
     headers_set = set()
     dict_ = collections.OrderedDict()
     for triple in os.walk(path):
+        # Skip the dirs that are not part of the dataset (e.g., the tile
+        # index), consistently with `pyarrow`.
+        triple[1][:] = [
+            dir_name
+            for dir_name in triple[1]
+            if not dir_name.startswith(("_", "."))
+        ]
         # If the walk has taken us to, e.g.,
         #     asset_id=100/year=2010/month=1/data.parquet
         # then we expect
@@ -531,6 +771,32 @@ def collate_parquet_tile_metadata(
     return df
 
 
+def _collate_parquet_tile_metadata_from_index(
+    tile_index: pd.DataFrame,
+) -> pd.DataFrame:
+    """
+    Same as `collate_parquet_tile_metadata()` but using a tile index.
+    """
+    hdbg.dassert_lte(1, tile_index.shape[0])
+    partition_columns = [
+        col
+        for col in tile_index.columns
+        if col != "file_path" and col not in _TILE_INDEX_STATS_COLUMNS
+    ]
+    hdbg.dassert_lte(1, len(partition_columns))
+    # Ensure that all the files are at the same partition depth.
+    hdbg.dassert(
+        not tile_index[partition_columns].isna().any().any(),
+        "All the files should be partitioned by %s",
+        partition_columns,
+    )
+    df = tile_index.groupby(partition_columns)[["file_size_in_bytes"]].sum()
+    df.sort_index(inplace=True)
+    file_size = df["file_size_in_bytes"].apply(hintros.format_size)
+    df["file_size"] = file_size
+    return df
+
+
 # TODO(Paul): The `int` assumption is baked in. We can generalize to strings
 #  if needed, but if we do, then we should continue to handle string ints as
 #  ints as we do here (e.g., there are sorting advantages, among others).
@@ -776,6 +1042,7 @@ def to_partitioned_parquet(
     *,
     partition_filename: Union[Callable, None] = lambda x: "data.parquet",
     aws_profile: hs3.AwsProfile = None,
+    update_tile_index: bool = False,
 ) -> None:
     """
     Save the given dataframe as Parquet file partitioned along the given
@@ -786,6 +1053,10 @@ def to_partitioned_parquet(
     :param dst_dir: location of partitioned dataset
     :param partition_filename: a callable to override standard partition names. None for `uuid`.
     :param aws_profile: the name of an AWS profile or a s3fs filesystem
+    :param update_tile_index: add the written files to the tile index of the
+        dataset (see `update_parquet_tile_index()`)
+        - the index is not updated by other writers, so it should be used
+          only if all the writes to `dst_dir` go through this function
 
     E.g., in case of partition using `date`, the file layout looks like:
     ```
@@ -837,12 +1108,18 @@ def to_partitioned_parquet(
         #  how to do it. Either setting permissions to read-only before writing.
         #  Or having a list of files that will be written and ensure that none of
         #  those files already existing.
+        file_metadata_list: List[pq.FileMetaData] = []
         pq.write_to_dataset(
             table,
             dst_dir,
             partition_cols=partition_columns,
             partition_filename_cb=partition_filename,
             filesystem=filesystem,
+            metadata_collector=file_metadata_list,
+        )
+    if update_tile_index:
+        update_parquet_tile_index(
+            dst_dir, file_metadata_list, aws_profile=aws_profile
         )
 
 
@@ -950,3 +1227,487 @@ def maybe_cast_to_int(string: str) -> Union[str, int]:
     except ValueError:
         val = string
     return val
+
+
+# #############################################################################
+# Parquet tile index
+# #############################################################################
+
+
+# The tile index of a dataset is stored in this dir under the root dir of the
+# dataset. The leading underscore makes `pyarrow` skip the dir when discovering
+# the dataset.
+_TILE_INDEX_DIR_NAME = "_tile_index"
+# Stats stored in the tile index for each file, besides the file path and the
+# partition values.
+_TILE_INDEX_STATS_COLUMNS = [
+    "num_rows",
+    "file_size_in_bytes",
+    "start_timestamp",
+    "end_timestamp",
+    "schema_hash",
+]
+
+
+def _get_tile_index_dir(root_dir: str) -> str:
+    return os.path.join(root_dir.rstrip("/"), _TILE_INDEX_DIR_NAME)
+
+
+def _get_timestamp_stats(
+    file_metadata: pq.FileMetaData, timestamp_col_name: Optional[str]
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Get the min and max timestamp of a Parquet file from its footer.
+
+    :param timestamp_col_name: column with the timestamps
+        - `None` to use the index stored by pandas
+    :return: min and max timestamp as ISO strings in UTC, if tz-aware
+        - `None` if the timestamp column or its statistics are missing
+    """
+    schema = file_metadata.schema.to_arrow_schema()
+    if timestamp_col_name is None:
+        pandas_metadata = schema.pandas_metadata
+        if pandas_metadata is None:
+            return None, None
+        # A `RangeIndex` is stored as a dict instead of a column name.
+        index_columns = [
+            col
+            for col in pandas_metadata["index_columns"]
+            if isinstance(col, str)
+        ]
+        if not index_columns:
+            return None, None
+        timestamp_col_name = index_columns[0]
+    if timestamp_col_name not in schema.names or not pa.types.is_timestamp(
+        schema.field(timestamp_col_name).type
+    ):
+        return None, None
+    min_ts = None
+    max_ts = None
+    for row_group_idx in range(file_metadata.num_row_groups):
+        row_group = file_metadata.row_group(row_group_idx)
+        for column_idx in range(row_group.num_columns):
+            column = row_group.column(column_idx)
+            if column.path_in_schema != timestamp_col_name:
+                continue
+            stats = column.statistics
+            if stats is None or not stats.has_min_max:
+                # Without statistics on all the row groups the min and max are
+                # not known.
+                return None, None
+            rg_min = pd.Timestamp(stats.min)
+            rg_max = pd.Timestamp(stats.max)
+            min_ts = rg_min if min_ts is None else min(min_ts, rg_min)
+            max_ts = rg_max if max_ts is None else max(max_ts, rg_max)
+    if min_ts is None:
+        return None, None
+    if min_ts.tzinfo is not None:
+        min_ts = min_ts.tz_convert("UTC")
+        max_ts = max_ts.tz_convert("UTC")
+    return min_ts.isoformat(), max_ts.isoformat()
+
+
+def _get_schema_hash(file_metadata: pq.FileMetaData) -> str:
+    schema = file_metadata.schema.to_arrow_schema().remove_metadata()
+    schema_hash = hashlib.sha256(schema.to_string().encode("utf-8"))
+    return schema_hash.hexdigest()[:16]
+
+
+def _get_file_size(file_path: str, aws_profile: hs3.AwsProfile) -> int:
+    if aws_profile is None:
+        size = os.path.getsize(file_path)
+    else:
+        s3fs_ = hs3.get_s3fs(aws_profile)
+        size = s3fs_.size(file_path)
+    return size
+
+
+def _get_tile_index_entry(
+    root_dir: str,
+    rel_file_path: str,
+    file_metadata: pq.FileMetaData,
+    timestamp_col_name: Optional[str],
+    aws_profile: hs3.AwsProfile,
+) -> Dict[str, Any]:
+    """
+    Build the tile index entry for a Parquet file.
+    """
+    start_timestamp, end_timestamp = _get_timestamp_stats(
+        file_metadata, timestamp_col_name
+    )
+    file_path = os.path.join(root_dir.rstrip("/"), rel_file_path)
+    entry = {
+        "file_path": rel_file_path,
+        "partition": dict(_get_parquet_tiles_from_file_path(rel_file_path)),
+        "num_rows": file_metadata.num_rows,
+        "file_size_in_bytes": _get_file_size(file_path, aws_profile),
+        "start_timestamp": start_timestamp,
+        "end_timestamp": end_timestamp,
+        "schema_hash": _get_schema_hash(file_metadata),
+    }
+    return entry
+
+
+def _write_tile_index_shard(
+    root_dir: str, entries: List[Dict[str, Any]], aws_profile: hs3.AwsProfile
+) -> str:
+    """
+    Write a new shard of the tile index.
+
+    Each write adds a shard instead of updating a single file, so that
+    concurrent writers (e.g., the processes of a tiled backtest) never
+    overwrite each other's entries.
+
+    :return: path to the written shard
+    """
+    tile_index_dir = _get_tile_index_dir(root_dir)
+    # The shards are sorted by name when loaded, so that the entries of later
+    # writes override the ones of earlier writes for the same file.
+    shard_name = "%s_%s.json" % (
+        datetime.datetime.utcnow().strftime("%Y%m%d_%H%M%S_%f"),
+        uuid.uuid4().hex,
+    )
+    shard_path = os.path.join(tile_index_dir, shard_name)
+    txt = json.dumps(entries)
+    if aws_profile is None:
+        os.makedirs(tile_index_dir, exist_ok=True)
+        # Write to a tmp file and rename it, so that concurrent readers never
+        # see a partially written shard.
+        tmp_shard_path = os.path.join(tile_index_dir, f".{shard_name}.tmp")
+        with open(tmp_shard_path, "w") as f:
+            f.write(txt)
+        os.replace(tmp_shard_path, shard_path)
+    else:
+        s3fs_ = hs3.get_s3fs(aws_profile)
+        # Objects on S3 become visible only once completely written.
+        with s3fs_.open(shard_path, "w") as f:
+            f.write(txt)
+    _LOG.debug("Written %s entries in '%s'", len(entries), shard_path)
+    return shard_path
+
+
+def _list_tile_index_shards(
+    root_dir: str, aws_profile: hs3.AwsProfile
+) -> List[str]:
+    tile_index_dir = _get_tile_index_dir(root_dir)
+    if aws_profile is None:
+        if not os.path.isdir(tile_index_dir):
+            return []
+        shard_paths = [
+            os.path.join(tile_index_dir, file_name)
+            for file_name in os.listdir(tile_index_dir)
+        ]
+    else:
+        s3fs_ = hs3.get_s3fs(aws_profile)
+        if not s3fs_.exists(tile_index_dir):
+            return []
+        shard_paths = s3fs_.ls(tile_index_dir)
+    shard_paths = sorted(
+        shard_path
+        for shard_path in shard_paths
+        if shard_path.endswith(".json")
+        and not os.path.basename(shard_path).startswith(".")
+    )
+    return shard_paths
+
+
+def update_parquet_tile_index(
+    root_dir: str,
+    file_metadata_list: List[pq.FileMetaData],
+    *,
+    timestamp_col_name: Optional[str] = None,
+    aws_profile: hs3.AwsProfile = None,
+) -> None:
+    """
+    Add the given Parquet files to the tile index of a dataset.
+
+    The tile index stores for each file its partition values, number of rows,
+    size, min / max timestamp, and schema hash, so that readers can prune the
+    files of a dataset without walking the dirs and opening the files.
+
+    Entries for files already in the index are replaced.
+
+    :param root_dir: root dir of the partitioned dataset
+    :param file_metadata_list: footers of the written files, with the file
+        paths relative to `root_dir` (e.g., as filled in by
+        `pq.write_to_dataset(..., metadata_collector=...)`)
+    :param timestamp_col_name: column with the timestamps to compute the min
+        / max of, `None` for the index stored by pandas
+    :param aws_profile: AWS profile to use if and only if using an S3 path
+    """
+    hs3.dassert_is_valid_aws_profile(root_dir, aws_profile)
+    entries = []
+    for file_metadata in file_metadata_list:
+        hdbg.dassert_lte(1, file_metadata.num_row_groups)
+        rel_file_path = file_metadata.row_group(0).column(0).file_path
+        hdbg.dassert(rel_file_path, "The file path must be set in the footer")
+        entry = _get_tile_index_entry(
+            root_dir,
+            rel_file_path,
+            file_metadata,
+            timestamp_col_name,
+            aws_profile,
+        )
+        entries.append(entry)
+    if not entries:
+        return
+    _write_tile_index_shard(root_dir, entries, aws_profile)
+
+
+def build_parquet_tile_index(
+    root_dir: str,
+    *,
+    timestamp_col_name: Optional[str] = None,
+    aws_profile: hs3.AwsProfile = None,
+) -> None:
+    """
+    Build the tile index of a dataset from scratch reading the file footers.
+
+    This is used to index a dataset written without a tile index, or to
+    compact the shards of an existing index into a single one.
+
+    Same params as `update_parquet_tile_index()`.
+    """
+    hs3.dassert_is_valid_aws_profile(root_dir, aws_profile)
+    root_dir = root_dir.rstrip("/")
+    if aws_profile is None:
+        filesystem = None
+        base_dir = root_dir
+    else:
+        filesystem = hs3.get_s3fs(aws_profile)
+        base_dir = root_dir[len("s3://") :]
+    dataset = ds.dataset(
+        base_dir, filesystem=filesystem, format="parquet", partitioning="hive"
+    )
+    entries = []
+    for fragment in dataset.get_fragments():
+        rel_file_path = os.path.relpath(fragment.path, base_dir)
+        entry = _get_tile_index_entry(
+            root_dir,
+            rel_file_path,
+            fragment.metadata,
+            timestamp_col_name,
+            aws_profile,
+        )
+        entries.append(entry)
+    old_shard_paths = _list_tile_index_shards(root_dir, aws_profile)
+    _write_tile_index_shard(root_dir, entries, aws_profile)
+    # Remove the old shards, which are superseded by the new one.
+    for shard_path in old_shard_paths:
+        if aws_profile is None:
+            os.remove(shard_path)
+        else:
+            filesystem.rm(shard_path)
+    _LOG.info("Indexed %s files in '%s'", len(entries), root_dir)
+
+
+def load_parquet_tile_index(
+    root_dir: str, *, aws_profile: hs3.AwsProfile = None
+) -> Optional[pd.DataFrame]:
+    """
+    Load the tile index of a dataset.
+
+    :param root_dir: root dir of the partitioned dataset
+    :param aws_profile: AWS profile to use if and only if using an S3 path
+    :return: dataframe with one row per file, sorted by file path, with
+        columns:
+        - `file_path`: path relative to `root_dir`
+        - one column per partition column (e.g., `asset_id`, `year`, `month`)
+        - `num_rows`, `file_size_in_bytes`
+        - `start_timestamp`, `end_timestamp`: min / max timestamp in the file
+        - `schema_hash`: hash of the file schema
+        - `None` if the dataset has no tile index
+    """
+    hs3.dassert_is_valid_aws_profile(root_dir, aws_profile)
+    shard_paths = _list_tile_index_shards(root_dir, aws_profile)
+    if not shard_paths:
+        return None
+    # Merge the shards so that later entries override earlier ones.
+    entries: Dict[str, Dict[str, Any]] = {}
+    for shard_path in shard_paths:
+        if aws_profile is None:
+            with open(shard_path) as f:
+                txt = f.read()
+        else:
+            with hs3.get_s3fs(aws_profile).open(shard_path) as f:
+                txt = f.read()
+        for entry in json.loads(txt):
+            entries[entry["file_path"]] = entry
+    rows = []
+    partition_columns: List[str] = []
+    for file_path in sorted(entries):
+        entry = entries[file_path]
+        partition = entry["partition"]
+        for col in partition:
+            if col not in partition_columns:
+                partition_columns.append(col)
+        row = {"file_path": file_path, **partition}
+        for col in _TILE_INDEX_STATS_COLUMNS:
+            row[col] = entry[col]
+        rows.append(row)
+    columns = ["file_path"] + partition_columns + _TILE_INDEX_STATS_COLUMNS
+    df = pd.DataFrame(rows, columns=columns)
+    for col in ["start_timestamp", "end_timestamp"]:
+        values = df[col].dropna()
+        # The timestamps are stored in UTC, if tz-aware.
+        is_tz_aware = len(values) > 0 and values.str.endswith("+00:00").all()
+        df[col] = pd.to_datetime(df[col], utc=is_tz_aware)
+    return df
+
+
+def _get_filter_mask(
+    tile_index: pd.DataFrame, filter_: ParquetFilter
+) -> pd.Series:
+    col, op, value = filter_
+    if col not in tile_index.columns:
+        # A filter on a non-partition column can't be used to prune files.
+        return pd.Series(True, index=tile_index.index)
+
+    # Partition values are parsed from the paths, so compare strings of
+    # digits as ints, consistently with `_get_parquet_tiles_from_file_path()`.
+    def _cast(val: Any) -> Any:
+        if isinstance(val, str) and val.isdigit():
+            val = int(val)
+        return val
+
+    srs = tile_index[col].map(_cast)
+    if op in ("in", "not in"):
+        values = [_cast(val) for val in value]
+        mask = srs.isin(values)
+        if op == "not in":
+            mask = ~mask
+    else:
+        value = _cast(value)
+        if op in ("=", "=="):
+            mask = srs == value
+        elif op == "!=":
+            mask = srs != value
+        elif op == "<":
+            mask = srs < value
+        elif op == "<=":
+            mask = srs <= value
+        elif op == ">":
+            mask = srs > value
+        elif op == ">=":
+            mask = srs >= value
+        else:
+            raise ValueError("Invalid op='%s'" % op)
+    return mask
+
+
+def filter_parquet_tile_index(
+    tile_index: pd.DataFrame,
+    filters: Optional[Union[ParquetAndFilter, ParquetOrAndFilter]],
+) -> pd.DataFrame:
+    """
+    Select the files of a tile index that can contain data matching `filters`.
+
+    Only the filters on partition columns are used to prune files, while the
+    filters on the other columns are applied when reading the data.
+
+    :param tile_index: as returned by `load_parquet_tile_index()`
+    :param filters: Parquet query in the AND or OR-AND form
+    :return: the rows of `tile_index` for the selected files
+    """
+    if not filters:
+        return tile_index
+    if isinstance(filters[0], tuple):
+        # Convert an AND filter into an OR-AND one.
+        filters = [filters]
+    mask = pd.Series(False, index=tile_index.index)
+    for and_filter in filters:
+        and_mask = pd.Series(True, index=tile_index.index)
+        for filter_ in and_filter:
+            and_mask &= _get_filter_mask(tile_index, filter_)
+        mask |= and_mask
+    return tile_index[mask]
+
+
+def get_parquet_file_stats(
+    root_dir: str,
+    *,
+    filters: Optional[Union[ParquetAndFilter, ParquetOrAndFilter]] = None,
+    aws_profile: hs3.AwsProfile = None,
+) -> pd.DataFrame:
+    """
+    List the files of a partitioned dataset with their size and modification
+    time.
+
+    Unlike the tile index, the stats are read from the filesystem, so they
+    reflect the files rewritten after the index was updated.
+
+    :param root_dir: root dir of the partitioned dataset
+    :param filters: select only the files that can contain data matching the
+        filters on the partition columns, as in `filter_parquet_tile_index()`
+    :param aws_profile: AWS profile to use if and only if using an S3 path
+    :return: dataframe with one row per file, sorted by file path, with
+        columns:
+        - `file_path`: path relative to `root_dir`
+        - one column per partition column (e.g., `asset_id`, `year`, `month`)
+        - `file_size_in_bytes`
+        - `modification_time`: last modification time of the file
+    """
+    hs3.dassert_is_valid_aws_profile(root_dir, aws_profile)
+    root_dir = root_dir.rstrip("/")
+    # Map the paths relative to `root_dir` to the size and the modification
+    # time of the files.
+    file_stats: Dict[str, Tuple[int, str]] = {}
+    if aws_profile is None:
+        for dir_path, dir_names, file_names in os.walk(root_dir):
+            # Skip the dirs that are not part of the dataset (e.g., the tile
+            # index), consistently with `pyarrow`.
+            dir_names[:] = [
+                dir_name
+                for dir_name in dir_names
+                if not dir_name.startswith(("_", "."))
+            ]
+            for file_name in file_names:
+                if file_name.startswith(("_", ".")):
+                    continue
+                file_path = os.path.join(dir_path, file_name)
+                stat = os.stat(file_path)
+                rel_file_path = os.path.relpath(file_path, root_dir)
+                file_stats[rel_file_path] = (
+                    stat.st_size,
+                    str(pd.Timestamp(stat.st_mtime_ns, unit="ns", tz="UTC")),
+                )
+    else:
+        s3fs_ = hs3.get_s3fs(aws_profile)
+        s3_root_dir = root_dir[len("s3://") :]
+        for file_path, info in s3fs_.find(root_dir, detail=True).items():
+            rel_file_path = os.path.relpath(file_path, s3_root_dir)
+            if any(
+                part.startswith(("_", "."))
+                for part in rel_file_path.split("/")
+            ):
+                continue
+            file_stats[rel_file_path] = (info["size"], str(info["LastModified"]))
+    rows = []
+    for rel_file_path in sorted(file_stats):
+        size_in_bytes, modification_time = file_stats[rel_file_path]
+        row = {
+            "file_path": rel_file_path,
+            **dict(_get_parquet_tiles_from_file_path(rel_file_path)),
+            "file_size_in_bytes": size_in_bytes,
+            "modification_time": modification_time,
+        }
+        rows.append(row)
+    df = pd.DataFrame(rows)
+    if df.empty:
+        df = pd.DataFrame(
+            columns=["file_path", "file_size_in_bytes", "modification_time"]
+        )
+    df = filter_parquet_tile_index(df, filters)
+    return df
+
+
+def get_parquet_filter_columns(
+    filters: Union[ParquetAndFilter, ParquetOrAndFilter]
+) -> List[str]:
+    """
+    Get the columns that `filters` is on.
+    """
+    if filters and isinstance(filters[0], tuple):
+        filters = [filters]
+    columns = sorted({col for and_filter in filters for col, _, _ in and_filter})
+    return columns
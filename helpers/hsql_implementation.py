@@ -4,7 +4,9 @@ Import as:
 import helpers.hsql_implementation as hsqlimpl
 """
 
+import asyncio
 import collections
+import hashlib
 import io
 import logging
 import os
@@ -472,6 +474,25 @@ def get_table_columns(connection: DbConnection, table_name: str) -> List[str]:
     return columns
 
 
+def get_table_column_types(
+    connection: DbConnection, table_name: str
+) -> Dict[str, str]:
+    """
+    Get the data type of each column of a table.
+
+    :return: column name to data type, e.g., `{"timestamp": "bigint",
+        "knowledge_timestamp": "timestamp with time zone"}`
+    """
+    query = f"""
+        SELECT column_name, data_type
+            FROM information_schema.columns
+            WHERE TABLE_NAME = '{table_name}'"""
+    cursor = connection.cursor()
+    cursor.execute(query)
+    column_types = dict(cursor.fetchall())
+    return column_types
+
+
 def find_tables_common_columns(
     connection: DbConnection,
     tables: List[str],
@@ -594,6 +615,26 @@ def execute_query_to_df(
     return df
 
 
+def execute_query_to_df_with_copy(
+    connection: DbConnection, query: str
+) -> pd.DataFrame:
+    """
+    Execute a SELECT query streaming the result with `COPY ... TO STDOUT`.
+
+    This is faster than `execute_query_to_df()` for large results since the
+    rows are not converted to Python objects one by one. The result is
+    transferred as CSV, so the types that `pd.read_csv()` doesn't infer
+    (e.g., timestamps) need to be converted by the caller.
+    """
+    copy_query = f"COPY ({query}) TO STDOUT WITH (FORMAT CSV, HEADER)"
+    buffer = io.StringIO()
+    with connection.cursor() as cursor:
+        cursor.copy_expert(copy_query, buffer)
+    buffer.seek(0)
+    df = pd.read_csv(buffer)
+    return df
+
+
 # #############################################################################
 # Insert
 # #############################################################################
@@ -649,6 +690,120 @@ def copy_rows_with_copy_from(
     connection.commit()
 
 
+def copy_rows_on_conflict_do_nothing(
+    connection: DbConnection,
+    df: pd.DataFrame,
+    table_name: str,
+    unique_columns: List[str],
+    *,
+    batch_size: Optional[int] = None,
+) -> int:
+    """
+    Bulk insert data streaming it with `COPY FROM STDIN`, skipping duplicates.
+
+    This is equivalent to `execute_insert_on_conflict_do_nothing_query()` but
+    much faster for large dataframes, since the rows are not converted to
+    Python objects and sent as values of an INSERT query:
+    - the rows are copied into a temporary staging table with the columns of
+      `df`, which is private to the connection and not WAL-logged, and is
+      reused by the following calls with the same columns
+    - the staging table is merged into `table_name` with
+      `INSERT ... SELECT ... ON CONFLICT (unique_columns) DO NOTHING`
+    If `unique_columns` is empty, the rows are copied directly into
+    `table_name`.
+
+    :param connection: DB connection
+    :param df: data to insert
+    :param table_name: name of the table for insertion
+    :param unique_columns: set of columns which should be unique record-wise
+    :param batch_size: max number of rows to insert in one round trip, `None`
+        to insert all the rows at once
+    :return: number of inserted rows
+    """
+    hdbg.dassert_isinstance(df, pd.DataFrame)
+    hdbg.dassert_is_subset(unique_columns, list(df.columns))
+    if batch_size is None:
+        batch_size = max(len(df), 1)
+    hdbg.dassert_lte(1, batch_size)
+    start_time = time.time()
+    columns = psql.SQL(",").join(map(psql.Identifier, df.columns))
+    table = psql.Identifier(table_name)
+    num_inserted_rows = 0
+    with connection.cursor() as cursor:
+        if unique_columns:
+            # Create the staging table, if it doesn't exist yet for this
+            # connection. The staging table is named after the columns of `df`
+            # since a staging table created for a different set of columns
+            # can't be reused.
+            columns_hash = hashlib.md5(
+                ",".join(df.columns).encode("utf-8")
+            ).hexdigest()[:8]
+            staging_table_name = f"{table_name}_staging_{columns_hash}"
+            # Postgres truncates longer identifiers, which could make the
+            # names of the staging tables collide.
+            hdbg.dassert_lte(len(staging_table_name), 63)
+            staging_table = psql.Identifier(staging_table_name)
+            query = psql.SQL(
+                "CREATE TEMP TABLE IF NOT EXISTS {} AS "
+                "SELECT {} FROM {} WITH NO DATA"
+            ).format(staging_table, columns, table)
+            cursor.execute(query)
+            copy_table = staging_table
+            merge_query = psql.SQL(
+                "INSERT INTO {}({}) SELECT {} FROM {} "
+                "ON CONFLICT ({}) DO NOTHING"
+            ).format(
+                table,
+                columns,
+                columns,
+                staging_table,
+                psql.SQL(",").join(map(psql.Identifier, unique_columns)),
+            )
+        else:
+            copy_table = table
+        # In CSV format an unquoted empty string is read as NULL by default,
+        # so write the missing values as `\N` and use it as the NULL string,
+        # to insert empty strings as `""` and `None` as NULL like
+        # `execute_values()` does.
+        copy_query = psql.SQL(
+            "COPY {}({}) FROM STDIN WITH (FORMAT CSV, NULL '\\N')"
+        ).format(copy_table, columns)
+        float_columns = df.select_dtypes("float").columns.tolist()
+        for start in range(0, len(df), batch_size):
+            df_batch = df.iloc[start : start + batch_size]
+            # Keep NaNs in the float columns as `NaN`, as `execute_values()`
+            # does, instead of converting them to NULL.
+            nan_columns = [
+                col for col in float_columns if df_batch[col].isna().any()
+            ]
+            if nan_columns:
+                df_batch = df_batch.fillna({col: "NaN" for col in nan_columns})
+            buffer = io.StringIO()
+            df_batch.to_csv(buffer, index=False, header=False, na_rep="\\N")
+            buffer.seek(0)
+            if unique_columns:
+                cursor.execute(psql.SQL("TRUNCATE {}").format(staging_table))
+                cursor.copy_expert(copy_query, buffer)
+                cursor.execute(merge_query)
+                num_inserted_rows += cursor.rowcount
+            else:
+                cursor.copy_expert(copy_query, buffer)
+                num_inserted_rows += df_batch.shape[0]
+            if not connection.autocommit:
+                connection.commit()
+    # Report the throughput.
+    elapsed_time = time.time() - start_time
+    _LOG.debug(
+        "Inserted %s / %s rows into '%s' in %.3f secs (%.0f rows/sec)",
+        num_inserted_rows,
+        df.shape[0],
+        table_name,
+        elapsed_time,
+        df.shape[0] / max(elapsed_time, 1e-9),
+    )
+    return num_inserted_rows
+
+
 # TODO(gp): -> table_name, df
 def create_insert_query(df: pd.DataFrame, table_name: str) -> str:
     """
@@ -852,6 +1007,75 @@ def get_num_rows(connection: DbConnection, table_name: str) -> int:
     return vals[0][0]  # type: ignore[no-any-return]
 
 
+# #############################################################################
+# Notifications
+# #############################################################################
+
+
+def listen(connection: DbConnection, channel: str) -> None:
+    """
+    Subscribe the connection to the notifications sent on `channel`.
+
+    The connection needs to be in autocommit mode, otherwise the notifications
+    are delivered only when the current transaction ends.
+    """
+    hdbg.dassert(
+        connection.autocommit, "The connection needs to be in autocommit mode"
+    )
+    query = psql.SQL("LISTEN {}").format(psql.Identifier(channel))
+    with connection.cursor() as cursor:
+        cursor.execute(query)
+
+
+def notify(connection: DbConnection, channel: str, payload: str = "") -> None:
+    """
+    Send a notification with `payload` to the listeners of `channel`.
+
+    The notification is delivered when the transaction is committed.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_notify(%s, %s)", (channel, payload))
+    if not connection.autocommit:
+        connection.commit()
+
+
+def get_notifications(connection: DbConnection) -> List[str]:
+    """
+    Return the payloads of the notifications received so far without blocking.
+    """
+    connection.poll()
+    payloads = [notification.payload for notification in connection.notifies]
+    connection.notifies.clear()
+    return payloads
+
+
+async def wait_for_notifications(
+    connection: DbConnection, timeout_in_secs: float
+) -> List[str]:
+    """
+    Wait up to `timeout_in_secs` for notifications on a listening connection.
+
+    :return: the payloads of the received notifications, or an empty list on
+        timeout
+    """
+    payloads = get_notifications(connection)
+    if payloads:
+        return payloads
+    # Wait for the socket of the connection to become readable.
+    loop = asyncio.get_running_loop()
+    is_readable = asyncio.Event()
+    fd = connection.fileno()
+    loop.add_reader(fd, is_readable.set)
+    try:
+        await asyncio.wait_for(is_readable.wait(), timeout_in_secs)
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        loop.remove_reader(fd)
+    payloads = get_notifications(connection)
+    return payloads
+
+
 # #############################################################################
 # Polling functions
 # #############################################################################
@@ -1147,6 +1147,22 @@ class TestDfToStr(hunitest.TestCase):
         2  0.0  0  3  5.1"""
         self.assert_equal(actual, expected, fuzzy_match=True)
 
+    def test_df_to_str10(self) -> None:
+        """
+        Test that the total memory usage is added as a row.
+        """
+        df = self.get_test_data()
+        actual = hpandas.df_to_str(
+            df, print_memory_usage=True, memory_usage_mode="bytes"
+        )
+        # The memory usage depends on the Python version, so it is computed
+        # instead of being frozen.
+        shallow = df.memory_usage(deep=False).sum()
+        deep = df.memory_usage(deep=True).sum()
+        lines = [" ".join(line.split()) for line in actual.split("\n")]
+        self.assertIn("shallow deep", lines)
+        self.assertIn(f"Total {shallow} {deep}", lines)
+
 
 # #############################################################################
 
@@ -418,6 +418,65 @@ class TestPartitionedParquet1(hunitest.TestCase):
         78   0     A"""
         self.assert_equal(df_as_str, exp, fuzzy_match=True)
 
+    def test_write_and_read_exclude_columns1(self) -> None:
+        """
+        - Write a partitioned dataset with one partitioning column
+        - Read everything back but the partitioning column
+        """
+        df = _get_df_example1()
+        partition_cols = ["idx"]
+        exp_dir_signature = None
+        dir_name = self.write_partitioned_dataset_and_check(
+            df, partition_cols, exp_dir_signature
+        )
+        for cache_dataset in [False, True]:
+            df2 = hparque.from_parquet(
+                dir_name, exclude_columns=["idx"], cache_dataset=cache_dataset
+            )
+            # Compare.
+            df_tmp = df.drop("idx", axis=1)
+            hdbg.dassert_set_eq(df_tmp.columns, df2.columns)
+            _compare_dfs(self, df_tmp, df2[df_tmp.columns])
+        hparque.clear_dataset_cache()
+
+    def test_write_and_read_arrow_table1(self) -> None:
+        """
+        - Write a partitioned dataset with one partitioning column
+        - Read two columns back as an Arrow table
+        """
+        df = _get_df_example1()
+        partition_cols = ["idx"]
+        exp_dir_signature = None
+        dir_name = self.write_partitioned_dataset_and_check(
+            df, partition_cols, exp_dir_signature
+        )
+        columns_to_read = ["val1", "val2"]
+        table = hparque.from_parquet(
+            dir_name, columns=columns_to_read, return_arrow_table=True
+        )
+        self.assertIsInstance(table, pyarrow.Table)
+        # Compare.
+        df2 = table.to_pandas()
+        df_tmp = df[columns_to_read]
+        _compare_dfs(self, df_tmp, df2)
+
+    def test_write_and_read_low_memory1(self) -> None:
+        """
+        - Write a partitioned dataset with one partitioning column
+        - Read it back with and without the low memory conversion
+        """
+        df = _get_df_example1()
+        partition_cols = ["idx"]
+        exp_dir_signature = None
+        dir_name = self.write_partitioned_dataset_and_check(
+            df, partition_cols, exp_dir_signature
+        )
+        for low_memory in [False, True]:
+            df2 = hparque.from_parquet(dir_name, low_memory=low_memory)
+            # Compare.
+            hdbg.dassert_set_eq(df.columns, df2.columns)
+            _compare_dfs(self, df, df2[df.columns])
+
     # //////////////////////////////////////////////////////////////////////////////
 
     def test_merge1(self) -> None:
@@ -1055,3 +1114,216 @@ class TestYieldParquetTiles(hunitest.TestCase):
         max_date = df.index.max()
         self.assertEqual(max_date.month, end_month)
         self.assertEqual(max_date.year, end_year)
+
+
+# #############################################################################
+
+
+class TestParquetTileIndex1(hunitest.TestCase):
+    @staticmethod
+    def write_test_data(dst_dir: str) -> None:
+        """
+        Write tiles partitioned by asset, year, and month, updating the tile
+        index.
+        """
+        index = pd.date_range(
+            "2021-12-31 22:00:00", "2022-01-01 02:00:00", freq="H", tz="UTC"
+        )
+        df = pd.DataFrame(
+            {
+                "price": range(len(index)),
+            },
+            index=index,
+        )
+        df.index.name = "end_ts"
+        df_list = []
+        for asset_id in [100, 200]:
+            df_tmp = df.copy()
+            df_tmp["asset_id"] = asset_id
+            df_list.append(df_tmp)
+        df = pd.concat(df_list)
+        df["year"] = df.index.year
+        df["month"] = df.index.month
+        hparque.to_partitioned_parquet(
+            df,
+            ["asset_id", "year", "month"],
+            dst_dir,
+            update_tile_index=True,
+        )
+
+    def test_load_parquet_tile_index1(self) -> None:
+        """
+        Check the tile index updated by `to_partitioned_parquet()`.
+        """
+        dst_dir = self.get_scratch_space()
+        self.write_test_data(dst_dir)
+        tile_index = hparque.load_parquet_tile_index(dst_dir)
+        # All the files have the same schema.
+        self.assertEqual(tile_index["schema_hash"].nunique(), 1)
+        # The file size depends on the version of the Parquet writer.
+        tile_index = tile_index.drop(
+            columns=["file_size_in_bytes", "schema_hash"]
+        )
+        actual = hpandas.df_to_str(tile_index, num_rows=None)
+        expected = r"""
+                                     file_path  asset_id  year  month  num_rows           start_timestamp             end_timestamp
+        0  asset_id=100/year=2021/month=12/data.parquet       100  2021     12         2 2021-12-31 22:00:00+00:00 2021-12-31 23:00:00+00:00
+        1   asset_id=100/year=2022/month=1/data.parquet       100  2022      1         3 2022-01-01 00:00:00+00:00 2022-01-01 02:00:00+00:00
+        2  asset_id=200/year=2021/month=12/data.parquet       200  2021     12         2 2021-12-31 22:00:00+00:00 2021-12-31 23:00:00+00:00
+        3   asset_id=200/year=2022/month=1/data.parquet       200  2022      1         3 2022-01-01 00:00:00+00:00 2022-01-01 02:00:00+00:00
+        """
+        self.assert_equal(actual, expected, fuzzy_match=True)
+
+    def test_update_parquet_tile_index1(self) -> None:
+        """
+        Check that rewriting a tile replaces its entry in the tile index.
+        """
+        dst_dir = self.get_scratch_space()
+        self.write_test_data(dst_dir)
+        # Overwrite one tile with less data.
+        index = pd.date_range(
+            "2022-01-01 00:00:00", periods=1, freq="H", tz="UTC", name="end_ts"
+        )
+        df = pd.DataFrame(
+            {"price": [10], "asset_id": [100], "year": [2022], "month": [1]},
+            index=index,
+        )
+        hparque.to_partitioned_parquet(
+            df,
+            ["asset_id", "year", "month"],
+            dst_dir,
+            update_tile_index=True,
+        )
+        tile_index = hparque.load_parquet_tile_index(dst_dir)
+        actual = hpandas.df_to_str(
+            tile_index[["file_path", "num_rows", "end_timestamp"]],
+            num_rows=None,
+        )
+        expected = r"""
+                                     file_path  num_rows             end_timestamp
+        0  asset_id=100/year=2021/month=12/data.parquet         2 2021-12-31 23:00:00+00:00
+        1   asset_id=100/year=2022/month=1/data.parquet         1 2022-01-01 00:00:00+00:00
+        2  asset_id=200/year=2021/month=12/data.parquet         2 2021-12-31 23:00:00+00:00
+        3   asset_id=200/year=2022/month=1/data.parquet         3 2022-01-01 02:00:00+00:00
+        """
+        self.assert_equal(actual, expected, fuzzy_match=True)
+
+    def test_build_parquet_tile_index1(self) -> None:
+        """
+        Check that building the index from the footers gives the same index
+        as updating it on write.
+        """
+        dst_dir = self.get_scratch_space()
+        self.write_test_data(dst_dir)
+        expected = hparque.load_parquet_tile_index(dst_dir)
+        # Rebuild the index.
+        hparque.build_parquet_tile_index(dst_dir)
+        actual = hparque.load_parquet_tile_index(dst_dir)
+        self.assert_equal(
+            hpandas.df_to_str(actual, num_rows=None),
+            hpandas.df_to_str(expected, num_rows=None),
+        )
+
+    def test_get_parquet_file_stats1(self) -> None:
+        """
+        Check that the file stats skip the tile index and reflect rewrites.
+        """
+        dst_dir = self.get_scratch_space()
+        self.write_test_data(dst_dir)
+        filters = [("asset_id", "=", 100)]
+        file_stats = hparque.get_parquet_file_stats(dst_dir, filters=filters)
+        actual = hpandas.df_to_str(
+            file_stats.drop(columns=["file_size_in_bytes", "modification_time"]),
+            num_rows=None,
+        )
+        expected = r"""
+                                     file_path  asset_id  year  month
+        0  asset_id=100/year=2021/month=12/data.parquet       100  2021     12
+        1   asset_id=100/year=2022/month=1/data.parquet       100  2022      1
+        """
+        self.assert_equal(actual, expected, fuzzy_match=True)
+        # Overwrite one tile with less data.
+        index = pd.date_range(
+            "2022-01-01 00:00:00", periods=1, freq="H", tz="UTC", name="end_ts"
+        )
+        df = pd.DataFrame(
+            {"price": [10], "asset_id": [100], "year": [2022], "month": [1]},
+            index=index,
+        )
+        hparque.to_partitioned_parquet(df, ["asset_id", "year", "month"], dst_dir)
+        new_file_stats = hparque.get_parquet_file_stats(dst_dir, filters=filters)
+        self.assertEqual(
+            new_file_stats["file_size_in_bytes"].iloc[0],
+            file_stats["file_size_in_bytes"].iloc[0],
+        )
+        self.assertNotEqual(
+            new_file_stats["file_size_in_bytes"].iloc[1],
+            file_stats["file_size_in_bytes"].iloc[1],
+        )
+
+    def test_collate_parquet_tile_metadata1(self) -> None:
+        """
+        Check that the tile metadata from the index is the same as walking the
+        dirs.
+        """
+        dst_dir = self.get_scratch_space()
+        self.write_test_data(dst_dir)
+        expected = hparque.collate_parquet_tile_metadata(
+            dst_dir, use_tile_index=False
+        )
+        actual = hparque.collate_parquet_tile_metadata(
+            dst_dir, use_tile_index=True
+        )
+        self.assert_equal(
+            hpandas.df_to_str(actual, num_rows=None),
+            hpandas.df_to_str(expected, num_rows=None),
+        )
+
+    def test_collate_parquet_tile_metadata2(self) -> None:
+        """
+        Check that by default the tile metadata includes the files not in the
+        tile index.
+        """
+        dst_dir = self.get_scratch_space()
+        self.write_test_data(dst_dir)
+        # Add a file without updating the tile index.
+        df = hparque.from_parquet(dst_dir, filters=[("asset_id", "==", 100)])
+        df["asset_id"] = 300
+        hparque.to_partitioned_parquet(
+            df, ["asset_id", "year", "month"], dst_dir
+        )
+        actual = hparque.collate_parquet_tile_metadata(dst_dir)
+        asset_ids = actual.index.get_level_values("asset_id").unique().tolist()
+        self.assertEqual(asset_ids, [100, 200, 300])
+
+    def test_from_parquet1(self) -> None:
+        """
+        Check that reading through the tile index prunes the files and returns
+        the same data.
+        """
+        dst_dir = self.get_scratch_space()
+        self.write_test_data(dst_dir)
+        filters = [
+            [("asset_id", "in", [100]), ("year", "==", 2022)],
+            [("asset_id", "==", 200), ("month", "=", 12)],
+        ]
+        # Check the selected files.
+        tile_index = hparque.load_parquet_tile_index(dst_dir)
+        tile_index = hparque.filter_parquet_tile_index(tile_index, filters)
+        actual = str(tile_index["file_path"].tolist())
+        expected = (
+            "['asset_id=100/year=2022/month=1/data.parquet',"
+            " 'asset_id=200/year=2021/month=12/data.parquet']"
+        )
+        self.assert_equal(actual, expected)
+        # Check the data.
+        expected = hparque.from_parquet(dst_dir, filters=filters)
+        actual = hparque.from_parquet(
+            dst_dir, filters=filters, use_tile_index=True
+        )
+        expected = expected.sort_values(["asset_id", "end_ts"])
+        actual = actual.sort_values(["asset_id", "end_ts"])
+        self.assert_equal(
+            hpandas.df_to_str(actual, num_rows=None),
+            hpandas.df_to_str(expected, num_rows=None),
+        )
@@ -1,6 +1,10 @@
+import asyncio
 import logging
 import pprint
+import time
+from typing import List
 
+import numpy as np
 import pandas as pd
 import psycopg2.errors as perrors
 import pytest
@@ -119,6 +123,69 @@ class TestSql1(imvcddbut.TestImDbHelper):
         # Delete the table.
         hsql.remove_table(self.connection, "test_table")
 
+    @pytest.mark.slow("16 seconds.")
+    def test_copy_rows_on_conflict_do_nothing1(self) -> None:
+        """
+        Verify that copying data skips the rows that are already in the table.
+        """
+        self._create_test_table()
+        test_data = self._get_test_data()
+        # Insert part of the data.
+        hsql.execute_insert_query(self.connection, test_data.head(2), "test_table")
+        # Copy all the data, including the rows that already exist.
+        num_inserted = hsql.copy_rows_on_conflict_do_nothing(
+            self.connection, test_data, "test_table", ["id"], batch_size=2
+        )
+        self.assertEqual(num_inserted, 3)
+        # Load data.
+        df = hsql.execute_query_to_df(
+            self.connection, "SELECT * FROM test_table ORDER BY id"
+        )
+        self.assert_equal(str(df["id"].tolist()), "[1, 2, 3, 4, 5]")
+        # Delete the table.
+        hsql.remove_table(self.connection, "test_table")
+
+    @pytest.mark.slow("16 seconds.")
+    def test_copy_rows_on_conflict_do_nothing2(self) -> None:
+        """
+        Verify that copying data with different columns and missing values
+        gives the same result as inserting it.
+        """
+        test_data = pd.DataFrame(
+            {
+                "id": [1, 2, 3],
+                "column_1": [1000.0, np.nan, 1002.0],
+                "column_2": [None, "", "test_string_3"],
+            }
+        )
+        query = "SELECT * FROM test_table ORDER BY id"
+        # Insert the data with `execute_values()`.
+        self._create_test_table()
+        hsql.execute_insert_on_conflict_do_nothing_query(
+            self.connection, test_data, "test_table", ["id"]
+        )
+        expected = hsql.execute_query_to_df(self.connection, query)
+        expected = hpandas.df_to_str(expected, num_rows=None)
+        hsql.remove_table(self.connection, "test_table")
+        # Copy part of the columns and then all of them, with the same
+        # connection.
+        self._create_test_table()
+        hsql.copy_rows_on_conflict_do_nothing(
+            self.connection,
+            test_data.head(1)[["id", "column_1"]],
+            "test_table",
+            ["id"],
+        )
+        num_inserted = hsql.copy_rows_on_conflict_do_nothing(
+            self.connection, test_data, "test_table", ["id"]
+        )
+        self.assertEqual(num_inserted, 2)
+        actual = hsql.execute_query_to_df(self.connection, query)
+        actual = hpandas.df_to_str(actual, num_rows=None)
+        self.assert_equal(actual, expected)
+        # Delete the table.
+        hsql.remove_table(self.connection, "test_table")
+
     @pytest.mark.slow("9 seconds.")
     def test_duplicate_removal1(self) -> None:
         """
@@ -244,3 +311,84 @@ class TestSql1(imvcddbut.TestImDbHelper):
                     )
                     """
         self.connection.cursor().execute(query)
+
+
+class TestSqlNotifications1(imvcddbut.TestImDbHelper):
+    """
+    Test `LISTEN` / `NOTIFY` between two connections.
+    """
+
+    @classmethod
+    def get_id(cls) -> int:
+        return hash(cls.__name__) % 10000
+
+    def setUp(self) -> None:
+        super().setUp()
+        # The notifications are sent on `self.connection` and received on a
+        # separate connection.
+        connection_info = hsql.get_connection_info_from_env_file(
+            self.db_env_file
+        )
+        self.listen_connection = hsql.get_connection(
+            *connection_info, autocommit=True
+        )
+        hsql.listen(self.listen_connection, "test_channel")
+
+    def tearDown(self) -> None:
+        self.listen_connection.close()
+        super().tearDown()
+
+    @pytest.mark.slow("10 seconds.")
+    def test_get_notifications1(self) -> None:
+        """
+        Verify that only the notifications sent on the channel are received.
+        """
+        self.assertEqual(hsql.get_notifications(self.listen_connection), [])
+        hsql.notify(self.connection, "other_channel", payload="payload1")
+        hsql.notify(self.connection, "test_channel", payload="payload2")
+        payloads = asyncio.run(
+            hsql.wait_for_notifications(self.listen_connection, 10)
+        )
+        self.assertEqual(payloads, ["payload2"])
+        # The notifications are consumed.
+        self.assertEqual(hsql.get_notifications(self.listen_connection), [])
+
+    @pytest.mark.slow("10 seconds.")
+    def test_wait_for_notifications1(self) -> None:
+        """
+        Verify that a notification wakes up the wait before the timeout.
+        """
+        timeout_in_secs = 10
+
+        async def _notify() -> None:
+            await asyncio.sleep(0.5)
+            hsql.notify(self.connection, "test_channel", payload="payload1")
+
+        async def _run() -> List[str]:
+            payloads, _ = await asyncio.gather(
+                hsql.wait_for_notifications(
+                    self.listen_connection, timeout_in_secs
+                ),
+                _notify(),
+            )
+            return payloads
+
+        start_time = time.time()
+        payloads = asyncio.run(_run())
+        elapsed_time = time.time() - start_time
+        self.assertEqual(payloads, ["payload1"])
+        self.assertLess(elapsed_time, timeout_in_secs)
+
+    @pytest.mark.slow("10 seconds.")
+    def test_wait_for_notifications2(self) -> None:
+        """
+        Verify that the wait returns no notifications after the timeout.
+        """
+        timeout_in_secs = 0.5
+        start_time = time.time()
+        payloads = asyncio.run(
+            hsql.wait_for_notifications(self.listen_connection, timeout_in_secs)
+        )
+        elapsed_time = time.time() - start_time
+        self.assertEqual(payloads, [])
+        self.assertGreaterEqual(elapsed_time, timeout_in_secs)
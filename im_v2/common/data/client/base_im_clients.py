@@ -712,6 +712,12 @@ class SqlRealTimeImClient(RealTimeImClient):
         self._table_name = table_name
         self._db_connection = db_connection
         super().__init__(vendor, universe_version, resample_1min=resample_1min)
+        # The table schema is read from the DB once, when needed.
+        self._table_columns: Optional[List[str]] = None
+        self._table_column_types: Optional[Dict[str, str]] = None
+        # By default read all the data from the DB at each query.
+        self.set_cache_mode(False)
+        self.set_read_mode(use_copy=False)
 
     @staticmethod
     def get_metadata() -> pd.DataFrame:
@@ -763,6 +769,51 @@ class SqlRealTimeImClient(RealTimeImClient):
         _LOG.debug(hprint.to_str("full_symbols"))
         return full_symbols
 
+    def set_cache_mode(
+        self,
+        use_cache: bool,
+        *,
+        late_arrival_overlap: pd.Timedelta = pd.Timedelta(minutes=1),
+    ) -> None:
+        """
+        Keep a rolling in-memory cache of the rows read from the DB.
+
+        In real time, consecutive reads (e.g., the lookback window of a DAG at
+        each bar) overlap almost completely. With the cache, only the rows with
+        a timestamp after the last cached one are read from the DB, and the
+        requested interval is served from memory. Rows older than the largest
+        requested lookback are evicted.
+
+        :param use_cache: whether to use the cache
+        :param late_arrival_overlap: how far before the last cached timestamp
+            to read the data again, to pick up rows that are written late
+        """
+        hdbg.dassert_isinstance(late_arrival_overlap, pd.Timedelta)
+        hdbg.dassert_lte(pd.Timedelta(0), late_arrival_overlap)
+        self._use_cache = use_cache
+        self._late_arrival_overlap_in_ms = int(
+            late_arrival_overlap / pd.Timedelta(milliseconds=1)
+        )
+        # Raw rows as returned by the DB.
+        self._cache_df: Optional[pd.DataFrame] = None
+        # Symbols as `(exchange_id, currency_pair)` stored in the cache.
+        self._cached_parsed_symbols: List[Tuple[str, str]] = []
+        # Interval of Unix epochs covered by the cache.
+        self._cache_start_unix_epoch: Optional[int] = None
+        self._cache_end_unix_epoch: Optional[int] = None
+        # Largest requested interval, used to evict old rows.
+        self._max_lookback_in_ms = 0
+
+    def set_read_mode(self, *, use_copy: bool) -> None:
+        """
+        Set how the query results are transferred from the DB.
+
+        :param use_copy: stream the results with `COPY ... TO STDOUT` instead
+            of fetching the rows through the cursor, which is faster for large
+            query results (e.g., hours of 1-second bid / ask data)
+        """
+        self._use_copy = use_copy
+
     # TODO(Danya): Propagate usage of `columns` parameter here and in descendant
     #  classes.
     def _read_data(
@@ -804,35 +855,189 @@ class SqlRealTimeImClient(RealTimeImClient):
             end_unix_epoch = hdateti.convert_timestamp_to_unix_epoch(end_ts)
         else:
             end_unix_epoch = end_ts
-        # Read data from DB.
-        select_query = self._build_select_query(
-            parsed_symbols, start_unix_epoch, end_unix_epoch, **kwargs
+        full_symbol_col_name = self._get_full_symbol_col_name(
+            full_symbol_col_name
         )
-        data = hsql.execute_query_to_df(self._db_connection, select_query)
+        if self._use_cache and start_unix_epoch is not None and not kwargs:
+            # Read data from the cache, updating it if needed.
+            data = self._read_data_from_cache(
+                parsed_symbols, start_unix_epoch, end_unix_epoch
+            )
+        else:
+            if columns is not None and "columns" not in kwargs:
+                # Read only the requested columns and the ones needed to build
+                # the output.
+                kwargs["columns"] = self._get_query_columns(
+                    columns, full_symbol_col_name
+                )
+            # Read data from DB.
+            select_query = self._build_select_query(
+                parsed_symbols, start_unix_epoch, end_unix_epoch, **kwargs
+            )
+            data = self._execute_select_query(select_query)
         _LOG.debug(
             "-> df after execute_query_to_df=\n%s", hpandas.df_to_str(data)
         )
         # Add a full symbol column.
-        full_symbol_col_name = self._get_full_symbol_col_name(
-            full_symbol_col_name
-        )
         data[full_symbol_col_name] = ivcu.build_full_symbol(
             data["exchange_id"], data["currency_pair"]
         )
         data = data.drop(["exchange_id", "currency_pair"], axis=1)
         # Convert timestamp column with Unix epoch to timestamp format.
-        data[self._timestamp_col_name] = data[self._timestamp_col_name].apply(
-            hdateti.convert_unix_epoch_to_timestamp
+        data[self._timestamp_col_name] = pd.to_datetime(
+            data[self._timestamp_col_name], unit="ms", utc=True
         )
         # Set timestamp column as index.
         data = data.set_index(self._timestamp_col_name)
-        # TODO(Dan): Move column filtering to the SQL query.
         if columns is None:
             columns = data.columns
         hdbg.dassert_is_subset(columns, data.columns.to_list())
         data = data[columns]
         return data
 
+    def _read_data_from_cache(
+        self,
+        parsed_symbols: List[Tuple[str, str]],
+        start_unix_epoch: int,
+        end_unix_epoch: Optional[int],
+    ) -> pd.DataFrame:
+        """
+        Read the rows in `[start_unix_epoch, end_unix_epoch]` through the cache.
+
+        :return: data in the same format as read from the DB
+        """
+        ts_col_name = self._timestamp_col_name
+        is_cache_hit = (
+            self._cache_df is not None
+            and set(parsed_symbols).issubset(self._cached_parsed_symbols)
+            and self._cache_start_unix_epoch <= start_unix_epoch
+        )
+        if is_cache_hit:
+            # Read only the new rows, together with the ones that might have
+            # been written after the last query.
+            query_parsed_symbols = self._cached_parsed_symbols
+            query_start_unix_epoch = (
+                self._cache_end_unix_epoch - self._late_arrival_overlap_in_ms
+            )
+            query_start_unix_epoch = max(
+                query_start_unix_epoch, self._cache_start_unix_epoch
+            )
+            cache_df = self._cache_df[
+                self._cache_df[ts_col_name] < query_start_unix_epoch
+            ]
+        else:
+            # Reload the cache for all the symbols read so far.
+            query_parsed_symbols = sorted(
+                set(parsed_symbols) | set(self._cached_parsed_symbols)
+            )
+            query_start_unix_epoch = start_unix_epoch
+            if self._cache_start_unix_epoch is not None:
+                query_start_unix_epoch = min(
+                    query_start_unix_epoch, self._cache_start_unix_epoch
+                )
+            cache_df = None
+            self._cache_start_unix_epoch = query_start_unix_epoch
+            self._cache_end_unix_epoch = None
+        _LOG.debug(
+            hprint.to_str("is_cache_hit query_parsed_symbols query_start_unix_epoch")
+        )
+        # The rows are read without an upper bound, since the DB doesn't have
+        # data in the future.
+        select_query = self._build_select_query(
+            query_parsed_symbols, query_start_unix_epoch, None
+        )
+        df = self._execute_select_query(select_query)
+        if cache_df is not None and not cache_df.empty:
+            if df.empty:
+                df = cache_df
+            else:
+                df = pd.concat([cache_df, df], ignore_index=True)
+        # Update the high-water mark.
+        if df.empty:
+            last_unix_epoch = query_start_unix_epoch
+        else:
+            last_unix_epoch = int(df[ts_col_name].max())
+        if self._cache_end_unix_epoch is not None:
+            last_unix_epoch = max(last_unix_epoch, self._cache_end_unix_epoch)
+        self._cache_end_unix_epoch = last_unix_epoch
+        # Evict the rows that are older than the largest requested lookback.
+        if end_unix_epoch is not None:
+            self._max_lookback_in_ms = max(
+                self._max_lookback_in_ms, end_unix_epoch - start_unix_epoch
+            )
+            evict_unix_epoch = end_unix_epoch - self._max_lookback_in_ms
+            if evict_unix_epoch > self._cache_start_unix_epoch:
+                df = df[df[ts_col_name] >= evict_unix_epoch]
+                self._cache_start_unix_epoch = evict_unix_epoch
+        self._cache_df = df
+        self._cached_parsed_symbols = query_parsed_symbols
+        # Filter the requested data.
+        mask = df[ts_col_name] >= start_unix_epoch
+        if end_unix_epoch is not None:
+            mask &= df[ts_col_name] <= end_unix_epoch
+        if len(parsed_symbols) < len(query_parsed_symbols):
+            full_symbols = [
+                ivcu.build_full_symbol(exchange_id, currency_pair)
+                for exchange_id, currency_pair in parsed_symbols
+            ]
+            mask &= ivcu.build_full_symbol(
+                df["exchange_id"], df["currency_pair"]
+            ).isin(full_symbols)
+        data = df[mask].reset_index(drop=True)
+        return data
+
+    def _get_table_columns(self) -> List[str]:
+        """
+        Return the columns of the table, reading them from the DB only once.
+        """
+        if self._table_columns is None:
+            self._table_columns = hsql.get_table_columns(
+                self._db_connection, self._table_name
+            )
+        return self._table_columns
+
+    def _get_query_columns(
+        self, columns: List[str], full_symbol_col_name: str
+    ) -> List[str]:
+        """
+        Return the table columns to read in order to output `columns`.
+        """
+        # The full symbol column is built from `exchange_id` and
+        # `currency_pair`, and the timestamp is needed for the index.
+        query_columns = [self._timestamp_col_name, "exchange_id", "currency_pair"]
+        query_columns.extend(
+            col
+            for col in columns
+            if col != full_symbol_col_name and col not in query_columns
+        )
+        return query_columns
+
+    def _execute_select_query(self, select_query: str) -> pd.DataFrame:
+        """
+        Execute a query built by `_build_select_query()`.
+        """
+        if not self._use_copy:
+            data = hsql.execute_query_to_df(self._db_connection, select_query)
+            return data
+        data = hsql.execute_query_to_df_with_copy(
+            self._db_connection, select_query
+        )
+        # Restore the types that are lost when transferring the data as CSV.
+        if self._table_column_types is None:
+            self._table_column_types = hsql.get_table_column_types(
+                self._db_connection, self._table_name
+            )
+        for col in data.columns:
+            col_type = self._table_column_types[col]
+            if col_type.startswith("timestamp"):
+                is_tz_aware = col_type == "timestamp with time zone"
+                data[col] = pd.to_datetime(data[col], utc=is_tz_aware)
+            elif col_type in ("numeric", "double precision", "real"):
+                # Integer values (e.g., "30") are parsed as integers, while
+                # `execute_query_to_df()` returns floats.
+                data[col] = data[col].astype(float)
+        return data
+
     def _build_select_query(
         self,
         parsed_symbols: List[Tuple],
@@ -881,9 +1086,7 @@ class SqlRealTimeImClient(RealTimeImClient):
             elem_type=tuple,
             msg="`parsed_symbols` should be a list of tuple",
         )
-        table_columns = hsql.get_table_columns(
-            self._db_connection, self._table_name
-        )
+        table_columns = self._get_table_columns()
         _LOG.debug(hprint.to_str("table_columns"))
         if columns is None:
             columns = table_columns
@@ -6,11 +6,15 @@ import im_v2.common.data.client.historical_pq_clients as imvcdchpcl
 
 import abc
 import collections
+import concurrent.futures
+import hashlib
 import logging
 import os
-from typing import Any, Dict, List, Optional
+import threading
+from typing import Any, Dict, List, Optional, Tuple
 
 import pandas as pd
+import pyarrow.feather as pafeat
 
 import helpers.hdbg as hdbg
 import helpers.hpandas as hpandas
@@ -80,6 +84,10 @@ class HistoricalPqByTileClient(
         self._infer_exchange_id = infer_exchange_id
         self._partition_mode = partition_mode
         self._aws_profile = aws_profile
+        self._num_threads = 1
+        self._cache_dataset = False
+        self._tile_cache_dir: Optional[str] = None
+        self._use_tile_index = False
 
     @staticmethod
     def get_metadata() -> pd.DataFrame:
@@ -88,6 +96,43 @@ class HistoricalPqByTileClient(
         """
         raise NotImplementedError
 
+    def set_read_mode(
+        self,
+        *,
+        num_threads: int = 1,
+        cache_dataset: bool = False,
+        tile_cache_dir: Optional[str] = None,
+        use_tile_index: bool = False,
+    ) -> None:
+        """
+        Set how the Parquet data is read.
+
+        :param num_threads: number of threads used to read the root dirs
+            concurrently
+        :param cache_dataset: reuse the filesystem and the dataset discovery
+            across reads (see `hparque.from_parquet()`)
+        :param tile_cache_dir: local dir used to cache the data read from each
+            root dir as Arrow files, keyed by root dir, Parquet filters,
+            columns, and size and modification time of the files read
+            - `None` to disable the cache
+            - queries without an end timestamp are not cached, since the
+              tiles they read can still be updated
+
+        :param use_tile_index: use the tile index of the root dirs, if
+            present, to read only the files selected by the filters and to get
+            the start / end timestamp of a symbol without reading its data
+            (see `hparque.update_parquet_tile_index()`)
+        """
+        hdbg.dassert_isinstance(num_threads, int)
+        hdbg.dassert_lte(1, num_threads)
+        self._num_threads = num_threads
+        self._cache_dataset = cache_dataset
+        if tile_cache_dir is not None:
+            hdbg.dassert_isinstance(tile_cache_dir, str)
+            os.makedirs(tile_cache_dir, exist_ok=True)
+        self._tile_cache_dir = tile_cache_dir
+        self._use_tile_index = use_tile_index
+
     # TODO(Grisha): factor out the column names in the child classes, see `CCXT`, `Talos`.
     @staticmethod
     def _get_columns_for_query(
@@ -158,85 +203,266 @@ class HistoricalPqByTileClient(
         root_dir_symbol_filter_dict = self._get_root_dirs_symbol_filters(
             full_symbols, full_symbol_col_name
         )
-        #
-        res_df_list = []
-        for root_dir, symbol_filter in root_dir_symbol_filter_dict.items():
-            # Build list of filters for a query and add them to kwargs.
-            filters = hparque.get_parquet_filters_from_timestamp_interval(
-                self._partition_mode,
+        # Read data from all the root dirs.
+        root_dir_symbol_filters = list(root_dir_symbol_filter_dict.items())
+
+        def _read_data(root_dir_symbol_filter: Tuple) -> pd.DataFrame:
+            root_dir, symbol_filter = root_dir_symbol_filter
+            return self._read_data_for_root_dir(
+                root_dir,
+                symbol_filter,
                 start_ts,
                 end_ts,
-                additional_filters=[symbol_filter],
+                full_symbol_col_name,
+                **kwargs,
             )
-            kwargs["filters"] = filters
-            # Read Parquet data from a root dir.
-            root_dir_df = hparque.from_parquet(root_dir, **kwargs)
-            # TODO(Grisha): "Handle missing tiles" CmTask #1775.
-            # hdbg.dassert_lte(
-            #     1,
-            #     root_dir_df.shape[0],
-            #     "Can't find data for root_dir='%s' and symbol_filter='%s'",
-            #     root_dir,
-            #     symbol_filter,
-            # )
-            # Convert index to datetime.
-            root_dir_df.index = pd.to_datetime(root_dir_df.index)
-            # TODO(gp): IgHistoricalPqByTileTaqBarClient used a ctor param to rename a column.
-            #  Not sure if this is still needed.
-            #        # Rename column storing `full_symbols`, if needed.
-            #        hdbg.dassert_in(self._full_symbol_col_name, df.columns)
-            #        if full_symbol_col_name != self._full_symbol_col_name:
-            #            hdbg.dassert_not_in(full_symbol_col_name, df.columns)
-            #            df.rename(
-            #                columns={self._full_symbol_col_name: full_symbol_col_name},
-            #                inplace=True,
-            #            )
-            transformation_kwargs: Dict = {}
-            if self._infer_exchange_id:
-                # Infer `exchange_id` position in a file path.
-                s3_bucket_path = hs3.get_s3_bucket_path(self._aws_profile)
-                reorg_root_dir = os.path.join(s3_bucket_path, "reorg")
-                daily_staged_reorg_dir = os.path.join(
-                    reorg_root_dir, "daily_staged.airflow.pq"
+
+        if self._num_threads == 1 or len(root_dir_symbol_filters) == 1:
+            res_df_list = [
+                _read_data(root_dir_symbol_filter)
+                for root_dir_symbol_filter in root_dir_symbol_filters
+            ]
+        else:
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=self._num_threads
+            ) as executor:
+                res_df_list = list(
+                    executor.map(_read_data, root_dir_symbol_filters)
                 )
-                if root_dir == daily_staged_reorg_dir:
-                    # E.g. "binance" from
-                    # "s3://cryptokaizen-data/reorg/daily_staged.airflow.pq/bid_ask-futures/crypto_chassis.downloaded_1min/binance/".
-                    exchange_loc = -1
-                else:
-                    # E.g. "binance" from
-                    # "s3://cryptokaizen-data/v3/periodic_daily/airflow/downloaded_1min/parquet/bid_ask/futures/v3/crypto_chassis/binance/v1_0_0/".
-                    exchange_loc = -2
-                # Infer `exchange_id` from a file path if it is not present in data.
-                # E.g., `s3://.../latest/ohlcv/ccxt/binance` -> `binance`.
-                transformation_kwargs["exchange_id"] = root_dir.split("/")[
-                    exchange_loc
-                ]
-            # Transform data.
-            root_dir_df = self._apply_transformations(
-                root_dir_df, full_symbol_col_name, **transformation_kwargs
+        # Combine data from all root dirs into a single DataFrame.
+        res_df = pd.concat(res_df_list, axis=0)
+        return res_df
+
+    def _read_data_for_root_dir(
+        self,
+        root_dir: str,
+        symbol_filter: hparque.ParquetFilter,
+        start_ts: Optional[pd.Timestamp],
+        end_ts: Optional[pd.Timestamp],
+        full_symbol_col_name: str,
+        **kwargs: Any,
+    ) -> pd.DataFrame:
+        """
+        Read and transform the data for the symbols in a root dir.
+
+        :param root_dir: root dir to the data
+        :param symbol_filter: Parquet filter on the symbols in `root_dir`
+        :param kwargs: kwargs for `hparque.from_parquet()`
+        """
+        # Build list of filters for a query and add them to kwargs.
+        filters = hparque.get_parquet_filters_from_timestamp_interval(
+            self._partition_mode,
+            start_ts,
+            end_ts,
+            additional_filters=[symbol_filter],
+        )
+        kwargs["filters"] = filters
+        # Do not read the columns that are dropped from the output below.
+        kwargs["exclude_columns"] = self._get_columns_to_drop()
+        # Avoid holding both the Arrow and the pandas copies of the data.
+        kwargs["low_memory"] = True
+        # Read Parquet data from a root dir.
+        root_dir_df = self._read_parquet(root_dir, end_ts, **kwargs)
+        # TODO(Grisha): "Handle missing tiles" CmTask #1775.
+        # hdbg.dassert_lte(
+        #     1,
+        #     root_dir_df.shape[0],
+        #     "Can't find data for root_dir='%s' and symbol_filter='%s'",
+        #     root_dir,
+        #     symbol_filter,
+        # )
+        # Convert index to datetime, unless it is already a datetime index
+        # built from the Arrow timestamps.
+        if not isinstance(root_dir_df.index, pd.DatetimeIndex):
+            root_dir_df.index = pd.to_datetime(root_dir_df.index)
+        # TODO(gp): IgHistoricalPqByTileTaqBarClient used a ctor param to rename a column.
+        #  Not sure if this is still needed.
+        #        # Rename column storing `full_symbols`, if needed.
+        #        hdbg.dassert_in(self._full_symbol_col_name, df.columns)
+        #        if full_symbol_col_name != self._full_symbol_col_name:
+        #            hdbg.dassert_not_in(full_symbol_col_name, df.columns)
+        #            df.rename(
+        #                columns={self._full_symbol_col_name: full_symbol_col_name},
+        #                inplace=True,
+        #            )
+        transformation_kwargs: Dict = {}
+        if self._infer_exchange_id:
+            # Infer `exchange_id` position in a file path.
+            s3_bucket_path = hs3.get_s3_bucket_path(self._aws_profile)
+            reorg_root_dir = os.path.join(s3_bucket_path, "reorg")
+            daily_staged_reorg_dir = os.path.join(
+                reorg_root_dir, "daily_staged.airflow.pq"
             )
-            # The columns are used just to partition the data but these columns
-            # are not included in the `ImClient` output.
-            current_columns = root_dir_df.columns.to_list()
-            month_column = "month"
-            if month_column in current_columns:
-                root_dir_df = root_dir_df.drop(month_column, axis=1)
-            year_column = "year"
-            if year_column in current_columns:
-                root_dir_df = root_dir_df.drop(year_column, axis=1)
+            if root_dir == daily_staged_reorg_dir:
+                # E.g. "binance" from
+                # "s3://cryptokaizen-data/reorg/daily_staged.airflow.pq/bid_ask-futures/crypto_chassis.downloaded_1min/binance/".
+                exchange_loc = -1
+            else:
+                # E.g. "binance" from
+                # "s3://cryptokaizen-data/v3/periodic_daily/airflow/downloaded_1min/parquet/bid_ask/futures/v3/crypto_chassis/binance/v1_0_0/".
+                exchange_loc = -2
+            # Infer `exchange_id` from a file path if it is not present in data.
+            # E.g., `s3://.../latest/ohlcv/ccxt/binance` -> `binance`.
+            transformation_kwargs["exchange_id"] = root_dir.split("/")[
+                exchange_loc
+            ]
+        # Transform data.
+        root_dir_df = self._apply_transformations(
+            root_dir_df, full_symbol_col_name, **transformation_kwargs
+        )
+        # Drop the columns that are not included in the `ImClient` output, in
+        # case they were added by the transformations.
+        columns_to_drop = [
+            column
+            for column in self._get_columns_to_drop()
+            if column in root_dir_df.columns
+        ]
+        if columns_to_drop:
+            root_dir_df = root_dir_df.drop(columns_to_drop, axis=1)
+        return root_dir_df
+
+    @staticmethod
+    def _get_columns_to_drop() -> List[str]:
+        """
+        Get the columns that are read from Parquet but not returned.
+        """
+        columns = [
+            # The columns are used just to partition the data but these
+            # columns are not included in the `ImClient` output.
+            "month",
+            "year",
             # Column with name "timestamp" that stores epochs remains in most
             # vendors data if no column filtering was done. Drop it since it
             # replicates data from index and has the same name as index column
             # which causes a break when we try to reset it.
-            timestamp_column = "timestamp"
-            if timestamp_column in current_columns:
-                root_dir_df = root_dir_df.drop(timestamp_column, axis=1)
-            #
-            res_df_list.append(root_dir_df)
-        # Combine data from all root dirs into a single DataFrame.
-        res_df = pd.concat(res_df_list, axis=0)
-        return res_df
+            "timestamp",
+        ]
+        return columns
+
+    def _read_parquet(
+        self,
+        root_dir: str,
+        end_ts: Optional[pd.Timestamp],
+        **kwargs: Any,
+    ) -> pd.DataFrame:
+        """
+        Read Parquet data from a root dir, possibly through the tile cache.
+        """
+        use_tile_cache = self._tile_cache_dir is not None and end_ts is not None
+        if not use_tile_cache:
+            df = hparque.from_parquet(
+                root_dir,
+                cache_dataset=self._cache_dataset,
+                use_tile_index=self._use_tile_index,
+                **kwargs,
+            )
+            return df
+        # Key the cached tiles by what determines their content, including the
+        # size and the modification time of the files to read, so that the
+        # tiles rewritten after being cached (e.g., by a backfill) are read
+        # again.
+        file_stats = hparque.get_parquet_file_stats(
+            root_dir,
+            filters=kwargs["filters"],
+            aws_profile=kwargs.get("aws_profile"),
+        )
+        file_stats = file_stats[
+            ["file_path", "file_size_in_bytes", "modification_time"]
+        ].values.tolist()
+        key = str(
+            (
+                root_dir,
+                kwargs["filters"],
+                kwargs["columns"],
+                kwargs["exclude_columns"],
+                file_stats,
+            )
+        )
+        key = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        file_name = os.path.join(self._tile_cache_dir, f"{key}.feather")
+        if os.path.exists(file_name):
+            _LOG.debug("Reading cached tile '%s' for '%s'", file_name, root_dir)
+            df = pafeat.read_feather(file_name)
+        else:
+            df = hparque.from_parquet(
+                root_dir,
+                cache_dataset=self._cache_dataset,
+                use_tile_index=self._use_tile_index,
+                **kwargs,
+            )
+            # Write to a tmp file and rename it, so that concurrent readers
+            # never see a partially written file.
+            tmp_file_name = (
+                f"{file_name}.{os.getpid()}.{threading.get_ident()}.tmp"
+            )
+            pafeat.write_feather(df, tmp_file_name)
+            os.replace(tmp_file_name, file_name)
+        return df
+
+    def _get_start_end_ts_for_symbol(
+        self, full_symbol: ivcu.FullSymbol, mode: str
+    ) -> pd.Timestamp:
+        """
+        Get the start / end timestamp of a symbol from the tile index, if
+        possible, without reading the data.
+
+        Fall back to reading all the data for the symbol if the tile index is
+        not used or can't answer the query.
+        """
+        if self._use_tile_index:
+            timestamp = self._get_start_end_ts_for_symbol_from_tile_index(
+                full_symbol, mode
+            )
+            if timestamp is not None:
+                return timestamp
+        return super()._get_start_end_ts_for_symbol(full_symbol, mode)
+
+    def _get_start_end_ts_for_symbol_from_tile_index(
+        self, full_symbol: ivcu.FullSymbol, mode: str
+    ) -> Optional[pd.Timestamp]:
+        """
+        Get the start / end timestamp of a symbol from the tile index.
+
+        :return: the timestamp or `None` if a root dir has no tile index, the
+            symbol is not a partition column, or the index has no timestamp
+            stats for the selected files
+        """
+        hdbg.dassert_in(mode, ["start", "end"])
+        full_symbol_col_name = self._get_full_symbol_col_name(None)
+        root_dir_symbol_filter_dict = self._get_root_dirs_symbol_filters(
+            [full_symbol], full_symbol_col_name
+        )
+        timestamps = []
+        for root_dir, symbol_filter in root_dir_symbol_filter_dict.items():
+            tile_index = hparque.load_parquet_tile_index(
+                root_dir, aws_profile=self._aws_profile
+            )
+            if tile_index is None:
+                return None
+            filters = [symbol_filter]
+            filter_columns = hparque.get_parquet_filter_columns(filters)
+            if not set(filter_columns).issubset(tile_index.columns):
+                # The symbol can't be selected using only the index.
+                return None
+            tile_index = hparque.filter_parquet_tile_index(tile_index, filters)
+            if tile_index.empty:
+                continue
+            col = "start_timestamp" if mode == "start" else "end_timestamp"
+            if tile_index[col].isna().any():
+                return None
+            timestamp = (
+                tile_index[col].min() if mode == "start" else tile_index[col].max()
+            )
+            timestamps.append(timestamp)
+        if not timestamps:
+            return None
+        timestamp = min(timestamps) if mode == "start" else max(timestamps)
+        hdbg.dassert_isinstance(timestamp, pd.Timestamp)
+        if timestamp.tzinfo is None:
+            # Only tz-aware timestamps can be returned as UTC.
+            return None
+        timestamp = timestamp.tz_convert("UTC")
+        return timestamp
 
     # TODO(Grisha): try to unify child classes with the base class, see CmTask #1696
     # "Refactor HistoricalPqByTileClient and its child classes".
@@ -1,12 +1,17 @@
 import logging
+import os
 import random
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 import pandas as pd
 import pytest
 
 import helpers.hdatetime as hdateti
+import helpers.hparquet as hparque
+import helpers.hpandas as hpandas
+import helpers.hunit_test as hunitest
 import im_v2.common.data.client as icdc
+import im_v2.common.data.client.historical_pq_clients as imvcdchpcl
 import im_v2.common.data.client.historical_pq_clients_example as imvcdchpce
 import im_v2.common.universe as ivcu
 
@@ -831,3 +836,145 @@ class TestHistoricalPqByTileClient3(icdc.ImClientTestCase):
         self.assert_equal(str(actual_df.shape[0]), str(expected_length))
         self.assert_equal(str(actual_df.index[0]), str(start_ts))
         self.assert_equal(str(actual_df.index[-1]), str(end_ts))
+
+
+# #############################################################################
+# TestHistoricalPqByTileClient4
+# #############################################################################
+
+
+class _MultipleRootDirsHistoricalByTileClient(
+    imvcdchpce.MockHistoricalByTileClient
+):
+    """
+    Store the data for each exchange in a separate root dir.
+    """
+
+    def _get_root_dirs_symbol_filters(
+        self, full_symbols: List[ivcu.FullSymbol], full_symbol_col_name: str
+    ) -> Dict[str, hparque.ParquetFilter]:
+        root_dir_symbol_filter_dict = {}
+        for full_symbol in full_symbols:
+            exchange_id, _ = ivcu.parse_full_symbol(full_symbol)
+            root_dir = os.path.join(self._root_dir, exchange_id)
+            root_dir_symbol_filter_dict[root_dir] = (
+                full_symbol_col_name,
+                "in",
+                [full_symbol],
+            )
+        return root_dir_symbol_filter_dict
+
+
+class TestHistoricalPqByTileClient4(hunitest.TestCase):
+    """
+    Test reading multiple root dirs concurrently and through the tile cache.
+    """
+
+    def get_im_client(
+        self, full_symbols: List[ivcu.FullSymbol]
+    ) -> imvcdchpcl.HistoricalPqByTileClient:
+        """
+        Write the data for each exchange in a separate root dir.
+        """
+        root_dir = os.path.join(self.get_scratch_space(), "tiled.bar_data")
+        partition_mode = "by_year_month"
+        index = pd.date_range(
+            "2021-12-30", "2022-01-02", freq="1H", tz="UTC", name="timestamp"
+        )
+        for full_symbol in full_symbols:
+            exchange_id, _ = ivcu.parse_full_symbol(full_symbol)
+            df = pd.DataFrame(
+                {"full_symbol": full_symbol, "close": range(len(index))},
+                index=index,
+            )
+            df, partition_columns = hparque.add_date_partition_columns(
+                df, partition_mode
+            )
+            hparque.to_partitioned_parquet(
+                df,
+                ["full_symbol"] + partition_columns,
+                os.path.join(root_dir, exchange_id),
+            )
+        im_client = _MultipleRootDirsHistoricalByTileClient(
+            "mock",
+            "small",
+            root_dir,
+            partition_mode,
+            False,
+        )
+        return im_client
+
+    def test_read_data1(self) -> None:
+        """
+        Check that all the read modes return the same data.
+        """
+        full_symbols = ["binance::BTC_USDT", "kucoin::FIL_USDT"]
+        im_client = self.get_im_client(full_symbols)
+        start_ts = pd.Timestamp("2021-12-31 00:00:00+00:00")
+        end_ts = pd.Timestamp("2022-01-01 12:00:00+00:00")
+        columns = None
+        filter_data_mode = "assert"
+        expected = im_client.read_data(
+            full_symbols, start_ts, end_ts, columns, filter_data_mode
+        )
+        expected = hpandas.df_to_str(expected, num_rows=None)
+        # Read the data concurrently through the tile cache.
+        tile_cache_dir = os.path.join(self.get_scratch_space(), "tile_cache")
+        im_client.set_read_mode(
+            num_threads=2, cache_dataset=True, tile_cache_dir=tile_cache_dir
+        )
+        for _ in range(2):
+            actual = im_client.read_data(
+                full_symbols, start_ts, end_ts, columns, filter_data_mode
+            )
+            actual = hpandas.df_to_str(actual, num_rows=None)
+            self.assert_equal(actual, expected)
+            # There is one cached tile per root dir.
+            self.assertEqual(len(os.listdir(tile_cache_dir)), 2)
+        hparque.clear_dataset_cache()
+
+
+    def test_read_data2(self) -> None:
+        """
+        Check that a rewritten tile is not served from the tile cache.
+        """
+        full_symbols = ["binance::BTC_USDT", "kucoin::FIL_USDT"]
+        im_client = self.get_im_client(full_symbols)
+        start_ts = pd.Timestamp("2021-12-31 00:00:00+00:00")
+        end_ts = pd.Timestamp("2022-01-01 12:00:00+00:00")
+        columns = None
+        filter_data_mode = "assert"
+        tile_cache_dir = os.path.join(self.get_scratch_space(), "tile_cache")
+        im_client.set_read_mode(
+            num_threads=2, cache_dataset=False, tile_cache_dir=tile_cache_dir
+        )
+        df = im_client.read_data(
+            full_symbols, start_ts, end_ts, columns, filter_data_mode
+        )
+        # Rewrite the tiles of one root dir with different values.
+        root_dir = os.path.join(self.get_scratch_space(), "tiled.bar_data")
+        index = pd.date_range(
+            "2021-12-30", "2022-01-02", freq="1H", tz="UTC", name="timestamp"
+        )
+        new_df = pd.DataFrame(
+            {"full_symbol": "kucoin::FIL_USDT", "close": -1}, index=index
+        )
+        new_df, partition_columns = hparque.add_date_partition_columns(
+            new_df, "by_year_month"
+        )
+        hparque.to_partitioned_parquet(
+            new_df,
+            ["full_symbol"] + partition_columns,
+            os.path.join(root_dir, "kucoin"),
+        )
+        # Check that the new values are read.
+        actual = im_client.read_data(
+            full_symbols, start_ts, end_ts, columns, filter_data_mode
+        )
+        mask = actual["full_symbol"] == "kucoin::FIL_USDT"
+        self.assertTrue((actual.loc[mask, "close"] == -1).all())
+        # Check that the data of the other root dir is unchanged.
+        actual = hpandas.df_to_str(actual[~mask], num_rows=None)
+        expected = df[df["full_symbol"] != "kucoin::FIL_USDT"]
+        expected = hpandas.df_to_str(expected, num_rows=None)
+        self.assert_equal(actual, expected)
@@ -36,16 +36,31 @@ SUPPORTED_DOWNLOAD_METHODS = ["rest", "websocket"]
 #  - max_buffer_size: specifies number of websocket
 #    messages to cache before attempting DB insert.
 
+# `use_copy` controls whether the data is saved to the DB streaming it with
+# `COPY`, which keeps up with large buffers of multi-level bid / ask data.
 WEBSOCKET_CONFIG = {
     "ohlcv": {
         # Buffer size is 0 for OHLCV because we want to insert after round of receival
         #  from websockets.
         "max_buffer_size": 0,
         "sleep_between_iter_in_ms": 60000,
+        "use_copy": False,
+    },
+    "bid_ask": {
+        "max_buffer_size": 250,
+        "sleep_between_iter_in_ms": 200,
+        "use_copy": True,
+    },
+    "trades": {
+        "max_buffer_size": 250,
+        "sleep_between_iter_in_ms": 200,
+        "use_copy": True,
     },
-    "bid_ask": {"max_buffer_size": 250, "sleep_between_iter_in_ms": 200},
-    "trades": {"max_buffer_size": 250, "sleep_between_iter_in_ms": 200},
 }
+# Max number of buffers waiting to be saved to the DB by the websocket writer
+# task. When the queue is full the data collection waits for the writer, i.e.
+# it applies backpressure instead of accumulating data in memory.
+WEBSOCKET_MAX_WRITE_QUEUE_SIZE = 10
 
 
 def _add_common_download_args(
@@ -367,6 +382,134 @@ def _download_exchange_data_to_db_with_timeout(
     download_exchange_data_to_db(args, exchange_class)
 
 
+async def _subscribe_to_websocket_data(
+    exchange: ivcdexex.Extractor,
+    data_type: str,
+    exchange_id: str,
+    currency_pairs: List[str],
+    tz: Any,
+    bid_ask_depth: Optional[int],
+) -> None:
+    """
+    Subscribe to the websocket data of all the currency pairs concurrently.
+
+    :param exchange: exchange used in script run
+    :param data_type: the type of data, e.g. `bid_ask`
+    :param exchange_id: exchange to subscribe to, e.g. `binance`
+    :param currency_pairs: currency pairs to subscribe to, e.g. `["ETH_USDT"]`
+    :param tz: time zone of the script run
+    :param bid_ask_depth: how many levels of order book to download
+    """
+    since = hdateti.convert_timestamp_to_unix_epoch(pd.Timestamp.now(tz))
+    coroutines = [
+        exchange.subscribe_to_websocket_data(
+            data_type,
+            exchange_id,
+            currency_pair,
+            # The following arguments are only applied for
+            # the corresponding data type
+            bid_ask_depth=bid_ask_depth,
+            since=since,
+        )
+        for currency_pair in currency_pairs
+    ]
+    await asyncio.gather(*coroutines)
+
+
+def _transform_and_save_websocket_data_to_db(
+    data_buffer: List[Dict],
+    data_type: str,
+    exchange_id: str,
+    db_connection: Any,
+    db_table: str,
+    tz: Any,
+) -> None:
+    """
+    Transform a buffer of raw websocket messages and save it to the DB.
+    """
+    df = imvcdttrut.transform_raw_websocket_data(
+        data_buffer, data_type, exchange_id
+    )
+    imvcddbut.save_data_to_db(
+        df,
+        data_type,
+        db_connection,
+        db_table,
+        str(tz),
+        use_copy=WEBSOCKET_CONFIG[data_type]["use_copy"],
+    )
+
+
+async def _save_websocket_data_to_db_from_queue(
+    queue: asyncio.Queue,
+    data_type: str,
+    exchange_id: str,
+    db_connection: Any,
+    db_table: str,
+    tz: Any,
+) -> None:
+    """
+    Save the buffers of websocket messages in `queue` to the DB until `None` is
+    received.
+
+    The transformation and the DB write run in a worker thread, so that the
+    event loop keeps exchanging websocket ping / pong messages and collecting
+    data in the meantime.
+
+    :param queue: queue of buffers of raw websocket messages
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        data_buffer = await queue.get()
+        if data_buffer is None:
+            break
+        write_start_time = time.time()
+        await loop.run_in_executor(
+            None,
+            _transform_and_save_websocket_data_to_db,
+            data_buffer,
+            data_type,
+            exchange_id,
+            db_connection,
+            db_table,
+            tz,
+        )
+        write_length = (time.time() - write_start_time) * 1000
+        _LOG.info(
+            "Saved %i websocket messages to DB in %i ms, %i buffers are queued",
+            len(data_buffer),
+            write_length,
+            queue.qsize(),
+        )
+
+
+async def _put_to_write_queue(
+    queue: asyncio.Queue, data_buffer: Optional[List[Any]], writer_task: Any
+) -> None:
+    """
+    Put `data_buffer` in the queue of the task saving the data to the DB.
+
+    The wait for a free slot in the queue is interrupted if the writer task
+    stops, since the queue would never be consumed.
+
+    :param queue: queue consumed by `writer_task`
+    :param data_buffer: buffer of raw websocket messages or `None` to stop the
+        writer task
+    :param writer_task: task running `_save_websocket_data_to_db_from_queue()`
+    """
+    put_task = asyncio.ensure_future(queue.put(data_buffer))
+    done, _ = await asyncio.wait(
+        {put_task, writer_task}, return_when=asyncio.FIRST_COMPLETED
+    )
+    if put_task in done:
+        put_task.result()
+        return
+    put_task.cancel()
+    # Propagate the exception of the writer task, if any.
+    writer_task.result()
+    raise RuntimeError("Websocket writer task stopped unexpectedly")
+
+
 # TODO(Juraj): refactor names to get rid of "_for_one_exchange" part of the
 #  functions' names since it spreads across the codebase. Docstring and the
 #  method signature should sufficiently explain what the function does.
@@ -377,6 +520,10 @@ async def _download_websocket_realtime_for_one_exchange_periodically(
     Encapsulate common logic for periodical exchange data download using
     websocket based download.
 
+    The data collection and the DB writes are pipelined: the data collected
+    in each iteration is buffered and passed through a bounded queue to a
+    background task that saves it to the DB.
+
     :param args: arguments passed on script run
     :param exchange: name of exchange used in script run
     """
@@ -393,67 +540,124 @@ async def _download_websocket_realtime_for_one_exchange_periodically(
     currency_pairs = universe[exchange_id]
     db_connection = imvcddbut.DbConnectionManager.get_connection(args["db_stage"])
     db_table = args["db_table"]
-    for currency_pair in currency_pairs:
-        await exchange.subscribe_to_websocket_data(
-            data_type,
-            exchange_id,
-            currency_pair,
-            # The following arguments are only applied for
-            # the corresponding data type
-            bid_ask_depth=args.get("bid_ask_depth"),
-            since=hdateti.convert_timestamp_to_unix_epoch(pd.Timestamp.now(tz)),
-        )
+    await _subscribe_to_websocket_data(
+        exchange,
+        data_type,
+        exchange_id,
+        currency_pairs,
+        tz,
+        args.get("bid_ask_depth"),
+    )
     _LOG.info("Subscribed to %s websocket data successfully", exchange_id)
     # In order not to bombard the database with many small insert operations
     # a buffer is created, its size is determined by the config specific to each
     # data type.
     data_buffer = []
-    # Sync to the specified start_time.
-    start_delay = max(0, ((start_time - datetime.now(tz)).total_seconds()))
-    _LOG.info("Syncing with the start time, waiting for %s seconds", start_delay)
-    # Exchange.sleep() method is needed instead of built in python time.sleep()
-    #  to ensure websocket ping-pong messages are exchanged in a timely fashion.
-    #  The method expects value in miliseconds.
-    await exchange._async_exchange.sleep(start_delay * 1000)
-    # Start data collection
-    while pd.Timestamp.now(tz) < stop_time:
-        iter_start_time = pd.Timestamp.now(tz)
-        for curr_pair in currency_pairs:
-            data_point = exchange.download_websocket_data(
-                data_type, exchange_id, curr_pair
-            )
-            if data_point != None:
-                data_buffer.append(data_point)
-        # If the buffer is full or this is the last iteration, process and save buffered data.
-        if (
-            len(data_buffer) >= WEBSOCKET_CONFIG[data_type]["max_buffer_size"]
-            or pd.Timestamp.now(tz) >= stop_time
-        ):
-            df = imvcdttrut.transform_raw_websocket_data(
-                data_buffer, data_type, exchange_id
-            )
-            imvcddbut.save_data_to_db(
-                df, data_type, db_connection, db_table, str(tz)
-            )
-            # Empty buffer after persisting the data.
-            data_buffer = []
-        # Determine actual sleep time needed based on the difference
-        # between value set in config and actual time it took to complete
-        # an iteration, this provides an "time align" mechanism.
-        iter_length = (
-            pd.Timestamp.now(tz) - iter_start_time
-        ).total_seconds() * 1000
-        actual_sleep_time = max(
-            0,
-            WEBSOCKET_CONFIG[data_type]["sleep_between_iter_in_ms"] - iter_length,
+    # Start the task saving the buffered data to the DB.
+    write_queue: asyncio.Queue = asyncio.Queue(
+        maxsize=WEBSOCKET_MAX_WRITE_QUEUE_SIZE
+    )
+    writer_task = asyncio.create_task(
+        _save_websocket_data_to_db_from_queue(
+            write_queue, data_type, exchange_id, db_connection, db_table, tz
         )
+    )
+    try:
+        # Sync to the specified start_time.
+        start_delay = max(0, ((start_time - datetime.now(tz)).total_seconds()))
         _LOG.info(
-            "Iteration took %i ms, waiting between iterations for %i ms",
-            iter_length,
-            actual_sleep_time,
+            "Syncing with the start time, waiting for %s seconds", start_delay
         )
-        await exchange._async_exchange.sleep(actual_sleep_time)
-    _LOG.info("Websocket download finished at %s", pd.Timestamp.now(tz))
+        # Exchange.sleep() method is needed instead of built in python
+        #  time.sleep() to ensure websocket ping-pong messages are exchanged in
+        #  a timely fashion. The method expects value in miliseconds.
+        await exchange._async_exchange.sleep(start_delay * 1000)
+        sleep_between_iter_in_ms = WEBSOCKET_CONFIG[data_type][
+            "sleep_between_iter_in_ms"
+        ]
+        # Stats about the iterations exceeding their time budget and the time
+        # spent waiting for the writer task.
+        num_iters = 0
+        num_overruns = 0
+        max_lag = 0
+        total_backpressure_wait = 0
+        # Start data collection
+        while pd.Timestamp.now(tz) < stop_time:
+            iter_start_time = pd.Timestamp.now(tz)
+            if writer_task.done():
+                # Propagate the exception of the writer task, if any.
+                writer_task.result()
+                raise RuntimeError("Websocket writer task stopped unexpectedly")
+            for curr_pair in currency_pairs:
+                data_point = exchange.download_websocket_data(
+                    data_type, exchange_id, curr_pair
+                )
+                if data_point != None:
+                    data_buffer.append(data_point)
+            # If the buffer is full or this is the last iteration, process and
+            # save buffered data.
+            max_buffer_size = WEBSOCKET_CONFIG[data_type]["max_buffer_size"]
+            if (
+                len(data_buffer) >= max_buffer_size
+                or pd.Timestamp.now(tz) >= stop_time
+            ):
+                put_start_time = time.time()
+                await _put_to_write_queue(write_queue, data_buffer, writer_task)
+                backpressure_wait = (time.time() - put_start_time) * 1000
+                total_backpressure_wait += backpressure_wait
+                if backpressure_wait >= 1:
+                    _LOG.warning(
+                        "Waited %i ms for the DB writer, %i buffers are queued",
+                        backpressure_wait,
+                        write_queue.qsize(),
+                    )
+                # Start a new buffer, the old one is owned by the writer.
+                data_buffer = []
+            # Determine actual sleep time needed based on the difference
+            # between value set in config and actual time it took to complete
+            # an iteration, this provides an "time align" mechanism.
+            iter_length = (
+                pd.Timestamp.now(tz) - iter_start_time
+            ).total_seconds() * 1000
+            actual_sleep_time = max(0, sleep_between_iter_in_ms - iter_length)
+            num_iters += 1
+            lag = iter_length - sleep_between_iter_in_ms
+            if lag > 0:
+                num_overruns += 1
+                max_lag = max(max_lag, lag)
+                _LOG.warning(
+                    "Iteration took %i ms, lagging by %i ms", iter_length, lag
+                )
+            else:
+                _LOG.info(
+                    "Iteration took %i ms, waiting between iterations for %i "
+                    "ms",
+                    iter_length,
+                    actual_sleep_time,
+                )
+            await exchange._async_exchange.sleep(actual_sleep_time)
+        # Save the data collected after the last flush, e.g., when the last
+        # iteration ends right before `stop_time`.
+        if data_buffer:
+            await _put_to_write_queue(write_queue, data_buffer, writer_task)
+        # Wait for the writer task to save all the queued data.
+        await _put_to_write_queue(write_queue, None, writer_task)
+        await writer_task
+    finally:
+        # Stop the writer task if the data collection fails, e.g., when the
+        # websocket connection is lost.
+        if not writer_task.done():
+            writer_task.cancel()
+            await asyncio.gather(writer_task, return_exceptions=True)
+    _LOG.info(
+        "Websocket download finished at %s: num_iters=%s num_overruns=%s "
+        "max_lag=%i ms total_backpressure_wait=%i ms",
+        pd.Timestamp.now(tz),
+        num_iters,
+        num_overruns,
+        max_lag,
+        total_backpressure_wait,
+    )
 
 
 def _download_rest_realtime_for_one_exchange_periodically(
@@ -1,5 +1,6 @@
 import argparse
 import asyncio
+import time
 import unittest.mock as umock
 from datetime import datetime, timedelta
 from typing import Any, Dict, Optional
@@ -433,6 +434,70 @@ class TestDownloadExchangeDataToDbPeriodically2(hunitest.TestCase):
         super().tearDown()
 
 
+class TestSaveWebsocketDataToDbFromQueue1(hunitest.TestCase):
+    """
+    Test the task saving the websocket data to the DB.
+    """
+
+    def test_save1(self) -> None:
+        """
+        Check that all the queued buffers are saved in order.
+        """
+        data_buffers = [[{"id": 1}, {"id": 2}], [{"id": 3}]]
+
+        async def _run() -> None:
+            queue = asyncio.Queue(maxsize=1)
+            writer_task = asyncio.create_task(
+                imvcdeexut._save_websocket_data_to_db_from_queue(
+                    queue, "bid_ask", "okx", umock.MagicMock(), "table", None
+                )
+            )
+            for data_buffer in data_buffers:
+                await queue.put(data_buffer)
+            await queue.put(None)
+            await writer_task
+
+        with umock.patch.object(
+            imvcdeexut, "_transform_and_save_websocket_data_to_db"
+        ) as transform_and_save:
+            asyncio.run(_run())
+        # Check.
+        actual = [call.args[0] for call in transform_and_save.call_args_list]
+        self.assertEqual(actual, data_buffers)
+
+    def test_writer_failure1(self) -> None:
+        """
+        Check that the failure of the writer is raised while waiting for a full
+        queue.
+        """
+
+        def _fail(*args: Any) -> None:
+            time.sleep(0.1)
+            raise ValueError("DB is down")
+
+        async def _run() -> None:
+            queue = asyncio.Queue(maxsize=1)
+            writer_task = asyncio.create_task(
+                imvcdeexut._save_websocket_data_to_db_from_queue(
+                    queue, "bid_ask", "okx", umock.MagicMock(), "table", None
+                )
+            )
+            # The writer gets the first buffer and the second one fills the
+            # queue, so the third one waits for the writer, which fails.
+            for data_buffer in [[{"id": 1}], [{"id": 2}], [{"id": 3}]]:
+                await imvcdeexut._put_to_write_queue(
+                    queue, data_buffer, writer_task
+                )
+
+        with umock.patch.object(
+            imvcdeexut,
+            "_transform_and_save_websocket_data_to_db",
+            side_effect=_fail,
+        ):
+            with self.assertRaises(ValueError):
+                asyncio.run(asyncio.wait_for(_run(), timeout=10))
+
+
 @pytest.mark.skipif(
     not henv.execute_repo_config_code("is_CK_S3_available()"),
     reason="Run only if CK S3 is available",
@@ -791,16 +856,16 @@ class TestDownloadResampleBidAskData(hmoto.S3Mock_TestCase):
         }
         namespace = argparse.Namespace(**run_args)
 
-        def mock_resample_multilevel_bid_ask_data(
+        def mock_resample_multisymbol_multilevel_bid_ask_data(
             data: pd.DataFrame,
         ) -> pd.DataFrame:
-            # Return an empty df for BTC.
-            if data["currency_pair"][0] == "BTC_USDT":
-                return pd.DataFrame()
-            return pd.DataFrame([{"timestamp": datetime.now()}])
+            # Return no data for BTC.
+            return pd.DataFrame(
+                [{"timestamp": datetime.now(), "currency_pair": "ADA_USDT"}]
+            ).set_index("timestamp")
 
-        imvcdtrdbad.imvcdttrut.resample_multilevel_bid_ask_data_from_1sec_to_1min = (
-            mock_resample_multilevel_bid_ask_data
+        imvcdtrdbad.imvcdttrut.resample_multisymbol_multilevel_bid_ask_data_from_1sec_to_1min = (
+            mock_resample_multisymbol_multilevel_bid_ask_data
         )
         with self.assertRaises(RuntimeError) as fail:
             imvcdtrdbad._run(namespace, aws_profile=self.s3fs_)
@@ -91,37 +91,24 @@ def _run(args: argparse.Namespace, aws_profile: hs3.AwsProfile = "ck") -> None:
     data = data.drop_duplicates(
         subset=["timestamp", "exchange_id", "currency_pair"]
     )
-    data_resampled = []
     input_currency_pairs = data["currency_pair"].unique()
-    for currency_pair in input_currency_pairs:
-        data_single = data[data["currency_pair"] == currency_pair]
-        if data_single.empty:
-            _LOG.warning(
-                "Empty Dataframe: no data for %s in %s-%s time period",
-                currency_pair,
-                args.start_timestamp,
-                args.end_timestamp,
-            )
-            continue
-        data_resampled_single = (
-            imvcdttrut.resample_multilevel_bid_ask_data_from_1sec_to_1min(
-                data_single
-            )
+    if data.empty:
+        _LOG.warning(
+            "Empty Dataframe: no data in %s-%s time period",
+            args.start_timestamp,
+            args.end_timestamp,
         )
-        if not data_resampled_single.empty:
-            data_resampled_single["currency_pair"] = currency_pair
-            data_resampled.append(data_resampled_single)
-        else:
-            _LOG.warning(
-                "Empty Dataframe: no resampled data for %s "
-                "in %s-%s time period",
-                currency_pair,
-                args.start_timestamp,
-                args.end_timestamp,
+        data_resampled = pd.DataFrame()
+    else:
+        # Resample all the symbols at once.
+        data_resampled = (
+            imvcdttrut.resample_multisymbol_multilevel_bid_ask_data_from_1sec_to_1min(
+                data
             )
+        )
     # Transform the dataset to make save_parquet applicable.
-    if data_resampled:
-        data_resampled = pd.concat(data_resampled).reset_index()
+    if not data_resampled.empty:
+        data_resampled = data_resampled.reset_index()
         output_currency_pairs = data_resampled["currency_pair"].unique()
         # The set of input symbols should be equal to the set of output symbols
         # since this is a resampling transformation.
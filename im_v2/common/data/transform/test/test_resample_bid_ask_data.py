@@ -1,3 +1,5 @@
+import unittest.mock as umock
+
 import numpy as np
 import pandas as pd
 
@@ -38,3 +40,75 @@ class TestResampleBidAskData(hunitest.TestCase):
 """
         actual = hpandas.df_to_str(resampled_df)
         self.assert_equal(actual, expected_signature, fuzzy_match=True)
+
+
+class TestResampleMultisymbolMultilevelBidAskData(hunitest.TestCase):
+    @staticmethod
+    def get_test_data() -> pd.DataFrame:
+        """
+        Get 2 levels of bid/ask data for 2 symbols with some missing seconds.
+        """
+        dfs = []
+        for currency_pair, num_secs in [("BTC_USDT", 150), ("ETH_USDT", 100)]:
+            index = pd.date_range(
+                start="2020-01-10 00:00:00.300",
+                periods=num_secs,
+                freq="s",
+                tz="UTC",
+                name="timestamp",
+            )
+            # Drop every 7th second.
+            index = index[index.second % 7 != 0]
+            rng = np.random.default_rng(seed=len(index))
+            data = {
+                f"{col}_l{level}": rng.random(len(index))
+                for level in [1, 2]
+                for col in imvcdttrut.BID_ASK_COLS
+            }
+            df = pd.DataFrame(data, index=index)
+            df["exchange_id"] = "binance"
+            df["currency_pair"] = currency_pair
+            dfs.append(df)
+        df = pd.concat(dfs)
+        return df
+
+    @staticmethod
+    def resample_by_level(data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Resample each symbol and level separately as reference.
+        """
+        dfs = []
+        for currency_pair, data_symbol in data.groupby(
+            "currency_pair", sort=False
+        ):
+            dfs_level = []
+            for level in [1, 2]:
+                cols = [f"{col}_l{level}" for col in imvcdttrut.BID_ASK_COLS]
+                data_level = data_symbol[cols]
+                data_level.columns = imvcdttrut.BID_ASK_COLS
+                df_level = imvcdttrut.resample_bid_ask_data_from_1sec_to_1min(
+                    data_level
+                )
+                df_level = df_level.rename(
+                    columns=lambda x: f"level_{level}.{x}"
+                )
+                dfs_level.append(df_level)
+            df = pd.concat(dfs_level, axis=1)
+            df["exchange_id"] = "binance"
+            df["currency_pair"] = currency_pair
+            dfs.append(df)
+        df = pd.concat(dfs)
+        return df
+
+    def test_resample1(self) -> None:
+        """
+        Check that resampling all symbols and levels at once is equivalent to
+        resampling each one separately.
+        """
+        df = self.get_test_data()
+        with umock.patch.object(imvcdttrut, "NUMBER_LEVELS_OF_ORDER_BOOK", 2):
+            actual = imvcdttrut.resample_multisymbol_multilevel_bid_ask_data_from_1sec_to_1min(
+                df
+            )
+        expected = self.resample_by_level(df)
+        pd.testing.assert_frame_equal(actual, expected, check_freq=False)
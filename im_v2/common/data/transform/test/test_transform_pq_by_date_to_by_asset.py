@@ -1,10 +1,15 @@
 import argparse
 import os
-from typing import Any, Dict, Tuple
+import unittest.mock as umock
+from typing import Any, Dict, List, Optional, Tuple
 
+import pandas as pd
 import pytest
 
 import helpers.hgit as hgit
+import helpers.hpandas as hpandas
+import helpers.hparquet as hparque
+import helpers.hs3 as hs3
 import helpers.hsystem as hsystem
 import helpers.hunit_test as hunitest
 import im_v2.common.data.transform.transform_pq_by_date_to_by_asset as imvcdttpbdtba
@@ -194,3 +199,149 @@ class TestPqByDateToByAsset1(hunitest.TestCase):
         self.check_directory_structure_with_file_contents(
             by_date_dir, by_asset_dir
         )
+
+
+class TestStreamingPqByDateToByAsset1(hunitest.TestCase):
+    def write_by_date_data(self, src_dir: str, dates: List[str]) -> None:
+        """
+        Write 1-minute data for 2 assets in daily Parquet files.
+        """
+        for date in dates:
+            index = pd.date_range(
+                date, periods=3, freq="T", tz="America/New_York", name="end_time"
+            )
+            df = pd.concat(
+                [
+                    pd.DataFrame(
+                        {"asset_id": asset_id, "close": range(len(index))},
+                        index=index,
+                    )
+                    for asset_id in [1, 2]
+                ]
+            )
+            file_name = os.path.join(src_dir, f"date={date}", "data.parquet")
+            hparque.to_parquet(df, file_name)
+
+    def run_conversion(self, src_dir: str, dst_dir: str, log_dir: str) -> None:
+        cmd = [
+            f"--src_dir {src_dir}",
+            f"--dst_dir {dst_dir}",
+            "--timestamp_col_name end_time",
+            "--num_threads serial",
+            "--max_open_files 2",
+        ]
+        parser = imvcdttpbdtba._parse()
+        args = parser.parse_args(" ".join(cmd).split())
+        # Write the joblib log file in the scratch dir.
+        with umock.patch.object(os, "getcwd", return_value=log_dir):
+            imvcdttpbdtba._run(args)
+
+    def test_incremental1(self) -> None:
+        """
+        Convert by-date data to by-asset and then convert only the new dates.
+        """
+        scratch_dir = self.get_scratch_space()
+        src_dir = os.path.join(scratch_dir, "by_date")
+        dst_dir = os.path.join(scratch_dir, "by_asset")
+        self.write_by_date_data(src_dir, ["20211230", "20211231", "20220101"])
+        self.run_conversion(src_dir, dst_dir, scratch_dir)
+        self.write_by_date_data(src_dir, ["20220102"])
+        self.run_conversion(src_dir, dst_dir, scratch_dir)
+        # Check the files.
+        file_names = hs3.listdir(
+            dst_dir,
+            "*.parquet",
+            only_files=True,
+            use_relative_paths=True,
+        )
+        actual = "\n".join(sorted(file_names))
+        expected = r"""
+        asset_id=1/year=2021/month=12/data.20211230_20211231.0.parquet
+        asset_id=1/year=2022/month=1/data.20220101_20220101.0.parquet
+        asset_id=1/year=2022/month=1/data.20220102_20220102.0.parquet
+        asset_id=2/year=2021/month=12/data.20211230_20211231.0.parquet
+        asset_id=2/year=2022/month=1/data.20220101_20220101.0.parquet
+        asset_id=2/year=2022/month=1/data.20220102_20220102.0.parquet
+        """
+        self.assert_equal(actual, expected, fuzzy_match=True)
+        # Check the data.
+        df = hparque.from_parquet(dst_dir, columns=["asset_id", "close"])
+        df["asset_id"] = df["asset_id"].astype(int)
+        df = df.reset_index().sort_values(["asset_id", "end_time"])
+        actual = hpandas.df_to_str(df, num_rows=None)
+        self.check_string(actual)
+
+    def test_incremental2(self) -> None:
+        """
+        Check that a task processing the same dates again asserts only in
+        incremental mode.
+        """
+        scratch_dir = self.get_scratch_space()
+        src_dir = os.path.join(scratch_dir, "by_date")
+        dst_dir = os.path.join(scratch_dir, "by_asset")
+        self.write_by_date_data(src_dir, ["20211230", "20211231"])
+        self.run_conversion(src_dir, dst_dir, scratch_dir)
+        src_file_names = [
+            os.path.join(src_dir, f"date={date}", "data.parquet")
+            for date in ["20211230", "20211231"]
+        ]
+        args = (
+            src_file_names,
+            "asset_id",
+            "end_time",
+            dst_dir,
+            "data.20211230_20211231.{i}.parquet",
+        )
+        kwargs = {
+            "batch_size": 1024,
+            "max_open_files": 2,
+            "max_rows_per_file": 0,
+            "num_attempts": 1,
+        }
+        with self.assertRaises(AssertionError):
+            imvcdttpbdtba.streaming_execute_task(
+                *args, incremental=True, **kwargs
+            )
+        # In non-incremental mode the files are overwritten.
+        imvcdttpbdtba.streaming_execute_task(*args, incremental=False, **kwargs)
+        df = hparque.from_parquet(dst_dir, columns=["asset_id", "close"])
+        self.assertEqual(len(df), 2 * 2 * 3)
+
+
+class TestLime317ExecuteTask1(hunitest.TestCase):
+    def test_update_tile_index1(self) -> None:
+        """
+        Check that the tile index is updated only if requested.
+        """
+        scratch_dir = self.get_scratch_space()
+        index = pd.date_range(
+            "2022-01-03", periods=3, freq="T", tz="UTC", name="end_time"
+        )
+        df = pd.DataFrame({"asset_id": 1, "close": range(3)}, index=index)
+        src_file_name = os.path.join(
+            scratch_dir, "by_date", "20220103", "data.parquet"
+        )
+        hparque.to_parquet(df, src_file_name)
+
+        def _read_parquet_data(
+            file_name: str, asset_ids: List[int], columns: Optional[List[str]]
+        ) -> pd.DataFrame:
+            _ = asset_ids, columns
+            return hparque.from_parquet(file_name)
+
+        for update_tile_index in [False, True]:
+            dst_dir = os.path.join(scratch_dir, f"by_asset.{update_tile_index}")
+            imvcdttpbdtba.lime317_execute_task(
+                [src_file_name],
+                [1],
+                "asset_id",
+                None,
+                _read_parquet_data,
+                "by_year_month",
+                dst_dir,
+                False,
+                1,
+                update_tile_index=update_tile_index,
+            )
+            tile_index = hparque.load_parquet_tile_index(dst_dir)
+            self.assertEqual(tile_index is not None, update_tile_index)
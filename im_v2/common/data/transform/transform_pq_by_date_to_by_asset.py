@@ -38,6 +38,16 @@ dst_dir/
     --dst_dir im_v2/common/data/transform/test_data_by_asset \
     --num_threads 2
 
+# To convert by-date data streaming it by month, processing only the new
+# source dates:
+> im_v2/common/data/transform/transform_pq_by_date_to_by_asset.py \
+    --src_dir ./by_date \
+    --dst_dir ./by_asset \
+    --asset_col_name asset_id \
+    --timestamp_col_name end_time \
+    --max_open_files 256 \
+    --num_threads 4
+
 # To process Parquet data for LimeTask317:
 > im_v2/common/data/transform/transform_pq_by_date_to_by_asset.py \
     --src_dir 's3://<ck-data>/unit_test/parquet/' \
@@ -53,14 +63,19 @@ dst_dir/
 import argparse
 import logging
 import os
-from typing import Any, Callable, Dict, List, Optional, Tuple
+import re
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
 from tqdm.autonotebook import tqdm
 
 import helpers.hdatetime as hdateti
 import helpers.hdbg as hdbg
 import helpers.hintrospection as hintros
+import helpers.hio as hio
 import helpers.hjoblib as hjoblib
 import helpers.hpandas as hpandas
 import helpers.hparquet as hparque
@@ -136,6 +151,8 @@ def lime317_prepare_tasks(
     chunk_mode: str,
     args_num_threads: str,
     dst_dir: str,
+    *,
+    update_tile_index: bool = False,
 ) -> List[hjoblib.Task]:
     """
     Each task processes a consecutive chunk of data (e.g., week or month).
@@ -148,6 +165,7 @@ def lime317_prepare_tasks(
     :param args_num_threads: string from command line representing how many threads
         to employ
     :param dst_dir: directory where to save the data
+    :param update_tile_index: as in `lime317_execute_task()`
     :return: list of joblib tasks
     """
     hdbg.dassert_container_type(src_file_names, list, str)
@@ -223,7 +241,7 @@ def lime317_prepare_tasks(
                 dst_dir,
             ),
             # kwargs.
-            {},
+            {"update_tile_index": update_tile_index},
         )
         tasks.append(task)
     # # Split the chunks by thread.
@@ -247,6 +265,8 @@ def lime317_execute_task(
     dst_dir: str,
     incremental: bool,
     num_attempts: int,
+    *,
+    update_tile_index: bool = False,
 ) -> None:
     """
     Process a task by:
@@ -256,6 +276,8 @@ def lime317_execute_task(
     - writing it into `dst_dir` (partitioning by assets using Parquet datasets)
 
     :param src_file_names: a list of files to merge together
+    :param update_tile_index: update the tile index of `dst_dir` with the
+        written files (see `hparque.to_partitioned_parquet()`)
     """
     # This function only supports non-incremental mode and no re-try.
     hdbg.dassert(not incremental)
@@ -296,7 +318,229 @@ def lime317_execute_task(
     # Partition also over the asset column.
     partition_columns.insert(0, asset_id_col_name)
     # Write.
-    hparque.to_partitioned_parquet(df, partition_columns, dst_dir)
+    hparque.to_partitioned_parquet(
+        df, partition_columns, dst_dir, update_tile_index=update_tile_index
+    )
+
+
+# #############################################################################
+# Streaming processing
+# #############################################################################
+
+# The data of each task is streamed from the source files in record batches
+# and routed to the by-asset partitions (e.g., `asset_id=A/year=2022/month=1`)
+# by the Arrow dataset writer, which:
+# - keeps at most `max_open_files` partition files open, closing the least
+#   recently used ones
+# - applies backpressure to the reader, so that the memory used is bounded by a
+#   few record batches and not by the size of a date tile
+#
+# Each task processes the source dates of a single month so that the tasks
+# write different partitions and can run in parallel.
+#
+# In incremental mode only the source dates that have not been processed yet
+# are converted: after a task succeeds, a marker file for each source file is
+# saved in `dst_dir/_processed`, which is ignored when reading the dataset.
+
+_PROCESSED_DIR_NAME = "_processed"
+
+
+def _get_src_file_date(src_file_name: str) -> pd.Timestamp:
+    """
+    Extract the date from the dir of a by-date source file.
+
+    E.g., `./tmp.s3/20220111/data.parquet` and
+    `./tmp.s3/date=20220111/data.parquet` -> `2022-01-11`.
+    """
+    dir_name = os.path.basename(os.path.dirname(src_file_name))
+    m = re.search(r"(\d{8})$", dir_name)
+    hdbg.dassert(m, "Invalid file_name='%s'", src_file_name)
+    date = pd.Timestamp(m.group(1))
+    return date
+
+
+def _get_processed_marker_file_name(src_file_name: str, dst_dir: str) -> str:
+    """
+    Get the name of the file marking `src_file_name` as processed.
+    """
+    date = _get_src_file_date(src_file_name)
+    file_name = os.path.join(
+        dst_dir, _PROCESSED_DIR_NAME, date.strftime("%Y%m%d") + ".txt"
+    )
+    return file_name
+
+
+def streaming_prepare_tasks(
+    src_file_names: List[str], args: argparse.Namespace
+) -> List[hjoblib.Task]:
+    """
+    Prepare a task for each month of source files.
+
+    :param src_file_names: list of all Parquet files to process, with the name
+        of the dir encoding the date
+    :param args: command line arguments
+    :return: list of joblib tasks
+    """
+    hdbg.dassert_container_type(src_file_names, list, str)
+    # Skip the source files already processed, if in incremental mode.
+    incremental = not args.no_incremental
+    if incremental:
+        src_dst_file_name_map = [
+            (
+                src_file_name,
+                _get_processed_marker_file_name(src_file_name, args.dst_dir),
+            )
+            for src_file_name in src_file_names
+        ]
+        src_dst_file_name_map = hjoblib.apply_incremental_mode(
+            src_dst_file_name_map
+        )
+        src_file_names = [src for src, _ in src_dst_file_name_map]
+    # Group the source files by month.
+    key_to_src_file_names: Dict[Tuple[int, int], List[str]] = {}
+    for src_file_name in src_file_names:
+        date = _get_src_file_date(src_file_name)
+        key = (date.year, date.month)
+        key_to_src_file_names.setdefault(key, []).append(src_file_name)
+    # Build a task for each month.
+    tasks = []
+    for key in sorted(key_to_src_file_names.keys()):
+        task_src_file_names = sorted(
+            key_to_src_file_names[key], key=_get_src_file_date
+        )
+        # Name the output files after the processed dates, so that the files
+        # written by incremental runs don't overwrite the existing ones.
+        start_date = _get_src_file_date(task_src_file_names[0])
+        end_date = _get_src_file_date(task_src_file_names[-1])
+        basename_template = "data.{}_{}.{{i}}.parquet".format(
+            start_date.strftime("%Y%m%d"), end_date.strftime("%Y%m%d")
+        )
+        task: hjoblib.Task = (
+            # args.
+            (
+                task_src_file_names,
+                args.asset_col_name,
+                args.timestamp_col_name,
+                args.dst_dir,
+                basename_template,
+            ),
+            # kwargs.
+            {
+                "batch_size": args.batch_size,
+                "max_open_files": args.max_open_files,
+                "max_rows_per_file": args.max_rows_per_file,
+            },
+        )
+        tasks.append(task)
+    _LOG.info(
+        "Prepared %s tasks for %s source files", len(tasks), len(src_file_names)
+    )
+    return tasks
+
+
+def _add_year_month_columns(
+    batches: Iterator[pa.RecordBatch], timestamp_col_name: str
+) -> Iterator[pa.RecordBatch]:
+    """
+    Add the `year` and `month` partition columns to each record batch.
+
+    Like `hparque.add_date_partition_columns()`, the year and month of
+    timestamps with a timezone are computed in that timezone.
+    """
+    for batch in batches:
+        timestamps = batch.column(timestamp_col_name)
+        columns = batch.columns + [pc.year(timestamps), pc.month(timestamps)]
+        names = batch.schema.names + ["year", "month"]
+        yield pa.RecordBatch.from_arrays(columns, names=names)
+
+
+def streaming_execute_task(
+    src_file_names: List[str],
+    asset_col_name: str,
+    timestamp_col_name: str,
+    dst_dir: str,
+    basename_template: str,
+    *,
+    batch_size: int,
+    max_open_files: int,
+    max_rows_per_file: int,
+    incremental: bool,
+    num_attempts: int,
+) -> None:
+    """
+    Stream the source files into a Parquet dataset partitioned by asset, year,
+    and month.
+
+    :param src_file_names: source files to process
+    :param asset_col_name: name of the column with the asset ids
+    :param timestamp_col_name: name of the column with the timestamps used to
+        compute the year and month partitions
+    :param dst_dir: dir of the by-asset dataset
+    :param basename_template: template for the names of the written files
+        (e.g., `data.20220101_20220131.{i}.parquet`)
+    :param batch_size: max number of rows read at once
+    :param max_open_files: max number of partition files open at once
+    :param max_rows_per_file: max number of rows in a file, 0 for no limit
+    :param incremental: whether the source files already processed have been
+        skipped when preparing the tasks (see `streaming_prepare_tasks()`)
+    :param num_attempts: only 1 attempt is supported
+    """
+    hdbg.dassert_eq(num_attempts, 1)
+    hdbg.dassert_container_type(src_file_names, list, str)
+    if incremental:
+        # The rows of a source file processed again can be written in files
+        # with a different name, duplicating the existing rows.
+        for src_file_name in src_file_names:
+            file_name = _get_processed_marker_file_name(src_file_name, dst_dir)
+            hdbg.dassert(
+                not os.path.exists(file_name),
+                "Source file '%s' has already been processed in incremental "
+                "mode",
+                src_file_name,
+            )
+    src_dataset = ds.dataset(src_file_names, format="parquet")
+    # Add the partition columns to the schema.
+    schema = src_dataset.schema
+    hdbg.dassert_in(asset_col_name, schema.names)
+    hdbg.dassert_in(timestamp_col_name, schema.names)
+    schema = schema.append(pa.field("year", pa.int64()))
+    schema = schema.append(pa.field("month", pa.int64()))
+    # Stream the data.
+    batches = _add_year_month_columns(
+        src_dataset.to_batches(batch_size=batch_size), timestamp_col_name
+    )
+    reader = pa.RecordBatchReader.from_batches(schema, batches)
+    partition_schema = pa.schema(
+        [schema.field(col) for col in [asset_col_name, "year", "month"]]
+    )
+    partitioning = ds.partitioning(partition_schema, flavor="hive")
+    # Collect the footers of the written files to update the tile index.
+    file_metadata_list = []
+
+    def _collect_file_metadata(written_file: Any) -> None:
+        file_metadata = written_file.metadata
+        file_metadata.set_file_path(os.path.relpath(written_file.path, dst_dir))
+        file_metadata_list.append(file_metadata)
+
+    ds.write_dataset(
+        reader,
+        dst_dir,
+        format="parquet",
+        partitioning=partitioning,
+        basename_template=basename_template,
+        existing_data_behavior="overwrite_or_ignore",
+        max_open_files=max_open_files,
+        max_rows_per_file=max_rows_per_file,
+        # Write row groups of at most one batch to bound the memory.
+        max_rows_per_group=batch_size,
+        file_visitor=_collect_file_metadata,
+    )
+    hparque.update_parquet_tile_index(dst_dir, file_metadata_list)
+    # Mark the source files as processed.
+    for src_file_name in src_file_names:
+        file_name = _get_processed_marker_file_name(src_file_name, dst_dir)
+        hio.to_file(file_name, src_file_name)
+    _LOG.info("Processed %s source files", len(src_file_names))
 
 
 # #############################################################################
@@ -424,10 +668,59 @@ def _parse() -> argparse.ArgumentParser:
     parser.add_argument(
         "--aws_profile",
         action="store",
-        required=True,
+        default=None,
         type=str,
         help="The AWS profile to use for `.aws/credentials` or for env vars",
     )
+    parser.add_argument(
+        "--prepare_tasks_func_name",
+        action="store",
+        type=str,
+        default="im_v2.common.data.transform.transform_pq_by_date_to_by_asset.streaming_prepare_tasks",
+        help="Function to prepare the tasks, e.g., `module.func`",
+    )
+    parser.add_argument(
+        "--execute_task_func_name",
+        action="store",
+        type=str,
+        default="im_v2.common.data.transform.transform_pq_by_date_to_by_asset.streaming_execute_task",
+        help="Function to execute a task, e.g., `module.func`",
+    )
+    parser.add_argument(
+        "--asset_col_name",
+        action="store",
+        type=str,
+        default="asset_id",
+        help="Name of the column with the asset ids",
+    )
+    parser.add_argument(
+        "--timestamp_col_name",
+        action="store",
+        type=str,
+        default="timestamp",
+        help="Name of the column with the timestamps to partition by month",
+    )
+    parser.add_argument(
+        "--batch_size",
+        action="store",
+        type=int,
+        default=128 * 1024,
+        help="Max number of rows to read at once",
+    )
+    parser.add_argument(
+        "--max_open_files",
+        action="store",
+        type=int,
+        default=512,
+        help="Max number of partition files to keep open at once",
+    )
+    parser.add_argument(
+        "--max_rows_per_file",
+        action="store",
+        type=int,
+        default=0,
+        help="Max number of rows in a written file, 0 for no limit",
+    )
     parser = hparser.add_parallel_processing_arg(parser)
     parser = hparser.add_verbosity_arg(parser)
     return parser
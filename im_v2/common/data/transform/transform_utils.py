@@ -460,6 +460,168 @@ def resample_bid_ask_data_from_1sec_to_1min(data: pd.DataFrame) -> pd.DataFrame:
     return data_1min
 
 
+def _get_1sec_to_1min_full_index(
+    index: pd.MultiIndex,
+) -> pd.MultiIndex:
+    """
+    Build the index with all the seconds between the first and the last
+    timestamp of each group.
+
+    :param index: index sorted by group and timestamp, where the last level
+        contains the timestamps, e.g.,
+        ```
+        exchange_id  currency_pair  timestamp
+        binance      BTC_USDT       2022-11-16 00:00:01+00:00
+                                    2022-11-16 00:00:04+00:00
+        ```
+    :return: index with all the missing seconds of each group, e.g.,
+        ```
+        exchange_id  currency_pair  timestamp
+        binance      BTC_USDT       2022-11-16 00:00:01+00:00
+                                    2022-11-16 00:00:02+00:00
+                                    2022-11-16 00:00:03+00:00
+                                    2022-11-16 00:00:04+00:00
+        ```
+    """
+    timestamps = index.get_level_values(-1)
+    # Find the boundaries of each group.
+    group_codes = pd.MultiIndex.from_arrays(
+        [index.get_level_values(i) for i in range(index.nlevels - 1)]
+    ).codes
+    is_group_start = np.zeros(len(index), dtype=bool)
+    is_group_start[0] = True
+    for codes in group_codes:
+        is_group_start[1:] |= codes[1:] != codes[:-1]
+    start_idxs = np.flatnonzero(is_group_start)
+    end_idxs = np.append(start_idxs[1:], len(index)) - 1
+    # Compute the number of seconds in each group.
+    one_sec = pd.Timedelta(seconds=1)
+    num_secs = (timestamps[end_idxs] - timestamps[start_idxs]) // one_sec + 1
+    num_secs = np.asarray(num_secs, dtype=np.int64)
+    # Build the timestamps of each group as the start plus offsets in seconds.
+    group_idxs = np.repeat(np.arange(len(start_idxs)), num_secs)
+    offsets = np.arange(num_secs.sum()) - np.repeat(
+        np.cumsum(num_secs) - num_secs, num_secs
+    )
+    full_timestamps = timestamps[start_idxs[group_idxs]] + pd.to_timedelta(
+        offsets, unit="s"
+    )
+    arrays = [
+        index.get_level_values(i)[start_idxs[group_idxs]]
+        for i in range(index.nlevels - 1)
+    ]
+    arrays.append(full_timestamps)
+    full_index = pd.MultiIndex.from_arrays(arrays, names=index.names)
+    return full_index
+
+
+def resample_bid_ask_data_from_1sec_to_1min_by_group(
+    data: pd.DataFrame, cols: List[str], group_cols: List[str]
+) -> pd.DataFrame:
+    """
+    Resample bid/ask data to 1 minute interval for all the groups at once.
+
+    This is equivalent to calling `resample_bid_ask_data_from_1sec_to_1min()`
+    on each group but it computes all the columns and all the groups in a
+    single pass:
+    - average the data in 1 second bars `[a, b)` labeled with `b`
+    - forward fill the missing seconds between the first and the last
+      timestamp of each group
+    - aggregate the 1 second bars in 1 minute bars `(a, b]` labeled with `b`,
+      computing the last, max, min and mean values
+
+    :param data: data indexed by timestamp, e.g.,
+        ```
+                                   currency_pair  bid_price_l1  bid_size_l1 ...
+        timestamp
+        2022-11-16 00:00:01+00:00       BTC_USDT         13.50       5450.0 ...
+        ```
+    :param cols: float columns to resample, e.g., `["bid_price_l1", ...]`
+    :param group_cols: columns to group by, e.g., `["currency_pair"]`
+    :return: resampled data indexed by the group columns and the timestamp
+        and with columns `(agg_func, col)`, e.g.,
+        ```
+                                                         last            ...
+                                                 bid_price_l1 bid_size_l1 ...
+        currency_pair timestamp
+        BTC_USDT      2022-11-16 00:01:00+00:00         13.50      5450.0 ...
+        ```
+    """
+    hdbg.dassert_isinstance(data.index, pd.DatetimeIndex)
+    hdbg.dassert_is_subset(cols, data.columns)
+    hdbg.dassert_lte(1, len(group_cols))
+    hdbg.dassert_is_subset(group_cols, data.columns)
+    timestamp_name = data.index.name
+    # Average in 1 second bars `[a, b)` labeled with `b`.
+    one_sec = pd.Timedelta(seconds=1)
+    timestamps_1sec = data.index.floor("s") + one_sec
+    keys = [data[col] for col in group_cols] + [
+        pd.Series(timestamps_1sec, index=data.index, name=timestamp_name)
+    ]
+    data_1sec = data[cols].groupby(keys, sort=True).mean()
+    # Forward fill the missing seconds of each group.
+    full_index = _get_1sec_to_1min_full_index(data_1sec.index)
+    data_1sec = data_1sec.reindex(full_index)
+    group_levels = list(range(len(group_cols)))
+    data_1sec = data_1sec.groupby(level=group_levels, sort=False).ffill()
+    # Aggregate in 1 minute bars `(a, b]` labeled with `b`.
+    timestamps_1min = (
+        data_1sec.index.get_level_values(-1).ceil("min").rename(timestamp_name)
+    )
+    keys = [
+        data_1sec.index.get_level_values(level) for level in group_levels
+    ] + [timestamps_1min]
+    grouped = data_1sec.groupby(keys, sort=False)
+    data_1min = pd.concat(
+        [grouped.last(), grouped.max(), grouped.min(), grouped.mean()],
+        axis=1,
+        keys=["last", "max", "min", "mean"],
+    )
+    return data_1min
+
+
+def _get_multilevel_bid_ask_cols() -> List[str]:
+    """
+    Get the bid/ask columns of all the levels of the order book.
+    """
+    cols = [
+        f"{col}_l{level}"
+        for level in range(1, NUMBER_LEVELS_OF_ORDER_BOOK + 1)
+        for col in BID_ASK_COLS
+    ]
+    return cols
+
+
+def _rename_multilevel_bid_ask_resampled_cols(
+    data_1min: pd.DataFrame,
+) -> pd.DataFrame:
+    """
+    Rename the columns resampled by
+    `resample_bid_ask_data_from_1sec_to_1min_by_group()` in the format of
+    `resample_multilevel_bid_ask_data_from_1sec_to_1min()`.
+
+    E.g., `("max", "bid_size_l1")` -> `level_1.bid_size.max`.
+    """
+    # Names of the aggregations for price and size columns.
+    agg_names = {
+        "last": ("close", "close"),
+        "max": ("high", "max"),
+        "min": ("low", "min"),
+        "mean": ("mean", "mean"),
+    }
+    cols = []
+    names = []
+    for level in range(1, NUMBER_LEVELS_OF_ORDER_BOOK + 1):
+        for agg_func, (price_agg_name, size_agg_name) in agg_names.items():
+            for col in BID_ASK_COLS:
+                agg_name = price_agg_name if "price" in col else size_agg_name
+                cols.append((agg_func, f"{col}_l{level}"))
+                names.append(f"level_{level}.{col}.{agg_name}")
+    data_1min = data_1min[cols]
+    data_1min.columns = names
+    return data_1min
+
+
 def resample_multilevel_bid_ask_data_from_1sec_to_1min(
     data: pd.DataFrame,
 ) -> pd.DataFrame:
@@ -475,20 +637,50 @@ def resample_multilevel_bid_ask_data_from_1sec_to_1min(
 
     :return DataFrame resampled to 1 minute.
     """
-    all_levels_resampled = []
-    for i in range(1, NUMBER_LEVELS_OF_ORDER_BOOK + 1):
-        bid_ask_cols_level = list(map(lambda x: f"{x}_l{i}", BID_ASK_COLS))
-        data_one_level = data[bid_ask_cols_level]
-        # Canonize column name for resampling function.
-        data_one_level.columns = BID_ASK_COLS
-        data_one_level = resample_bid_ask_data_from_1sec_to_1min(data_one_level)
-        # Uncanonize the column levels back.
-        data_one_level = data_one_level.rename(columns=lambda x: f"level_{i}.{x}")
-        all_levels_resampled.append(data_one_level)
-    # Drop duplicate columns because a vetical concatenation follows.
-    data_resampled = pd.concat(all_levels_resampled, axis=1)
-    # Insert exchange_id column
-    data_resampled["exchange_id"] = data["exchange_id"].iloc[0]
+    cols = _get_multilevel_bid_ask_cols()
+    # Group by exchange to carry it over, the data comes from a single exchange.
+    data_resampled = resample_bid_ask_data_from_1sec_to_1min_by_group(
+        data, cols, ["exchange_id"]
+    )
+    data_resampled = _rename_multilevel_bid_ask_resampled_cols(data_resampled)
+    data_resampled = data_resampled.reset_index(level="exchange_id")
+    # Move `exchange_id` to the end.
+    data_resampled["exchange_id"] = data_resampled.pop("exchange_id")
+    return data_resampled
+
+
+def resample_multisymbol_multilevel_bid_ask_data_from_1sec_to_1min(
+    data: pd.DataFrame,
+) -> pd.DataFrame:
+    """
+    Resample multilevel bid/ask data to 1 minute interval for multiple symbols.
+
+    This is equivalent to calling
+    `resample_multilevel_bid_ask_data_from_1sec_to_1min()` on the data of each
+    symbol, but all the symbols are resampled at once.
+
+    The method expects data in the following format:
+            exchange_id, currency_pair, bid_size_l1,bid_price_l1,...
+    timestamp 2022-11-16T00:00:01+00:00 binance, BTC_USDT, 5450, 13.50, ...
+
+    :return DataFrame resampled to 1 minute with the symbols in the order of
+        appearance in `data`
+    """
+    cols = _get_multilevel_bid_ask_cols()
+    data_resampled = resample_bid_ask_data_from_1sec_to_1min_by_group(
+        data, cols, ["currency_pair"]
+    )
+    data_resampled = _rename_multilevel_bid_ask_resampled_cols(data_resampled)
+    # Restore the order of the symbols.
+    currency_pairs = data["currency_pair"].unique()
+    data_resampled = data_resampled.loc[currency_pairs]
+    # Take the exchange of each symbol from the first row, like for a single
+    # symbol.
+    exchange_ids = data.groupby("currency_pair", sort=False)["exchange_id"].first()
+    data_resampled = data_resampled.reset_index(level="currency_pair")
+    currency_pair_col = data_resampled.pop("currency_pair")
+    data_resampled["exchange_id"] = currency_pair_col.map(exchange_ids)
+    data_resampled["currency_pair"] = currency_pair_col
     return data_resampled
 
 
@@ -512,42 +704,24 @@ def transform_and_resample_rt_bid_ask_data(
         ["timestamp", "exchange_id", "currency_pair", "level"]
     )
     # Convert timestamp to pd.Timestamp and set as index before sending for resampling.
-    df_raw["timestamp"] = df_raw["timestamp"].map(
-        hdateti.convert_unix_epoch_to_timestamp
-    )
+    df_raw["timestamp"] = pd.to_datetime(df_raw["timestamp"], unit="ms", utc=True)
     df_raw = df_raw.set_index("timestamp")
-    dfs_resampled = []
-    # Resample to 1 sec.
-    #  to match resample_bid_ask_data_from_1sec_to_1min() interface.
-    df_raw = (
-        df_raw.groupby(["exchange_id", "currency_pair", "level"])
-        .resample(rule="S", closed="left", label="left")
-        .mean()
+    # Resample all the symbols and levels at once.
+    group_cols = ["exchange_id", "currency_pair", "level"]
+    df_resampled = resample_bid_ask_data_from_1sec_to_1min_by_group(
+        df_raw, BID_ASK_COLS, group_cols
     )
-    # Drop level column, it's already in index
-    df_raw = df_raw.drop("level", axis=1)
-    # Resample to 1 min.
-    for group_cols, group in df_raw.groupby(
-        ["exchange_id", "currency_pair", "level"]
-    ):
-        df_part = resample_bid_ask_data_from_1sec_to_1min(
-            group.reset_index().set_index("timestamp")
-        )
-        # For DB we keep only mean columns.
-        mean_cols = list(filter(lambda col: "mean" in col, df_part.columns))
-        df_part = df_part[mean_cols]
-        df_part.columns = list(
-            map(lambda col: col.replace(".mean", ""), df_part.columns)
-        )
-        # Add the removed columns back.
-        df_part[["exchange_id", "currency_pair", "level"]] = group_cols
-        dfs_resampled.append(df_part)
-    df_resampled = pd.concat(dfs_resampled)
+    # For DB we keep only mean columns.
+    df_resampled = df_resampled["mean"]
+    # Add the group columns back after the data columns.
+    df_resampled = df_resampled.reset_index(level=group_cols)
+    df_resampled = df_resampled[BID_ASK_COLS + group_cols]
     # Convert back to unix timestamp after resampling
     df_resampled = df_resampled.reset_index()
-    df_resampled["timestamp"] = df_resampled["timestamp"].map(
-        hdateti.convert_timestamp_to_unix_epoch
-    )
+    df_resampled["timestamp"] = (
+        df_resampled["timestamp"].dt.tz_convert(None)
+        - pd.Timestamp("1970-01-01")
+    ) // pd.Timedelta("1ms")
     # This data is only reloaded from our DB so end_download_timestamp is None.
     df_resampled["end_download_timestamp"] = None
     # Round column values for readability.
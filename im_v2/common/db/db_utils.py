@@ -481,6 +481,9 @@ def save_data_to_db(
     db_table: str,
     # TODO(Vlad, Juraj): Implement the time_zone
     time_zone: str,
+    *,
+    use_copy: bool = False,
+    notification_channel: Optional[str] = None,
 ) -> None:
     """
     Save data into specified database table.
@@ -492,6 +495,12 @@ def save_data_to_db(
     :param db_connection: a database connection object
     :param db_table: name of the table to insert to.
     :param time_zone: time zone used to add correct knowledge_timestamp to the data
+    :param use_copy: stream the data with `COPY FROM STDIN` (see
+        `hsql.copy_rows_on_conflict_do_nothing()`), which is faster for large
+        data, e.g., multi-level bid / ask snapshots
+    :param notification_channel: if not None, notify the listeners of this
+        channel (e.g., a `PostgresBarNotifier`) after the data is inserted,
+        using the table name as payload
     """
     if data.empty:
         _LOG.warning("The DataFame is empty, nothing to insert.")
@@ -505,12 +514,19 @@ def save_data_to_db(
         unique_columns = TRADES_UNIQUE_COLUMNS
     else:
         raise ValueError(f"Invalid data_type='{data_type}'")
-    hsql.execute_insert_on_conflict_do_nothing_query(
-        connection=db_connection,
-        obj=data,
-        table_name=db_table,
-        unique_columns=unique_columns,
-    )
+    if use_copy:
+        hsql.copy_rows_on_conflict_do_nothing(
+            db_connection, data, db_table, unique_columns
+        )
+    else:
+        hsql.execute_insert_on_conflict_do_nothing_query(
+            connection=db_connection,
+            obj=data,
+            table_name=db_table,
+            unique_columns=unique_columns,
+        )
+    if notification_channel is not None:
+        hsql.notify(db_connection, notification_channel, payload=db_table)
 
 
 # #############################################################################
@@ -117,7 +117,24 @@ class TestSaveDataToDb(hunitest.TestCase):
         with self.assertRaises(imvcddbut.RETRY_EXCEPTION[0]):
             self._call_save_data_to_db()
 
-    def _call_save_data_to_db(self) -> None:
+    def test_save_data_to_db_with_copy1(self) -> None:
+        """
+        Test that the data is streamed with `COPY` when `use_copy=True`.
+        """
+        with umock.patch.object(
+            imvcddbut.hsql, "copy_rows_on_conflict_do_nothing"
+        ) as mock_copy:
+            self._call_save_data_to_db(use_copy=True)
+        # Check that the data was copied and not inserted.
+        self.assertEqual(mock_copy.call_count, 1)
+        _, _, table_name, unique_columns = mock_copy.call_args.args
+        self.assertEqual(table_name, "test_table")
+        self.assertEqual(unique_columns, imvcddbut.BID_ASK_UNIQUE_COLUMNS)
+        self.assertEqual(
+            self.mock_execute_insert_on_conflict_do_nothing_query.call_count, 0
+        )
+
+    def _call_save_data_to_db(self, *, use_copy: bool = False) -> None:
         """
         Call the `save_data_to_db` method with the stub data.
         """
@@ -129,5 +146,5 @@ class TestSaveDataToDb(hunitest.TestCase):
         time_zone = "UTC"
         # Call the method under test.
         imvcddbut.save_data_to_db(
-            data, data_type, db_connection, db_table, time_zone
+            data, data_type, db_connection, db_table, time_zone, use_copy=use_copy
         )
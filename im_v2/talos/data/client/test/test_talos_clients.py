@@ -1,16 +1,22 @@
+import logging
 from typing import Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 import pytest
 
 import helpers.henv as henv
+import helpers.hpandas as hpandas
 import helpers.hsql as hsql
+import helpers.htimer as htimer
 import im_v2.common.data.client as icdc
 import im_v2.common.db.db_utils as imvcddbut
 import im_v2.talos.data.client.talos_clients as imvtdctacl
 import im_v2.talos.data.client.talos_clients_example as imvtdctcex
 import im_v2.talos.db.utils as imvtadbut
 
+_LOG = logging.getLogger(__name__)
+
 
 def get_expected_column_names() -> List[str]:
     """
@@ -1268,6 +1274,114 @@ class TestTalosSqlRealTimeImClient1(
             actual, ["binance::BTC_USDT", "binance::ETH_USDT"], message
         )
 
+    def test_read_data_with_cache1(self) -> None:
+        """
+        Verify that reading through the cache returns the same data as reading
+        from the DB, also after new rows are written.
+        """
+        im_client = self.setup_talos_sql_client()
+        cached_im_client = self.setup_talos_sql_client()
+        cached_im_client.set_cache_mode(True)
+        full_symbols = ["binance::BTC_USDT", "binance::ETH_USDT"]
+        columns = None
+        filter_data_mode = "assert"
+        # Read the data for the first time.
+        start_ts = pd.Timestamp("2022-03-24T16:21:00-00:00", tz="UTC")
+        end_ts = pd.Timestamp("2022-03-24T16:22:00-00:00", tz="UTC")
+        expected = im_client.read_data(
+            full_symbols, start_ts, end_ts, columns, filter_data_mode
+        )
+        actual = cached_im_client.read_data(
+            full_symbols, start_ts, end_ts, columns, filter_data_mode
+        )
+        self.assert_equal(
+            hpandas.df_to_str(actual, num_rows=None),
+            hpandas.df_to_str(expected, num_rows=None),
+        )
+        # Write a new bar and read a window that includes it.
+        new_data = self._get_test_data().iloc[-2:]
+        new_data["id"] += 2
+        new_data["timestamp"] = 1648139040000
+        hsql.copy_rows_with_copy_from(self.connection, new_data, "talos_ohlcv")
+        start_ts = pd.Timestamp("2022-03-24T16:22:00-00:00", tz="UTC")
+        end_ts = pd.Timestamp("2022-03-24T16:24:00-00:00", tz="UTC")
+        expected = im_client.read_data(
+            full_symbols, start_ts, end_ts, columns, filter_data_mode
+        )
+        actual = cached_im_client.read_data(
+            full_symbols, start_ts, end_ts, columns, filter_data_mode
+        )
+        self.assert_equal(
+            hpandas.df_to_str(actual, num_rows=None),
+            hpandas.df_to_str(expected, num_rows=None),
+        )
+        self.assertEqual(expected.index.max(), end_ts)
+
+    def test_read_data_with_copy1(self) -> None:
+        """
+        Verify that reading with `COPY ... TO STDOUT` returns the same data as
+        fetching the rows through the cursor.
+        """
+        im_client = self.setup_talos_sql_client()
+        copy_im_client = self.setup_talos_sql_client()
+        copy_im_client.set_read_mode(use_copy=True)
+        full_symbols = ["binance::BTC_USDT", "binance::ETH_USDT"]
+        start_ts = pd.Timestamp("2022-03-24T16:21:00-00:00", tz="UTC")
+        end_ts = pd.Timestamp("2022-03-24T16:23:00-00:00", tz="UTC")
+        filter_data_mode = "assert"
+        for columns in [None, ["full_symbol", "close", "knowledge_timestamp"]]:
+            expected = im_client.read_data(
+                full_symbols, start_ts, end_ts, columns, filter_data_mode
+            )
+            actual = copy_im_client.read_data(
+                full_symbols, start_ts, end_ts, columns, filter_data_mode
+            )
+            self.assert_equal(
+                hpandas.df_to_str(actual, num_rows=None, print_dtypes=True),
+                hpandas.df_to_str(expected, num_rows=None, print_dtypes=True),
+            )
+
+    @pytest.mark.slow("Takes around 30 seconds")
+    def test_read_data_with_copy_perf1(self) -> None:
+        """
+        Compare the time to read 4 hours of 1-second data for 10 symbols with
+        `COPY ... TO STDOUT` and through the cursor.
+        """
+        num_symbols = 10
+        num_timestamps = 4 * 60 * 60
+        start_ts = pd.Timestamp("2022-03-24T16:00:00-00:00", tz="UTC")
+        end_ts = start_ts + pd.Timedelta(seconds=num_timestamps - 1)
+        # Replace the test data with the large table.
+        hsql.execute_query(self.connection, "DELETE FROM talos_ohlcv")
+        test_data = self._get_large_test_data(
+            start_ts, num_symbols, num_timestamps
+        )
+        hsql.copy_rows_with_copy_from(self.connection, test_data, "talos_ohlcv")
+        full_symbols = [
+            f"binance::{currency_pair}"
+            for currency_pair in test_data["currency_pair"].unique()
+        ]
+        columns = None
+        filter_data_mode = "assert"
+        elapsed_times = {}
+        dfs = {}
+        for use_copy in [False, True]:
+            im_client = self.setup_talos_sql_client(resample_1min=False)
+            im_client.set_read_mode(use_copy=use_copy)
+            timer = htimer.Timer()
+            dfs[use_copy] = im_client.read_data(
+                full_symbols, start_ts, end_ts, columns, filter_data_mode
+            )
+            elapsed_times[use_copy] = timer.get_elapsed()
+        _LOG.info(
+            "Read %s rows: cursor=%.3f s, copy=%.3f s",
+            dfs[True].shape[0],
+            elapsed_times[False],
+            elapsed_times[True],
+        )
+        self.assertEqual(dfs[True].shape[0], num_symbols * num_timestamps)
+        pd.testing.assert_frame_equal(dfs[True], dfs[False])
+
     def setUp(self) -> None:
         super().setUp()
         self._create_test_table()
@@ -1321,6 +1435,39 @@ class TestTalosSqlRealTimeImClient1(
         )
         return test_data
 
+    @staticmethod
+    def _get_large_test_data(
+        start_ts: pd.Timestamp, num_symbols: int, num_timestamps: int
+    ) -> pd.DataFrame:
+        """
+        Create a Talos OHLCV dataframe with 1-second bars for many symbols.
+        """
+        start_unix_epoch = int(start_ts.timestamp() * 1000)
+        timestamps = start_unix_epoch + 1000 * np.arange(num_timestamps)
+        num_rows = num_symbols * num_timestamps
+        prices = np.arange(num_rows) / 100.0
+        knowledge_timestamp = pd.Timestamp("2022-03-26", tz="UTC")
+        test_data = pd.DataFrame(
+            {
+                "id": np.arange(num_rows),
+                "timestamp": np.tile(timestamps, num_symbols),
+                "open": prices,
+                "high": prices + 1,
+                "low": prices - 1,
+                "close": prices,
+                "volume": np.arange(num_rows),
+                "ticks": np.arange(num_rows),
+                "currency_pair": np.repeat(
+                    [f"COIN{i}_USDT" for i in range(num_symbols)],
+                    num_timestamps,
+                ),
+                "exchange_id": "binance",
+                "end_download_timestamp": knowledge_timestamp,
+                "knowledge_timestamp": knowledge_timestamp,
+            }
+        )
+        return test_data
+
     @staticmethod
     def _get_expected_column_names() -> List[str]:
         """
@@ -18,6 +18,7 @@ import helpers.hobject as hobject
 import helpers.hpandas as hpandas
 import helpers.hprint as hprint
 import helpers.hwall_clock_time as hwacltim
+import market_data.bar_notifier as mdbanoti
 
 _LOG = logging.getLogger(__name__)
 
@@ -166,6 +167,8 @@ class MarketData(abc.ABC, hobject.PrintableMixin):
                 "No time limit is set via `max_iterations`. Interrupt manually if needed."
             )
         self._max_iterations = max_iterations
+        # By default sample the data source every `sleep_in_secs`.
+        self._bar_notifier: Optional[mdbanoti.BarNotifier] = None
 
     # /////////////////////////////////////////////////////////////////////////////
 
@@ -630,6 +633,17 @@ class MarketData(abc.ABC, hobject.PrintableMixin):
             _LOG.trace("-> ret=%s", ret)
         return ret
 
+    def set_bar_notifier(self, bar_notifier: mdbanoti.BarNotifier) -> None:
+        """
+        Wait for notifications of new bars instead of sampling the data source.
+
+        With a notifier, `wait_for_latest_data()` checks for the last bar as
+        soon as a notification arrives. If no notification arrives within
+        `sleep_in_secs`, it checks anyway, like in the default sampling mode.
+        """
+        hdbg.dassert_isinstance(bar_notifier, mdbanoti.BarNotifier)
+        self._bar_notifier = bar_notifier
+
     async def wait_for_latest_data(
         self,
     ) -> Tuple[pd.Timestamp, pd.Timestamp, int]:
@@ -637,6 +651,10 @@ class MarketData(abc.ABC, hobject.PrintableMixin):
         Wait until the bar with `end_time` == `current_bar_timestamp` is
         present in the RT DB.
 
+        In the default mode the RT DB is sampled every `sleep_in_secs`, while
+        with a bar notifier (see `set_bar_notifier()`) it is checked after
+        each notification.
+
         :return:
             - start_sampling_time: timestamp when the sampling started
             - end_sampling_time: timestamp when the sampling ended, since the bar
@@ -676,9 +694,8 @@ class MarketData(abc.ABC, hobject.PrintableMixin):
                 end_sampling_time = wall_clock_time
                 break
             # Raise timeout if wait time limit is exceeded.
-            if (
-                self._max_iterations is not None
-                and num_iter >= self._max_iterations
+            if self._is_timed_out(
+                num_iter, start_sampling_time, wall_clock_time
             ):
                 msg = " ".join(
                     [
@@ -691,9 +708,18 @@ class MarketData(abc.ABC, hobject.PrintableMixin):
                 _LOG.error(msg)
                 raise TimeoutError
             num_iter += 1
-            if _TRACE:
-                _LOG.trace("Sleep for %s secs", self._sleep_in_secs)
-            await asyncio.sleep(self._sleep_in_secs)
+            if self._bar_notifier is None:
+                if _TRACE:
+                    _LOG.trace("Sleep for %s secs", self._sleep_in_secs)
+                await asyncio.sleep(self._sleep_in_secs)
+            else:
+                if _TRACE:
+                    _LOG.trace(
+                        "Wait for a notification for %s secs",
+                        self._sleep_in_secs,
+                    )
+                is_notified = await self._bar_notifier.wait(self._sleep_in_secs)
+                _LOG.debug(hprint.to_str("is_notified"))
         if _TRACE:
             _LOG.trace(
                 "-> %s",
@@ -703,6 +729,27 @@ class MarketData(abc.ABC, hobject.PrintableMixin):
 
     # /////////////////////////////////////////////////////////////////////////////
 
+    def _is_timed_out(
+        self,
+        num_iter: int,
+        start_sampling_time: pd.Timestamp,
+        wall_clock_time: pd.Timestamp,
+    ) -> bool:
+        """
+        Return whether `wait_for_latest_data()` exceeded the time limit.
+        """
+        if self._max_iterations is None:
+            return False
+        if self._bar_notifier is None:
+            ret = num_iter >= self._max_iterations
+        else:
+            # Notifications can wake up the sampling more often than every
+            # `sleep_in_secs`, so the time limit is checked on the elapsed time.
+            time_out_in_secs = self._max_iterations * self._sleep_in_secs
+            elapsed_time = wall_clock_time - start_sampling_time
+            ret = elapsed_time >= pd.Timedelta(seconds=time_out_in_secs)
+        return ret
+
     @staticmethod
     def _process_period(
         timedelta: pd.Timedelta, wall_clock_time: pd.Timestamp
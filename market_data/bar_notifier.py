@@ -0,0 +1,119 @@
+"""
+Import as:
+
+import market_data.bar_notifier as mdbanoti
+"""
+
+import abc
+import asyncio
+import logging
+from typing import Optional
+
+import helpers.hdbg as hdbg
+import helpers.hsql as hsql
+
+_LOG = logging.getLogger(__name__)
+
+
+# #############################################################################
+# BarNotifier
+# #############################################################################
+
+
+class BarNotifier(abc.ABC):
+    """
+    Notify the consumers of market data that new bars are available.
+
+    A `MarketData` with a notifier (see `MarketData.set_bar_notifier()`) checks
+    for the latest bar as soon as a notification arrives, instead of sampling
+    the data source every `sleep_in_secs`.
+    """
+
+    @abc.abstractmethod
+    async def wait(self, timeout_in_secs: float) -> bool:
+        """
+        Wait for a notification of new data.
+
+        :param timeout_in_secs: max time to wait for
+        :return: whether a notification was received before the timeout
+        """
+        ...
+
+
+# #############################################################################
+# InProcessBarNotifier
+# #############################################################################
+
+
+class InProcessBarNotifier(BarNotifier):
+    """
+    Notify new bars from a writer running in the same event loop.
+
+    This is the in-process counterpart of `PostgresBarNotifier` (e.g., for
+    tests and simulations).
+    """
+
+    def __init__(self) -> None:
+        # The event is built lazily so that it is bound to the running event
+        # loop.
+        self._event: Optional[asyncio.Event] = None
+
+    def notify(self) -> None:
+        """
+        Signal that new data is available.
+
+        This needs to be called from the thread running the event loop, e.g.,
+        through `loop.call_soon_threadsafe(notifier.notify)` from a different
+        thread.
+        """
+        self._get_event().set()
+
+    async def wait(self, timeout_in_secs: float) -> bool:
+        hdbg.dassert_lt(0, timeout_in_secs)
+        event = self._get_event()
+        try:
+            await asyncio.wait_for(event.wait(), timeout_in_secs)
+        except asyncio.TimeoutError:
+            return False
+        # Consume the notification, so that the next call waits for new data.
+        event.clear()
+        return True
+
+    def _get_event(self) -> asyncio.Event:
+        if self._event is None:
+            self._event = asyncio.Event()
+        return self._event
+
+
+# #############################################################################
+# PostgresBarNotifier
+# #############################################################################
+
+
+class PostgresBarNotifier(BarNotifier):
+    """
+    Receive notifications of new bars through Postgres `LISTEN` / `NOTIFY`.
+
+    The writer sends a notification on `channel` after the data is committed
+    (e.g., `save_data_to_db(..., notification_channel=...)`).
+    """
+
+    def __init__(self, db_connection: hsql.DbConnection, channel: str) -> None:
+        """
+        Constructor.
+
+        :param db_connection: connection in autocommit mode used only to
+            listen to the notifications
+        :param channel: name of the notification channel
+        """
+        self._db_connection = db_connection
+        self._channel = channel
+        hsql.listen(self._db_connection, self._channel)
+
+    async def wait(self, timeout_in_secs: float) -> bool:
+        hdbg.dassert_lt(0, timeout_in_secs)
+        payloads = await hsql.wait_for_notifications(
+            self._db_connection, timeout_in_secs
+        )
+        _LOG.debug("Received %s notifications", len(payloads))
+        return len(payloads) > 0
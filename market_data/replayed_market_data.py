@@ -5,11 +5,13 @@ import market_data.replayed_market_data as mdremada
 """
 
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
+import numpy as np
 import pandas as pd
 
 import core.real_time as creatime
+import helpers.hdatetime as hdateti
 import helpers.hdbg as hdbg
 import helpers.hpandas as hpandas
 import helpers.hprint as hprint
@@ -34,6 +36,15 @@ class ReplayedMarketData(mdabmada.MarketData):
 
     Another approach to achieve the same goal is to mock the IM directly
     instead of this class.
+
+    The queries are answered using an index built once at construction:
+    - the timestamps of the sorted timestamp columns, to find the rows in an
+      interval with a binary search
+    - the running max of the knowledge timestamps, to find the rows that are
+      known "as of" a timestamp with a binary search
+    - the positions of the rows of each asset
+    If the index can't be used (e.g., the timestamp column is not sorted), the
+    data is filtered scanning the entire df.
     """
 
     def __init__(
@@ -78,6 +89,25 @@ class ReplayedMarketData(mdabmada.MarketData):
             self._df.sort_values(
                 [self._end_time_col_name, self._asset_id_col], inplace=True
             )
+        self._build_index()
+
+    def __str__(
+        self,
+        attr_names_to_skip: Optional[List[str]] = None,
+    ) -> str:
+        if attr_names_to_skip is None:
+            attr_names_to_skip = []
+        attr_names_to_skip.extend(self._get_index_attr_names())
+        return super().__str__(attr_names_to_skip=attr_names_to_skip)
+
+    def __repr__(
+        self,
+        attr_names_to_skip: Optional[List[str]] = None,
+    ) -> str:
+        if attr_names_to_skip is None:
+            attr_names_to_skip = []
+        attr_names_to_skip.extend(self._get_index_attr_names())
+        return super().__repr__(attr_names_to_skip=attr_names_to_skip)
 
     def should_be_online(self, wall_clock_time: pd.Timestamp) -> bool:
         return True
@@ -105,6 +135,221 @@ class ReplayedMarketData(mdabmada.MarketData):
             delay_in_secs = 0
         else:
             delay_in_secs = self._delay_in_secs
+        if ts_col_name in self._ts_values:
+            df_tmp = self._get_data_from_index(
+                start_ts,
+                end_ts,
+                ts_col_name,
+                asset_ids,
+                left_close,
+                right_close,
+                delay_in_secs,
+            )
+        else:
+            df_tmp = self._get_data_from_df(
+                start_ts,
+                end_ts,
+                ts_col_name,
+                asset_ids,
+                left_close,
+                right_close,
+                delay_in_secs,
+            )
+        # Handle `limit`.
+        if limit:
+            hdbg.dassert_lte(1, limit)
+            df_tmp = df_tmp.head(limit)
+        if _TRACE:
+            _LOG.trace("-> df_tmp=\n%s", hpandas.df_to_str(df_tmp))
+        return df_tmp
+
+    def _get_last_end_time(self) -> Optional[pd.Timestamp]:
+        # We need to find the last timestamp before the current time. We use
+        # `7W` but could also use all the data since we don't call the DB.
+        # TODO(gp): SELECT MAX(start_time) instead of getting all the data
+        #  and then find the max and use `start_time`
+        timedelta = pd.Timedelta("7D")
+        df = self.get_data_for_last_period(timedelta)
+        _LOG.debug(
+            hpandas.df_to_str(df, print_shape_info=True, tag="after get_data")
+        )
+        if df.empty:
+            ret = None
+        else:
+            ret = df.index.max()
+        _LOG.debug("-> ret=%s", ret)
+        return ret
+
+    # /////////////////////////////////////////////////////////////////////////
+
+    @staticmethod
+    def _get_index_attr_names() -> List[str]:
+        """
+        Return the names of the attributes storing the index.
+
+        The index is derived from `_df`, so it's not printed.
+        """
+        return [
+            "_ts_values",
+            "_knowledge_times",
+            "_knowledge_times_cummax",
+            "_asset_positions",
+        ]
+
+    @staticmethod
+    def _to_int64(srs: pd.Series) -> Optional[np.ndarray]:
+        """
+        Convert a datetime series to nanoseconds since epoch.
+
+        :return: array of nanoseconds or `None` if the series is not datetime
+            or contains NaTs
+        """
+        if not pd.api.types.is_datetime64_any_dtype(srs):
+            return None
+        if srs.isna().any():
+            return None
+        values = srs.values.astype("datetime64[ns]").view(np.int64)
+        return values
+
+    @staticmethod
+    def _ts_to_int64(ts: pd.Timestamp) -> int:
+        return pd.Timestamp(ts).value
+
+    def _build_index(self) -> None:
+        """
+        Build the data structures to answer the queries without scanning the
+        entire df.
+        """
+        # Map the name of a timestamp column to its sorted values.
+        self._ts_values: Dict[str, np.ndarray] = {}
+        if (
+            self._knowledge_datetime_col_name not in self._df.columns
+            or self._asset_id_col not in self._df.columns
+        ):
+            _LOG.debug("Can't build the index since columns are missing")
+            return
+        knowledge_times = self._to_int64(
+            self._df[self._knowledge_datetime_col_name]
+        )
+        if knowledge_times is None:
+            _LOG.debug("Can't build the index for the knowledge time")
+            return
+        # The knowledge timestamps are typically, but not necessarily, sorted.
+        # All the rows before the first one with a running max larger than the
+        # "as of" timestamp are known.
+        self._knowledge_times = knowledge_times
+        self._knowledge_times_cummax = np.maximum.accumulate(knowledge_times)
+        # Store the positions of the rows of each asset.
+        codes, asset_ids = pd.factorize(self._df[self._asset_id_col])
+        positions = np.argsort(codes, kind="stable")
+        counts = np.bincount(codes, minlength=len(asset_ids))
+        self._asset_positions: Dict[Any, np.ndarray] = dict(
+            zip(asset_ids, np.split(positions, np.cumsum(counts)[:-1]))
+        )
+        # Store the timestamp columns that can be searched with a binary
+        # search.
+        for col_name in [self._start_time_col_name, self._end_time_col_name]:
+            if col_name not in self._df.columns:
+                continue
+            values = self._to_int64(self._df[col_name])
+            if values is not None and np.all(values[1:] >= values[:-1]):
+                self._ts_values[col_name] = values
+        _LOG.debug("Built index for columns=%s", list(self._ts_values.keys()))
+
+    def _get_data_from_index(
+        self,
+        start_ts: Optional[pd.Timestamp],
+        end_ts: Optional[pd.Timestamp],
+        ts_col_name: str,
+        asset_ids: Optional[List[int]],
+        left_close: bool,
+        right_close: bool,
+        delay_in_secs: int,
+    ) -> pd.DataFrame:
+        """
+        Same interface as `_get_data_from_df()` but using the index.
+        """
+        if asset_ids is not None:
+            # Make sure that the requested asset_ids are in the df at some
+            # point.
+            hdbg.dassert_is_subset(asset_ids, self._asset_positions.keys())
+        # Handle `columns`.
+        columns = self._df.columns
+        if self._columns is not None:
+            hdbg.dassert_is_subset(self._columns, columns)
+            columns = self._columns
+        hdbg.dassert_in(ts_col_name, columns)
+        # Handle `period` finding the range of rows `[left_idx, right_idx)`.
+        ts_values = self._ts_values[ts_col_name]
+        if start_ts is not None:
+            side = "left" if left_close else "right"
+            left_idx = ts_values.searchsorted(self._ts_to_int64(start_ts), side)
+        else:
+            left_idx = 0
+        if end_ts is not None:
+            side = "right" if right_close else "left"
+            right_idx = ts_values.searchsorted(self._ts_to_int64(end_ts), side)
+        else:
+            right_idx = len(ts_values)
+        right_idx = max(left_idx, right_idx)
+        # Filter the data by the current time.
+        wall_clock_time = self.get_wall_clock_time()
+        if _TRACE:
+            _LOG.trace(hprint.to_str("wall_clock_time"))
+        hdateti.dassert_tz_compatible_timestamp_with_df(
+            wall_clock_time, self._df, self._knowledge_datetime_col_name
+        )
+        as_of_ts = wall_clock_time - pd.Timedelta(seconds=delay_in_secs)
+        as_of_ts = self._ts_to_int64(as_of_ts)
+        # All the rows before `known_idx` are known, while the ones after
+        # need to be checked one by one.
+        known_idx = self._knowledge_times_cummax.searchsorted(as_of_ts, "right")
+        known_idx = min(max(left_idx, known_idx), right_idx)
+        rows: Union[slice, np.ndarray]
+        if asset_ids is None:
+            # Handle `asset_ids`.
+            rows = slice(left_idx, known_idx)
+            if known_idx < right_idx:
+                tail_rows = np.arange(known_idx, right_idx)
+                tail_rows = tail_rows[
+                    self._knowledge_times[tail_rows] <= as_of_ts
+                ]
+                if tail_rows.size > 0:
+                    rows = np.concatenate(
+                        [np.arange(left_idx, known_idx), tail_rows]
+                    )
+        else:
+            # Handle `asset_ids`.
+            rows_list = [np.array([], dtype=np.int64)]
+            for asset_id in pd.unique(np.asarray(asset_ids)):
+                asset_rows = self._asset_positions[asset_id]
+                start_idx, end_idx = asset_rows.searchsorted(
+                    [left_idx, right_idx]
+                )
+                rows_list.append(asset_rows[start_idx:end_idx])
+            rows = np.sort(np.concatenate(rows_list))
+            is_known = (rows < known_idx) | (
+                self._knowledge_times[rows] <= as_of_ts
+            )
+            rows = rows[is_known]
+        df_tmp = self._df.iloc[rows]
+        if self._columns is not None:
+            df_tmp = df_tmp[self._columns]
+        return df_tmp
+
+    def _get_data_from_df(
+        self,
+        start_ts: Optional[pd.Timestamp],
+        end_ts: Optional[pd.Timestamp],
+        ts_col_name: str,
+        asset_ids: Optional[List[int]],
+        left_close: bool,
+        right_close: bool,
+        delay_in_secs: int,
+    ) -> pd.DataFrame:
+        """
+        Filter the data scanning the entire df.
+        """
         # TODO(gp): This assertion seems very slow. Move this check in a
         #  centralized place instead of calling it every time, if possible.
         if asset_ids is not None:
@@ -143,31 +388,8 @@ class ReplayedMarketData(mdabmada.MarketData):
             df_tmp = df_tmp[mask]
         if _TRACE:
             _LOG.trace("after df_tmp=\n%s", hpandas.df_to_str(df_tmp))
-        # Handle `limit`.
-        if limit:
-            hdbg.dassert_lte(1, limit)
-            df_tmp = df_tmp.head(limit)
-        if _TRACE:
-            _LOG.trace("-> df_tmp=\n%s", hpandas.df_to_str(df_tmp))
         return df_tmp
 
-    def _get_last_end_time(self) -> Optional[pd.Timestamp]:
-        # We need to find the last timestamp before the current time. We use
-        # `7W` but could also use all the data since we don't call the DB.
-        # TODO(gp): SELECT MAX(start_time) instead of getting all the data
-        #  and then find the max and use `start_time`
-        timedelta = pd.Timedelta("7D")
-        df = self.get_data_for_last_period(timedelta)
-        _LOG.debug(
-            hpandas.df_to_str(df, print_shape_info=True, tag="after get_data")
-        )
-        if df.empty:
-            ret = None
-        else:
-            ret = df.index.max()
-        _LOG.debug("-> ret=%s", ret)
-        return ret
-
 
 # #############################################################################
 # Serialize / deserialize example of DB.
@@ -0,0 +1,196 @@
+import asyncio
+import logging
+import time
+from typing import Optional, Tuple
+
+import pandas as pd
+
+import helpers.hasyncio as hasynci
+import helpers.hdatetime as hdateti
+import helpers.hsql as hsql
+import helpers.hunit_test as hunitest
+import im_v2.common.db.db_utils as imvcddbut
+import market_data.bar_notifier as mdbanoti
+import market_data.market_data_example as mdmadaex
+
+_LOG = logging.getLogger(__name__)
+
+
+class TestInProcessBarNotifier1(hunitest.TestCase):
+    """
+    Test `wait_for_latest_data()` with an `InProcessBarNotifier`.
+    """
+
+    def test_notification1(self) -> None:
+        """
+        The bar is checked as soon as the notification arrives.
+        """
+        notification_delay_in_secs = 10
+        start_time, end_time, num_iter = self._run(notification_delay_in_secs)
+        # Check.
+        expected_start_time = pd.Timestamp(
+            "2000-01-03 09:31:00-05:00", tz="America/New_York"
+        )
+        self.assertEqual(start_time, expected_start_time)
+        # Without notifications the bar is found only at the next sample, i.e.
+        # after `sleep_in_secs=30`.
+        expected_end_time = pd.Timestamp(
+            "2000-01-03 09:31:10-05:00", tz="America/New_York"
+        )
+        self.assertEqual(end_time, expected_end_time)
+        #
+        expected_num_iter = 1
+        self.assertEqual(num_iter, expected_num_iter)
+
+    def test_notification2(self) -> None:
+        """
+        A notification arrives before the bar is available.
+
+        The bar is not ready when the notification arrives, so the next check
+        happens after `sleep_in_secs`.
+        """
+        notification_delay_in_secs = 5
+        start_time, end_time, num_iter = self._run(notification_delay_in_secs)
+        # Check.
+        expected_start_time = pd.Timestamp(
+            "2000-01-03 09:31:00-05:00", tz="America/New_York"
+        )
+        self.assertEqual(start_time, expected_start_time)
+        #
+        expected_end_time = pd.Timestamp(
+            "2000-01-03 09:31:35-05:00", tz="America/New_York"
+        )
+        self.assertEqual(end_time, expected_end_time)
+        #
+        expected_num_iter = 2
+        self.assertEqual(num_iter, expected_num_iter)
+
+    def test_no_notification1(self) -> None:
+        """
+        Without notifications fall back to sampling every `sleep_in_secs`.
+        """
+        notification_delay_in_secs = None
+        start_time, end_time, num_iter = self._run(notification_delay_in_secs)
+        # Check.
+        expected_start_time = pd.Timestamp(
+            "2000-01-03 09:31:00-05:00", tz="America/New_York"
+        )
+        self.assertEqual(start_time, expected_start_time)
+        #
+        expected_end_time = pd.Timestamp(
+            "2000-01-03 09:31:30-05:00", tz="America/New_York"
+        )
+        self.assertEqual(end_time, expected_end_time)
+        #
+        expected_num_iter = 1
+        self.assertEqual(num_iter, expected_num_iter)
+
+    def _run(
+        self, notification_delay_in_secs: Optional[int]
+    ) -> Tuple[pd.Timestamp, pd.Timestamp, int]:
+        """
+        - Build a ReplayedMarketData with an `InProcessBarNotifier`
+        - Run `wait_for_latest_data()` while notifying a new bar after
+          `notification_delay_in_secs`, if not None
+        """
+        with hasynci.solipsism_context() as event_loop:
+            (market_data, _,) = mdmadaex.get_ReplayedTimeMarketData_example4(
+                event_loop,
+                replayed_delay_in_mins_or_timestamp=1,
+                start_datetime=pd.Timestamp(
+                    "2000-01-03 09:31:00-05:00", tz="America/New_York"
+                ),
+                end_datetime=pd.Timestamp(
+                    "2000-01-03 09:31:00-05:00", tz="America/New_York"
+                ),
+                asset_ids=[101, 202, 303],
+            )
+            bar_notifier = mdbanoti.InProcessBarNotifier()
+            market_data.set_bar_notifier(bar_notifier)
+            # Set the `current_bar_timestamp` that is needed inside
+            # `wait_for_latest_data()`.
+            current_timestamp = market_data.get_wall_clock_time()
+            bar_duration_in_secs = 60
+            hdateti.set_current_bar_timestamp(
+                current_timestamp, bar_duration_in_secs
+            )
+
+            async def _notify() -> None:
+                if notification_delay_in_secs is not None:
+                    await asyncio.sleep(notification_delay_in_secs)
+                    bar_notifier.notify()
+
+            # Run the method.
+            coroutines = [market_data.wait_for_latest_data(), _notify()]
+            (start_time, end_time, num_iter), _ = hasynci.run(
+                asyncio.gather(*coroutines),
+                event_loop=event_loop,
+            )
+        return start_time, end_time, num_iter
+
+
+class TestPostgresBarNotifier1(imvcddbut.TestImDbHelper):
+    """
+    Test `PostgresBarNotifier` with notifications sent through the DB.
+    """
+
+    @classmethod
+    def get_id(cls) -> int:
+        return hash(cls.__name__) % 10000
+
+    def setUp(self) -> None:
+        super().setUp()
+        # The notifier listens on a separate connection, while the writer
+        # notifies on `self.connection`.
+        connection_info = hsql.get_connection_info_from_env_file(
+            self.db_env_file
+        )
+        self.listen_connection = hsql.get_connection(
+            *connection_info, autocommit=True
+        )
+        self.bar_notifier = mdbanoti.PostgresBarNotifier(
+            self.listen_connection, "new_bars"
+        )
+
+    def tearDown(self) -> None:
+        self.listen_connection.close()
+        super().tearDown()
+
+    def test_notification1(self) -> None:
+        """
+        A notification wakes up the wait before the timeout.
+        """
+        timeout_in_secs = 10
+
+        async def _notify() -> None:
+            await asyncio.sleep(0.5)
+            hsql.notify(self.connection, "new_bars", payload="bars")
+
+        async def _run() -> bool:
+            is_notified, _ = await asyncio.gather(
+                self.bar_notifier.wait(timeout_in_secs), _notify()
+            )
+            return is_notified
+
+        start_time = time.time()
+        is_notified = asyncio.run(_run())
+        elapsed_time = time.time() - start_time
+        self.assertTrue(is_notified)
+        self.assertLess(elapsed_time, timeout_in_secs)
+
+    def test_no_notification1(self) -> None:
+        """
+        Without notifications the wait falls back to returning at the timeout.
+        """
+        timeout_in_secs = 0.5
+        # A notification on a different channel doesn't wake up the wait.
+        hsql.notify(self.connection, "other_bars", payload="bars")
+        start_time = time.time()
+        is_notified = asyncio.run(self.bar_notifier.wait(timeout_in_secs))
+        elapsed_time = time.time() - start_time
+        self.assertFalse(is_notified)
+        self.assertGreaterEqual(elapsed_time, timeout_in_secs)
+        # A notification sent before the wait is not lost.
+        hsql.notify(self.connection, "new_bars", payload="bars")
+        is_notified = asyncio.run(self.bar_notifier.wait(10))
+        self.assertTrue(is_notified)
@@ -1,8 +1,10 @@
 import logging
 from typing import Any, Callable, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
+import core.finance as cofinanc
 import helpers.hasyncio as hasynci
 import helpers.hdatetime as hdateti
 import helpers.hpandas as hpandas
@@ -733,3 +735,59 @@ class TestReplayedMarketData4(hunitest.TestCase):
                 event_loop=event_loop,
             )
         return start_time, end_time, num_iter
+
+
+# #############################################################################
+
+
+class TestReplayedMarketData5(hunitest.TestCase):
+    """
+    Check that querying the index matches filtering the entire df.
+    """
+
+    def test1(self) -> None:
+        start_datetime = pd.Timestamp("2000-01-03 09:31:00-05:00")
+        end_datetime = pd.Timestamp("2000-01-03 11:00:00-05:00")
+        asset_ids = [101, 202, 303]
+        df = cofinanc.generate_random_bars(
+            start_datetime, end_datetime, asset_ids
+        )
+        # Make the knowledge timestamps not sorted.
+        np.random.seed(10)
+        delays = np.random.randint(0, 180, size=len(df))
+        df["timestamp_db"] = df["end_datetime"] + pd.to_timedelta(
+            delays, unit="s"
+        )
+        with hasynci.solipsism_context() as event_loop:
+            (market_data, _,) = mdmadaex.get_ReplayedTimeMarketData_from_df(
+                event_loop,
+                30,
+                df,
+                delay_in_secs=5,
+            )
+            self.assertIn("end_datetime", market_data._ts_values)
+            self.assertIn("start_datetime", market_data._ts_values)
+            for ts_col_name in ["start_datetime", "end_datetime"]:
+                for asset_ids_ in [None, [202], [303, 101]]:
+                    for left_close, right_close in [(True, False), (False, True)]:
+                        for start_ts, end_ts in [
+                            (None, None),
+                            (start_datetime, start_datetime),
+                            (
+                                start_datetime + pd.Timedelta("10T"),
+                                start_datetime + pd.Timedelta("35T"),
+                            ),
+                        ]:
+                            args = (
+                                start_ts,
+                                end_ts,
+                                ts_col_name,
+                                asset_ids_,
+                                left_close,
+                                right_close,
+                                5,
+                            )
+                            actual = market_data._get_data_from_index(*args)
+                            expected = market_data._get_data_from_df(*args)
+                            self.assert_equal(str(actual), str(expected))
+                            self.assertTrue(actual.equals(expected))
@@ -343,105 +343,281 @@ def _get_execution_prices(
     return prices
 
 
-# TODO(Paul): This function allows us to get the execution price for one order
-#   at a time. It supports multiple (but untested) ways of doing this. Consider
-#   vectorizing this code or else adding a switch to invoke order-by-order
-#   processing.
-# def _get_execution_price(
-#     market_data: mdata.MarketData,
-#     order: oordorde.Order,
-#     *,
-#     timestamp_col: str = "end_datetime",
-#     column_remap: Optional[Dict[str, str]] = None,
-# ) -> float:
-#     """
-#     Get the simulated execution price of an order.
-#     """
-#     hdbg.dassert_isinstance(order, oordorde.Order)
-#     needed_columns = ["bid", "ask", "price", "midpoint"]
-#     if column_remap is None:
-#         column_remap = {col_name: col_name for col_name in needed_columns}
-#     hdbg.dassert_set_eq(column_remap.keys(), needed_columns)
-#     # Parse the order type.
-#     config = order.type_.split("@")
-#     hdbg.dassert_eq(len(config), 2, "Invalid type_='%s'", order.type_)
-#     price_type, timing = config
-#     # Get the price depending on the price_type.
-#     if price_type in ("price", "midpoint"):
-#         column = column_remap[price_type]
-#         prices = _get_price_per_share(
-#             market_data,
-#             order.start_timestamp,
-#             order.end_timestamp,
-#             timestamp_col,
-#             order.asset_id,
-#             column,
-#             timing,
-#         )
-#     elif price_type == "full_spread":
-#         # Cross the spread depending on buy / sell.
-#         if order.diff_num_shares >= 0:
-#             column = "ask"
-#         else:
-#             column = "bid"
-#         column = column_remap[column]
-#         prices = _get_price_per_share(
-#             market_data,
-#             order.start_timestamp,
-#             order.end_timestamp,
-#             timestamp_col,
-#             order.asset_id,
-#             column,
-#             timing,
-#         )
-#     elif price_type.startswith("partial_spread"):
-#         # Pay part of the spread depending on the parameter encoded in the
-#         # `price_type` (e.g., TWAP).
-#         perc = float(price_type.split("_")[2])
-#         hdbg.dassert_lte(0, perc)
-#         hdbg.dassert_lte(perc, 1.0)
-#         column = column_remap["bid"]
-#         bid_price = _get_price_per_share(
-#             market_data,
-#             order.start_timestamp,
-#             order.end_timestamp,
-#             timestamp_col,
-#             order.asset_id,
-#             column,
-#             timing,
-#         )
-#         column = column_remap["ask"]
-#         ask_price = _get_price_per_share(
-#             market_data,
-#             order.start_timestamp,
-#             order.end_timestamp,
-#             timestamp_col,
-#             order.asset_id,
-#             column,
-#             timing,
-#         )
-#         if order.diff_num_shares >= 0:
-#             # We need to buy:
-#             # - if perc == 1.0 pay ask (i.e., pay full-spread)
-#             # - if perc == 0.5 pay midpoint
-#             # - if perc == 0.0 pay bid
-#             price = perc * ask_price + (1.0 - perc) * bid_price
-#         else:
-#             # We need to sell:
-#             # - if perc == 1.0 pay bid (i.e., pay full-spread)
-#             # - if perc == 0.5 pay midpoint
-#             # - if perc == 0.0 pay ask
-#             price = (1.0 - perc) * ask_price + perc * bid_price
-#     else:
-#         raise ValueError(f"Invalid type='{order.type_}'")
-#     _LOG.debug(
-#         "type=%s, start_timestamp=%s, end_timestamp=%s -> execution_price=%s",
-#         order.type_,
-#         order.start_timestamp,
-#         order.end_timestamp,
-#         price,
-#     )
-#     return prices
+# The following functions implement the approach 1) for a batch of orders with
+# different types, execution intervals, and assets at once, retrieving the
+# market data with a single query and computing the prices of all the orders
+# with a single grouped computation.
+
+
+def _to_nanoseconds(timestamps: Any) -> np.ndarray:
+    """
+    Convert timestamps into nanoseconds since epoch.
+    """
+    timestamps = pd.DatetimeIndex(timestamps)
+    return timestamps.values.astype("datetime64[ns]").view(np.int64)
+
+
+def _parse_order_type(order_type: str) -> Tuple[str, str]:
+    """
+    Split an order type (e.g., `partial_spread_0.5@twap`) in price type and
+    timing.
+    """
+    config = order_type.split("@")
+    hdbg.dassert_eq(len(config), 2, "Invalid type_='%s'", order_type)
+    price_type, timing = config
+    hdbg.dassert_in(timing, ("start", "end", "twap"))
+    return price_type, timing
+
+
+def _get_price_windows(
+    orders_df: pd.DataFrame,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compute the window of market data used to price each order.
+
+    :param orders_df: df with the columns `timing`, `start_timestamp`,
+        `end_timestamp` with one row per order
+    :return: arrays with one element per order with
+        - the start and end of the window as nanoseconds since epoch
+        - whether the start and end of the window are included
+    """
+    start_ts = _to_nanoseconds(orders_df["start_timestamp"])
+    end_ts = _to_nanoseconds(orders_df["end_timestamp"])
+    timing = orders_df["timing"].to_numpy()
+    is_twap = timing == "twap"
+    # The TWAP is computed on `(start_timestamp, end_timestamp]`, like in
+    # `MarketData.get_twap_price()`.
+    # The price at a timestamp `ts` is looked up in `[ts - 1s, ts + 1s)`, like
+    # in `MarketData.get_data_at_timestamp()`.
+    ts = np.where(timing == "start", start_ts, end_ts)
+    one_sec = pd.Timedelta("1S").value
+    lo = np.where(is_twap, start_ts, ts - one_sec)
+    hi = np.where(is_twap, end_ts, ts + one_sec)
+    lo_included = ~is_twap
+    hi_included = is_twap
+    return lo, hi, lo_included, hi_included
+
+
+def _get_prices_over_windows(
+    data: pd.DataFrame,
+    timestamp_col: str,
+    asset_id_col: str,
+    columns: List[str],
+    orders_df: pd.DataFrame,
+) -> pd.DataFrame:
+    """
+    Compute the average of `columns` in the window of each order.
+
+    :param data: market data as returned by `MarketData.get_data_for_interval()`
+    :param orders_df: df with one row per order (see `_get_price_windows()`)
+    :return: df with the average of `columns` and the number of rows `count` in
+        the window of each order, indexed like `orders_df`
+    """
+    # Get the timestamps to filter on, which can be the index (e.g., for
+    # `end_datetime`) or a column (e.g., for `start_datetime`).
+    if timestamp_col in data.columns:
+        timestamps = _to_nanoseconds(data[timestamp_col])
+    else:
+        hdbg.dassert_eq(data.index.name, timestamp_col)
+        timestamps = _to_nanoseconds(data.index)
+    # Sort the data by asset and timestamp preserving the order of the rows
+    # with the same asset and timestamp.
+    asset_codes, asset_ids = pd.factorize(data[asset_id_col])
+    sort_idxs = np.lexsort((timestamps, asset_codes))
+    # Assign to each row a key increasing with asset and timestamp, so that the
+    # rows of an asset in a time interval are contiguous.
+    unique_timestamps = np.unique(timestamps)
+    num_ranks = len(unique_timestamps) + 1
+    ranks = np.searchsorted(unique_timestamps, timestamps)
+    keys = (asset_codes * num_ranks + ranks)[sort_idxs]
+    # Find the range of rows `[lo_idxs, hi_idxs)` for each order.
+    lo, hi, lo_included, hi_included = _get_price_windows(orders_df)
+    order_asset_codes = pd.Index(asset_ids).get_indexer(orders_df["asset_id"])
+    lo_ranks = np.where(
+        lo_included,
+        np.searchsorted(unique_timestamps, lo, "left"),
+        np.searchsorted(unique_timestamps, lo, "right"),
+    )
+    hi_ranks = np.where(
+        hi_included,
+        np.searchsorted(unique_timestamps, hi, "right"),
+        np.searchsorted(unique_timestamps, hi, "left"),
+    )
+    lo_idxs = np.searchsorted(keys, order_asset_codes * num_ranks + lo_ranks)
+    hi_idxs = np.searchsorted(keys, order_asset_codes * num_ranks + hi_ranks)
+    # There is no data for the assets that are not in the market data.
+    is_missing = order_asset_codes < 0
+    lo_idxs[is_missing] = 0
+    hi_idxs[is_missing] = 0
+    hi_idxs = np.maximum(lo_idxs, hi_idxs)
+    # Gather the rows of all the windows.
+    counts = hi_idxs - lo_idxs
+    num_rows = counts.sum()
+    offsets = np.cumsum(counts) - counts
+    row_idxs = (
+        np.arange(num_rows)
+        - np.repeat(offsets, counts)
+        + np.repeat(lo_idxs, counts)
+    )
+    order_idxs = np.repeat(np.arange(len(orders_df)), counts)
+    window_data = data[columns].iloc[sort_idxs[row_idxs]]
+    window_data.index = order_idxs
+    # Compute the average of each window.
+    prices = window_data.groupby(level=0).mean()
+    prices = prices.reindex(np.arange(len(orders_df)))
+    prices.index = orders_df.index
+    prices["count"] = counts
+    return prices
+
+
+def get_execution_prices_for_orders(
+    market_data: mdata.MarketData,
+    orders: List[oordorde.Order],
+    *,
+    timestamp_col: str = "end_datetime",
+    column_remap: Optional[Dict[str, str]] = None,
+) -> pd.Series:
+    """
+    Get the simulated execution prices of a batch of orders.
+
+    Unlike `_get_execution_prices()`, the orders can have different types,
+    start and end timestamps (e.g., all the orders of a day). The market data
+    is retrieved with a single query for all the orders with the same delay
+    and the prices of all the orders are computed together.
+
+    :param column_remap: remap columns from `market_data` to the canonical
+        columns (e.g., "bid", "ask", "price", "midpoint")
+    :return: series of prices with one element per order in the same order
+        as `orders`, e.g.,
+        ```
+        0    997.93
+        1    1001.2
+        ```
+        The price is NaN if it can't be computed
+    """
+    _LOG.debug(hprint.to_str("orders"))
+    needed_columns = ["bid", "ask", "price", "midpoint"]
+    if column_remap is None:
+        column_remap = {col_name: col_name for col_name in needed_columns}
+    hdbg.dassert_set_eq(column_remap.keys(), needed_columns)
+    hdbg.dassert_container_type(orders, list, oordorde.Order)
+    hdbg.dassert(orders)
+    # Convert the orders into a df.
+    orders_df = pd.DataFrame(
+        {
+            "type_": [order.type_ for order in orders],
+            "asset_id": [order.asset_id for order in orders],
+            "start_timestamp": [order.start_timestamp for order in orders],
+            "end_timestamp": [order.end_timestamp for order in orders],
+            "diff_num_shares": [order.diff_num_shares for order in orders],
+        }
+    )
+    for col_name in ["start_timestamp", "end_timestamp"]:
+        orders_df[col_name] = pd.to_datetime(orders_df[col_name], utc=True)
+    hdbg.dassert(
+        (orders_df["start_timestamp"] < orders_df["end_timestamp"]).all()
+    )
+    # Parse the order types.
+    order_types = orders_df["type_"].unique()
+    parsed_order_types = {
+        order_type: _parse_order_type(order_type) for order_type in order_types
+    }
+    orders_df["price_type"] = orders_df["type_"].map(
+        lambda x: parsed_order_types[x][0]
+    )
+    orders_df["timing"] = orders_df["type_"].map(
+        lambda x: parsed_order_types[x][1]
+    )
+    # Compute the columns needed to price the orders.
+    columns = set()
+    for price_type, _ in parsed_order_types.values():
+        if price_type in ("price", "midpoint"):
+            columns.add(column_remap[price_type])
+        elif price_type.startswith("partial_spread"):
+            columns.update([column_remap["bid"], column_remap["ask"]])
+        else:
+            raise ValueError(f"Invalid type='{price_type}'")
+    columns = sorted(columns)
+    # The TWAP prices are observed ignoring the market delay (see the comment
+    # in `_get_price_per_share()`), while the prices at a timestamp are not.
+    window_prices = []
+    is_twap = orders_df["timing"] == "twap"
+    for ignore_delay in (True, False):
+        orders_df_tmp = orders_df[is_twap == ignore_delay]
+        if orders_df_tmp.empty:
+            continue
+        # Retrieve all the data needed by the orders with one query.
+        lo, hi, _, _ = _get_price_windows(orders_df_tmp)
+        tz = orders[0].start_timestamp.tz
+        start_ts = pd.Timestamp(lo.min(), tz="UTC").tz_convert(tz)
+        end_ts = pd.Timestamp(hi.max(), tz="UTC").tz_convert(tz)
+        asset_ids = sorted(orders_df_tmp["asset_id"].unique().tolist())
+        data = market_data.get_data_for_interval(
+            start_ts,
+            end_ts,
+            timestamp_col,
+            asset_ids,
+            left_close=True,
+            right_close=True,
+            ignore_delay=ignore_delay,
+        )
+        if _TRACE:
+            _LOG.trace("data=\n%s", hpandas.df_to_str(data, precision=2))
+        hdbg.dassert_is_subset(columns, data.columns)
+        window_prices_tmp = _get_prices_over_windows(
+            data,
+            timestamp_col,
+            market_data.asset_id_col,
+            columns,
+            orders_df_tmp,
+        )
+        window_prices.append(window_prices_tmp)
+    window_prices = pd.concat(window_prices).sort_index()
+    # Check that there is market data for each order.
+    counts = window_prices["count"]
+    hdbg.dassert_lte(
+        1,
+        counts.min(),
+        "No market data to price orders=\n%s",
+        orders_df[counts == 0],
+    )
+    is_at_timestamp = orders_df["timing"] != "twap"
+    hdbg.dassert_lte(
+        counts[is_at_timestamp].to_numpy().max(initial=0),
+        1,
+        "Multiple prices for orders=\n%s",
+        orders_df[is_at_timestamp & (counts > 1)],
+    )
+    for column in columns:
+        hdbg.dassert(
+            not window_prices[column].isna().all(),
+            "window_prices=%s",
+            window_prices,
+        )
+    # Compute the price for each price type.
+    prices = pd.Series(np.nan, index=orders_df.index)
+    for price_type, _ in parsed_order_types.values():
+        mask = orders_df["price_type"] == price_type
+        if price_type in ("price", "midpoint"):
+            column = column_remap[price_type]
+            prices[mask] = window_prices.loc[mask, column]
+        else:
+            perc = float(price_type.split("_")[2])
+            hdbg.dassert_lte(0, perc)
+            hdbg.dassert_lte(perc, 1.0)
+            bids = window_prices.loc[mask, column_remap["bid"]]
+            asks = window_prices.loc[mask, column_remap["ask"]]
+            is_buy = orders_df.loc[mask, "diff_num_shares"] >= 0
+            # If perc == 0, we buy at the bid and sell at the ask (we collect
+            # the spread).
+            # If perc == 1, we buy at the ask and sell at the bid (we cross
+            # the spread).
+            buy_prices = (1.0 - perc) * bids + perc * asks
+            sell_prices = perc * bids + (1.0 - perc) * asks
+            prices[mask] = np.where(is_buy, buy_prices, sell_prices)
+    if _TRACE:
+        _LOG.trace("prices=\n%s", hpandas.df_to_str(prices, precision=2))
+    return prices
 
 
 # #############################################################################
@@ -459,25 +635,24 @@ def fill_orders_fully_at_once(
     Execute orders fully (i.e., with no missing fills) with one single fill.
 
     :param market_data, timestamp_col, column_remap: used to retrieve prices
-    :param orders: list of orders to execute
+    :param orders: list of orders to execute, possibly with different types,
+        start and end timestamps
     """
     _LOG.debug(hprint.to_str("orders"))
-    # TODO(Paul): The function `_get_execution_prices()` should be
+    # TODO(Paul): The function `get_execution_prices_for_orders()` should be
     #  configurable.
-    prices = _get_execution_prices(
+    prices = get_execution_prices_for_orders(
         market_data,
         orders,
         timestamp_col=timestamp_col,
         column_remap=column_remap,
     )
     fills = []
-    for order in orders:
+    for order, price in zip(orders, prices):
         _LOG.debug(hprint.to_str("order"))
         # Extract the information from the order.
         end_timestamp = order.end_timestamp
         num_shares = order.diff_num_shares
-        hdbg.dassert_in(order.asset_id, prices.index)
-        price = prices[order.asset_id]
         if not np.isfinite(price):
             _LOG.warning("Unable to fill order=\n%s", order)
             continue
@@ -563,14 +738,11 @@ def fill_orders_fully_twap(
     )
     # Split the orders in child orders over the period of time.
     child_orders = _split_in_child_twap_orders(orders, freq_as_pd_string)
-    #
-    fills = []
-    for order in child_orders:
-        fills_tmp = fill_orders_fully_at_once(
-            market_data, timestamp_col, column_remap, [order]
-        )
-        hdbg.dassert_eq(len(fills_tmp), 1)
-        fills.append(fills_tmp[0])
+    # Fill all the child orders at once.
+    fills = fill_orders_fully_at_once(
+        market_data, timestamp_col, column_remap, child_orders
+    )
+    hdbg.dassert_eq(len(fills), len(child_orders))
     return fills
 
 
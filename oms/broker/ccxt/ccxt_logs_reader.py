@@ -3,17 +3,20 @@ Import as:
 
 import oms.broker.ccxt.ccxt_logs_reader as obcclore
 """
+import concurrent.futures
+import glob
+import hashlib
 import logging
 import os
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 import numpy as np
 import pandas as pd
 from tqdm.autonotebook import tqdm
 
-import helpers.hdatetime as hdateti
 import helpers.hdbg as hdbg
 import helpers.hio as hio
+import helpers.hpickle as hpickle
 import oms.broker.ccxt.abstract_ccxt_broker as obcaccbr
 
 # TODO(Danya): CMTask4420.
@@ -25,6 +28,29 @@ import datetime  # pylint: disable=unused-import
 
 _LOG = logging.getLogger(__name__)
 
+
+def _convert_timestamps_to_utc(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert the timestamp columns of a df to UTC.
+
+    A column is converted if it has a tz-aware dtype or if all its non-null
+    values are `pd.Timestamp`s (e.g., timestamps with different timezones or
+    missing values). The other columns are left unchanged.
+    """
+    df = df.copy()
+    for col in df.columns:
+        srs = df[col]
+        if isinstance(srs.dtype, pd.DatetimeTZDtype):
+            df[col] = srs.dt.tz_convert("UTC")
+        elif srs.dtype == object:
+            values = srs.dropna()
+            if len(values) > 0 and all(
+                isinstance(val, pd.Timestamp) for val in values
+            ):
+                df[col] = pd.to_datetime(srs, utc=True)
+    return df
+
+
 # #############################################################################
 # CcxtLogsReader
 # #############################################################################
@@ -64,18 +90,31 @@ class CcxtLogsReader:
                   and 'realizedPNL' fields
                 - Works only for v2
     ```
+
+    The JSON files are read by a pool of threads. If `cache_dir` is passed,
+    each loaded DataFrame is cached in `cache_dir` as a pickle file keyed by
+    the names, sizes and modification times of the JSON files it was built
+    from, so that loading the same logs again reads a single file.
     """
 
     def __init__(
         self,
         root_dir: str,
+        *,
+        num_threads: int = 8,
+        cache_dir: Optional[str] = None,
     ):
         """
         :param root_dir: root location of broker logs,
           e.g. /shared_data/system_log_dir_20230315_30minutes/
+        :param num_threads: number of threads reading the JSON files
+        :param cache_dir: dir to cache the loaded DataFrames, e.g.,
+          `{root_dir}/cache`; if None, the DataFrames are not cached
         """
-        #
+        hdbg.dassert_lte(1, num_threads)
         self._root_dir = root_dir
+        self._num_threads = num_threads
+        self._cache_dir = cache_dir
         self._get_log_subdirectories()
 
     def load_all_data(self) -> Dict[str, pd.DataFrame]:
@@ -134,16 +173,19 @@ class CcxtLogsReader:
         """
         # Get the files.
         files = self._get_files(self._ccxt_order_responses_dir)
-        # Read all the files.
-        ccxt_order_responses = []
-        for path in tqdm(
-            files, desc=f"Loading files from '{self._ccxt_order_responses_dir}'"
-        ):
-            data = hio.from_json(path, use_types=True)
-            ccxt_order_responses.append(data)
-        # Assemble the output df.
-        ccxt_order_responses = self._convert_ccxt_order_structures_to_dataframe(
-            ccxt_order_responses
+
+        def _load() -> pd.DataFrame:
+            # Read all the files.
+            ccxt_order_responses = self._load_json_files(
+                files, self._ccxt_order_responses_dir, flatten=False
+            )
+            # Assemble the output df.
+            return self._convert_ccxt_order_structures_to_dataframe(
+                ccxt_order_responses
+            )
+
+        ccxt_order_responses = self._load_df_with_cache(
+            "ccxt_order_responses", files, _load
         )
         return ccxt_order_responses
 
@@ -163,18 +205,17 @@ class CcxtLogsReader:
         files = self._get_files(
             self._oms_parent_orders_dir, file_extension="json"
         )
-        # Read all the files.
-        parent_orders = []
-        # Load individual orders as pd.Series.
-        for path in tqdm(
-            files, desc=f"Loading files from '{self._oms_parent_orders_dir}'"
-        ):
-            # Load parent order files from JSON format.
-            data = hio.from_json(path, use_types=True)
-            parent_orders.extend(data)
-        # Assemble the output df.
-        oms_parent_order_df = self._convert_oms_parent_orders_to_dataframe(
-            parent_orders
+
+        def _load() -> pd.DataFrame:
+            # Read all the files. Each file contains a list of parent orders.
+            parent_orders = self._load_json_files(
+                files, self._oms_parent_orders_dir, flatten=True
+            )
+            # Assemble the output df.
+            return self._convert_oms_parent_orders_to_dataframe(parent_orders)
+
+        oms_parent_order_df = self._load_df_with_cache(
+            "oms_parent_orders", files, _load
         )
         return oms_parent_order_df
 
@@ -216,20 +257,20 @@ class CcxtLogsReader:
         """
         # Get the files.
         files = self._get_files(self._oms_child_orders_dir)
-        # Read all the files.
-        child_orders = []
-        # Load individual orders as pd.Series.
-        for path in tqdm(
-            files, desc=f"Loading files from '{self._oms_child_orders_dir}'"
-        ):
-            # Load individual orders in pd.Series format.
-            data = hio.from_json(path, use_types=True)
-            child_orders.append(data)
-        # Assemble the output df.
-        oms_child_orders_df = self._convert_oms_child_orders_to_dataframe(
-            child_orders,
-            unpack_extra_params=unpack_extra_params,
-        )
+
+        def _load() -> pd.DataFrame:
+            # Read all the files. Each file contains a single child order.
+            child_orders = self._load_json_files(
+                files, self._oms_child_orders_dir, flatten=False
+            )
+            # Assemble the output df.
+            return self._convert_oms_child_orders_to_dataframe(
+                child_orders,
+                unpack_extra_params=unpack_extra_params,
+            )
+
+        cache_name = f"oms_child_orders.unpack_extra_params_{unpack_extra_params}"
+        oms_child_orders_df = self._load_df_with_cache(cache_name, files, _load)
         return oms_child_orders_df
 
     def load_ccxt_trades_df(self) -> pd.DataFrame:
@@ -300,16 +341,19 @@ class CcxtLogsReader:
         """
         # Get the files.
         files = self._get_files(self._ccxt_trades_dir)
-        # Read all the files.
-        ccxt_child_order_trades = []
-        for path in tqdm(
-            files, desc=f"Loading files from '{self._ccxt_trades_dir}'"
-        ):
-            data = hio.from_json(path, use_types=True)
-            ccxt_child_order_trades.extend(data)
-        # Convert fills to DataFrame.
-        ccxt_child_order_trades = self._convert_ccxt_trades_json_to_dataframe(
-            ccxt_child_order_trades
+
+        def _load() -> pd.DataFrame:
+            # Read all the files.
+            ccxt_child_order_trades = self._load_json_files(
+                files, self._ccxt_trades_dir, flatten=True
+            )
+            # Convert fills to DataFrame.
+            return self._convert_ccxt_trades_json_to_dataframe(
+                ccxt_child_order_trades
+            )
+
+        ccxt_child_order_trades = self._load_df_with_cache(
+            "ccxt_trades", files, _load
         )
         # Remove full duplicates for fills.
         # Note: generally fills are loaded in bulk via CCXT `fetchMyTrades()`
@@ -355,13 +399,16 @@ class CcxtLogsReader:
         Works only for version v2.
         """
         files = self._get_files(self._oms_fills_dir)
-        oms_child_order_fills = []
-        for path in tqdm(
-            files, desc=f"Loading files from '{self._oms_fills_dir}'"
-        ):
-            data = hio.from_json(path, use_types=True)
-            oms_child_order_fills.extend(data)
-        oms_child_order_fills = pd.DataFrame(oms_child_order_fills)
+
+        def _load() -> pd.DataFrame:
+            oms_child_order_fills = self._load_json_files(
+                files, self._oms_fills_dir, flatten=True
+            )
+            return pd.DataFrame(oms_child_order_fills)
+
+        oms_child_order_fills = self._load_df_with_cache(
+            "oms_fills", files, _load
+        )
         return oms_child_order_fills
 
     def load_ccxt_fills_df(self) -> pd.DataFrame:
@@ -453,13 +500,14 @@ class CcxtLogsReader:
         Works only for version v2.
         """
         files = self._get_files(self._ccxt_fills_dir)
-        ccxt_fills = []
-        for path in tqdm(
-            files, desc=f"Loading `{self._ccxt_fills_dir}` files..."
-        ):
-            data = hio.from_json(path, use_types=True)
-            ccxt_fills.extend(data)
-        ccxt_fills = self._convert_ccxt_order_structures_to_dataframe(ccxt_fills)
+
+        def _load() -> pd.DataFrame:
+            ccxt_fills = self._load_json_files(
+                files, self._ccxt_fills_dir, flatten=True
+            )
+            return self._convert_ccxt_order_structures_to_dataframe(ccxt_fills)
+
+        ccxt_fills = self._load_df_with_cache("ccxt_fills", files, _load)
         return ccxt_fills
 
     @staticmethod
@@ -483,6 +531,74 @@ class CcxtLogsReader:
         files.sort()
         return files
 
+    def _load_json_files(
+        self, files: List[str], log_dir: str, *, flatten: bool
+    ) -> List[Any]:
+        """
+        Read JSON files in parallel.
+
+        :param files: paths to the files to read
+        :param log_dir: dir with the files, used only for logging
+        :param flatten: if True, each file contains a list of objects and the
+            lists are concatenated; otherwise, each file contains a single
+            object
+        :return: the objects in the order of `files`
+        """
+        with concurrent.futures.ThreadPoolExecutor(
+            self._num_threads
+        ) as executor:
+            data = list(
+                tqdm(
+                    executor.map(
+                        lambda path: hio.from_json(path, use_types=True), files
+                    ),
+                    total=len(files),
+                    desc=f"Loading files from '{log_dir}'",
+                )
+            )
+        if flatten:
+            data = [obj for objs in data for obj in objs]
+        return data
+
+    def _load_df_with_cache(
+        self,
+        cache_name: str,
+        files: List[str],
+        load_df: Callable[[], pd.DataFrame],
+    ) -> pd.DataFrame:
+        """
+        Load a df from the cache or build it with `load_df()`.
+
+        The cache key depends on the paths, sizes and modification times of
+        `files`, so that the df is rebuilt when the logs change. The stale
+        cache files for `cache_name` are removed.
+
+        :param cache_name: name of the df, e.g., "ccxt_trades"
+        :param files: JSON files the df is built from
+        :param load_df: function building the df from `files`
+        """
+        if self._cache_dir is None:
+            return load_df()
+        hasher = hashlib.sha256()
+        for path in files:
+            stat = os.stat(path)
+            hasher.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+        cache_key = hasher.hexdigest()[:16]
+        file_name = os.path.join(
+            self._cache_dir, f"{cache_name}.{cache_key}.pkl"
+        )
+        if os.path.exists(file_name):
+            _LOG.debug("Loading '%s' from cache '%s'", cache_name, file_name)
+            df: pd.DataFrame = hpickle.from_pickle(file_name)
+            return df
+        df = load_df()
+        # Remove the cache files built from previous versions of the logs.
+        pattern = os.path.join(self._cache_dir, f"{cache_name}.*.pkl")
+        for stale_file_name in glob.glob(pattern):
+            os.remove(stale_file_name)
+        hpickle.to_pickle(df, file_name)
+        return df
+
     @staticmethod
     def _convert_ccxt_order_structures_to_dataframe(
         ccxt_order_structures: List[obcaccbr.CcxtData],
@@ -497,27 +613,28 @@ class CcxtLogsReader:
         `ccxt_order_structure` and use this function for both data
         structures.
         """
-        ccxt_order_structures_series_list = []
-        for ccxt_order_structure in ccxt_order_structures:
-            # Skip the response JSON if it is empty.
-            if not ccxt_order_structure:
-                continue
-            srs = pd.Series(
-                ccxt_order_structure.values(), ccxt_order_structure.keys()
-            )
-            # Get order update Unix timestamp from the exchange.
-            info_timestamp = ccxt_order_structure["info"]["updateTime"]
-            srs["info_timestamp"] = info_timestamp
-            # Convert to datetime.
-            srs["info_datetime"] = pd.to_datetime(
-                info_timestamp, unit="ms", utc=True
-            )
-            ccxt_order_structures_series_list.append(srs)
-        ccxt_order_df = pd.concat(ccxt_order_structures_series_list, axis=1).T
-        # Transform timestamp columns to UTC.
-        ccxt_order_df = ccxt_order_df.applymap(
-            lambda x: x.tz_convert("UTC") if isinstance(x, pd.Timestamp) else x
+        # Skip the response JSON if it is empty.
+        ccxt_order_structures = [
+            ccxt_order_structure
+            for ccxt_order_structure in ccxt_order_structures
+            if ccxt_order_structure
+        ]
+        # Build the df column-wise, keeping all the values as objects, as
+        # each order structure was a row of the same type.
+        ccxt_order_df = pd.DataFrame.from_records(ccxt_order_structures)
+        ccxt_order_df = ccxt_order_df.astype(object)
+        # Get order update Unix timestamp from the exchange.
+        ccxt_order_df["info_timestamp"] = [
+            info["updateTime"] for info in ccxt_order_df["info"]
+        ]
+        # Convert to datetime, casting the epochs that are stored as strings
+        # to integers to avoid losing precision.
+        ccxt_order_df["info_datetime"] = pd.to_datetime(
+            ccxt_order_df["info_timestamp"].astype("int64"), unit="ms", utc=True
         )
+        ccxt_order_df = ccxt_order_df.infer_objects()
+        # Transform timestamp columns to UTC.
+        ccxt_order_df = _convert_timestamps_to_utc(ccxt_order_df)
         #  Check the timestamp logs in `CcxtBroker_v2` and update the conversion accordingly.
         # Rename columns.
         ccxt_order_df = ccxt_order_df.rename(
@@ -687,9 +804,7 @@ class CcxtLogsReader:
         oms_parent_orders_df = pd.DataFrame(oms_parent_orders)
         oms_parent_orders_df = oms_parent_orders_df.set_index("order_id")
         # Transform timestamp columns to UTC.
-        oms_parent_orders_df = oms_parent_orders_df.applymap(
-            lambda x: x.tz_convert("UTC") if isinstance(x, pd.Timestamp) else x
-        )
+        oms_parent_orders_df = _convert_timestamps_to_utc(oms_parent_orders_df)
         return oms_parent_orders_df
 
     def _convert_oms_child_orders_to_dataframe(
@@ -755,20 +870,21 @@ class CcxtLogsReader:
         oms_child_orders_df = pd.DataFrame(oms_child_orders_series_list)
         oms_child_orders_df = oms_child_orders_df.set_index("order_id")
         # Transform timestamp columns to UTC.
-        oms_child_orders_df = oms_child_orders_df.applymap(
-            lambda x: x.tz_convert("UTC") if isinstance(x, pd.Timestamp) else x
-        )
+        oms_child_orders_df = _convert_timestamps_to_utc(oms_child_orders_df)
         # Unpack ccxt_id from the list format.
         # E.g. [12028516372] -> 12028516372.
         hdbg.dassert_in("ccxt_id", oms_child_orders_df.columns)
         # Make sure that all CCXT ID lists have length of 1.
         hdbg.dassert_eq_all(set(oms_child_orders_df["ccxt_id"].str.len()), {1})
-        oms_child_orders_df["ccxt_id"] = oms_child_orders_df["ccxt_id"].apply(
-            lambda x: x[0]
-        )
+        oms_child_orders_df["ccxt_id"] = [
+            ccxt_id[0] for ccxt_id in oms_child_orders_df["ccxt_id"]
+        ]
         if unpack_extra_params:
             # Unpack 'extra params' dictionary into a DataFrame.
-            extra_params_df = oms_child_orders_df["extra_params"].apply(pd.Series)
+            extra_params_df = pd.DataFrame.from_records(
+                list(oms_child_orders_df["extra_params"]),
+                index=oms_child_orders_df.index,
+            )
             # Add extra_params columns to the child orders DataFrame.
             oms_child_orders_df = pd.concat(
                 [oms_child_orders_df, extra_params_df], axis=1
@@ -804,8 +920,8 @@ class CcxtLogsReader:
         # PnL is extracted from `info` field, which stores all values as strings.
         trades["realized_pnl"] = trades["realized_pnl"].astype(float)
         # Replace unix epoch with a timestamp.
-        trades["timestamp"] = trades["timestamp"].apply(
-            hdateti.convert_unix_epoch_to_timestamp
+        trades["timestamp"] = pd.to_datetime(
+            trades["timestamp"], unit="ms", utc=True
         )
         # Set columns.
         columns = [
@@ -1,5 +1,6 @@
 import datetime
 import os
+import warnings
 from typing import Any
 
 import numpy as np
@@ -1203,6 +1204,129 @@ class TestCcxtLogsReader1(hunitest.TestCase):
         for df in all_data.values():
             self.assertFalse(df.empty)
 
+    def test_load_all_data_in_parallel1(self) -> None:
+        """
+        Verify that reading the files with one or more threads gives the same
+        data.
+        """
+        target_dir = self.get_scratch_space()
+        broker_version = "v2"
+        _write_test_data(target_dir, broker_version)
+        #
+        reader = obcclore.CcxtLogsReader(target_dir, num_threads=1)
+        expected = reader.load_all_data()
+        reader = obcclore.CcxtLogsReader(target_dir, num_threads=4)
+        actual = reader.load_all_data()
+        # Check.
+        self.assertEqual(list(actual), list(expected))
+        for key, df in actual.items():
+            pd.testing.assert_frame_equal(df, expected[key])
+
+    def test_load_all_data_with_cache1(self) -> None:
+        """
+        Verify that the cached data is reused until the logs change.
+        """
+        target_dir = self.get_scratch_space()
+        broker_version = "v2"
+        _write_test_data(target_dir, broker_version)
+        cache_dir = os.path.join(target_dir, "cache")
+        expected = obcclore.CcxtLogsReader(target_dir).load_all_data()
+        # Build the cache.
+        reader = obcclore.CcxtLogsReader(target_dir, cache_dir=cache_dir)
+        actual = reader.load_all_data()
+        for key, df in actual.items():
+            pd.testing.assert_frame_equal(df, expected[key])
+        cache_files = sorted(os.listdir(cache_dir))
+        self.assertEqual(len(cache_files), 6)
+        # Load from the cache.
+        actual = reader.load_all_data()
+        for key, df in actual.items():
+            pd.testing.assert_frame_equal(df, expected[key])
+        self.assertEqual(sorted(os.listdir(cache_dir)), cache_files)
+        # Add a file with new trades and check that only the stale cache file
+        # is replaced.
+        trades_dir = os.path.join(target_dir, "child_order_fills", "ccxt_trades")
+        trades_file_name = sorted(os.listdir(trades_dir))[0]
+        trades = hio.from_json(
+            os.path.join(trades_dir, trades_file_name), use_types=True
+        )
+        for trade in trades:
+            trade["id"] += 1
+        hio.to_json(
+            os.path.join(trades_dir, "ccxt_trades.new.json"),
+            trades,
+            use_types=True,
+        )
+        ccxt_trades_df = reader.load_ccxt_trades_df()
+        self.assertEqual(
+            ccxt_trades_df.shape[0],
+            expected["ccxt_trades"].shape[0] + len(trades),
+        )
+        new_cache_files = sorted(os.listdir(cache_dir))
+        self.assertEqual(len(new_cache_files), 6)
+        self.assertEqual(len(set(new_cache_files) - set(cache_files)), 1)
+        self.assertTrue(
+            all(
+                file_name.startswith("ccxt_trades.")
+                for file_name in set(cache_files) - set(new_cache_files)
+            )
+        )
+
+
+class Test_convert_timestamps_to_utc1(hunitest.TestCase):
+    def test1(self) -> None:
+        """
+        Check that the columns of timestamps with missing values are converted.
+        """
+        timestamp = pd.Timestamp("2023-08-01 10:00:00", tz="America/New_York")
+        # The columns are built as `object`, like the ones parsed from the
+        # logs.
+        df = pd.DataFrame(
+            {
+                "timestamp": [timestamp, None],
+                "mixed_tz": [timestamp, timestamp.tz_convert("Asia/Tokyo")],
+                "str": ["a", None],
+                "nan": [None, None],
+            },
+            dtype=object,
+        )
+        actual = obcclore._convert_timestamps_to_utc(df)
+        expected_timestamp = pd.Timestamp("2023-08-01 14:00:00", tz="UTC")
+        self.assertEqual(
+            actual["timestamp"].tolist(), [expected_timestamp, pd.NaT]
+        )
+        self.assertEqual(actual["mixed_tz"].tolist(), [expected_timestamp] * 2)
+        self.assertEqual(str(actual["timestamp"].dtype), "datetime64[ns, UTC]")
+        # The other columns are unchanged.
+        self.assertEqual(actual["str"].tolist(), ["a", None])
+        self.assertEqual(actual["nan"].tolist(), [None, None])
+
+
+
+class Test_convert_ccxt_order_structures_to_dataframe1(hunitest.TestCase):
+    def test1(self) -> None:
+        """
+        Check that the update epochs stored as strings are converted exactly.
+        """
+        ccxt_order_structures = [
+            {"id": "1", "info": {"updateTime": "1678898139268"}},
+            {},
+            {"id": "2", "info": {"updateTime": "1678898139999"}},
+        ]
+        # Parsing strings with `unit` is deprecated by pandas.
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", FutureWarning)
+            reader_cls = obcclore.CcxtLogsReader
+            actual = reader_cls._convert_ccxt_order_structures_to_dataframe(
+                ccxt_order_structures
+            )
+        expected = [
+            pd.Timestamp("2023-03-15 16:35:39.268", tz="UTC"),
+            pd.Timestamp("2023-03-15 16:35:39.999", tz="UTC"),
+        ]
+        self.assertEqual(actual["order_update_datetime"].tolist(), expected)
+
+
 @pytest.mark.skip("CMTask5079: Disabled due to obsolete data format.")
 class Test_read_rt_data1(hunitest.TestCase):
     """
@@ -296,6 +296,74 @@ class Test_fill_orders1(hunitest.TestCase):
         self.helper(asset_ids, order, mode, exp)
 
 
+# #############################################################################
+# Test_get_execution_prices_for_orders1
+# #############################################################################
+
+
+class Test_get_execution_prices_for_orders1(hunitest.TestCase):
+    """
+    Check that pricing a batch of heterogeneous orders at once matches pricing
+    each group of homogeneous orders separately.
+    """
+
+    def test1(self) -> None:
+        asset_ids = [101, 102, 103]
+        types = [
+            "price@twap",
+            "price@end",
+            "midpoint@start",
+            "midpoint@end",
+            "partial_spread_0.25@twap",
+            "partial_spread_0.0@end",
+        ]
+        intervals = [
+            ("2000-01-01 09:31:00-05:00", "2000-01-01 09:36:00-05:00"),
+            ("2000-01-01 09:35:00-05:00", "2000-01-01 09:40:00-05:00"),
+        ]
+        # Build the orders, grouped by type and interval.
+        order_groups = []
+        for type_ in types:
+            for start_timestamp, end_timestamp in intervals:
+                orders = []
+                for asset_id in asset_ids:
+                    diff_num_shares = 100 if asset_id % 2 == 0 else -100
+                    order = oordorde.Order(
+                        pd.Timestamp(start_timestamp),
+                        asset_id,
+                        type_,
+                        pd.Timestamp(start_timestamp),
+                        pd.Timestamp(end_timestamp),
+                        0,
+                        diff_num_shares,
+                    )
+                    orders.append(order)
+                order_groups.append(orders)
+        with hasynci.solipsism_context() as event_loop:
+            market_data, _ = mdata.get_ReplayedTimeMarketData_example5(
+                event_loop,
+                pd.Timestamp("2000-01-01 09:29:00-05:00"),
+                pd.Timestamp("2000-01-01 10:30:00-05:00"),
+                asset_ids,
+                replayed_delay_in_mins_or_timestamp=pd.Timestamp(
+                    "2000-01-01 09:45:00-05:00"
+                ),
+                use_midpoint_as_price=True,
+            )
+            # Price all the orders at once.
+            all_orders = [order for orders in order_groups for order in orders]
+            actual = obrobrok.get_execution_prices_for_orders(
+                market_data, all_orders
+            )
+            # Price each group of orders separately.
+            expected = []
+            for orders in order_groups:
+                prices = obrobrok._get_execution_prices(market_data, orders)
+                expected.extend(prices[order.asset_id] for order in orders)
+        self.assertEqual(actual.tolist(), expected)
+        self.assertFalse(actual.isna().any())
+
+
 # #############################################################################
 # TestDataFrameBroker1
 # #############################################################################
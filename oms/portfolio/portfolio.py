@@ -8,10 +8,12 @@ import abc
 import collections
 import logging
 import os
+import struct
 from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
 from tqdm.autonotebook import tqdm
 
 import core.key_sorted_ordered_dict as cksoordi
@@ -25,6 +27,19 @@ import oms.broker.broker as obrobrok
 
 _LOG = logging.getLogger(__name__)
 
+# Schema of the Arrow IPC streams written by `Portfolio.log_state()`, with one
+# row for each timestamp and column of a logged df.
+_ARROW_LOG_SCHEMA = pa.schema(
+    [
+        ("timestamp", pa.timestamp("ns", tz="UTC")),
+        ("column", pa.string()),
+        ("value", pa.float64()),
+    ]
+)
+# Size in bytes of the Arrow IPC streams after the last append of this
+# process, to check whether a stream needs to be repaired before appending.
+_ARROW_STREAM_SIZES: Dict[str, int] = {}
+
 
 # #############################################################################
 # Portfolio
@@ -76,6 +91,7 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         *,
         retrieve_initial_holdings_from_db: bool = False,
         max_num_bars: Optional[int] = 100,
+        log_state_format: str = "csv",
     ):
         """
         Constructor.
@@ -95,6 +111,11 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
             holdings_shares must be a subset of the index of `initial_holdings`.
         :param max_num_bars: maximum number of market data bars to store in memory;
             if `None`, then impose no restriction
+        :param log_state_format: format used by `log_state()` to save each
+            component of the state (e.g., `holdings_shares`)
+            - "csv": a CSV file per bar
+            - "arrow": an Arrow IPC stream per day, appending a record batch
+              per bar
         """
         _LOG.debug(
             hprint.to_str(
@@ -103,7 +124,8 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
                 "pricing_method "
                 "initial_holdings_shares "
                 "retrieve_initial_holdings_from_db "
-                "max_num_bars"
+                "max_num_bars "
+                "log_state_format"
             )
         )
         # Set and unpack broker.
@@ -116,6 +138,8 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         self._get_wall_clock_time = self.market_data.get_wall_clock_time
         self._asset_id_col = self.market_data.asset_id_col
         self._mark_to_market_col = mark_to_market_col
+        hdbg.dassert_in(log_state_format, ("csv", "arrow"))
+        self._log_state_format = log_state_format
         # Parse `pricing_method`.
         (
             self._pricing_type,
@@ -281,6 +305,8 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         """
         Read and process logged Portfolio state.
 
+        The state can be logged in any of the formats of `log_state()`.
+
         :param log_dir: store the state of a Portfolio in terms of its components,
             one per dir
         """
@@ -656,42 +682,53 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
     # /////////////////////////////////////////////////////////////////////////////
 
     def log_state(self, log_dir: str, *, num_periods: Optional[int] = 1) -> str:
+        """
+        Save the last `num_periods` of the state to `log_dir`.
+
+        Each component of the state is saved in `{log_dir}/{name}` in the
+        format set by `log_state_format`, i.e.:
+        - "csv": in `{bar_timestamp}.{wall_clock_time}.csv`
+        - "arrow": appending to `{wall_clock_date}.arrows`
+
+        :return: name of the file written for each component
+        """
         hdbg.dassert(log_dir, "Must specify `log_dir` to log state.")
         #
         bar_timestamp = hwacltim.get_current_bar_timestamp(as_str=True)
         #
         wall_clock_time = self._get_wall_clock_time()
         wall_clock_time_str = wall_clock_time.strftime("%Y%m%d_%H%M%S")
-        file_name = f"{bar_timestamp}.{wall_clock_time_str}.csv"
         #
         holdings_shares_df = self.get_historical_holdings_shares(num_periods)
-        Portfolio._write_df(
-            holdings_shares_df, log_dir, "holdings_shares", file_name
-        )
-        #
         holdings_notional_df = self.get_historical_holdings_notional(num_periods)
-        Portfolio._write_df(
-            holdings_notional_df, log_dir, "holdings_notional", file_name
-        )
-        #
         executed_trades_shares = self.get_historical_executed_trades_shares(
             num_periods
         )
-        Portfolio._write_df(
-            executed_trades_shares, log_dir, "executed_trades_shares", file_name
-        )
         executed_trades_notional_df = (
             self.get_historical_executed_trades_notional(num_periods)
         )
-        Portfolio._write_df(
-            executed_trades_notional_df,
-            log_dir,
-            "executed_trades_notional",
-            file_name,
-        )
-        #
         stats_df = self.get_historical_statistics(num_periods)
-        Portfolio._write_df(stats_df, log_dir, "statistics", file_name)
+        dfs = {
+            "holdings_shares": holdings_shares_df,
+            "holdings_notional": holdings_notional_df,
+            "executed_trades_shares": executed_trades_shares,
+            "executed_trades_notional": executed_trades_notional_df,
+            "statistics": stats_df,
+        }
+        if self._log_state_format == "csv":
+            file_name = f"{bar_timestamp}.{wall_clock_time_str}.csv"
+            for name, df in dfs.items():
+                Portfolio._write_df(df, log_dir, name, file_name)
+        elif self._log_state_format == "arrow":
+            # Use a stream per day, so that the state of a day can be loaded
+            # with a single read.
+            file_name = f"{wall_clock_time.strftime('%Y%m%d')}.arrows"
+            for name, df in dfs.items():
+                Portfolio._append_df_to_arrow_stream(df, log_dir, name, file_name)
+        else:
+            raise ValueError(
+                f"Invalid log_state_format='{self._log_state_format}'"
+            )
         return file_name
 
     def price_assets(self, asset_ids: List[int]) -> pd.Series:
@@ -742,13 +779,21 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         use_relative_paths = True
         files = hio.listdir(dir_name, pattern, only_files, use_relative_paths)
         files.sort()
-        # Read each file as dataframe.
+        arrow_files = [file for file in files if file.endswith(".arrows")]
+        csv_files = [file for file in files if not file.endswith(".arrows")]
+        # Read each CSV file as dataframe.
         dfs = []
-        for file_name in tqdm(files, desc=f"Loading `{name}` files..."):
+        for file_name in tqdm(csv_files, desc=f"Loading `{name}` files..."):
             df = Portfolio._read_df(log_dir, name, file_name, tz)
             dfs.append(df)
+        # Read all the Arrow streams at once.
+        if arrow_files:
+            df = Portfolio._read_arrow_streams(log_dir, name, arrow_files, tz)
+            dfs.append(df)
         # Concatenate.
         df = pd.concat(dfs)
+        if csv_files and arrow_files:
+            df = df.sort_index()
         hdbg.dassert(
             not df.index.has_duplicates,
             "Duplicated indices for `%s`=\n%s",
@@ -783,6 +828,177 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         hio.create_enclosing_dir(path, incremental=True)
         df.to_csv(path)
 
+    @staticmethod
+    def _append_df_to_arrow_stream(
+        df: pd.DataFrame,
+        log_dir: str,
+        name: str,
+        file_name: str,
+    ) -> None:
+        """
+        Append `df` to an Arrow IPC stream as a record batch.
+
+        Each batch is written and flushed on its own, without keeping the
+        stream open, so that the stream can be read at any time and a crash
+        can only truncate the last batch.
+        """
+        path = os.path.join(log_dir, name, file_name)
+        hio.create_enclosing_dir(path, incremental=True)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        if size > 0 and _ARROW_STREAM_SIZES.get(path) != size:
+            # The stream was not written by this process (e.g., the process
+            # was restarted after a crash), so remove a truncated last batch
+            # before appending, since a new batch after it would be misparsed.
+            _, valid_size = Portfolio._read_arrow_stream(path)
+            if valid_size < size:
+                _LOG.warning(
+                    "Removing the truncated end of '%s' (%s bytes)",
+                    path,
+                    size - valid_size,
+                )
+                os.truncate(path, valid_size)
+                size = valid_size
+        with open(path, "ab") as f:
+            if size == 0:
+                f.write(_ARROW_LOG_SCHEMA.serialize())
+            if df.shape[0] != 0:
+                Portfolio._write_df_as_arrow_batch(df, f)
+        _ARROW_STREAM_SIZES[path] = os.path.getsize(path)
+
+    @staticmethod
+    def _write_df_as_arrow_batch(df: pd.DataFrame, f: Any) -> None:
+        """
+        Write a non-empty `df` to the file `f` as an Arrow record batch.
+        """
+        hdbg.dassert_isinstance(df.index, pd.DatetimeIndex)
+        # Convert to long format, so that the schema doesn't depend on the
+        # columns (e.g., the asset ids).
+        num_rows, num_cols = df.shape
+        if num_cols == 0:
+            # Keep the timestamps of a df without columns (e.g., the
+            # executed trades without any trade) using a null column.
+            timestamps = df.index.tz_convert("UTC").values
+            columns = np.full(num_rows, None)
+            values = np.full(num_rows, np.nan)
+        else:
+            timestamps = np.repeat(df.index.tz_convert("UTC").values, num_cols)
+            columns = np.tile(df.columns.astype(str).values, num_rows)
+            values = df.to_numpy(dtype=np.float64).ravel()
+        batch = pa.RecordBatch.from_arrays(
+            [
+                pa.array(timestamps, type=_ARROW_LOG_SCHEMA.field(0).type),
+                pa.array(columns, type=pa.string()),
+                pa.array(values, type=pa.float64()),
+            ],
+            schema=_ARROW_LOG_SCHEMA,
+        )
+        f.write(batch.serialize())
+
+    @staticmethod
+    def _read_arrow_streams(
+        log_dir: str,
+        name: str,
+        file_names: List[str],
+        tz: str,
+    ) -> pd.DataFrame:
+        """
+        Read the Arrow IPC streams written by `_append_df_to_arrow_stream()`.
+
+        :return: df in the same format as the logged dfs
+        """
+        tables = []
+        for file_name in file_names:
+            path = os.path.join(log_dir, name, file_name)
+            batches, valid_size = Portfolio._read_arrow_stream(path)
+            if valid_size < os.path.getsize(path):
+                # The writer was interrupted while writing the last batch.
+                _LOG.warning("Skipping the truncated end of '%s'", path)
+            tables.append(
+                pa.Table.from_batches(batches, schema=_ARROW_LOG_SCHEMA)
+            )
+        long_df = pa.concat_tables(tables).to_pandas()
+        index = pd.DatetimeIndex(long_df["timestamp"].unique()).sort_values()
+        long_df = long_df[long_df["column"].notna()]
+        duplicated = long_df.duplicated(["timestamp", "column"])
+        hdbg.dassert(
+            not duplicated.any(),
+            "Duplicated indices for `%s`=\n%s",
+            name,
+            long_df.loc[duplicated, "timestamp"].unique(),
+        )
+        # Convert back to wide format, keeping the order of the columns.
+        columns = long_df["column"].unique()
+        df = long_df.pivot(index="timestamp", columns="column", values="value")
+        df = df.reindex(index=index, columns=columns)
+        df.index.name = None
+        df.columns.name = None
+        df.index = df.index.tz_convert(tz)
+        return df
+
+    @staticmethod
+    def _read_arrow_stream(path: str) -> Tuple[List[pa.RecordBatch], int]:
+        """
+        Read the record batches of an Arrow IPC stream.
+
+        Only the last message of the stream can be truncated (i.e., by a crash
+        of the writer), while any other inconsistency raises.
+
+        :return: record batches and size in bytes of the stream without the
+            truncated last message, if any
+        """
+        with open(path, "rb") as f:
+            buffer = pa.py_buffer(f.read())
+        size = buffer.size
+        offset = 0
+        batches = []
+        while offset < size:
+            # Each message starts with a continuation marker and the length
+            # of its metadata.
+            if size - offset < 8:
+                break
+            marker, metadata_length = struct.unpack(
+                "<Ii", buffer.slice(offset, 8).to_pybytes()
+            )
+            hdbg.dassert_eq(
+                marker,
+                0xFFFFFFFF,
+                "Corrupted Arrow stream '%s' at byte %s",
+                path,
+                offset,
+            )
+            if metadata_length == 0:
+                # End-of-stream marker.
+                offset += 8
+                hdbg.dassert_eq(offset, size, "Data after the end of '%s'", path)
+                break
+            if offset + 8 + metadata_length > size:
+                break
+            reader = pa.BufferReader(buffer.slice(offset))
+            try:
+                message = pa.ipc.read_message(reader)
+            except OSError:
+                # The body of the last message is truncated.
+                break
+            except pa.ArrowInvalid as e:
+                raise ValueError(
+                    f"Corrupted Arrow stream '{path}' at byte {offset}: {e}"
+                ) from e
+            if offset == 0:
+                hdbg.dassert_eq(message.type, "schema")
+                schema = pa.ipc.read_schema(message)
+                hdbg.dassert(
+                    schema.equals(_ARROW_LOG_SCHEMA),
+                    "Invalid schema in '%s'",
+                    path,
+                )
+            else:
+                hdbg.dassert_eq(message.type, "record batch")
+                batch = pa.ipc.read_record_batch(message, _ARROW_LOG_SCHEMA)
+                batch.validate(full=True)
+                batches.append(batch)
+            offset += reader.tell()
+        return batches, offset
+
     # //////////////////////////////////////////////////////////////////////////////
 
     @staticmethod
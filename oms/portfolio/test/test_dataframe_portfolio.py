@@ -1,5 +1,7 @@
+import asyncio
 import io
 import logging
+import os
 
 import pandas as pd
 
@@ -10,6 +12,7 @@ import helpers.hunit_test as hunitest
 import market_data as mdata
 import oms.broker.broker_example as obrbrexa
 import oms.portfolio.dataframe_portfolio as opodapor
+import oms.portfolio.portfolio as oporport
 import oms.portfolio.portfolio_example as opopoexa
 
 _LOG = logging.getLogger(__name__)
@@ -242,3 +245,137 @@ class TestDataFramePortfolio2(hunitest.TestCase):
             leverage                            0.0"""
             actual = portfolio.get_historical_statistics().transpose()
             self.assert_equal(str(actual), expected, fuzzy_match=True)
+
+
+# #############################################################################
+# TestDataFramePortfolio3
+# #############################################################################
+
+
+class TestDataFramePortfolio3(hunitest.TestCase):
+    """
+    Test the `log_state()` / `read_state()` round trip.
+    """
+
+    @staticmethod
+    def log_state(log_dir: str, log_state_format: str) -> None:
+        """
+        Log the state of a Portfolio with holdings for 3 bars.
+        """
+        with hasynci.solipsism_context() as event_loop:
+            (
+                market_data,
+                _,
+            ) = mdata.get_ReplayedTimeMarketData_example3(event_loop)
+            broker = obrbrexa.get_DataFrameBroker_example1(
+                event_loop, market_data=market_data
+            )
+            mark_to_market_col = "price"
+            pricing_method = "last"
+            holdings_dict = {101: 727.5, 202: 1040.3, -1: 10000}
+            portfolio = opodapor.DataFramePortfolio.from_dict(
+                broker,
+                mark_to_market_col,
+                pricing_method,
+                holdings_shares_dict=holdings_dict,
+                log_state_format=log_state_format,
+            )
+
+            async def _log_state() -> None:
+                for _ in range(3):
+                    portfolio.mark_to_market()
+                    portfolio.log_state(log_dir)
+                    await asyncio.sleep(60 * 5)
+
+            hasynci.run(_log_state(), event_loop=event_loop)
+
+    def test_arrow1(self) -> None:
+        """
+        Check that the state logged as Arrow streams matches the CSV one.
+        """
+        scratch_dir = self.get_scratch_space()
+        csv_log_dir = os.path.join(scratch_dir, "csv")
+        self.log_state(csv_log_dir, "csv")
+        arrow_log_dir = os.path.join(scratch_dir, "arrow")
+        self.log_state(arrow_log_dir, "arrow")
+        # There is a single stream for each component and day.
+        file_names = os.listdir(os.path.join(arrow_log_dir, "holdings_shares"))
+        self.assertEqual(file_names, ["20000101.arrows"])
+        #
+        expected_portfolio_df, expected_stats_df = oporport.Portfolio.read_state(
+            csv_log_dir
+        )
+        portfolio_df, stats_df = oporport.Portfolio.read_state(arrow_log_dir)
+        self.assertEqual(portfolio_df.shape[0], 3)
+        self.assert_dfs_close(portfolio_df, expected_portfolio_df)
+        self.assert_dfs_close(stats_df, expected_stats_df)
+
+    def test_arrow2(self) -> None:
+        """
+        Check that a stream with a truncated last bar is read up to that bar.
+        """
+        log_dir = self.get_scratch_space()
+        self.log_state(log_dir, "arrow")
+        for name in [
+            "holdings_shares",
+            "holdings_notional",
+            "executed_trades_shares",
+            "executed_trades_notional",
+            "statistics",
+        ]:
+            file_name = os.path.join(log_dir, name, "20000101.arrows")
+            with open(file_name, "rb+") as f:
+                f.truncate(os.path.getsize(file_name) - 10)
+        portfolio_df, stats_df = oporport.Portfolio.read_state(log_dir)
+        self.assertEqual(portfolio_df.shape[0], 2)
+        self.assertEqual(stats_df.shape[0], 2)
+
+    def test_arrow3(self) -> None:
+        """
+        Check that bars appended after a truncated last bar are read back.
+        """
+        log_dir = self.get_scratch_space()
+        file_name = "20000101.arrows"
+        index = pd.date_range(
+            "2000-01-01 09:35:00", periods=5, freq="5T", tz="America/New_York"
+        )
+        df = pd.DataFrame(
+            {
+                "101": [1.0, 2.0, 3.0, 4.0, 5.0],
+                "202": [-1.0, -2.0, -3.0, -4.0, -5.0],
+            },
+            index=index,
+        )
+        for idx in range(3):
+            oporport.Portfolio._append_df_to_arrow_stream(
+                df.iloc[idx : idx + 1], log_dir, "holdings_shares", file_name
+            )
+        # Simulate a crash while writing the third bar.
+        path = os.path.join(log_dir, "holdings_shares", file_name)
+        with open(path, "rb+") as f:
+            f.truncate(os.path.getsize(path) - 10)
+        # Append more bars, e.g., after a restart.
+        for idx in range(3, 5):
+            oporport.Portfolio._append_df_to_arrow_stream(
+                df.iloc[idx : idx + 1], log_dir, "holdings_shares", file_name
+            )
+        actual = oporport.Portfolio._read_arrow_streams(
+            log_dir, "holdings_shares", [file_name], "America/New_York"
+        )
+        expected = df.iloc[[0, 1, 3, 4]]
+        self.assert_dfs_close(actual, expected)
+
+    def test_arrow4(self) -> None:
+        """
+        Check that a stream corrupted before its last bar is not read.
+        """
+        log_dir = self.get_scratch_space()
+        self.log_state(log_dir, "arrow")
+        file_name = os.path.join(log_dir, "statistics", "20000101.arrows")
+        # Corrupt the header of the first bar, which follows the schema.
+        schema_size = len(oporport._ARROW_LOG_SCHEMA.serialize())
+        with open(file_name, "rb+") as f:
+            f.seek(schema_size)
+            f.write(b"\x00" * 8)
+        with self.assertRaises(AssertionError):
+            oporport.Portfolio.read_state(log_dir)
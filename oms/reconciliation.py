@@ -4,16 +4,21 @@ Import as:
 import oms.reconciliation as omreconc
 """
 
+import ast
+import concurrent.futures
 import datetime
 import itertools
 import logging
 import os
 import pprint
 import re
+import threading
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 import matplotlib.pyplot as plt
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 import core.config as cconfig
 import core.plotting as coplotti
@@ -22,6 +27,7 @@ import helpers.hdatetime as hdateti
 import helpers.hdbg as hdbg
 import helpers.hgit as hgit
 import helpers.hintrospection as hintros
+import helpers.hio as hio
 import helpers.hpandas as hpandas
 import helpers.hparquet as hparque
 import helpers.hpickle as hpickle
@@ -1094,12 +1100,112 @@ def get_dag_node_names(
     return node_names
 
 
+# #############################################################################
+# DAG node output index
+# #############################################################################
+
+
+# Timezone of the bar timestamps in the names of the node output files.
+# TODO(Grisha): Pass tz as a param?
+_DAG_NODE_FILE_TZ = "America/New_York"
+# Map a DAG dir to the index of the node output files in it.
+_DAG_NODE_FILE_INDEX_CACHE: Dict[str, Dict[str, Dict[pd.Timestamp, str]]] = {}
+# Map a DAG dir, a node name, and the columns to the output loaded by
+# `load_dag_outputs()`.
+_DAG_OUTPUTS_CACHE: Dict[
+    Tuple[str, str, Optional[Tuple[str, ...]]], pd.DataFrame
+] = {}
+_DAG_CACHE_LOCK = threading.Lock()
+
+
+def clear_dag_output_cache() -> None:
+    """
+    Forget the DAG node file indices and the DAG outputs loaded so far.
+
+    This is needed to see the files added to a DAG dir after it was indexed,
+    e.g., when inspecting a system that is still running.
+    """
+    with _DAG_CACHE_LOCK:
+        _DAG_NODE_FILE_INDEX_CACHE.clear()
+        _DAG_OUTPUTS_CACHE.clear()
+
+
+def _build_dag_node_file_index(
+    dag_dir: str,
+) -> Dict[str, Dict[pd.Timestamp, str]]:
+    hdbg.dassert_dir_exists(dag_dir)
+    pattern = "*.df_out.*.parquet"
+    only_files = True
+    use_relative_paths = True
+    file_names = hio.listdir(dag_dir, pattern, only_files, use_relative_paths)
+    node_names = []
+    bar_timestamps = []
+    for file_name in file_names:
+        # E.g., file name is "predict.8.process_forecasts.df_out.20221028_080000.20221028_080143.parquet".
+        # The node name is "predict.8.process_forecasts" and the bar timestamp
+        # is "20221028_080000".
+        node_name, suffix = os.path.basename(file_name).split(".df_out.", 1)
+        node_names.append(node_name)
+        bar_timestamps.append(suffix.split(".")[0])
+    # Convert all the timestamps at once since it is much faster than
+    # converting them one by one.
+    bar_timestamps = pd.to_datetime(
+        bar_timestamps, format="%Y%m%d_%H%M%S"
+    ).tz_localize(_DAG_NODE_FILE_TZ)
+    index: Dict[str, Dict[pd.Timestamp, str]] = {}
+    for node_name, bar_timestamp, file_name in zip(
+        node_names, bar_timestamps, file_names
+    ):
+        index.setdefault(node_name, {})[bar_timestamp] = os.path.join(
+            dag_dir, file_name
+        )
+    # Sort by bar timestamp.
+    index = {
+        node_name: dict(sorted(files.items()))
+        for node_name, files in sorted(index.items())
+    }
+    return index
+
+
+def get_dag_node_file_index(
+    dag_dir: str, *, use_cache: bool = True
+) -> Dict[str, Dict[pd.Timestamp, str]]:
+    """
+    Index the Parquet node output files in a DAG dir.
+
+    The dir is listed once and the index is cached, so that the following
+    lookups don't need to scan the dir again.
+
+    :param dag_dir: dir with the DAG output
+    :param use_cache: reuse the index built for the same dir, if any
+    :return: node name -> bar timestamp -> file path, sorted by node name and
+        bar timestamp, e.g.,
+        ```
+        {
+            "predict.0.read_data": {
+                Timestamp("2022-10-28 08:00:00-04:00"): ".../predict.0.read_data.df_out.20221028_080000.20221028_080143.parquet",
+                ...
+            },
+            ...
+        }
+        ```
+    """
+    with _DAG_CACHE_LOCK:
+        index = _DAG_NODE_FILE_INDEX_CACHE.get(dag_dir) if use_cache else None
+    if index is None:
+        index = _build_dag_node_file_index(dag_dir)
+        with _DAG_CACHE_LOCK:
+            _DAG_NODE_FILE_INDEX_CACHE[dag_dir] = index
+    return index
+
+
 def get_dag_node_timestamps(
     dag_dir: str,
     dag_node_name: str,
     *,
     as_timestamp: bool = True,
     log_level: int = logging.DEBUG,
+    use_cache: bool = False,
 ) -> List[Tuple[Union[str, pd.Timestamp], Union[str, pd.Timestamp]]]:
     """
     Get all bar timestamps and the corresponding wall clock timestamps.
@@ -1111,14 +1217,17 @@ def get_dag_node_timestamps(
     :param dag_node_name: a node name, e.g., `predict.0.read_data`
     :param as_timestamp: if True return as `pd.Timestamp`, otherwise
         return as string
+    :param use_cache: reuse the index of the dir built by a previous call, if
+        any; the cached index doesn't include the files written after it was
+        built, so use it only for a DAG dir that is not updated anymore
     :return: a list of tuples with bar timestamps and wall clock timestamps
         for the specified node
     """
     _LOG.log(log_level, hprint.to_str("dag_dir dag_node_name as_timestamp"))
-    file_names = _get_dag_node_parquet_file_names(dag_dir)
-    node_file_names = list(filter(lambda node: dag_node_name in node, file_names))
+    index = get_dag_node_file_index(dag_dir, use_cache=use_cache)
+    hdbg.dassert_in(dag_node_name, index)
     node_timestamps = []
-    for file_name in node_file_names:
+    for file_name in index[dag_node_name].values():
         # E.g., file name is "predict.8.process_forecasts.df_out.20221028_080000.20221028_080143.parquet".
         # The bar timestamp is "20221028_080000", and the wall clock timestamp
         # is "20221028_080143".
@@ -1128,8 +1237,7 @@ def get_dag_node_timestamps(
         if as_timestamp:
             bar_timestamp = bar_timestamp.replace("_", " ")
             wall_clock_timestamp = wall_clock_timestamp.replace("_", " ")
-            # TODO(Grisha): Pass tz as a param?
-            tz = "America/New_York"
+            tz = _DAG_NODE_FILE_TZ
             bar_timestamp = pd.Timestamp(bar_timestamp, tz=tz)
             wall_clock_timestamp = pd.Timestamp(wall_clock_timestamp, tz=tz)
         node_timestamps.append((bar_timestamp, wall_clock_timestamp))
@@ -1155,17 +1263,82 @@ def get_dag_node_output(
 
     :param dag_dir: dir with the DAG output
     :param dag_node_name: a node name, e.g., `predict.0.read_data`
-    :param timestamp: bar timestamp
+    :param timestamp: bar timestamp; a naive timestamp is in the timezone of
+        the file names (i.e., "America/New_York")
     :return: a DAG node output
     """
-    hdbg.dassert_dir_exists(dag_dir)
     hdbg.dassert_isinstance(timestamp, pd.Timestamp)
-    timestamp = timestamp.strftime("%Y%m%d_%H%M%S")
-    # TODO(Grisha): merge the logic with the one in `get_dag_node_names()`.
-    cmd = f"find '{dag_dir}' -name {dag_node_name}*.parquet"
-    cmd += f" | grep 'df_out.{timestamp}'"
-    _, file = hsystem.system_to_string(cmd)
-    df = hparque.from_parquet(file)
+    if timestamp.tz is None:
+        timestamp = timestamp.tz_localize(_DAG_NODE_FILE_TZ)
+    index = get_dag_node_file_index(dag_dir)
+    if timestamp not in index.get(dag_node_name, {}):
+        # The file could have been written after the dir was indexed.
+        index = get_dag_node_file_index(dag_dir, use_cache=False)
+    hdbg.dassert_in(dag_node_name, index)
+    hdbg.dassert_in(timestamp, index[dag_node_name])
+    file_name = index[dag_node_name][timestamp]
+    df = hparque.from_parquet(file_name)
+    hpandas.dassert_index_is_datetime(df.index)
+    return df
+
+
+def _get_parquet_column_names(
+    schema: pa.Schema, columns: Optional[List[str]]
+) -> Optional[List[str]]:
+    """
+    Get the names of the Parquet columns storing the requested df columns.
+
+    :param columns: names of the df columns, i.e. the values of the first
+        level for a df with multi-index columns; None for all the columns
+    """
+    if columns is None:
+        return None
+    pandas_metadata = schema.pandas_metadata
+    is_multiindex = len(pandas_metadata["column_indexes"]) > 1
+    column_names = []
+    for column in pandas_metadata["columns"]:
+        field_name = column["field_name"]
+        if field_name in pandas_metadata["index_columns"]:
+            continue
+        name = column["name"]
+        if is_multiindex:
+            # Multi-index columns are stored as strings, e.g.,
+            # "('close', '101')".
+            name = ast.literal_eval(name)[0]
+        if name in columns:
+            column_names.append(field_name)
+    hdbg.dassert_lte(1, len(column_names), "No columns in %s", columns)
+    return column_names
+
+
+def _load_last_row_from_parquet(
+    file_name: str, columns: Optional[List[str]]
+) -> pd.DataFrame:
+    """
+    Load the row with the latest timestamp from a Parquet file.
+
+    Only the index and the row group containing the latest row are read.
+    """
+    parquet_file = pq.ParquetFile(file_name)
+    schema = parquet_file.schema_arrow
+    index_columns = schema.pandas_metadata["index_columns"]
+    hdbg.dassert_eq(len(index_columns), 1)
+    hdbg.dassert_isinstance(index_columns[0], str)
+    # Find the position of the latest row.
+    index = parquet_file.read(columns=index_columns).column(0).to_pandas()
+    hdbg.dassert_lte(1, len(index), "No rows in '%s'", file_name)
+    position = int(index.argmax())
+    # Read the row group that contains the row.
+    for row_group in range(parquet_file.num_row_groups):
+        num_rows = parquet_file.metadata.row_group(row_group).num_rows
+        if position < num_rows:
+            break
+        position -= num_rows
+    column_names = _get_parquet_column_names(schema, columns)
+    df = parquet_file.read_row_group(
+        row_group, columns=column_names, use_pandas_metadata=True
+    ).to_pandas()
+    df = df.iloc[[position]]
     hpandas.dassert_index_is_datetime(df.index)
     return df
 
@@ -1174,6 +1347,10 @@ def get_dag_node_output(
 def load_dag_outputs(
     dag_data_path: str,
     node_name: str,
+    *,
+    columns: Optional[List[str]] = None,
+    num_threads: int = 8,
+    use_cache: bool = False,
 ) -> pd.DataFrame:
     """
     Load DAG data for a specified node for all bar timestamps.
@@ -1182,24 +1359,46 @@ def load_dag_outputs(
     (i.e. the last row) for every bar timestamp and concatenate the rows into
     a single dataframe.
 
+    The files are found through `get_dag_node_file_index()` and read in
+    parallel, reading only the latest row and the requested columns of each
+    file.
+
     :param dag_data_path: a path to DAG output data
     :param node_name: a node name to load an output for
+    :param columns: columns to load (the first level for multi-index
+        columns), None for all
+    :param num_threads: number of threads reading the files
+    :param use_cache: reuse the output loaded for the same dir, node, and
+        columns, if any; the cached output doesn't include the files written
+        after it was loaded (see `clear_dag_output_cache()`), so use it only
+        for a DAG dir that is not updated anymore
     :return: a df that consists of last rows from every bar timestamp DAG
         results df
     """
-    # Get DAG timestamps to iterate over them.
-    dag_timestamps = get_dag_node_timestamps(dag_data_path, node_name)
-    # Keep bar timestamps only.
-    bar_timestamps = [bar_timestamp for bar_timestamp, _ in dag_timestamps]
-    last_rows = []
-    for timestamp in bar_timestamps:
-        # Get the row that corresponds to the current bar timestamp, i.e.
-        # the last row.
-        df = get_dag_node_output(dag_data_path, node_name, timestamp)
-        df = df.sort_index().tail(1)
-        last_rows.append(df)
-    df = pd.concat(last_rows)
-    return df
+    hdbg.dassert_lte(1, num_threads)
+    columns_key = None if columns is None else tuple(columns)
+    cache_key = (dag_data_path, node_name, columns_key)
+    with _DAG_CACHE_LOCK:
+        df = _DAG_OUTPUTS_CACHE.get(cache_key) if use_cache else None
+    if df is None:
+        index = get_dag_node_file_index(dag_data_path, use_cache=use_cache)
+        hdbg.dassert_in(node_name, index)
+        file_names = list(index[node_name].values())
+        _LOG.debug("Loading %s files for node=%s", len(file_names), node_name)
+        with concurrent.futures.ThreadPoolExecutor(num_threads) as executor:
+            last_rows = list(
+                executor.map(
+                    lambda file_name: _load_last_row_from_parquet(
+                        file_name, columns
+                    ),
+                    file_names,
+                )
+            )
+        df = pd.concat(last_rows)
+        with _DAG_CACHE_LOCK:
+            _DAG_OUTPUTS_CACHE[cache_key] = df
+    # Return a copy so that the cached df can't be modified by the caller.
+    return df.copy()
 
 
 # TODO(Grisha): obsolete, consider removing it. It's memory consuming
@@ -1,9 +1,11 @@
 import os
-from typing import Optional
+from typing import List, Optional
 
+import numpy as np
 import pandas as pd
 
 import helpers.hio as hio
+import helpers.hparquet as hparque
 import helpers.hunit_test as hunitest
 import oms.reconciliation as omreconc
 
@@ -129,3 +131,171 @@ class Test_get_system_run_parameters(hunitest.TestCase):
         end_timestamp = None
         expected = "[('20230720_131000', '20230721_130500', 'scheduled'), ('20230721_131000', '20230722_130500', 'manual'), ('20230722_131000', '20230723_130500', 'scheduled'), ('20230723_131000', '20230724_130500', 'manual'), ('20230724_131000', '20230725_130500', 'scheduled')]"
         self.check_helper(start_timestamp, end_timestamp, expected)
+
+
+class Test_load_dag_outputs(hunitest.TestCase):
+    def setUp(self) -> None:
+        """
+        Create a DAG dir with the outputs of 2 nodes for 3 bars.
+
+        E.g.:
+        ```
+        predict.0.read_data.df_out.20230720_100000.20230720_100002.parquet
+        predict.0.read_data.df_out.20230720_100500.20230720_100502.parquet
+        ...
+        predict.1.resample.df_out.20230720_101000.20230720_101002.parquet
+        ```
+        """
+        super().setUp()
+        omreconc.clear_dag_output_cache()
+        self._dag_dir = self.get_scratch_space()
+        tz = "America/New_York"
+        index = pd.date_range(
+            "2023-07-20 09:40:00", "2023-07-20 10:10:00", freq="5T", tz=tz
+        )
+        columns = pd.MultiIndex.from_product([["close", "volume"], [101, 202]])
+        full_df = pd.DataFrame(
+            np.arange(len(index) * 4).reshape(len(index), 4),
+            index=index,
+            columns=columns,
+        )
+        self._bar_timestamps = index[-3:]
+        self._file_names = []
+        for node_name in ["predict.0.read_data", "predict.1.resample"]:
+            for bar_timestamp in self._bar_timestamps:
+                # Each bar contains the history up to the bar timestamp.
+                df = full_df.loc[:bar_timestamp]
+                bar_timestamp_as_str = bar_timestamp.strftime("%Y%m%d_%H%M%S")
+                wall_clock_time_as_str = (
+                    bar_timestamp + pd.Timedelta(seconds=2)
+                ).strftime("%Y%m%d_%H%M%S")
+                file_name = f"{node_name}.df_out.{bar_timestamp_as_str}.{wall_clock_time_as_str}.parquet"
+                file_name = os.path.join(self._dag_dir, file_name)
+                hparque.to_parquet(df, file_name)
+                self._file_names.append(file_name)
+
+    def tearDown(self) -> None:
+        omreconc.clear_dag_output_cache()
+        super().tearDown()
+
+    def get_expected_last_rows(
+        self, node_name: str, columns: Optional[List[str]]
+    ) -> pd.DataFrame:
+        """
+        Load the last rows reading the full files, one by one.
+        """
+        last_rows = []
+        for file_name in self._file_names:
+            if f"{node_name}.df_out." in file_name:
+                df = hparque.from_parquet(file_name)
+                if columns is not None:
+                    df = df[columns]
+                last_rows.append(df.sort_index().tail(1))
+        df = pd.concat(last_rows)
+        return df
+
+    def test_get_dag_node_file_index1(self) -> None:
+        """
+        Check that the files are indexed by node and bar timestamp.
+        """
+        index = omreconc.get_dag_node_file_index(self._dag_dir)
+        self.assertEqual(
+            list(index.keys()), ["predict.0.read_data", "predict.1.resample"]
+        )
+        for node_name, files in index.items():
+            self.assertEqual(list(files.keys()), list(self._bar_timestamps))
+            for file_name in files.values():
+                self.assertIn(f"{node_name}.df_out.", file_name)
+
+    def test_get_dag_node_timestamps1(self) -> None:
+        """
+        Check that by default the files written after a call are found.
+        """
+        node_name = "predict.0.read_data"
+        # Remove the last bar and get the timestamps, caching the index.
+        os.rename(self._file_names[2], self._file_names[2] + ".tmp")
+        timestamps = omreconc.get_dag_node_timestamps(self._dag_dir, node_name)
+        bar_timestamps = [bar_timestamp for bar_timestamp, _ in timestamps]
+        self.assertEqual(bar_timestamps, list(self._bar_timestamps[:-1]))
+        # Write the last bar again.
+        os.rename(self._file_names[2] + ".tmp", self._file_names[2])
+        timestamps = omreconc.get_dag_node_timestamps(
+            self._dag_dir, node_name, use_cache=True
+        )
+        self.assertEqual(len(timestamps), 2)
+        timestamps = omreconc.get_dag_node_timestamps(self._dag_dir, node_name)
+        bar_timestamps = [bar_timestamp for bar_timestamp, _ in timestamps]
+        self.assertEqual(bar_timestamps, list(self._bar_timestamps))
+        # The wall clock timestamps are 2 seconds after the bar timestamps.
+        for bar_timestamp, wall_clock_timestamp in timestamps:
+            self.assertEqual(
+                wall_clock_timestamp - bar_timestamp, pd.Timedelta(seconds=2)
+            )
+
+    def test_load_dag_outputs1(self) -> None:
+        """
+        Check that the last row of every bar is loaded.
+        """
+        actual = omreconc.load_dag_outputs(
+            self._dag_dir, "predict.1.resample", num_threads=2
+        )
+        expected = self.get_expected_last_rows("predict.1.resample", None)
+        hunitest.compare_df(actual, expected)
+
+    def test_load_dag_outputs_with_cache1(self) -> None:
+        """
+        Check that the cached output is used even after the files are removed.
+        """
+        actual = omreconc.load_dag_outputs(
+            self._dag_dir, "predict.1.resample", use_cache=True
+        )
+        expected = self.get_expected_last_rows("predict.1.resample", None)
+        hunitest.compare_df(actual, expected)
+        hio.delete_dir(self._dag_dir)
+        hio.create_dir(self._dag_dir, incremental=False)
+        actual = omreconc.load_dag_outputs(
+            self._dag_dir, "predict.1.resample", use_cache=True
+        )
+        hunitest.compare_df(actual, expected)
+
+    def test_load_dag_outputs_without_cache1(self) -> None:
+        """
+        Check that by default the files written after a load are loaded.
+        """
+        _ = omreconc.load_dag_outputs(self._dag_dir, "predict.1.resample")
+        # Remove the last bar.
+        os.remove(self._file_names[-1])
+        actual = omreconc.load_dag_outputs(self._dag_dir, "predict.1.resample")
+        self.assertEqual(list(actual.index), list(self._bar_timestamps[:-1]))
+
+    def test_load_dag_outputs2(self) -> None:
+        """
+        Check that only the requested columns are loaded.
+        """
+        actual = omreconc.load_dag_outputs(
+            self._dag_dir, "predict.0.read_data", columns=["volume"]
+        )
+        expected = self.get_expected_last_rows("predict.0.read_data", ["volume"])
+        hunitest.compare_df(actual, expected)
+
+    def test_get_dag_node_output1(self) -> None:
+        """
+        Check that the full output of a bar is loaded.
+        """
+        bar_timestamp = self._bar_timestamps[1]
+        actual = omreconc.get_dag_node_output(
+            self._dag_dir, "predict.0.read_data", bar_timestamp
+        )
+        expected = hparque.from_parquet(self._file_names[1])
+        hunitest.compare_df(actual, expected)
+
+    def test_get_dag_node_output2(self) -> None:
+        """
+        Check that a naive bar timestamp is in the timezone of the file names.
+        """
+        bar_timestamp = self._bar_timestamps[1].tz_localize(None)
+        actual = omreconc.get_dag_node_output(
+            self._dag_dir, "predict.0.read_data", bar_timestamp
+        )
+        expected = hparque.from_parquet(self._file_names[1])
+        hunitest.compare_df(actual, expected)
@@ -3,6 +3,8 @@ Import as:
 
 import optimizer.forecast_evaluator_with_optimizer as optfewo
 """
+import concurrent.futures
+import functools
 import logging
 from typing import Dict, Optional, Tuple
 
@@ -148,9 +150,25 @@ class ForecastEvaluatorWithOptimizer:
         burn_in_days: int = 0,
         compute_extended_stats: bool = False,
         asset_id_to_share_decimals: Optional[Dict[int, int]] = None,
+        reuse_optimization_problem: bool = False,
+        num_processes: int = 1,
         **kwargs,
     ) -> Dict[str, pd.DataFrame]:
+        """
+        Compute holdings, trades, PnL, and stats by optimizing bar by bar.
+
+        :param df: multiindexed dataframe with predictions, price, volatility
+        :param reuse_optimization_problem: build the optimization problem once
+            and re-solve it with warm start at every bar (see
+            `ParametrizedSinglePeriodOptimizer`), instead of building a new
+            problem for every bar
+        :param num_processes: number of processes used to process the days
+            in parallel; it requires `liquidate_at_end_of_day` and
+            `initialize_beginning_of_day_trades_to_zero`, which make the days
+            independent
+        """
         _LOG.debug("df=\n%s", hpandas.df_to_str(df, print_shape_info=True))
+        hdbg.dassert_lte(1, num_processes)
         self._validate_df(df)
         # Record index in case we reindex the results.
         if reindex_like_input:
@@ -159,6 +177,168 @@ class ForecastEvaluatorWithOptimizer:
             idx = None
         # Trim to indices with prices and beginning of forecast availability.
         df = self._apply_trimming(df)
+        if num_processes == 1:
+            (
+                holdings_shares_dict,
+                holdings_notional_dict,
+                executed_trades_shares_dict,
+                executed_trades_notional_dict,
+            ) = self._compute_holdings_and_trades(
+                df,
+                quantization=quantization,
+                liquidate_at_end_of_day=liquidate_at_end_of_day,
+                initialize_beginning_of_day_trades_to_zero=initialize_beginning_of_day_trades_to_zero,
+                asset_id_to_share_decimals=asset_id_to_share_decimals,
+                reuse_optimization_problem=reuse_optimization_problem,
+            )
+        else:
+            # Holdings are liquidated at the end of each day and the next day
+            # starts from zero holdings and trades, so the days are independent
+            # and can be processed in parallel.
+            hdbg.dassert(
+                liquidate_at_end_of_day,
+                "Processing days in parallel requires liquidating at end of day",
+            )
+            hdbg.dassert(
+                initialize_beginning_of_day_trades_to_zero,
+                "Processing days in parallel requires initializing beginning "
+                "of day trades to zero",
+            )
+            day_dfs = [day_df for _, day_df in df.groupby(df.index.date)]
+            func = functools.partial(
+                self._compute_holdings_and_trades,
+                quantization=quantization,
+                liquidate_at_end_of_day=liquidate_at_end_of_day,
+                initialize_beginning_of_day_trades_to_zero=initialize_beginning_of_day_trades_to_zero,
+                asset_id_to_share_decimals=asset_id_to_share_decimals,
+                reuse_optimization_problem=reuse_optimization_problem,
+                disable_tqdm=True,
+            )
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=num_processes
+            ) as executor:
+                day_results = list(
+                    tqdm(executor.map(func, day_dfs), total=len(day_dfs))
+                )
+            # Merge the per-day results, which are already sorted by time.
+            (
+                holdings_shares_dict,
+                holdings_notional_dict,
+                executed_trades_shares_dict,
+                executed_trades_notional_dict,
+            ) = [
+                {
+                    timestamp: srs
+                    for day_result in day_results
+                    for timestamp, srs in day_result[pos].items()
+                }
+                for pos in range(4)
+            ]
+        # Create the portfolio dataframe.
+        holdings_shares = pd.DataFrame(holdings_shares_dict).T
+        holdings_notional = pd.DataFrame(holdings_notional_dict).T
+        executed_trades_shares = pd.DataFrame(executed_trades_shares_dict).T
+        executed_trades_notional = pd.DataFrame(executed_trades_notional_dict).T
+        pnl = holdings_notional.subtract(
+            holdings_notional.shift(1), fill_value=0
+        ).subtract(executed_trades_notional, fill_value=0)
+        stats = cofinanc.compute_bar_metrics(
+            holdings_notional,
+            -executed_trades_notional,
+            pnl,
+            compute_extended_stats=compute_extended_stats,
+        )
+        derived_dfs = {
+            "holdings_shares": holdings_shares,
+            "holdings_notional": holdings_notional,
+            "executed_trades_shares": executed_trades_shares,
+            "executed_trades_notional": executed_trades_notional,
+            "pnl": pnl,
+            "stats": stats,
+        }
+        # Apply burn-in and reindex like input.
+        return self._apply_burn_in_and_reindex(
+            df,
+            derived_dfs,
+            burn_in_bars,
+            burn_in_days,
+            idx,
+        )
+
+    def annotate_forecasts(
+        self,
+        df: pd.DataFrame,
+        **kwargs,
+    ) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[str, pd.DataFrame]]:
+        """
+        Compute target positions, PnL, and portfolio stats.
+
+        :param df: multiindexed dataframe with predictions, price, volatility
+        """
+        derived_dfs = self.compute_portfolio(df, **kwargs)
+        dfs = {
+            "price": df[self._price_col],
+            "volatility": df[self._volatility_col],
+            "prediction": df[self._prediction_col],
+            "holdings_shares": derived_dfs["holdings_shares"],
+            "holdings_notional": derived_dfs["holdings_notional"],
+            "executed_trades_shares": derived_dfs["executed_trades_shares"],
+            "executed_trades_notional": derived_dfs["executed_trades_notional"],
+            "pnl": derived_dfs["pnl"],
+        }
+        portfolio_df = ForecastEvaluatorWithOptimizer._build_multiindex_df(dfs)
+        return portfolio_df, derived_dfs["stats"]
+
+    @staticmethod
+    def _build_multiindex_df(dfs: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        portfolio_df = pd.concat(dfs.values(), axis=1, keys=dfs.keys())
+        return portfolio_df
+
+    def _compute_holdings_notional(
+        self,
+        df_slice: pd.DataFrame,
+        holdings_shares: pd.Series,
+    ) -> pd.Series:
+        price = df_slice["price"]
+        holdings_notional = (holdings_shares * price).rename("holdings_notional")
+        return holdings_notional
+
+    def _compute_executed_trades_notional(
+        self,
+        df_slice: pd.DataFrame,
+        executed_trades_shares: pd.Series,
+    ) -> pd.Series:
+        price = df_slice["price"]
+        # Compute the notional value of the trades that executed over the
+        # last bar.
+        executed_trades_notional = (executed_trades_shares * price).rename(
+            "executed_trades_notional"
+        )
+        return executed_trades_notional
+
+    def _compute_holdings_and_trades(
+        self,
+        df: pd.DataFrame,
+        *,
+        quantization: Optional[int],
+        liquidate_at_end_of_day: bool,
+        initialize_beginning_of_day_trades_to_zero: bool,
+        asset_id_to_share_decimals: Optional[Dict[int, int]],
+        reuse_optimization_problem: bool,
+        disable_tqdm: bool = False,
+    ) -> Tuple[
+        Dict[pd.Timestamp, pd.Series],
+        Dict[pd.Timestamp, pd.Series],
+        Dict[pd.Timestamp, pd.Series],
+        Dict[pd.Timestamp, pd.Series],
+    ]:
+        """
+        Process `df` row by row starting from zero holdings and trades.
+
+        :param df: trimmed dataframe, as in `compute_portfolio()`
+        :return: holdings in shares, holdings notional, executed trades in
+            shares, executed trades notional, indexed by timestamp
+        """
         # Prepare to process the DAG df row by row.
         iter_ = enumerate(df.iterrows())
         iter_idx = df.index
@@ -192,7 +372,15 @@ class ForecastEvaluatorWithOptimizer:
             df[self._price_col]
         )
         # Process the DAG row by row.
-        for idx, (timestamp, dag_data) in tqdm(iter_, total=num_rows):
+        if reuse_optimization_problem:
+            optimizer = osipeopt.ParametrizedSinglePeriodOptimizer(
+                self._optimizer_config_dict, len(asset_ids)
+            )
+        else:
+            optimizer = None
+        for idx, (timestamp, dag_data) in tqdm(
+            iter_, total=num_rows, disable=disable_tqdm
+        ):
             if idx + 1 < num_rows:
                 next_timestamp = iter_idx[idx + 1]
             else:
@@ -238,6 +426,7 @@ class ForecastEvaluatorWithOptimizer:
                 quantization,
                 asset_id_to_share_decimals,
                 liquidate_holdings,
+                optimizer,
             )
             # If the time step is not the last one, set the next-period
             # share holdings and executed trades in shares (assuming orders
@@ -260,88 +449,13 @@ class ForecastEvaluatorWithOptimizer:
                     executed_trades_shares_dict[next_timestamp] = (
                         targets_df["target_trades_shares"]
                     ).rename("executed_trades_shares")
-        # Create the portfolio dataframe.
-        holdings_shares = pd.DataFrame(holdings_shares_dict).T
-        holdings_notional = pd.DataFrame(holdings_notional_dict).T
-        executed_trades_shares = pd.DataFrame(executed_trades_shares_dict).T
-        executed_trades_notional = pd.DataFrame(executed_trades_notional_dict).T
-        pnl = holdings_notional.subtract(
-            holdings_notional.shift(1), fill_value=0
-        ).subtract(executed_trades_notional, fill_value=0)
-        stats = cofinanc.compute_bar_metrics(
-            holdings_notional,
-            -executed_trades_notional,
-            pnl,
-            compute_extended_stats=compute_extended_stats,
-        )
-        derived_dfs = {
-            "holdings_shares": holdings_shares,
-            "holdings_notional": holdings_notional,
-            "executed_trades_shares": executed_trades_shares,
-            "executed_trades_notional": executed_trades_notional,
-            "pnl": pnl,
-            "stats": stats,
-        }
-        # Apply burn-in and reindex like input.
-        return self._apply_burn_in_and_reindex(
-            df,
-            derived_dfs,
-            burn_in_bars,
-            burn_in_days,
-            idx,
+        return (
+            holdings_shares_dict,
+            holdings_notional_dict,
+            executed_trades_shares_dict,
+            executed_trades_notional_dict,
         )
 
-    def annotate_forecasts(
-        self,
-        df: pd.DataFrame,
-        **kwargs,
-    ) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[str, pd.DataFrame]]:
-        """
-        Compute target positions, PnL, and portfolio stats.
-
-        :param df: multiindexed dataframe with predictions, price, volatility
-        """
-        derived_dfs = self.compute_portfolio(df, **kwargs)
-        dfs = {
-            "price": df[self._price_col],
-            "volatility": df[self._volatility_col],
-            "prediction": df[self._prediction_col],
-            "holdings_shares": derived_dfs["holdings_shares"],
-            "holdings_notional": derived_dfs["holdings_notional"],
-            "executed_trades_shares": derived_dfs["executed_trades_shares"],
-            "executed_trades_notional": derived_dfs["executed_trades_notional"],
-            "pnl": derived_dfs["pnl"],
-        }
-        portfolio_df = ForecastEvaluatorWithOptimizer._build_multiindex_df(dfs)
-        return portfolio_df, derived_dfs["stats"]
-
-    @staticmethod
-    def _build_multiindex_df(dfs: Dict[str, pd.DataFrame]) -> pd.DataFrame:
-        portfolio_df = pd.concat(dfs.values(), axis=1, keys=dfs.keys())
-        return portfolio_df
-
-    def _compute_holdings_notional(
-        self,
-        df_slice: pd.DataFrame,
-        holdings_shares: pd.Series,
-    ) -> pd.Series:
-        price = df_slice["price"]
-        holdings_notional = (holdings_shares * price).rename("holdings_notional")
-        return holdings_notional
-
-    def _compute_executed_trades_notional(
-        self,
-        df_slice: pd.DataFrame,
-        executed_trades_shares: pd.Series,
-    ) -> pd.Series:
-        price = df_slice["price"]
-        # Compute the notional value of the trades that executed over the
-        # last bar.
-        executed_trades_notional = (executed_trades_shares * price).rename(
-            "executed_trades_notional"
-        )
-        return executed_trades_notional
-
     def _optimize(
         self,
         df_slice: pd.DataFrame,
@@ -350,6 +464,7 @@ class ForecastEvaluatorWithOptimizer:
         quantization,
         asset_id_to_share_decimals,
         liquidate_holdings,
+        optimizer: Optional[osipeopt.ParametrizedSinglePeriodOptimizer],
     ) -> pd.Series:
         # Prepare data for the optimizer.
         holdings_df = pd.concat([holdings_shares, holdings_notional], axis=1)
@@ -358,13 +473,21 @@ class ForecastEvaluatorWithOptimizer:
         input_df = input_df.rename(columns={"index": "asset_id"})
         _LOG.debug("input_df cols=%s", input_df.columns)
         # Optimize.
-        output_df = osipeopt.optimize(
-            self._optimizer_config_dict,
-            input_df,
-            quantization=quantization,
-            asset_id_to_share_decimals=asset_id_to_share_decimals,
-            liquidate_holdings=liquidate_holdings,
-        )
+        if optimizer is None:
+            output_df = osipeopt.optimize(
+                self._optimizer_config_dict,
+                input_df,
+                quantization=quantization,
+                asset_id_to_share_decimals=asset_id_to_share_decimals,
+                liquidate_holdings=liquidate_holdings,
+            )
+        else:
+            output_df = optimizer.optimize(
+                input_df,
+                quantization=quantization,
+                asset_id_to_share_decimals=asset_id_to_share_decimals,
+                liquidate_holdings=liquidate_holdings,
+            )
         return output_df
 
     def _validate_df(self, df: pd.DataFrame) -> None:
@@ -5,7 +5,7 @@ import optimizer.single_period_optimization as osipeopt
 """
 
 import logging
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -97,19 +97,7 @@ class SinglePeriodOptimizer:
         _LOG.debug(
             "current_weights=\n%s", hpandas.df_to_str(self._current_weights)
         )
-        # We pass "solver" as a string to avoid propagating `cvx` dependencies.
-        if "solver" in config_dict:
-            solver = config_dict["solver"]
-            if solver == "ECOS":
-                self._solver = cvx.ECOS
-            elif solver == "OSQP":
-                self._solver = cvx.OSQP
-            elif solver == "SCS":
-                self._solver = cvx.SCS
-            else:
-                raise ValueError("solver=%s not supported", solver)
-        else:
-            self._solver = None
+        self._solver = _get_solver(config_dict)
         self._verbose = config_dict.get("verbose", False)
 
     def optimize(
@@ -144,45 +132,13 @@ class SinglePeriodOptimizer:
                 "target_weight_diffs=\n%s", hpandas.df_to_str(target_weight_diffs)
             )
             _ = target_weight_diffs
-        _LOG.debug("target_weights=\n%s", hpandas.df_to_str(target_weights))
-        # Convert target weights to target notional holdings.
-        rescaling = self._target_gmv / self._n_assets
-        _LOG.debug("rescaling factor=%f", rescaling)
-        target_holdings_notional = (rescaling * target_weights).rename(
-            "target_holdings_notional"
-        )
-        input_df = self._df.set_index("asset_id")
-        target_holdings_shares = (
-            target_holdings_notional / input_df["price"]
-        ).rename("target_holdings_shares")
-        # Quantize holdings (e.g., nearest share).
-        target_holdings_shares = cofinanc.quantize_shares(
-            target_holdings_shares,
+        result_df = _process_target_weights(
+            self._df,
+            target_weights,
+            self._target_gmv,
             quantization,
-            asset_id_to_decimals=asset_id_to_share_decimals,
-        )
-        # Recompute `target_holdings_notional` from shares and price.
-        target_holdings_notional = (
-            target_holdings_shares * input_df["price"]
-        ).rename("target_holdings_notional")
-        # Compute target trades.
-        target_trades_shares = (
-            target_holdings_shares - input_df["holdings_shares"]
-        ).rename("target_trades_shares")
-        target_trades_notional = (
-            target_trades_shares * input_df["price"]
-        ).rename("target_trades_notional")
-        targets_df = pd.concat(
-            [
-                target_holdings_shares,
-                target_holdings_notional,
-                target_trades_shares,
-                target_trades_notional,
-            ],
-            axis=1,
+            asset_id_to_share_decimals,
         )
-        #
-        result_df = pd.concat([input_df, targets_df], axis=1)
         return result_df
 
     def compute_stats(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -303,60 +259,12 @@ class SinglePeriodOptimizer:
         return target_weights, target_weight_diffs
 
     def _get_soft_constraints(self) -> List[opbase.Expression]:
-        # Create soft constraints
-        soft_constraints = []
-        # Add diagonal risk soft constraint.
         volatility = self._df["volatility"]
-        diagonal_risk = osofcons.VolatilityRiskModel(
-            volatility, self._volatility_penalty
-        )
-        soft_constraints.append(diagonal_risk)
-        # Maybe add constant correlation risk constraint.
-        if "constant_correlation" in self._config_dict:
-            constant_correlation = self._config_dict["constant_correlation"]
-            constant_correlation_penalty = self._config_dict[
-                "constant_correlation_penalty"
-            ]
-            constant_correlation_risk = osofcons.ConstantCorrelationRiskModel(
-                constant_correlation,
-                volatility,
-                constant_correlation_penalty,
-            )
-            soft_constraints.append(constant_correlation_risk)
-        # Add GMV contraint.
-        target_gmv_constraint = osofcons.TargetGmvUpperBoundSoftConstraint(
-            self._target_gmv_upper_bound_penalty
-        )
-        soft_constraints.append(target_gmv_constraint)
-        # Add dollar neutrality constraint.
-        dollar_neutrality = osofcons.DollarNeutralitySoftConstraint(
-            self._dollar_neutrality_penalty
-        )
-        soft_constraints.append(dollar_neutrality)
-        # Add relative holding constraint.
-        relative_holding = osofcons.RelativeHoldingSoftConstraint(
-            self._relative_holding_penalty
-        )
-        soft_constraints.append(relative_holding)
-        # Add turnover soft constraint.
-        turnover = osofcons.TurnoverSoftConstraint(self._turnover_penalty)
-        soft_constraints.append(turnover)
+        soft_constraints = _get_soft_constraints(self._config_dict, volatility)
         return soft_constraints
 
     def _get_hard_constraints(self) -> List[opbase.Expression]:
-        # Create hard constraints.
-        hard_constraints = []
-        # Add target GMV hard constraint.
-        target_gmv_constraint = oharcons.TargetGmvUpperBoundHardConstraint(
-            self._target_gmv,
-            self._target_gmv_hard_upper_bound_multiple,
-        )
-        hard_constraints.append(target_gmv_constraint)
-        # Add relative holding constraint.
-        relative_holding_constraint = oharcons.RelativeHoldingHardConstraint(
-            self._relative_holding_max_frac_of_gmv
-        )
-        hard_constraints.append(relative_holding_constraint)
+        hard_constraints = _get_hard_constraints(self._config_dict)
         if self._restrictions is not None:
             restriction_constraints = self._get_restriction_constraints()
             if restriction_constraints:
@@ -432,3 +340,269 @@ class SinglePeriodOptimizer:
         df = pd.concat(srs_list, axis=1)
         _LOG.debug("optimizer result=\n%s", hpandas.df_to_str(df, precision=2))
         return df
+
+
+# #############################################################################
+# Single period optimization with a reusable problem
+# #############################################################################
+
+
+class ParametrizedSinglePeriodOptimizer:
+    """
+    Single period optimizer that builds the cvxpy problem once and re-solves it.
+
+    The problem is built for a fixed number of assets with `cvx.Parameter`s for
+    the returns forecasts, the volatility forecasts, and the current weights,
+    so that solving it for a new bar only requires updating the parameter
+    values. Since the problem is DPP-compliant, cvxpy caches its
+    canonicalization and the solver is warm-started from the previous
+    solution.
+
+    The constraints and the output are the same as `SinglePeriodOptimizer`,
+    except that restrictions (which depend on the current holdings) are not
+    supported.
+    """
+
+    def __init__(self, config_dict: dict, n_assets: int) -> None:
+        """
+        Build the optimization problem.
+
+        :param config_dict: optimizer config, as in `SinglePeriodOptimizer`
+        :param n_assets: number of assets of the dataframes passed to
+            `optimize()`
+        """
+        hdbg.dassert_lte(1, n_assets)
+        self._config_dict = config_dict
+        self._target_gmv = config_dict["target_gmv"]
+        self._n_assets = n_assets
+        self._solver = _get_solver(config_dict)
+        self._verbose = config_dict.get("verbose", False)
+        # Create the parameters that are updated at every bar.
+        self._predictions = cvx.Parameter(n_assets, name="predictions")
+        self._volatility = cvx.Parameter(n_assets, name="volatility")
+        self._current_weights = cvx.Parameter(n_assets, name="current_weights")
+        # Optimize over the target weights (instead of the target weight
+        # diffs as in `SinglePeriodOptimizer`), so that the objective does not
+        # contain products of parameters and stays DPP-compliant.
+        self._target_weights = cvx.Variable(n_assets)
+        target_weight_diffs = self._target_weights - self._current_weights
+        predicted_returns = cvx.multiply(self._predictions, self._target_weights)
+        mu = cvx.sum(predicted_returns)
+        # Get constraints.
+        soft_constraints = _get_soft_constraints(config_dict, self._volatility)
+        hard_constraints = _get_hard_constraints(config_dict)
+        # Convert constraints into cvxpy expressions. The soft constraints are
+        # scaled by the value of their penalty, since the product of the
+        # penalty parameter and a parametrized expression is not DPP-compliant.
+        soft_constraint_cvx_expr = []
+        for constraint in soft_constraints:
+            _ = constraint.get_expr(
+                self._target_weights, target_weight_diffs, self._target_gmv
+            )
+            soft_constraint_cvx_expr.append(
+                constraint.gamma.value * constraint.expr
+            )
+        hard_constraint_cvx_expr = [
+            constraint.get_expr(
+                self._target_weights, target_weight_diffs, self._target_gmv
+            )
+            for constraint in hard_constraints
+        ]
+        # Create the cvxpy problem.
+        self._problem = cvx.Problem(
+            cvx.Maximize(mu - sum(soft_constraint_cvx_expr)),
+            hard_constraint_cvx_expr,
+        )
+        hdbg.dassert(self._problem.is_dcp(dpp=True))
+
+    def optimize(
+        self,
+        df: pd.DataFrame,
+        *,
+        quantization: Optional[int] = 30,
+        asset_id_to_share_decimals: Optional[Dict[int, int]] = None,
+        liquidate_holdings: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Get target notional positions.
+
+        :param df: as in `SinglePeriodOptimizer`
+        :return: as in `SinglePeriodOptimizer.optimize()`
+        """
+        SinglePeriodOptimizer._validate_df(df)
+        hdbg.dassert_eq(df.shape[0], self._n_assets)
+        asset_ids = df["asset_id"]
+        if liquidate_holdings:
+            _LOG.debug("Liquidating holdings...")
+            target_weights = pd.Series(0, index=asset_ids, name="target_weights")
+        else:
+            # Update the parameters and re-solve the problem.
+            holdings_notional = df["holdings_notional"]
+            current_weights = (
+                holdings_notional * self._n_assets / self._target_gmv
+            )
+            self._current_weights.value = current_weights.to_numpy(
+                dtype=float
+            )
+            self._predictions.value = df["prediction"].to_numpy(dtype=float)
+            self._volatility.value = df["volatility"].to_numpy(dtype=float)
+            optimal_value = self._problem.solve(
+                self._solver, warm_start=True, verbose=self._verbose
+            )
+            if self._problem.status != "optimal":
+                _LOG.warning("problem.status=%s", self._problem.status)
+            _LOG.debug("`optimal_value`=%0.2f", optimal_value)
+            target_weights = pd.Series(
+                data=self._target_weights.value,
+                index=asset_ids,
+                name="target_weights",
+            )
+        result_df = _process_target_weights(
+            df,
+            target_weights,
+            self._target_gmv,
+            quantization,
+            asset_id_to_share_decimals,
+        )
+        return result_df
+
+
+# #############################################################################
+# Helpers
+# #############################################################################
+
+
+def _get_solver(config_dict: dict) -> Optional[str]:
+    # We pass "solver" as a string to avoid propagating `cvx` dependencies.
+    if "solver" in config_dict:
+        solver = config_dict["solver"]
+        if solver == "ECOS":
+            solver = cvx.ECOS
+        elif solver == "OSQP":
+            solver = cvx.OSQP
+        elif solver == "SCS":
+            solver = cvx.SCS
+        else:
+            raise ValueError("solver=%s not supported", solver)
+    else:
+        solver = None
+    return solver
+
+
+def _get_soft_constraints(
+    config_dict: dict,
+    volatility: Union[pd.Series, cvx.Parameter],
+) -> List[opbase.Expression]:
+    # Create soft constraints
+    soft_constraints = []
+    # Add diagonal risk soft constraint.
+    diagonal_risk = osofcons.VolatilityRiskModel(
+        volatility, config_dict["volatility_penalty"]
+    )
+    soft_constraints.append(diagonal_risk)
+    # Maybe add constant correlation risk constraint.
+    if "constant_correlation" in config_dict:
+        constant_correlation = config_dict["constant_correlation"]
+        constant_correlation_penalty = config_dict[
+            "constant_correlation_penalty"
+        ]
+        constant_correlation_risk = osofcons.ConstantCorrelationRiskModel(
+            constant_correlation,
+            volatility,
+            constant_correlation_penalty,
+        )
+        soft_constraints.append(constant_correlation_risk)
+    # Add GMV contraint.
+    target_gmv_constraint = osofcons.TargetGmvUpperBoundSoftConstraint(
+        config_dict["target_gmv_upper_bound_penalty"]
+    )
+    soft_constraints.append(target_gmv_constraint)
+    # Add dollar neutrality constraint.
+    dollar_neutrality = osofcons.DollarNeutralitySoftConstraint(
+        config_dict["dollar_neutrality_penalty"]
+    )
+    soft_constraints.append(dollar_neutrality)
+    # Add relative holding constraint.
+    relative_holding = osofcons.RelativeHoldingSoftConstraint(
+        config_dict["relative_holding_penalty"]
+    )
+    soft_constraints.append(relative_holding)
+    # Add turnover soft constraint.
+    turnover = osofcons.TurnoverSoftConstraint(config_dict["turnover_penalty"])
+    soft_constraints.append(turnover)
+    return soft_constraints
+
+
+def _get_hard_constraints(config_dict: dict) -> List[opbase.Expression]:
+    # Create hard constraints.
+    hard_constraints = []
+    # Add target GMV hard constraint.
+    target_gmv_constraint = oharcons.TargetGmvUpperBoundHardConstraint(
+        config_dict["target_gmv"],
+        config_dict["target_gmv_hard_upper_bound_multiple"],
+    )
+    hard_constraints.append(target_gmv_constraint)
+    # Add relative holding constraint.
+    relative_holding_constraint = oharcons.RelativeHoldingHardConstraint(
+        config_dict["relative_holding_max_frac_of_gmv"]
+    )
+    hard_constraints.append(relative_holding_constraint)
+    return hard_constraints
+
+
+def _process_target_weights(
+    df: pd.DataFrame,
+    target_weights: pd.Series,
+    target_gmv: float,
+    quantization: Optional[int],
+    asset_id_to_share_decimals: Optional[Dict[int, int]],
+) -> pd.DataFrame:
+    """
+    Convert target weights into target holdings and trades.
+
+    :param df: optimizer input dataframe
+    :param target_weights: target weights indexed by asset id
+    :return: `df` indexed by asset id with target holdings and trades, both
+        in shares and notional
+    """
+    _LOG.debug("target_weights=\n%s", hpandas.df_to_str(target_weights))
+    # Convert target weights to target notional holdings.
+    n_assets = df.shape[0]
+    rescaling = target_gmv / n_assets
+    _LOG.debug("rescaling factor=%f", rescaling)
+    target_holdings_notional = (rescaling * target_weights).rename(
+        "target_holdings_notional"
+    )
+    input_df = df.set_index("asset_id")
+    target_holdings_shares = (
+        target_holdings_notional / input_df["price"]
+    ).rename("target_holdings_shares")
+    # Quantize holdings (e.g., nearest share).
+    target_holdings_shares = cofinanc.quantize_shares(
+        target_holdings_shares,
+        quantization,
+        asset_id_to_decimals=asset_id_to_share_decimals,
+    )
+    # Recompute `target_holdings_notional` from shares and price.
+    target_holdings_notional = (
+        target_holdings_shares * input_df["price"]
+    ).rename("target_holdings_notional")
+    # Compute target trades.
+    target_trades_shares = (
+        target_holdings_shares - input_df["holdings_shares"]
+    ).rename("target_trades_shares")
+    target_trades_notional = (
+        target_trades_shares * input_df["price"]
+    ).rename("target_trades_notional")
+    targets_df = pd.concat(
+        [
+            target_holdings_shares,
+            target_holdings_notional,
+            target_trades_shares,
+            target_trades_notional,
+        ],
+        axis=1,
+    )
+    #
+    result_df = pd.concat([input_df, targets_df], axis=1)
+    return result_df
@@ -6,6 +6,7 @@ import optimizer.soft_constraints as osofcons
 
 import abc
 import logging
+from typing import Union
 
 import pandas as pd
 
@@ -73,16 +74,25 @@ class VolatilityRiskModel(SoftConstraint):
     Impose a diagonal volatility cost.
     """
 
-    def __init__(self, volatility: pd.Series, gamma: float = 1.0) -> None:
+    def __init__(
+        self, volatility: Union[pd.Series, cvx.Parameter], gamma: float = 1.0
+    ) -> None:
         self._volatility = volatility
         super().__init__(gamma)
 
     def _estimate(self, target_weights, target_weight_diffs, gmv) -> opbase.EXPR:
         _ = target_weight_diffs
         _ = gmv
-        expr = cvx.quad_form(
-            target_weights, cvx.diag(self._volatility.values**2)
-        )
+        if isinstance(self._volatility, cvx.Parameter):
+            # A `quad_form()` with a parametrized matrix is not DPP-compliant,
+            # so use the equivalent sum of squares.
+            expr = cvx.sum_squares(
+                cvx.multiply(target_weights, self._volatility)
+            )
+        else:
+            expr = cvx.quad_form(
+                target_weights, cvx.diag(self._volatility.values**2)
+            )
         return expr
 
 
@@ -109,7 +119,10 @@ class ConstantCorrelationRiskModel(SoftConstraint):
     """
 
     def __init__(
-        self, correlation: float, volatility: pd.Series, gamma: float = 1.0
+        self,
+        correlation: float,
+        volatility: Union[pd.Series, cvx.Parameter],
+        gamma: float = 1.0,
     ) -> None:
         self._correlation = correlation
         self._volatility = volatility
@@ -118,12 +131,14 @@ class ConstantCorrelationRiskModel(SoftConstraint):
     def _estimate(self, target_weights, target_weight_diffs, gmv) -> opbase.EXPR:
         _ = target_weight_diffs
         _ = gmv
+        if isinstance(self._volatility, cvx.Parameter):
+            volatility = self._volatility
+        else:
+            volatility = self._volatility.values
         expr1 = (1 - self._correlation) * cvx.sum_squares(
-            cvx.multiply(target_weights, self._volatility.values)
-        )
-        expr2 = self._correlation * cvx.power(
-            target_weights @ self._volatility.values, 2
+            cvx.multiply(target_weights, volatility)
         )
+        expr2 = self._correlation * cvx.power(target_weights @ volatility, 2)
         expr = expr1 + expr2
         return expr
 
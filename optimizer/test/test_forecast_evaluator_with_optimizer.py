@@ -333,3 +333,40 @@ class TestForecastEvaluatorWithOptimizer2(hunitest.TestCase):
 2022-01-05 16:00:00-05:00 -36.85     100269.89      135.35       0.00    0.00
 """
         self.assert_equal(actual, expected, fuzzy_match=True)
+
+    @pytest.mark.slow("Under 20 seconds.")
+    def test_multiday_reuse_problem_in_parallel(self) -> None:
+        """
+        Check that reusing the problem and processing days in parallel match
+        the default mode.
+        """
+        data = self.get_data(
+            pd.Timestamp("2022-01-03 09:30:00", tz="America/New_York"),
+            pd.Timestamp("2022-01-05 16:00:00", tz="America/New_York"),
+            asset_ids=[101, 201, 301],
+        )
+        config_dict = self.get_config_dict()
+        forecast_evaluator = ofevwiop.ForecastEvaluatorWithOptimizer(
+            price_col="price",
+            volatility_col="volatility",
+            prediction_col="prediction",
+            optimizer_config_dict=config_dict,
+        )
+        _, expected_stats_df = forecast_evaluator.annotate_forecasts(
+            data,
+            quantization=0,
+        )
+        _, stats_df = forecast_evaluator.annotate_forecasts(
+            data,
+            quantization=0,
+            reuse_optimization_problem=True,
+            num_processes=2,
+        )
+        precision = 2
+        actual = hpandas.df_to_str(
+            stats_df.round(precision), num_rows=None, precision=precision
+        )
+        expected = hpandas.df_to_str(
+            expected_stats_df.round(precision), num_rows=None, precision=precision
+        )
+        self.assert_equal(actual, expected)
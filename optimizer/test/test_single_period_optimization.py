@@ -286,3 +286,43 @@ asset_id
 301             -39037.56    0.0                0.0        0.03        0.08                2.74e+07                 -50499.60              2.74e+07               -50571.62
 401              42265.68    0.0                0.0        0.08        0.03                2.76e+07                  13939.71              2.76e+07                13918.37"""
         self.assert_equal(actual, expected, fuzzy_match=True)
+
+
+# #############################################################################
+# TestParametrizedSinglePeriodOptimizer1
+# #############################################################################
+
+
+class TestParametrizedSinglePeriodOptimizer1(hunitest.TestCase):
+    def test1(self) -> None:
+        """
+        Check that re-solving the same problem on different data matches
+        building a new problem for each dataframe.
+        """
+        dict_ = {
+            "dollar_neutrality_penalty": 0.1,
+            "volatility_penalty": 0.75,
+            "relative_holding_penalty": 0.0,
+            "relative_holding_max_frac_of_gmv": 1.0,
+            "target_gmv": 3000,
+            "target_gmv_upper_bound_penalty": 0.0,
+            "target_gmv_hard_upper_bound_multiple": 1.01,
+            "turnover_penalty": 0.0005,
+            "constant_correlation": 0.8,
+            "constant_correlation_penalty": 5.0,
+        }
+        df1 = TestSinglePeriodOptimizer1.get_prediction_df()
+        df2 = df1.copy()
+        df2["holdings_shares"] = [-200, 1000, -800]
+        df2["holdings_notional"] = df2["holdings_shares"]
+        df2["prediction"] = [0.02, -0.04, 0.08]
+        df2["volatility"] = [0.06, 0.05, 0.02]
+        spo = osipeopt.ParametrizedSinglePeriodOptimizer(dict_, df1.shape[0])
+        precision = 2
+        for df in [df1, df2, df1]:
+            optimized = spo.optimize(df, quantization=0)
+            actual = hpandas.df_to_str(
+                optimized.round(precision), precision=precision
+            )
+            expected = _run_optimizer(dict_, df, restrictions=None)
+            self.assert_equal(actual, expected)